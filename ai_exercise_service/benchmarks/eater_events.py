@@ -0,0 +1,71 @@
+"""
+Spring 식사 기록 변경 이벤트 발행기 (로컬 대체용)
+
+Spring이 식사 기록 저장 시 호출하는 `/internal/events/eater-record`를 흉내내
+사용자별 이벤트를 발행합니다. 한 사용자에게 짧은 간격으로 여러 이벤트를 보내
+debounce/중복 제거 동작을 확인할 수 있습니다.
+
+사용법:
+    cd ai_exercise_service
+    python -m benchmarks.eater_events --url http://localhost:8000 --secret $INTERNAL_WEBHOOK_SECRET --users 12 13 --burst 5
+"""
+import argparse
+import asyncio
+import os
+import sys
+from collections import Counter
+from typing import List, Optional
+
+import httpx
+
+EVENT_PATH = "/internal/events/eater-record"
+
+
+async def publish(
+    base_url: str,
+    secret: str,
+    user_ids: List[str],
+    burst: int = 1,
+    interval: float = 0.2,
+    date: Optional[str] = None
+) -> Counter:
+    """사용자마다 burst개 이벤트를 interval 간격으로 발행하고 처리 결과별 개수 반환"""
+    outcomes: Counter = Counter()
+    headers = {"X-Internal-Token": secret}
+
+    async with httpx.AsyncClient(base_url=base_url, timeout=10.0) as client:
+        async def send(user_id: str) -> None:
+            for i in range(burst):
+                body = {"userId": user_id}
+                if date:
+                    body["date"] = date
+                response = await client.post(EVENT_PATH, json=body, headers=headers)
+                if response.status_code == 202:
+                    outcomes[response.json()["outcome"]] += 1
+                else:
+                    outcomes[f"http_{response.status_code}"] += 1
+                if i < burst - 1:
+                    await asyncio.sleep(interval)
+
+        await asyncio.gather(*(send(user_id) for user_id in user_ids))
+    return outcomes
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="식사 기록 변경 이벤트 발행")
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--secret", default=os.getenv("INTERNAL_WEBHOOK_SECRET", ""))
+    parser.add_argument("--users", nargs="+", default=["12"])
+    parser.add_argument("--burst", type=int, default=1, help="사용자별 이벤트 수")
+    parser.add_argument("--interval", type=float, default=0.2, help="같은 사용자 이벤트 간격(초)")
+    parser.add_argument("--date", default=None, help="YYYY-MM-DD (기본: 오늘)")
+    args = parser.parse_args(argv)
+
+    outcomes = asyncio.run(publish(args.url, args.secret, args.users, args.burst, args.interval, args.date))
+    for outcome, count in sorted(outcomes.items()):
+        print(f"{outcome:<12}{count:>6}")
+    return 0 if all(not key.startswith("http_") for key in outcomes) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,172 @@
+"""
+부하 테스트용 가짜 채팅 모델
+
+LangGraph 노드명(`langgraph_node` 메타데이터)에 맞는 응답을 돌려주고,
+첫 토큰 지연(ttft)과 토큰당 지연을 설정해 실제 모델의 응답 시간을 흉내냅니다.
+"""
+import asyncio
+import json
+import time
+from typing import Any, Dict, List, Optional
+
+from langchain_core.callbacks import AsyncCallbackManagerForLLMRun, CallbackManagerForLLMRun
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+# 노드별 응답 (실제 프롬프트가 요구하는 형식)
+NODE_RESPONSES: Dict[str, str] = {
+    "analyze_calorie_intake": json.dumps({
+        "intake_status": "적정",
+        "target_burn_calories": 120,
+        "analysis_reason": "권장 범위 내 섭취로 가벼운 유산소 운동이 적합합니다",
+        "health_advice": "수분 섭취와 규칙적인 식사를 유지하세요",
+        "exercise_intensity": "보통",
+        "recommended_duration": 25
+    }, ensure_ascii=False),
+    "select_exercises": json.dumps({
+        "selected_exercises": [
+            {
+                "id": 1, "title": "운동 1", "category": "MOVING", "recommended_duration": 10,
+                "description": "전신을 사용하는 기본 운동입니다.", "method": "천천히 호흡하며 동작을 반복하세요.",
+                "expected_calories": 80, "selection_reason": "칼로리 소모 목표에 적합"
+            },
+            {
+                "id": 2, "title": "운동 2", "category": "STRETCH", "recommended_duration": 5,
+                "description": "근육 이완 스트레칭입니다.", "method": "각 동작을 20초간 유지하세요.",
+                "expected_calories": 15, "selection_reason": "운동 후 회복"
+            }
+        ],
+        "total_expected_burn": 95,
+        "total_duration": 15,
+        "workout_balance": "유산소와 스트레칭의 균형",
+        "difficulty_level": "중급"
+    }, ensure_ascii=False),
+    "generate_final_recommendation": "오늘은 1800kcal 섭취하셨네요! 이 운동을 통해 95kcal만큼 운동해 보아요!",
+    "process_data": (
+        "이번 달 평균 참여율은 78.5%예요. 김치찌개 1이 평점 4.9점으로 가장 인기 있었어요. "
+        "1학년 참여율이 75%로 가장 낮았고, 조식 참여율이 41.2%까지 떨어진 날이 있었어요. "
+        "급식량 평가는 SUITABLE 비율이 가장 높지만 석식에서 FEW 응답이 많았어요. "
+        "조식 메뉴를 간편식 위주로 바꾸고 석식 배식량을 조금 늘려 보는 걸 제안해요."
+    ) * 3,
+    "summarize_month": (
+        "평균 평점 4.2점, 평균 참여율 78.5%였어요. 김치찌개 1이 4.9점으로 가장 높았고 석식에서 FEW 응답이 많았어요."
+    ),
+    "combine_months": (
+        "기간 전체 평균 평점은 4점대를 유지했고 참여율도 꾸준했어요. 김치찌개는 매달 높은 평가를 받았어요. "
+        "석식 급식량이 적다는 응답이 반복되니 석식 배식량을 조금 늘려 보는 걸 제안해요."
+    ),
+    "analyze_nutrition": json.dumps({
+        "nutritional_balance": {"overall_score": 7, "carbohydrate_ratio": 55, "protein_ratio": 20,
+                                "fat_ratio": 25, "balance_assessment": "대체로 균형 잡힌 구성"},
+        "calorie_analysis": {"estimated_daily_calories": 700, "age_appropriate": "적절",
+                             "portion_size_assessment": "석식 분량 다소 부족"},
+        "food_group_diversity": {"grain_products": "충분", "vegetables": "보통", "proteins": "충분",
+                                 "dairy": "부족", "fruits": "부족", "diversity_score": 6},
+        "health_impact": {"positive_aspects": ["단백질 공급 충분"], "improvement_areas": ["과일 제공 확대"],
+                          "nutritional_goals": ["칼슘 섭취 보완"]},
+        "seasonal_considerations": {"seasonal_foods": ["봄나물"], "freshness_indicators": "양호"}
+    }, ensure_ascii=False),
+    "analyze_fitness": json.dumps({
+        "bmi": 22.5, "body_type": "정상", "fitness_assessment": "중급", "recommended_intensity": "보통",
+        "weekly_frequency": 3, "session_duration": 40, "focus_areas": ["전신운동"], "precautions": ["준비운동 필수"]
+    }, ensure_ascii=False),
+    # 압축 계획 인코딩 (exercise_analysis_graph.expand_compact_plan으로 복원)
+    "generate_plan": json.dumps({
+        "o": [3, 40, ["체력증진", "근력강화"], "주마다 세트/시간 10% 증가"],
+        "w": [
+            [focus, [
+                [1, [[2, 3, 12 + week, 60], [1, 3, 10 + week, 60], [4, 3, f"{30 + week * 10}s", 45]]],
+                [3, [[3, 1, f"{600 + week * 120}s", 0], [2, 3, 15, 60], [4, 2, "40s", 45]]],
+                [5, [[5, 3, 8 + week, 90], [1, 3, 12, 60], [4, 3, f"{40 + week * 10}s", 45]]]
+            ]]
+            for week, focus in enumerate(["기초 적응", "근지구력", "근력 강화", "전신 통합"])
+        ],
+        "n": ["운동 후 단백질 섭취", "충분한 수분 섭취"], "m": ["체중", "푸시업 횟수"],
+        "s": ["충분한 준비운동", "통증 시 중단"]
+    }, ensure_ascii=False, separators=(",", ":")),
+    "create_report": json.dumps({
+        "executive_summary": "4주 전신 프로그램을 권장합니다.",
+        "motivation_message": "꾸준함이 가장 중요해요!",
+        "next_steps": ["이번 주 3회 운동"]
+    }, ensure_ascii=False),
+}
+
+
+def estimate_tokens(text: str) -> int:
+    """한글 위주 텍스트 토큰 수 근사값 (약 2자당 1토큰)"""
+    return max(1, len(text) // 2)
+
+
+class FakeChatModel(BaseChatModel):
+    """노드별 고정 응답과 설정 가능한 지연을 가진 채팅 모델"""
+
+    ttft_ms: float = 300.0
+    token_latency_ms: float = 10.0
+    responses: Dict[str, str] = NODE_RESPONSES
+    default_response: str = "{}"
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-benchmark"
+
+    def _respond(self, messages: List[BaseMessage], run_manager) -> ChatResult:
+        node = (getattr(run_manager, "metadata", None) or {}).get("langgraph_node", "")
+        text = self.responses.get(node, self.default_response)
+        prompt_tokens = sum(estimate_tokens(str(message.content)) for message in messages)
+        output_tokens = estimate_tokens(text)
+        message = AIMessage(
+            content=text,
+            usage_metadata={
+                "input_tokens": prompt_tokens,
+                "output_tokens": output_tokens,
+                "total_tokens": prompt_tokens + output_tokens
+            }
+        )
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _latency_seconds(self, result: ChatResult) -> float:
+        output_tokens = result.generations[0].message.usage_metadata["output_tokens"]
+        return (self.ttft_ms + output_tokens * self.token_latency_ms) / 1000
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        result = self._respond(messages, run_manager)
+        time.sleep(self._latency_seconds(result))
+        return result
+
+    async def _agenerate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        result = self._respond(messages, run_manager)
+        await asyncio.sleep(self._latency_seconds(result))
+        return result
+
+
+def install_fake_chat_model(ttft_ms: float = 300.0, token_latency_ms: float = 10.0) -> None:
+    """서비스의 모든 LLM 호출을 FakeChatModel로 교체"""
+    from ai_exercise_service.src.util.llm.callbacks import LLMMetricsCallbackHandler
+    from ai_exercise_service.src.util.llm.client_factory import override_chat_model
+
+    models: Dict[tuple, FakeChatModel] = {}
+
+    def factory(temperature: float, model: str) -> FakeChatModel:
+        key = (temperature, model)
+        if key not in models:
+            models[key] = FakeChatModel(
+                ttft_ms=ttft_ms,
+                token_latency_ms=token_latency_ms,
+                callbacks=[LLMMetricsCallbackHandler(f"fake-{model}")]
+            )
+        return models[key]
+
+    override_chat_model(factory)
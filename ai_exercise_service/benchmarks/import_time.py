@@ -0,0 +1,78 @@
+"""
+main.py 임포트 시간 예산 검사
+
+`python -X importtime`으로 main 모듈을 여러 번 임포트해 최소 누적 시간을 측정하고,
+예산을 넘거나 지연 로딩 대상 모듈(LangGraph, LangChain, OpenAI 등)이 시작 시점에
+임포트되면 실패 코드로 종료합니다.
+
+사용법:
+    cd ai_exercise_service
+    python -m benchmarks.import_time --budget-ms 1000
+"""
+import argparse
+import os
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+SERVICE_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 첫 요청 시점까지 임포트를 미뤄야 하는 모듈
+LAZY_MODULES = ("langgraph", "langchain_openai", "langchain_core.language_models", "openai", "pandas")
+
+
+def measure_import(module: str = "main") -> Tuple[int, Dict[str, int]]:
+    """새 인터프리터에서 모듈을 임포트하고 (누적 시간 us, 모듈별 누적 시간) 반환"""
+    env = dict(os.environ)
+    # 임포트 시점에 API 키가 필요하지 않아야 함
+    env.pop("OPENAI_API_KEY", None)
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=SERVICE_ROOT,
+        env=env,
+        capture_output=True,
+        text=True
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(f"{module} 임포트 실패:\n{completed.stderr[-2000:]}")
+
+    cumulative: Dict[str, int] = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative_us, name = line[len("import time:"):].split("|")
+        if not cumulative_us.strip().isdigit():
+            continue
+        cumulative[name.strip()] = int(cumulative_us)
+    return cumulative.get(module, 0), cumulative
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="main.py 임포트 시간 예산 검사")
+    parser.add_argument("--module", default="main")
+    parser.add_argument("--budget-ms", type=float, default=1000.0)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    runs = [measure_import(args.module) for _ in range(args.runs)]
+    best_us, modules = min(runs, key=lambda run: run[0])
+    best_ms = best_us / 1000
+
+    print(f"{args.module} 임포트: {best_ms:.1f}ms (예산 {args.budget_ms:.0f}ms, {args.runs}회 중 최소)")
+    for name, us in sorted(modules.items(), key=lambda item: item[1], reverse=True)[1:args.top + 1]:
+        print(f"  {us / 1000:8.1f}ms  {name}")
+
+    failed = False
+    eager = sorted(name for name in modules if name.startswith(LAZY_MODULES))
+    if eager:
+        print(f"실패: 지연 로딩 대상 모듈이 시작 시점에 임포트됨: {', '.join(eager[:10])}")
+        failed = True
+    if best_ms > args.budget_ms:
+        print(f"실패: 임포트 시간 예산 초과 ({best_ms:.1f}ms > {args.budget_ms:.0f}ms)")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
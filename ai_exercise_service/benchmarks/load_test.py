@@ -0,0 +1,282 @@
+"""
+오프라인 부하 테스트
+
+모의 Spring 서버와 가짜 채팅 모델로 서비스를 실행하고, 설정한 동시성으로
+`/api/exercises/recommend`, `/api/meal-feedback/{year}/{month}`를 호출해
+p50/p95/p99 지연시간, 처리량, 이벤트 루프 지연을 측정합니다.
+외부 네트워크와 OpenAI 키 없이 실행됩니다.
+
+`--cassette`를 주면 모의 서버/가짜 모델 대신 운영 환경에서 녹화한 카세트
+(REPLAY_MODE=record로 수집)의 Spring/LLM 응답을 녹화 당시 지연시간으로 재생합니다.
+`--timing-scale 0`이면 지연 없이 재생해 서비스 자체의 CPU 비용만 측정합니다.
+
+사용법:
+    cd ai_exercise_service
+    python -m benchmarks.load_test --requests 200 --concurrency 20
+    python -m benchmarks.load_test --scenario recommend --max-p95-ms 2500 --json-out bench.json
+    python -m benchmarks.load_test --baseline bench.json --tolerance 0.2
+    python -m benchmarks.load_test --cassette data/cassettes/prod.jsonl --timing-scale 0.5
+"""
+import argparse
+import asyncio
+import contextlib
+import json
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+SERVICE_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SCENARIOS = {
+    "recommend": ("POST", "/api/exercises/recommend"),
+    "meal-feedback": ("POST", "/api/meal-feedback/2025/3"),
+}
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """nearest-rank 백분위수"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered) + 0.5)) - 1))
+    return ordered[index]
+
+
+class AppServer:
+    """별도 스레드/이벤트 루프에서 실행되는 서비스 (루프 지연 측정용)"""
+
+    def __init__(self, app, host: str, port: int):
+        import uvicorn
+
+        self.url = f"http://{host}:{port}"
+        self.loop = asyncio.new_event_loop()
+        self.server = uvicorn.Server(uvicorn.Config(app, host=host, port=port, log_level="warning"))
+        self._thread = threading.Thread(target=self._run, name="app-server", daemon=True)
+        self.lag_samples: List[float] = []
+        self._probe_stop = threading.Event()
+
+    def _run(self) -> None:
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_until_complete(self.server.serve())
+
+    def start(self, timeout: float = 15.0) -> None:
+        self._thread.start()
+        deadline = time.monotonic() + timeout
+        while not self.server.started:
+            if time.monotonic() > deadline:
+                raise RuntimeError("서비스 시작 시간 초과")
+            time.sleep(0.02)
+        asyncio.run_coroutine_threadsafe(self._probe_loop_lag(), self.loop)
+
+    async def _probe_loop_lag(self, interval: float = 0.01) -> None:
+        loop = asyncio.get_running_loop()
+        while not self._probe_stop.is_set():
+            started = loop.time()
+            await asyncio.sleep(interval)
+            self.lag_samples.append(max(0.0, loop.time() - started - interval))
+
+    def stop(self) -> None:
+        self._probe_stop.set()
+        self.server.should_exit = True
+        self._thread.join(timeout=10)
+
+
+async def run_scenario(base_url: str, name: str, total: int, concurrency: int) -> Dict[str, Any]:
+    """닫힌 루프 방식으로 total개 요청을 concurrency개 워커가 나누어 실행"""
+    import httpx
+
+    method, path = SCENARIOS[name]
+    latencies: List[float] = []
+    statuses: Dict[str, int] = {}
+    next_index = iter(range(total))
+
+    async def worker(client: httpx.AsyncClient) -> None:
+        for i in next_index:
+            # 사용자별 토큰으로 실제처럼 요청마다 다른 사용자를 흉내냄
+            headers = {"Authorization": f"Bearer bench-{name}-{i}"}
+            started = time.perf_counter()
+            try:
+                response = await client.request(method, path, headers=headers)
+                status = str(response.status_code)
+            except httpx.HTTPError as e:
+                status = type(e).__name__
+            latencies.append(time.perf_counter() - started)
+            statuses[status] = statuses.get(status, 0) + 1
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, timeout=120.0, limits=limits) as client:
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(client) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    return {
+        "scenario": name,
+        "requests": total,
+        "concurrency": concurrency,
+        "statuses": statuses,
+        "errors": total - statuses.get("200", 0),
+        "elapsed_s": round(elapsed, 3),
+        "throughput_rps": round(total / elapsed, 2) if elapsed else 0.0,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 1),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 1),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 1),
+        "max_ms": round(max(latencies, default=0) * 1000, 1),
+    }
+
+
+def summarize_lag(samples: List[float]) -> Dict[str, float]:
+    return {
+        "loop_lag_p50_ms": round(percentile(samples, 50) * 1000, 2),
+        "loop_lag_p99_ms": round(percentile(samples, 99) * 1000, 2),
+        "loop_lag_max_ms": round(max(samples, default=0) * 1000, 2),
+    }
+
+
+def blocking_counts(monitor) -> Dict[str, int]:
+    return {site: record["count"] for site, record in monitor.status()["blocking_sites"].items()}
+
+
+def blocking_delta(before: Dict[str, int], after: Dict[str, int], top: int = 5) -> Dict[str, int]:
+    """시나리오 동안 늘어난 위치별 블로킹 횟수 (많은 순 상위 top개)"""
+    delta = {site: count - before.get(site, 0) for site, count in after.items() if count > before.get(site, 0)}
+    return dict(sorted(delta.items(), key=lambda item: -item[1])[:top])
+
+
+def check_gates(results: List[Dict[str, Any]], args, baseline: Optional[Dict[str, Any]]) -> List[str]:
+    """성능 기준 위반 목록"""
+    failures = []
+    for result in results:
+        name = result["scenario"]
+        if result["errors"]:
+            failures.append(f"{name}: 실패 응답 {result['errors']}건 {result['statuses']}")
+        if args.max_p95_ms and result["p95_ms"] > args.max_p95_ms:
+            failures.append(f"{name}: p95 {result['p95_ms']}ms > {args.max_p95_ms}ms")
+        if args.max_p99_ms and result["p99_ms"] > args.max_p99_ms:
+            failures.append(f"{name}: p99 {result['p99_ms']}ms > {args.max_p99_ms}ms")
+        if args.max_loop_lag_ms and result["loop_lag_p99_ms"] > args.max_loop_lag_ms:
+            failures.append(f"{name}: 루프 지연 p99 {result['loop_lag_p99_ms']}ms > {args.max_loop_lag_ms}ms")
+
+        previous = (baseline or {}).get(name)
+        if previous:
+            for key in ("p95_ms", "p99_ms"):
+                limit = previous[key] * (1 + args.tolerance)
+                if result[key] > limit:
+                    failures.append(f"{name}: {key} {result[key]}ms가 기준선 {previous[key]}ms 대비 {args.tolerance:.0%} 초과")
+            if result["throughput_rps"] < previous["throughput_rps"] * (1 - args.tolerance):
+                failures.append(
+                    f"{name}: 처리량 {result['throughput_rps']}rps가 기준선 {previous['throughput_rps']}rps 대비 감소"
+                )
+    return failures
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="오프라인 부하 테스트")
+    parser.add_argument("--scenario", choices=["all", *SCENARIOS], default="all")
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--warmup", type=int, default=5)
+    parser.add_argument("--port", type=int, default=18001)
+    parser.add_argument("--spring-port", type=int, default=18080)
+    parser.add_argument("--spring-latency-ms", type=float, default=20.0)
+    parser.add_argument("--menu-count", type=int, default=200)
+    parser.add_argument("--meal-amount-count", type=int, default=1000)
+    parser.add_argument("--exercise-count", type=int, default=30)
+    parser.add_argument("--llm-ttft-ms", type=float, default=300.0)
+    parser.add_argument("--llm-token-ms", type=float, default=10.0)
+    parser.add_argument("--cassette", default=None, help="재생할 카세트 파일 (JSONL)")
+    parser.add_argument("--timing-scale", type=float, default=1.0, help="카세트 지연시간 배율 (0이면 지연 없음)")
+    parser.add_argument("--json-out", default=None)
+    parser.add_argument("--baseline", default=None, help="이전 --json-out 결과 파일")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="기준선 대비 허용 악화 비율")
+    parser.add_argument("--max-p95-ms", type=float, default=0)
+    parser.add_argument("--max-p99-ms", type=float, default=0)
+    parser.add_argument("--max-loop-lag-ms", type=float, default=0)
+    args = parser.parse_args(argv)
+
+    # 서비스 모듈이 임포트 시점에 읽는 환경변수를 먼저 설정
+    workdir = tempfile.mkdtemp(prefix="let-ai-bench-")
+    os.environ["SPRING_SERVER_URL"] = f"http://127.0.0.1:{args.spring_port}"
+    os.environ.setdefault("OPENAI_API_KEY", "offline-benchmark")
+    os.environ["CHECKPOINT_DB_PATH"] = os.path.join(workdir, "checkpoints.sqlite")
+    os.environ["TRACE_JSONL_PATH"] = os.path.join(workdir, "traces.jsonl")
+    if args.cassette:
+        cassette_path = os.path.abspath(args.cassette)
+        os.environ["REPLAY_MODE"] = "replay"
+        os.environ["CASSETTE_DIR"] = os.path.dirname(cassette_path)
+        os.environ["CASSETTE_NAME"] = os.path.splitext(os.path.basename(cassette_path))[0]
+        os.environ["REPLAY_TIMING_SCALE"] = str(args.timing_scale)
+    os.chdir(SERVICE_ROOT)
+    sys.path.insert(0, SERVICE_ROOT)
+
+    import main as service_main
+    from ai_exercise_service.src.util.monitoring.loop_monitor import loop_monitor
+    from benchmarks.fake_llm import install_fake_chat_model
+    from benchmarks.mock_spring import MockSpringConfig, MockSpringServer
+
+    logging.getLogger().setLevel(logging.WARNING)
+    if args.cassette:
+        # 재생 모드에서는 Spring/LLM 응답을 모두 카세트가 제공
+        upstream = contextlib.nullcontext()
+    else:
+        install_fake_chat_model(ttft_ms=args.llm_ttft_ms, token_latency_ms=args.llm_token_ms)
+        spring_config = MockSpringConfig(
+            latency_ms=args.spring_latency_ms,
+            menu_count=args.menu_count,
+            meal_amount_count=args.meal_amount_count,
+            exercise_count=args.exercise_count
+        )
+        upstream = MockSpringServer(spring_config, port=args.spring_port)
+
+    scenarios = list(SCENARIOS) if args.scenario == "all" else [args.scenario]
+    results = []
+
+    with upstream:
+        app_server = AppServer(service_main.app, "127.0.0.1", args.port)
+        app_server.start()
+        try:
+            for name in scenarios:
+                if args.warmup:
+                    asyncio.run(run_scenario(app_server.url, name, args.warmup, min(args.warmup, args.concurrency)))
+                app_server.lag_samples.clear()
+                blocks_before = blocking_counts(loop_monitor)
+                result = asyncio.run(run_scenario(app_server.url, name, args.requests, args.concurrency))
+                result.update(summarize_lag(list(app_server.lag_samples)))
+                result["blocking_sites"] = blocking_delta(blocks_before, blocking_counts(loop_monitor))
+                results.append(result)
+        finally:
+            app_server.stop()
+
+    print(f"{'scenario':<15}{'req':>6}{'conc':>6}{'err':>5}{'rps':>9}{'p50':>9}{'p95':>9}{'p99':>9}{'max':>9}{'lag p99':>9}")
+    for r in results:
+        print(
+            f"{r['scenario']:<15}{r['requests']:>6}{r['concurrency']:>6}{r['errors']:>5}{r['throughput_rps']:>9}"
+            f"{r['p50_ms']:>9}{r['p95_ms']:>9}{r['p99_ms']:>9}{r['max_ms']:>9}{r['loop_lag_p99_ms']:>9}"
+        )
+
+    for r in results:
+        if r["blocking_sites"]:
+            print(f"\n[{r['scenario']}] 이벤트 루프 블로킹 위치 (횟수)")
+            for site, count in r["blocking_sites"].items():
+                print(f"  {count:>5}  {site}")
+
+    if args.json_out:
+        with open(args.json_out, "w", encoding="utf-8") as f:
+            json.dump({r["scenario"]: r for r in results}, f, ensure_ascii=False, indent=2)
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+
+    failures = check_gates(results, args, baseline)
+    for failure in failures:
+        print(f"실패: {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,213 @@
+"""
+부하 테스트용 Spring API 모의 서버
+
+엔드포인트별 지연시간과 응답 크기(메뉴 수, 급식량 평가 수, 운동 수)를 설정할 수 있습니다.
+
+단독 실행:
+    python -m benchmarks.mock_spring --port 18080 --latency-ms 30 --menu-count 500
+"""
+import argparse
+import asyncio
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+import uvicorn
+from fastapi import FastAPI, Request
+
+MEAL_TYPES = ["조식", "중식", "석식"]
+MENU_NAMES = ["김치찌개", "된장국", "제육볶음", "닭갈비", "비빔밥", "미역국", "돈까스", "카레라이스", "잡채", "떡볶이"]
+
+
+@dataclass
+class MockSpringConfig:
+    """모의 Spring 서버 설정"""
+    latency_ms: float = 20.0
+    latency_jitter_ms: float = 5.0
+    # 특정 경로 접두사별 지연시간 (예: {"/menu-rank": 80})
+    path_latency_ms: Dict[str, float] = field(default_factory=dict)
+    menu_count: int = 200
+    menu_page_size: int = 20
+    meal_amount_count: int = 1000
+    exercise_count: int = 30
+    daily_calories: float = 1800.0
+    seed: int = 42
+
+
+def _payloads(config: MockSpringConfig) -> Dict[str, Any]:
+    """요청마다 다시 만들지 않도록 응답 본문을 미리 생성"""
+    rng = random.Random(config.seed)
+    menus = [
+        {
+            "menuId": i + 1,
+            "menuName": f"{MENU_NAMES[i % len(MENU_NAMES)]} {i + 1}",
+            "averageRating": round(rng.uniform(1, 5), 2),
+            "ratingCount": rng.randint(1, 300)
+        }
+        for i in range(config.menu_count)
+    ]
+    meal_amounts = [
+        {
+            "id": i + 1,
+            "rating": rng.choice(["FEW", "SUITABLE", "MUCH"]),
+            "meal": {"mealId": i % 90 + 1, "mealType": MEAL_TYPES[i % 3], "mealDate": f"2025-03-{i % 28 + 1:02d}"}
+        }
+        for i in range(config.meal_amount_count)
+    ]
+    exercises = [
+        {
+            "id": i + 1,
+            "title": f"운동 {i + 1}",
+            "category": ["MOVING", "STRETCH", "ETC"][i % 3],
+            "duration": 3 + i % 10,
+            "description": "전신을 사용하는 기본 운동입니다.",
+            "method": "천천히 호흡하며 동작을 반복하세요."
+        }
+        for i in range(config.exercise_count)
+    ]
+    meal_menus = {
+        meal_type: {
+            "data": [
+                {"date": f"2025-03-{day:02d}", "menus": [MENU_NAMES[(day + j) % len(MENU_NAMES)] for j in range(5)]}
+                for day in range(1, 29)
+            ]
+        }
+        for meal_type in MEAL_TYPES
+    }
+    return {"menus": menus, "meal_amounts": meal_amounts, "exercises": exercises, "meal_menus": meal_menus}
+
+
+def create_mock_spring_app(config: Optional[MockSpringConfig] = None) -> FastAPI:
+    """모의 Spring FastAPI 앱 생성"""
+    config = config or MockSpringConfig()
+    payloads = _payloads(config)
+    rng = random.Random(config.seed)
+    app = FastAPI(title="Mock Spring")
+    app.state.request_counts = {}
+
+    @app.middleware("http")
+    async def simulate_latency(request: Request, call_next):
+        path = request.url.path
+        latency = config.latency_ms
+        for prefix, value in config.path_latency_ms.items():
+            if path.startswith(prefix):
+                latency = value
+                break
+        latency += rng.uniform(-config.latency_jitter_ms, config.latency_jitter_ms)
+        app.state.request_counts[path] = app.state.request_counts.get(path, 0) + 1
+        await asyncio.sleep(max(latency, 0) / 1000)
+        return await call_next(request)
+
+    @app.get("/users/me")
+    async def users_me():
+        return {"data": {"userId": 12, "name": "벤치마크"}, "status": 200}
+
+    @app.get("/eater/user/{user_id}/date/{date}")
+    async def eater_by_date(user_id: str, date: str):
+        return {"data": {"userId": user_id, "date": date, "totalCalories": config.daily_calories}}
+
+    @app.get("/exercises")
+    async def exercises():
+        return {"data": payloads["exercises"], "status": 200}
+
+    @app.get("/meal-rating/monthly/{year}/{month}")
+    async def monthly_rating(year: int, month: int):
+        return {"data": 4.12, "status": 200, "message": "월별 평점 조회 성공"}
+
+    @app.get("/menu-rank")
+    async def menu_rank(page: int = 1, reverse: str = "true"):
+        size = config.menu_page_size
+        start = (page - 1) * size
+        return {
+            "data": {
+                "menus": payloads["menus"][start:start + size],
+                "total": len(payloads["menus"]),
+                "page": page,
+                "size": size
+            },
+            "status": 200
+        }
+
+    @app.get("/eater/month/meal-rate/all")
+    async def meal_rate():
+        return {"data": [{"grade": grade, "rate": 70 + grade * 5} for grade in (1, 2, 3)], "status": 200}
+
+    @app.get("/mealMenu/{meal_type}")
+    async def meal_menu(meal_type: str):
+        return payloads["meal_menus"].get(meal_type, {"data": []})
+
+    @app.get("/statistics/monthly/{year}/{month}")
+    async def monthly_statistics(year: int, month: int):
+        return {"data": {"year": year, "month": month, "participationRate": 78.5, "totalMeals": 84}}
+
+    @app.get("/statistics/meal/analysis/low-participation")
+    async def low_participation(period: str = ""):
+        return {"data": [{"date": f"{period}-0{day}", "mealType": "조식", "rate": 41.2} for day in range(1, 4)]}
+
+    @app.get("/meal-amount")
+    async def meal_amount(afterId: Optional[int] = None):
+        # afterId: 증분 집계용 워터마크 (이 id보다 큰 레코드만)
+        records = payloads["meal_amounts"]
+        if afterId is not None:
+            records = [record for record in records if record["id"] > afterId]
+        return {"data": records, "status": 200, "message": "급식량 평가 조회 성공"}
+
+    return app
+
+
+class MockSpringServer:
+    """백그라운드 스레드에서 실행되는 모의 Spring 서버"""
+
+    def __init__(self, config: Optional[MockSpringConfig] = None, host: str = "127.0.0.1", port: int = 18080):
+        self.app = create_mock_spring_app(config)
+        self.url = f"http://{host}:{port}"
+        self._server = uvicorn.Server(uvicorn.Config(self.app, host=host, port=port, log_level="warning"))
+        self._thread = threading.Thread(target=self._server.run, name="mock-spring", daemon=True)
+
+    def start(self, timeout: float = 10.0) -> "MockSpringServer":
+        self._thread.start()
+        deadline = time.monotonic() + timeout
+        while not self._server.started:
+            if time.monotonic() > deadline:
+                raise RuntimeError("모의 Spring 서버 시작 시간 초과")
+            time.sleep(0.02)
+        return self
+
+    def stop(self) -> None:
+        self._server.should_exit = True
+        self._thread.join(timeout=5)
+
+    @property
+    def request_counts(self) -> Dict[str, int]:
+        return dict(self.app.state.request_counts)
+
+    def __enter__(self) -> "MockSpringServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+
+def main(argv: List[str] = None) -> None:
+    parser = argparse.ArgumentParser(description="모의 Spring API 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=18080)
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    parser.add_argument("--menu-count", type=int, default=200)
+    parser.add_argument("--meal-amount-count", type=int, default=1000)
+    parser.add_argument("--exercise-count", type=int, default=30)
+    args = parser.parse_args(argv)
+
+    config = MockSpringConfig(
+        latency_ms=args.latency_ms,
+        menu_count=args.menu_count,
+        meal_amount_count=args.meal_amount_count,
+        exercise_count=args.exercise_count
+    )
+    uvicorn.run(create_mock_spring_app(config), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+운동 계획 출력 토큰 비교 (압축 인코딩 vs 기존 중첩 JSON)
+
+가짜 모델의 generate_plan 응답(압축 인코딩)을 서버 측 복원기로 기존 응답 형식으로
+되돌린 뒤, 모델이 기존 프롬프트대로 출력했을 때의 JSON(들여쓰기 포함)과 토큰 수를 비교합니다.
+
+사용법:
+    cd ai_exercise_service
+    python -m benchmarks.plan_encoding [--compact-file plan.json]
+"""
+import argparse
+import json
+import os
+import sys
+from typing import Any, Dict, Optional
+
+
+def compare(compact_text: str) -> Dict[str, Any]:
+    """압축 인코딩 문자열과 복원한 기존 형식의 토큰 수 비교"""
+    from ai_exercise_service.src.ai.exercise.graph.exercise_analysis_graph import expand_compact_plan
+    from ai_exercise_service.src.ai.exercise.service.exercise_recommendation_service import DEFAULT_EXERCISES
+    from ai_exercise_service.src.util.llm.token_budget import token_budget
+
+    expanded = expand_compact_plan(json.loads(compact_text), DEFAULT_EXERCISES)
+    verbose_text = json.dumps(expanded, ensure_ascii=False, indent=2)
+    compact_tokens = token_budget.counter.count(compact_text)
+    verbose_tokens = token_budget.counter.count(verbose_text)
+    # 모델이 공백 없이 출력한 경우 (가장 불리한 비교)
+    minified_tokens = token_budget.counter.count(json.dumps(expanded, ensure_ascii=False, separators=(",", ":")))
+    return {
+        "tokenizer": token_budget.counter.encoding_name if token_budget.counter.load() else "approximate",
+        "compact_tokens": compact_tokens,
+        "verbose_tokens": verbose_tokens,
+        "minified_tokens": minified_tokens,
+        "ratio": round(verbose_tokens / max(1, compact_tokens), 2),
+        "minified_ratio": round(minified_tokens / max(1, compact_tokens), 2),
+        "workouts": sum(len(week["workouts"]) for week in expanded["weekly_plans"].values())
+    }
+
+
+def main(argv: Optional[list] = None) -> None:
+    parser = argparse.ArgumentParser(description="운동 계획 압축 인코딩 출력 토큰 비교")
+    parser.add_argument("--compact-file", help="비교할 압축 계획 JSON 파일 (기본: 가짜 모델 응답)")
+    args = parser.parse_args(argv)
+
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+    if args.compact_file:
+        with open(args.compact_file, encoding="utf-8") as f:
+            compact_text = f.read().strip()
+    else:
+        from benchmarks.fake_llm import NODE_RESPONSES
+        compact_text = NODE_RESPONSES["generate_plan"]
+
+    result = compare(compact_text)
+    print(f"토크나이저: {result['tokenizer']}")
+    print(f"압축 인코딩: {result['compact_tokens']} 토큰")
+    print(f"기존 형식:   {result['verbose_tokens']} 토큰 (운동 세션 {result['workouts']}개)")
+    print(f"기존 형식(공백 제거): {result['minified_tokens']} 토큰")
+    print(f"감소 비율:   {result['ratio']}x (공백 제거 대비 {result['minified_ratio']}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""
+JSON 직렬화/압축 벤치마크
+
+운영 응답 형태의 페이로드(운동 분석 결과, 급식 피드백, Spring 급식량 평가/메뉴 순위 응답)로
+표준 json과 orjson의 인코딩/디코딩 CPU 시간, 그리고 원본/gzip/brotli 전송 바이트를 비교합니다.
+
+사용법:
+    cd ai_exercise_service
+    python -m benchmarks.serialization --repeat 200
+"""
+import argparse
+import gzip
+import json
+import sys
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List
+
+from benchmarks.fake_llm import NODE_RESPONSES
+from benchmarks.mock_spring import MockSpringConfig, _payloads
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+def build_payloads(meal_amount_count: int) -> Dict[str, Dict[str, Any]]:
+    """인코딩(응답 렌더링)/디코딩(Spring 응답) 대상 페이로드"""
+    spring = _payloads(MockSpringConfig(meal_amount_count=meal_amount_count, menu_count=meal_amount_count // 5))
+    user_data = {"user_id": "12", "age": 17, "height": 172.0, "weight": 63.5, "fitness_level": "중급", "goals": ["체력증진"]}
+    exercise_analysis = {
+        "success": True,
+        "error": "",
+        "analysis_result": {
+            "user_analysis": {**user_data, "fitness_analysis": json.loads(NODE_RESPONSES["analyze_fitness"])},
+            "exercise_plan": json.loads(NODE_RESPONSES["generate_plan"]),
+            "comprehensive_report": json.loads(NODE_RESPONSES["create_report"]),
+            "generated_at": str(datetime.now())
+        }
+    }
+    meal_feedback = {"message": NODE_RESPONSES["process_data"], "year": 2025, "month": 3}
+    return {
+        "encode": {
+            "exercise_analysis": exercise_analysis,
+            "meal_feedback": meal_feedback,
+        },
+        "decode": {
+            "spring_meal_amount": {"data": spring["meal_amounts"], "status": 200, "message": "급식량 평가 조회 성공"},
+            "spring_menu_rank": {"data": {"menus": spring["menus"], "total": len(spring["menus"])}, "status": 200},
+        }
+    }
+
+
+def stdlib_dumps(obj: Any) -> bytes:
+    """Starlette 기본 JSONResponse.render와 같은 방식"""
+    return json.dumps(obj, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode("utf-8")
+
+
+def time_per_op(func: Callable[[], Any], repeat: int) -> float:
+    """1회당 CPU 시간 (µs)"""
+    func()
+    start = time.process_time()
+    for _ in range(repeat):
+        func()
+    return (time.process_time() - start) / repeat * 1e6
+
+
+def wire_sizes(body: bytes) -> Dict[str, int]:
+    sizes = {"raw": len(body), "gzip": len(gzip.compress(body, compresslevel=6))}
+    if brotli is not None:
+        sizes["br"] = len(brotli.compress(body, quality=5))
+    return sizes
+
+
+def run(repeat: int, meal_amount_count: int) -> List[Dict[str, Any]]:
+    payloads = build_payloads(meal_amount_count)
+    rows = []
+    for name, obj in payloads["encode"].items():
+        body = stdlib_dumps(obj)
+        row = {"payload": name, "op": "encode", "json_us": time_per_op(lambda: stdlib_dumps(obj), repeat)}
+        if orjson is not None:
+            row["orjson_us"] = time_per_op(lambda: orjson.dumps(obj, default=str, option=orjson.OPT_NON_STR_KEYS), repeat)
+        row.update(wire_sizes(body))
+        rows.append(row)
+
+    for name, obj in payloads["decode"].items():
+        body = stdlib_dumps(obj)
+        row = {"payload": name, "op": "decode", "json_us": time_per_op(lambda: json.loads(body), repeat)}
+        if orjson is not None:
+            row["orjson_us"] = time_per_op(lambda: orjson.loads(body), repeat)
+        row.update(wire_sizes(body))
+        rows.append(row)
+    return rows
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="JSON 직렬화/압축 벤치마크")
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--meal-amount-count", type=int, default=1000)
+    args = parser.parse_args(argv)
+
+    rows = run(args.repeat, args.meal_amount_count)
+    print(f"{'payload':<22}{'op':<8}{'json µs':>10}{'orjson µs':>11}{'speedup':>9}{'raw B':>10}{'gzip B':>9}{'br B':>9}")
+    for r in rows:
+        orjson_us = r.get("orjson_us")
+        speedup = f"{r['json_us'] / orjson_us:.1f}x" if orjson_us else "-"
+        print(
+            f"{r['payload']:<22}{r['op']:<8}{r['json_us']:>10.1f}"
+            f"{(f'{orjson_us:.1f}' if orjson_us else '-'):>11}{speedup:>9}"
+            f"{r['raw']:>10}{r['gzip']:>9}{r.get('br', '-'):>9}"
+        )
+    if orjson is None:
+        print("orjson 미설치: 표준 json 결과만 표시")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,102 @@
+"""
+span JSONL 파일에서 느린 요청의 critical path 출력
+
+사용법:
+    cd ai_exercise_service
+    python -m benchmarks.trace_report data/traces.jsonl --top 5
+    python -m benchmarks.trace_report data/traces.jsonl --request-id <X-Request-ID>
+
+critical path(`*` 표시)는 루트 span의 종료 시각부터 거슬러 올라가며
+각 시점에 마지막으로 끝난 자식 span을 따라가 구성합니다.
+"""
+import argparse
+import json
+import sys
+from collections import defaultdict
+from typing import Any, Dict, List, Set
+
+
+def load_traces(path: str) -> Dict[str, List[Dict[str, Any]]]:
+    traces: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                item = json.loads(line)
+                traces[item["trace_id"]].append(item)
+    return traces
+
+
+def critical_path(span_id: str, spans: Dict[str, Dict[str, Any]], children: Dict[str, List[str]]) -> Set[str]:
+    """span_id 아래에서 종료 시각을 결정한 span 집합"""
+    path = {span_id}
+    cursor = spans[span_id]["end_ns"]
+    candidates = sorted(children.get(span_id, []), key=lambda cid: spans[cid]["end_ns"], reverse=True)
+    for child_id in candidates:
+        child = spans[child_id]
+        if child["end_ns"] <= cursor:
+            path |= critical_path(child_id, spans, children)
+            cursor = child["start_ns"]
+    return path
+
+
+def render_trace(items: List[Dict[str, Any]]) -> List[str]:
+    spans = {item["span_id"]: item for item in items}
+    children: Dict[str, List[str]] = defaultdict(list)
+    roots = []
+    for item in items:
+        if item["parent_span_id"] and item["parent_span_id"] in spans:
+            children[item["parent_span_id"]].append(item["span_id"])
+        else:
+            roots.append(item["span_id"])
+
+    lines = []
+    for root_id in roots:
+        on_path = critical_path(root_id, spans, children)
+        trace_start = spans[root_id]["start_ns"]
+
+        def walk(span_id: str, depth: int) -> None:
+            item = spans[span_id]
+            child_ms = sum(spans[cid]["duration_ms"] for cid in children.get(span_id, []))
+            marker = "*" if span_id in on_path else " "
+            offset_ms = (item["start_ns"] - trace_start) / 1e6
+            lines.append(
+                f"{marker} {offset_ms:9.1f}ms +{item['duration_ms']:9.1f}ms "
+                f"(self {max(item['duration_ms'] - child_ms, 0):8.1f}ms) "
+                f"{'  ' * depth}{item['name']}{' [error]' if item['status'] == 'error' else ''}"
+            )
+            for child_id in sorted(children.get(span_id, []), key=lambda cid: spans[cid]["start_ns"]):
+                walk(child_id, depth + 1)
+
+        walk(root_id, 0)
+    return lines
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="트레이스 critical path 리포트")
+    parser.add_argument("path")
+    parser.add_argument("--top", type=int, default=5, help="가장 느린 trace 개수")
+    parser.add_argument("--request-id", default=None)
+    args = parser.parse_args(argv)
+
+    traces = load_traces(args.path)
+    if args.request_id:
+        selected = [items for items in traces.values() if items[0]["request_id"] == args.request_id]
+    else:
+        selected = sorted(
+            traces.values(),
+            key=lambda items: max(item["duration_ms"] for item in items),
+            reverse=True
+        )[:args.top]
+
+    for items in selected:
+        root_ms = max(item["duration_ms"] for item in items)
+        print(f"trace {items[0]['trace_id']} request_id={items[0]['request_id']} total={root_ms:.1f}ms")
+        for line in render_trace(items):
+            print(line)
+        print()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
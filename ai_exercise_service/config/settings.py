@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings
-from typing import Literal
+from typing import Dict, List, Literal
 import os
 
 class Settings(BaseSettings):
@@ -20,6 +20,190 @@ class Settings(BaseSettings):
     min_burn_rate: float = 0.05  # 5%
     max_burn_rate: float = 0.25  # 25%
     
+    # 그래프 체크포인트 설정
+    checkpoint_enabled: bool = True
+    checkpoint_db_path: str = "data/graph_checkpoints.sqlite"
+    checkpoint_ttl_seconds: int = 86400  # 24시간
+    checkpoint_gc_interval_seconds: int = 600  # 10분
+    
+    # 트레이싱 설정
+    tracing_enabled: bool = True
+    trace_sample_rate: float = 0.1  # 10%
+    trace_slow_threshold_seconds: float = 10.0  # 이보다 느린 요청은 항상 기록
+    trace_exporter: Literal["jsonl", "otlp"] = "jsonl"
+    trace_jsonl_path: str = "data/traces.jsonl"
+    trace_otlp_endpoint: str = "http://localhost:4318/v1/traces"
+    
+    # 녹화/재생 설정 (운영 데이터 형태로 오프라인 성능 분석)
+    replay_mode: Literal["off", "record", "replay"] = "off"
+    cassette_dir: str = "data/cassettes"
+    cassette_name: str = "default"
+    replay_timing_scale: float = 1.0  # 0이면 지연 없이 재생
+    
+    # 프로덕션 실행 설정 (gunicorn + uvicorn 워커)
+    web_workers: int = 0  # 0이면 CPU 코어 수
+    web_timeout_seconds: int = 120
+    web_keepalive_seconds: int = 5
+    
+    # 공유 캐시 설정 (워커 간 공유, SQLite WAL)
+    shared_cache_path: str = "data/shared_cache.sqlite"
+    auth_cache_ttl_seconds: int = 60
+    catalog_cache_ttl_seconds: int = 300
+    llm_cache_enabled: bool = True  # temperature 0 모델 응답만 캐시
+    llm_cache_ttl_seconds: int = 86400
+
+    recommendation_store_enabled: bool = True
+    recommendation_store_ttl_seconds: int = 86400  # 사용자별 일일 추천 결과
+    meal_feedback_variants_enabled: bool = True
+    meal_feedback_variant_count: int = 4  # (연, 월)마다 미리 만들어 둘 피드백 수
+    meal_feedback_variant_selection: str = "rotate"  # rotate 또는 random
+    meal_feedback_store_ttl_seconds: int = 604800
+    meal_feedback_range_max_months: int = 12  # 여러 달 리뷰에서 한 번에 요약할 최대 개월 수
+    meal_range_snapshot_ttl_seconds: int = 3600  # 여러 달 리뷰에서 지난달 Spring 급식 데이터를 재사용할 시간
+    
+    # 급식량 평가 증분 집계 (날짜/식사 유형별 카운터 + 레코드 id 워터마크)
+    meal_amount_since_param: str = "afterId"  # Spring이 지원하면 워터마크 이후 레코드만 받음 (비우면 항상 전체 조회)
+    meal_amount_rebuild_seconds: float = 86400.0  # 수정/삭제된 평가를 반영하기 위한 전체 재집계 주기
+    
+    # 응답 직렬화/압축 설정
+    fast_json_enabled: bool = True  # orjson 설치 시 사용
+    gzip_min_size_bytes: int = 1024
+    gzip_compresslevel: int = 6
+    
+    # Spring 호출 보호 설정 (엔드포인트별 서킷 브레이커, 헤지 요청)
+    spring_circuit_enabled: bool = True
+    spring_circuit_failure_threshold: int = 5  # 연속 실패 횟수
+    spring_circuit_open_seconds: float = 30.0  # open 유지 후 half-open 시험 호출
+    spring_hedging_enabled: bool = False  # 멱등 GET에 한해 p95 지연 후 추가 요청
+    spring_hedge_min_delay_ms: float = 50.0
+    spring_hedge_min_samples: int = 20
+    
+    # 요청 시간 예산 설정 (하위 호출은 남은 시간만 사용)
+    request_deadline_seconds: float = 30.0
+    route_deadline_seconds: Dict[str, float] = {
+        "/api/exercises/recommend": 15.0,
+        "/api/meal-feedback": 45.0,
+    }
+    deadline_header: str = "X-Request-Deadline-Ms"
+    deadline_fallback_reserve_seconds: float = 0.5  # 대체 응답 생성용 여유 시간
+    
+    # 요청 수용 제어 설정 (워커 프로세스별, 라우트 분류 단위, LLM 그래프 실행 구간만 제한)
+    admission_enabled: bool = True
+    admission_route_classes: Dict[str, str] = {
+        "/api/exercises/recommend": "recommend",
+        "/api/meal-feedback": "meal_feedback",
+    }
+    admission_concurrency: Dict[str, int] = {"recommend": 16, "meal_feedback": 4}
+    admission_queue_size: Dict[str, int] = {"recommend": 32, "meal_feedback": 8}
+    admission_max_queue_seconds: float = 5.0
+    admission_limits_refresh_seconds: float = 10.0  # 런타임 한도 변경(PUT /internal/admission/...)을 워커에 반영하는 주기
+    admission_limits_override_ttl_seconds: int = 2592000  # 런타임 한도 변경 유지 시간 (지나면 설정값으로 복귀)
+    
+    # 브라운아웃 설정 (LLM 과부하 시 운동 추천을 규칙 기반으로 전환)
+    brownout_enabled: bool = True
+    brownout_window_seconds: float = 60.0
+    brownout_min_samples: int = 10
+    brownout_enter_llm_in_flight: int = 32
+    brownout_enter_error_rate: float = 0.3
+    brownout_enter_p95_seconds: float = 8.0
+    brownout_exit_ratio: float = 0.5  # 모든 지표가 진입 임계값 × 이 비율 아래로 내려가야 복귀
+    brownout_min_hold_seconds: float = 30.0
+    
+    # 식사 기록 변경 이벤트(백그라운드 추천 재계산) 설정
+    recompute_enabled: bool = True
+    internal_webhook_secret: str = ""  # 내부 API(/internal/...) X-Internal-Token 헤더 공유 비밀 (비어 있으면 거부)
+    internal_service_token: str = ""  # 재계산 시 Spring API 호출에 쓸 서비스 토큰 (없으면 무효화만)
+    recompute_debounce_seconds: float = 3.0
+    recompute_max_delay_seconds: float = 15.0  # 이벤트가 계속 와도 이 시간 안에는 재계산
+    recompute_lease_seconds: float = 120.0  # 재계산 실행 중 상태 유효 시간 (워커가 종료되면 이후 이벤트가 새로 예약)
+    recompute_concurrency: int = 2
+    
+    # LLM 호출 정책 설정 (노드별 타임아웃, 재시도, 헤지)
+    llm_default_timeout_seconds: float = 30.0
+    llm_node_timeout_seconds: Dict[str, float] = {
+        "analyze_calorie_intake": 10.0,
+        "select_exercises": 15.0,
+        "generate_final_recommendation": 10.0,
+        "process_data": 40.0,
+        "analyze_nutrition": 30.0,
+        "analyze_fitness": 20.0,
+        "generate_plan": 60.0,
+        "create_report": 30.0,
+        "summarize_month": 20.0,
+        "combine_months": 30.0
+    }
+    # 노드별 최대 출력 토큰 (없으면 모델 기본값)
+    llm_node_max_tokens: Dict[str, int] = {
+        "generate_plan": 900,
+        "summarize_month": 300
+    }
+    llm_max_retries: int = 2
+    llm_retry_base_seconds: float = 0.5
+    llm_retry_max_seconds: float = 4.0
+    llm_hedging_enabled: bool = False
+    llm_hedge_percentile: float = 90.0
+    llm_hedge_min_samples: int = 20
+    llm_hedge_min_delay_seconds: float = 1.0
+    
+    # 토큰 예산 설정 (0이면 제한 없음)
+    llm_tokenizer_encoding: str = "o200k_base"
+    llm_default_prompt_token_budget: int = 16000
+    llm_prompt_token_budget: Dict[str, int] = {
+        "process_data": 12000,
+        "analyze_nutrition": 6000,
+        "select_exercises": 6000,
+        "summarize_month": 6000
+    }
+    # 프롬프트 캐시가 적용되는 최소 공통 접두사 길이 (OpenAI 기준)
+    llm_prompt_cache_min_tokens: int = 1024
+    
+    # 요청 단위 프로파일링 (X-Profile 헤더가 관리자 토큰과 일치하는 요청만, 기본 비활성화)
+    profiling_enabled: bool = False
+    profiling_admin_token: str = ""
+    profiling_sample_rate: float = 1.0  # 헤더가 있는 요청 중 프로파일할 비율
+    profiling_interval_ms: float = 5.0
+    profiling_routes: List[str] = ["/api/exercises/recommend", "/api/meal-feedback/"]
+    profiling_output_dir: str = "data/profiles"
+    profiling_max_samples: int = 20000
+    
+    # 로그 파이프라인 (큐 기반 비동기 출력, 로거별 샘플링/속도 제한)
+    log_format: Literal["json", "text"] = "json"
+    log_async_enabled: bool = True
+    log_queue_size: int = 10000  # 가득 차면 WARNING 미만 레코드는 버림
+    log_batch_size: int = 256  # 한 번에 모아 쓰는 최대 레코드 수
+    log_capture_uvicorn: bool = True  # uvicorn 접근/오류 로그도 같은 형식으로
+    # 로거 이름(ai_exercise_service./src. 접두사 제외, 하위 로거 포함) -> 요청 샘플링 비율 (WARNING 미만만)
+    log_sample_rates: Dict[str, float] = {
+        "ai.exercise.graph": 0.1,
+        "ai.meal_feedback.graph": 0.1,
+        "util.llm.token_budget": 0.1
+    }
+    # 로거 이름 -> 초당 최대 레코드 수 (WARNING 미만만)
+    log_rate_limits: Dict[str, float] = {
+        "httpx": 20.0,
+        "util.services.meal_data_service": 20.0,
+        "ai.exercise.service.exercise_recommendation_service": 50.0
+    }
+    
+    # 이벤트 루프 지연 모니터 / 블로킹 호출 탐지
+    loop_monitor_enabled: bool = True
+    loop_monitor_interval_seconds: float = 0.1
+    loop_monitor_block_threshold_seconds: float = 0.25
+    loop_monitor_log_interval_seconds: float = 30.0  # 같은 위치의 스택 로그 최소 간격
+    loop_monitor_window: int = 600  # 백분위 계산에 쓸 최근 샘플 수
+    loop_monitor_dump_all_threads: bool = False  # 블로킹 시 다른 스레드 스택도 기록 (디버그용)
+    
+    # 시작 워밍업 및 Spring 커넥션 풀 설정
+    spring_pool_max_connections: int = 100
+    spring_pool_max_keepalive: int = 20
+    spring_pool_keepalive_seconds: float = 30.0
+    warmup_enabled: bool = True
+    warmup_spring_connections: int = 4  # 시작 시 미리 열어 둘 Spring 연결 수
+    warmup_timeout_seconds: float = 30.0
+    # 성공해야 /ready가 200이 되는 워밍업 단계 (tokenizer/prompts는 실패해도 근사값으로 동작)
+    warmup_required_steps: List[str] = ["graphs", "llm_clients", "persistent_store", "spring"]
+    warmup_retry_seconds: float = 10.0  # 필수 단계 실패 시 재시도 간격
+    
     class Config:
         env_file = "../.env"
         case_sensitive = False
@@ -0,0 +1,68 @@
+"""
+프로덕션 실행 설정 (gunicorn + uvicorn 워커)
+
+    cd ai_exercise_service
+    gunicorn -c gunicorn.conf.py main:app
+
+- 워커 수는 설정(WEB_WORKERS, 0이면 CPU 코어 수)에서 읽습니다.
+- preload_app으로 마스터에서 앱과 LangGraph 그래프를 미리 컴파일해
+  워커들이 copy-on-write로 공유합니다.
+- uvicorn 워커는 uvloop/httptools가 설치되어 있으면 자동으로 사용합니다.
+- 인증/운동 목록/LLM 응답 캐시는 워커 간 공유 캐시(SQLite WAL)를 사용합니다.
+"""
+import multiprocessing
+import os
+import shutil
+import sys
+import tempfile
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+# 서비스 코드와 같은 모듈(ai_exercise_service.src...)을 미리 로드하도록 상위 디렉터리도 경로에 추가
+for path in (current_dir, os.path.dirname(current_dir)):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+# 워커별 메트릭을 합산하기 위한 디렉터리 (prometheus_client 임포트 전에 설정해야 함)
+os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", os.path.join(tempfile.gettempdir(), "let-ai-prometheus"))
+# preload_app은 on_starting보다 먼저 앱을 임포트해 메트릭 파일을 열므로 설정 파일을 읽는 시점에 준비합니다.
+# 이전 실행의 파일은 처음 읽을 때만 지움 (HUP으로 설정을 다시 읽을 때 지우면 열려 있는 메트릭 파일이 사라짐)
+_multiproc_dir = os.environ["PROMETHEUS_MULTIPROC_DIR"]
+if os.environ.get("LET_AI_PROMETHEUS_DIR_READY") != _multiproc_dir:
+    shutil.rmtree(_multiproc_dir, ignore_errors=True)
+    os.environ["LET_AI_PROMETHEUS_DIR_READY"] = _multiproc_dir
+os.makedirs(_multiproc_dir, exist_ok=True)
+
+from config.settings import settings  # noqa: E402
+
+bind = f"{settings.api_host}:{settings.api_port}"
+workers = settings.web_workers or multiprocessing.cpu_count()
+worker_class = "uvicorn_worker.UvicornWorker"
+preload_app = True
+# LLM 호출이 수십 초 걸릴 수 있으므로 여유 있게 설정
+timeout = settings.web_timeout_seconds
+graceful_timeout = 30
+keepalive = settings.web_keepalive_seconds
+loglevel = settings.log_level.lower()
+accesslog = "-"
+
+
+def on_starting(server):
+    """워커 fork 전 마스터에서 실행 (preload된 앱 기준)"""
+    # 그래프를 마스터에서 컴파일해 워커가 공유하도록 함
+    from ai_exercise_service.src.ai.exercise.graph.exercise_analysis_graph import get_exercise_analysis_graph
+    from ai_exercise_service.src.ai.exercise.graph.exercise_recommendation_graph import get_exercise_recommendation_graph
+    from ai_exercise_service.src.ai.meal_feedback.graph.meal_analysis_graph import get_meal_analysis_graph
+    from ai_exercise_service.src.ai.meal_feedback.graph.meal_range_graph import get_meal_range_graph
+
+    get_exercise_analysis_graph()
+    get_exercise_recommendation_graph()
+    get_meal_analysis_graph()
+    get_meal_range_graph()
+    server.log.info(f"그래프 사전 컴파일 완료, 워커 {workers}개 시작")
+
+
+def child_exit(server, worker):
+    """종료된 워커의 메트릭 파일 정리"""
+    from prometheus_client import multiprocess
+
+    multiprocess.mark_process_dead(worker.pid)
@@ -1,6 +1,9 @@
-from fastapi import FastAPI, Depends, HTTPException
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Depends, HTTPException, Query, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 import uvicorn
+from typing import Optional
 import sys
 import os
 from dotenv import load_dotenv
@@ -11,26 +14,55 @@ load_dotenv(os.path.join(os.path.dirname(__file__), '..', '.env'))
 # Python path 설정
 current_dir = os.path.dirname(os.path.abspath(__file__))
 parent_dir = os.path.dirname(current_dir)
-sys.path.append(parent_dir)
-sys.path.append(current_dir)
-sys.path.append(os.path.join(current_dir, 'src'))
+for path in (parent_dir, current_dir, os.path.join(current_dir, 'src')):
+    if path not in sys.path:
+        sys.path.append(path)
 
 from config.settings import settings
 from src.ai.meal_feedback.router.meal_feedback_router import router as meal_feedback_router
 from src.ai.exercise.router.exercise_router import router as exercise_router
+from src.ai.exercise.router.event_router import router as event_router
+from ai_exercise_service.src.util.monitoring.metrics import MetricsMiddleware, render_metrics
+from ai_exercise_service.src.util.monitoring.log_pipeline import log_pipeline
+from ai_exercise_service.src.util.monitoring.loop_monitor import loop_monitor
+from ai_exercise_service.src.util.monitoring.profiler import ProfilingMiddleware, request_profiler
+from ai_exercise_service.src.util.monitoring.tracing import TracingMiddleware
+from ai_exercise_service.src.util.services.admission import AdmissionMiddleware, admission_controller
+from ai_exercise_service.src.util.services.auth_service import auth_service
+from ai_exercise_service.src.util.services.deadline import DeadlineMiddleware
+from ai_exercise_service.src.util.services.spring_client import close_spring_pool
+from ai_exercise_service.src.util.services.warmup import warmup_service
+from ai_exercise_service.src.ai.exercise.service.recommendation_refresh_service import recommendation_refresh_service
+from ai_exercise_service.src.ai.meal_feedback.service.feedback_variant_pool import feedback_variant_pool
+from ai_exercise_service.src.util.serialization.json_codec import FastJSONResponse
 import logging
 
-# 로깅 설정
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+# 로깅 설정 (큐 기반 비동기 출력, 요청 ID 연결, 로거별 샘플링/속도 제한)
+log_pipeline.configure()
 logger = logging.getLogger(__name__)
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """워커 시작 시 워밍업/루프 모니터 시작, 종료 시 백그라운드 작업/커넥션 풀 정리"""
+    log_pipeline.capture_uvicorn()
+    loop_monitor.start()
+    request_profiler.install()
+    warmup_service.start()
+    admission_controller.start()
+    yield
+    await warmup_service.stop()
+    await loop_monitor.stop()
+    await admission_controller.stop()
+    await recommendation_refresh_service.shutdown()
+    await feedback_variant_pool.shutdown()
+    await close_spring_pool()
+
 app = FastAPI(
     title="LET AI Server",
     description="AI 기반 급식 및 운동 분석 서비스",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=FastJSONResponse,
+    lifespan=lifespan
 )
 
 # CORS 설정
@@ -42,6 +74,28 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# 일정 크기 이상 응답 gzip 압축 (분석 결과/4주 계획 등 큰 JSON)
+app.add_middleware(
+    GZipMiddleware,
+    minimum_size=settings.gzip_min_size_bytes,
+    compresslevel=settings.gzip_compresslevel
+)
+
+# 라우트 분류별 LLM 그래프 실행 동시 처리 제한과 대기열 (deadline 안쪽에서 실행되어 대기 시간도 예산에 포함)
+app.add_middleware(AdmissionMiddleware)
+
+# 요청 시간 예산 (라우트별 설정 또는 X-Request-Deadline-Ms 헤더)
+app.add_middleware(DeadlineMiddleware)
+
+# 요청 지연시간 메트릭
+app.add_middleware(MetricsMiddleware)
+
+# 관리자 헤더 기반 요청 프로파일링 (요청 ID가 정해진 뒤 실행되도록 tracing 안쪽)
+app.add_middleware(ProfilingMiddleware)
+
+# 요청 ID 전파 및 span 추적
+app.add_middleware(TracingMiddleware)
+
 @app.get("/")
 async def root():
     """서비스 상태 확인"""
@@ -56,9 +110,51 @@ async def health_check():
     """헬스 체크"""
     return {"status": "healthy", "service": "LET AI Server"}
 
+@app.get("/ready")
+async def readiness_check():
+    """준비 상태 확인 (시작 워밍업의 필수 단계가 모두 성공해야 200, 아니면 단계별 실패와 함께 503)"""
+    status = warmup_service.status()
+    if not status["ready"]:
+        return FastJSONResponse(status, status_code=503)
+    return status
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus 메트릭"""
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
+
+@app.get("/debug/event-loop", include_in_schema=False)
+async def event_loop_status():
+    """이벤트 루프 지연 백분위 및 블로킹 코드 위치 (워커별)"""
+    return loop_monitor.status()
+
+@app.get("/internal/admission", include_in_schema=False, dependencies=[Depends(auth_service.require_internal_token)])
+async def admission_limits():
+    """라우트 분류별 수용 한도와 현재 처리/대기 수 (이 워커 기준)"""
+    return admission_controller.status()
+
+@app.put("/internal/admission/{route_class}", include_in_schema=False, dependencies=[Depends(auth_service.require_internal_token)])
+async def update_admission_limits(
+    route_class: str,
+    limit: Optional[int] = Query(None, ge=1),
+    queue_size: Optional[int] = Query(None, ge=0)
+):
+    """재시작 없이 수용 한도 변경 (공유 캐시에 저장되어 다른 워커도 갱신 주기 안에 반영)"""
+    try:
+        return await admission_controller.set_limits(route_class, limit, queue_size)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+@app.delete("/internal/admission", include_in_schema=False, dependencies=[Depends(auth_service.require_internal_token)])
+async def reset_admission_limits():
+    """런타임 한도 변경을 지우고 설정값으로 복귀"""
+    return await admission_controller.reset_limits()
+
 # 라우터 등록
 app.include_router(meal_feedback_router)
 app.include_router(exercise_router)
+app.include_router(event_router)
 
 if __name__ == "__main__":
     logger.info(f"LET AI Server 시작 - {settings.api_host}:{settings.api_port}")
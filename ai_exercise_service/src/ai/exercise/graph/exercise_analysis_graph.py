@@ -1,95 +1,180 @@
-from typing import Dict, Any, List
+from typing import Dict, Any, List, TypedDict
 from langgraph.graph import StateGraph, END
-from langchain_openai import ChatOpenAI
-from langchain_core.prompts import ChatPromptTemplate
-from dotenv import load_dotenv
-import sys
-import os
-sys.path.append(os.path.join(os.path.dirname(__file__), '../../../..'))
-
-# .env 파일 로드
-load_dotenv(os.path.join(os.path.dirname(__file__), '../../../..', '.env'))
-
+from functools import lru_cache
+from datetime import datetime
 import logging
 
 logger = logging.getLogger(__name__)
+from ai_exercise_service.src.util.llm.client_factory import get_chat_model
+from ai_exercise_service.src.util.llm.call_policy import llm_call_policy
+from ai_exercise_service.src.util.llm.prompt_registry import prompt_registry
+from ai_exercise_service.src.util.monitoring.metrics import instrument_node, record_llm_fallback
+from ai_exercise_service.src.util.graph.checkpoint import graph_checkpointer
+from ai_exercise_service.src.util.serialization.json_codec import dumps
+
+# 압축 계획의 요일 코드
+DAY_NAMES = {1: "월요일", 2: "화요일", 3: "수요일", 4: "목요일", 5: "금요일", 6: "토요일", 7: "일요일"}
 
-class ExerciseAnalysisState:
+class ExerciseAnalysisState(TypedDict):
     """운동 분석 상태 관리"""
-    def __init__(self):
-        self.user_data: Dict[str, Any] = {}
-        self.exercise_recommendations: List[Dict[str, Any]] = []
-        self.analysis_result: Dict[str, Any] = {}
-        self.error_message: str = ""
+    user_data: Dict[str, Any]
+    # 운동 목록 (Spring 운동 목록, id는 압축 계획에서 운동을 가리킴)
+    exercise_catalog: List[Dict[str, Any]]
+    exercise_recommendations: Dict[str, Any]
+    analysis_result: Dict[str, Any]
+    error_message: str
 
-# LLM 초기화
-llm = ChatOpenAI(model="gpt-4o-mini", temperature=0)
+# LLM 초기화 (첫 호출 시 생성)
+def get_llm():
+    return get_chat_model(temperature=0)
+
+# 프롬프트 (노드별 고정 지시사항/출력 형식이 앞, 요청 데이터는 마지막)
+prompt_registry.register_graph(
+    "exercise_analysis",
+    preamble=(
+        "공통 규칙:"
+        "\n- 모든 응답은 한국어로 작성"
+        "\n- 마크다운 코드 블록 없이 지정된 JSON 객체만 출력"
+    ),
+    tasks={
+        "analyze_fitness": {
+            "instructions": (
+                "당신은 전문 피트니스 트레이너입니다. 사용자의 기본 정보를 바탕으로 체력 수준과 운동 능력을 분석하세요."
+                "\n\n분석 기준:"
+                "\n- BMI 계산 및 체형 분석"
+                "\n- 나이별 권장 운동 강도"
+                "\n- 체력 수준에 따른 운동 계획"
+                "\n- 건강 상태 고려사항"
+            ),
+            "output": (
+                "{{\n"
+                "  \"bmi\": BMI수치,\n"
+                "  \"body_type\": \"저체중/정상/과체중/비만\",\n"
+                "  \"fitness_assessment\": \"초급/중급/고급\",\n"
+                "  \"recommended_intensity\": \"낮음/보통/높음\",\n"
+                "  \"weekly_frequency\": 주당운동횟수,\n"
+                "  \"session_duration\": 회당운동시간분,\n"
+                "  \"focus_areas\": [\"중점운동영역들\"],\n"
+                "  \"precautions\": [\"주의사항들\"]\n"
+                "}}"
+            ),
+            "data": "사용자 정보:\n{user_data}"
+        },
+        "generate_plan": {
+            "instructions": (
+                "당신은 개인 트레이너입니다. 사용자의 체력 분석 결과와 이용 가능한 운동들을 바탕으로 "
+                "4주간의 맞춤형 운동 계획을 수립하세요."
+                "\n\n계획 수립 기준:"
+                "\n- 사용자의 체력 수준과 목표에 맞는 운동 선택"
+                "\n- 점진적 강도 증가 원칙"
+                "\n- 다양한 근육군 균형적 발달"
+                "\n- 부상 방지를 위한 안전성 고려"
+            ),
+            "output": (
+                "공백/줄바꿈 없는 한 줄 압축 JSON (키 이름과 배열 위치를 정확히 지킬 것)\n"
+                "{{\"o\":[주당횟수,회당시간분,[\"주요목표\"],\"강도증가방식\"],"
+                "\"w\":[[\"주차집중영역\",[[요일코드,[[운동ID,세트수,반복,휴식초]]]]]],"
+                "\"n\":[\"영양관리팁\"],\"m\":[\"측정지표\"],\"s\":[\"안전수칙\"]}}\n"
+                "- w: 1~4주차 순서대로 4개, 주차마다 운동하는 요일별 [요일코드, 운동 목록]\n"
+                "- 요일코드: 1=월 2=화 3=수 4=목 5=금 6=토 7=일\n"
+                "- 운동ID: 이용 가능한 운동 목록의 id만 사용 (목록에 없는 id가 있으면 계획 전체를 쓰지 않음)\n"
+                "- 반복: 횟수는 정수(예: 12), 시간은 초 단위 문자열(예: \"30s\")\n"
+                "- 문자열 항목은 20자 이내, 목록은 각 최대 3개"
+            ),
+            "data": (
+                "사용자 분석 결과:\n{analysis_data}\n\n"
+                "이용 가능한 운동 목록 ([id, 이름, 분류] 배열):\n{exercise_list}"
+            )
+        },
+        "create_report": {
+            "instructions": (
+                "당신은 피트니스 전문가입니다. 사용자의 체력 분석과 운동 계획을 종합하여 피트니스 보고서를 작성하세요."
+                "\n\n보고서 작성 원칙:"
+                "\n- 전문적이면서도 이해하기 쉬운 설명"
+                "\n- 실행 가능한 구체적 가이드라인"
+                "\n- 동기부여가 되는 긍정적 메시지"
+                "\n- 안전한 운동을 위한 주의사항 강조"
+            ),
+            "output": (
+                "{{\n"
+                "  \"executive_summary\": \"전체요약\",\n"
+                "  \"user_profile\": {{\n"
+                "    \"current_status\": \"현재상태평가\",\n"
+                "    \"strengths\": [\"강점들\"],\n"
+                "    \"improvement_areas\": [\"개선영역들\"]\n"
+                "  }},\n"
+                "  \"fitness_goals\": {{\n"
+                "    \"short_term\": [\"단기목표들\"],\n"
+                "    \"long_term\": [\"장기목표들\"],\n"
+                "    \"success_metrics\": [\"성공지표들\"]\n"
+                "  }},\n"
+                "  \"recommended_program\": {{\n"
+                "    \"program_type\": \"프로그램유형\",\n"
+                "    \"key_benefits\": [\"주요효과들\"],\n"
+                "    \"expected_timeline\": \"예상기간\"\n"
+                "  }},\n"
+                "  \"lifestyle_recommendations\": {{\n"
+                "    \"daily_habits\": [\"일상습관권장사항들\"],\n"
+                "    \"nutrition_focus\": [\"영양관리포인트들\"],\n"
+                "    \"recovery_tips\": [\"회복관리팁들\"]\n"
+                "  }},\n"
+                "  \"motivation_message\": \"격려메시지\",\n"
+                "  \"next_steps\": [\"다음단계행동계획들\"]\n"
+                "}}"
+            ),
+            "data": (
+                "사용자 기본 정보:\n{user_data}\n\n"
+                "체력 분석 결과:\n{fitness_analysis}\n\n"
+                "운동 계획:\n{exercise_plan}"
+            )
+        }
+    }
+)
 
-def collect_user_data_node(state: ExerciseAnalysisState) -> ExerciseAnalysisState:
+def collect_user_data_node(state: ExerciseAnalysisState) -> Dict[str, Any]:
     """사용자 데이터 수집 노드"""
     try:
         logger.info("운동 분석용 사용자 데이터 수집 시작")
         
         # 사용자 기본 정보 수집 (실제로는 API에서 받아올 데이터)
+        raw_user_data = state["user_data"]
         user_data = {
-            "age": state.user_data.get("age", 20),
-            "weight": state.user_data.get("weight", 70),
-            "height": state.user_data.get("height", 170),
-            "fitness_level": state.user_data.get("fitness_level", "beginner"),
-            "goals": state.user_data.get("goals", ["체중감량", "근력증가"]),
-            "available_time": state.user_data.get("available_time", 30),  # 분
-            "medical_conditions": state.user_data.get("medical_conditions", [])
+            "age": raw_user_data.get("age", 20),
+            "weight": raw_user_data.get("weight", 70),
+            "height": raw_user_data.get("height", 170),
+            "fitness_level": raw_user_data.get("fitness_level", "beginner"),
+            "goals": raw_user_data.get("goals", ["체중감량", "근력증가"]),
+            "available_time": raw_user_data.get("available_time", 30),  # 분
+            "medical_conditions": raw_user_data.get("medical_conditions", [])
         }
         
-        state.user_data = user_data
         logger.info("사용자 데이터 수집 완료")
-        return state
+        return {"user_data": user_data}
         
     except Exception as e:
         logger.error(f"사용자 데이터 수집 실패: {str(e)}")
-        state.error_message = f"데이터 수집 오류: {str(e)}"
-        return state
+        return {"error_message": f"데이터 수집 오류: {str(e)}"}
 
-def analyze_fitness_level_node(state: ExerciseAnalysisState) -> ExerciseAnalysisState:
+def analyze_fitness_level_node(state: ExerciseAnalysisState) -> Dict[str, Any]:
     """체력 수준 분석 노드"""
     try:
         logger.info("체력 수준 분석 시작")
         
-        analysis_prompt = ChatPromptTemplate.from_messages([
-            ("system", 
-             "당신은 전문 피트니스 트레이너입니다. 사용자의 기본 정보를 바탕으로 체력 수준과 운동 능력을 분석하세요."
-             "\n\n분석 기준:"
-             "\n- BMI 계산 및 체형 분석"
-             "\n- 나이별 권장 운동 강도"
-             "\n- 체력 수준에 따른 운동 계획"
-             "\n- 건강 상태 고려사항"),
-            ("human", 
-             "사용자 정보:\n{user_data}\n\n"
-             "위 정보를 바탕으로 다음 JSON 형식으로 분석 결과를 제공해주세요:\n"
-             "{{\n"
-             "  \"bmi\": BMI수치,\n"
-             "  \"body_type\": \"저체중/정상/과체중/비만\",\n"
-             "  \"fitness_assessment\": \"초급/중급/고급\",\n"
-             "  \"recommended_intensity\": \"낮음/보통/높음\",\n"
-             "  \"weekly_frequency\": 주당운동횟수,\n"
-             "  \"session_duration\": 회당운동시간분,\n"
-             "  \"focus_areas\": [\"중점운동영역들\"],\n"
-             "  \"precautions\": [\"주의사항들\"]\n"
-             "}}")
-        ])
+        analysis_prompt = prompt_registry.get("exercise_analysis", "analyze_fitness")
         
-        chain = analysis_prompt | llm
-        result = chain.invoke({"user_data": str(state.user_data)})
+        result = llm_call_policy.invoke("analyze_fitness", analysis_prompt, get_llm(), {"user_data": str(state["user_data"])})
         
         # JSON 파싱
         import json
+        user_data = dict(state["user_data"])
         try:
             analysis_json = json.loads(result.content)
-            state.user_data["fitness_analysis"] = analysis_json
+            user_data["fitness_analysis"] = analysis_json
             logger.info("체력 수준 분석 완료")
         except json.JSONDecodeError:
             logger.warning("JSON 파싱 실패, 기본값 사용")
-            state.user_data["fitness_analysis"] = {
+            record_llm_fallback("analyze_fitness")
+            user_data["fitness_analysis"] = {
                 "bmi": 23.5,
                 "body_type": "정상",
                 "fitness_assessment": "중급",
@@ -100,85 +185,34 @@ def analyze_fitness_level_node(state: ExerciseAnalysisState) -> ExerciseAnalysis
                 "precautions": ["준비운동 필수"]
             }
         
-        return state
+        return {"user_data": user_data}
         
     except Exception as e:
         logger.error(f"체력 수준 분석 실패: {str(e)}")
-        state.error_message = f"체력 분석 오류: {str(e)}"
-        return state
+        return {"error_message": f"체력 분석 오류: {str(e)}"}
 
-def generate_exercise_plan_node(state: ExerciseAnalysisState) -> ExerciseAnalysisState:
+def generate_exercise_plan_node(state: ExerciseAnalysisState) -> Dict[str, Any]:
     """운동 계획 생성 노드"""
     try:
         logger.info("개인맞춤 운동 계획 생성 시작")
         
-        # 기본 운동 목록 (실제로는 Spring API에서 가져올 수 있음)
-        sample_exercises = [
-            {"name": "푸시업", "category": "근력운동", "difficulty": "중급", "calories_per_minute": 8},
-            {"name": "스쿼트", "category": "근력운동", "difficulty": "초급", "calories_per_minute": 6},
-            {"name": "런닝", "category": "유산소", "difficulty": "중급", "calories_per_minute": 12},
-            {"name": "플랭크", "category": "코어", "difficulty": "중급", "calories_per_minute": 5},
-            {"name": "버피", "category": "전신", "difficulty": "고급", "calories_per_minute": 15}
-        ]
+        plan_prompt = prompt_registry.get("exercise_analysis", "generate_plan")
         
-        plan_prompt = ChatPromptTemplate.from_messages([
-            ("system",
-             "당신은 개인 트레이너입니다. 사용자의 체력 분석 결과와 이용 가능한 운동들을 바탕으로 "
-             "맞춤형 운동 계획을 수립하세요."
-             "\n\n계획 수립 기준:"
-             "\n- 사용자의 체력 수준과 목표에 맞는 운동 선택"
-             "\n- 점진적 강도 증가 원칙"
-             "\n- 다양한 근육군 균형적 발달"
-             "\n- 부상 방지를 위한 안전성 고려"),
-            ("human",
-             "사용자 분석 결과:\n{analysis_data}\n\n"
-             "이용 가능한 운동 목록:\n{exercise_list}\n\n"
-             "위 정보를 바탕으로 4주간의 운동 계획을 다음 JSON 형식으로 작성해주세요:\n"
-             "{{\n"
-             "  \"program_overview\": {{\n"
-             "    \"duration_weeks\": 4,\n"
-             "    \"weekly_sessions\": 주당횟수,\n"
-             "    \"session_duration_minutes\": 회당시간,\n"
-             "    \"primary_goals\": [\"주요목표들\"],\n"
-             "    \"difficulty_progression\": \"점진적증가방식\"\n"
-             "  }},\n"
-             "  \"weekly_plans\": {{\n"
-             "    \"week_1\": {{\n"
-             "      \"focus\": \"1주차집중영역\",\n"
-             "      \"workouts\": [\n"
-             "        {{\n"
-             "          \"day\": \"월요일\",\n"
-             "          \"exercises\": [\n"
-             "            {{\"name\": \"운동명\", \"sets\": 세트수, \"reps\": \"반복수또는시간\", \"rest_seconds\": 휴식시간}}\n"
-             "          ]\n"
-             "        }}\n"
-             "      ]\n"
-             "    }},\n"
-             "    \"week_2\": {{...}},\n"
-             "    \"week_3\": {{...}},\n"
-             "    \"week_4\": {{...}}\n"
-             "  }},\n"
-             "  \"nutrition_tips\": [\"영양관리팁들\"],\n"
-             "  \"progress_tracking\": {{\"measurement_points\": [\"측정지표들\"]}},\n"
-             "  \"safety_guidelines\": [\"안전수칙들\"]\n"
-             "}}")
-        ])
-        
-        chain = plan_prompt | llm
-        result = chain.invoke({
-            "analysis_data": str(state.user_data["fitness_analysis"]),
-            "exercise_list": str(sample_exercises)
+        exercises = state.get("exercise_catalog") or []
+        result = llm_call_policy.invoke("generate_plan", plan_prompt, get_llm(), {
+            "analysis_data": str(state["user_data"]["fitness_analysis"]),
+            "exercise_list": compact_exercise_list(exercises)
         })
         
-        # JSON 파싱
+        # 압축 계획 파싱/검증 후 기존 응답 형식으로 복원
         import json
         try:
-            plan_json = json.loads(result.content)
-            state.exercise_recommendations = plan_json
+            plan_json = expand_compact_plan(json.loads(result.content), exercises)
             logger.info("운동 계획 생성 완료")
-        except json.JSONDecodeError:
-            logger.warning("운동 계획 JSON 파싱 실패, 기본값 사용")
-            state.exercise_recommendations = {
+        except (ValueError, TypeError, IndexError, KeyError) as e:
+            logger.warning(f"운동 계획 파싱/검증 실패, 기본값 사용: {str(e)}")
+            record_llm_fallback("generate_plan")
+            plan_json = {
                 "program_overview": {
                     "duration_weeks": 4,
                     "weekly_sessions": 3,
@@ -189,95 +223,135 @@ def generate_exercise_plan_node(state: ExerciseAnalysisState) -> ExerciseAnalysi
                 "safety_guidelines": ["충분한 준비운동", "본인 페이스 유지", "무리하지 않기"]
             }
         
-        return state
+        return {"exercise_recommendations": plan_json}
         
     except Exception as e:
         logger.error(f"운동 계획 생성 실패: {str(e)}")
-        state.error_message = f"운동 계획 생성 오류: {str(e)}"
-        return state
+        return {"error_message": f"운동 계획 생성 오류: {str(e)}"}
 
-def create_final_report_node(state: ExerciseAnalysisState) -> ExerciseAnalysisState:
+def create_final_report_node(state: ExerciseAnalysisState) -> Dict[str, Any]:
     """최종 보고서 생성 노드"""
     try:
         logger.info("최종 운동 분석 보고서 생성 시작")
         
-        report_prompt = ChatPromptTemplate.from_messages([
-            ("system",
-             "당신은 피트니스 전문가입니다. 사용자의 체력 분석과 운동 계획을 바탕으로 "
-             "종합적인 피트니스 보고서를 작성하세요."
-             "\n\n보고서 작성 원칙:"
-             "\n- 전문적이면서도 이해하기 쉬운 설명"
-             "\n- 실행 가능한 구체적 가이드라인"
-             "\n- 동기부여가 되는 긍정적 메시지"
-             "\n- 안전한 운동을 위한 주의사항 강조"),
-            ("human",
-             "사용자 기본 정보:\n{user_data}\n\n"
-             "체력 분석 결과:\n{fitness_analysis}\n\n"
-             "운동 계획:\n{exercise_plan}\n\n"
-             "위 모든 정보를 종합하여 다음 JSON 형식의 종합 피트니스 보고서를 작성해주세요:\n"
-             "{{\n"
-             "  \"executive_summary\": \"전체요약\",\n"
-             "  \"user_profile\": {{\n"
-             "    \"current_status\": \"현재상태평가\",\n"
-             "    \"strengths\": [\"강점들\"],\n"
-             "    \"improvement_areas\": [\"개선영역들\"]\n"
-             "  }},\n"
-             "  \"fitness_goals\": {{\n"
-             "    \"short_term\": [\"단기목표들\"],\n"
-             "    \"long_term\": [\"장기목표들\"],\n"
-             "    \"success_metrics\": [\"성공지표들\"]\n"
-             "  }},\n"
-             "  \"recommended_program\": {{\n"
-             "    \"program_type\": \"프로그램유형\",\n"
-             "    \"key_benefits\": [\"주요효과들\"],\n"
-             "    \"expected_timeline\": \"예상기간\"\n"
-             "  }},\n"
-             "  \"lifestyle_recommendations\": {{\n"
-             "    \"daily_habits\": [\"일상습관권장사항들\"],\n"
-             "    \"nutrition_focus\": [\"영양관리포인트들\"],\n"
-             "    \"recovery_tips\": [\"회복관리팁들\"]\n"
-             "  }},\n"
-             "  \"motivation_message\": \"격려메시지\",\n"
-             "  \"next_steps\": [\"다음단계행동계획들\"]\n"
-             "}}")
-        ])
+        report_prompt = prompt_registry.get("exercise_analysis", "create_report")
         
-        chain = report_prompt | llm
-        result = chain.invoke({
-            "user_data": str(state.user_data),
-            "fitness_analysis": str(state.user_data.get("fitness_analysis", {})),
-            "exercise_plan": str(state.exercise_recommendations)
+        result = llm_call_policy.invoke("create_report", report_prompt, get_llm(), {
+            "user_data": str(state["user_data"]),
+            "fitness_analysis": str(state["user_data"].get("fitness_analysis", {})),
+            "exercise_plan": str(state["exercise_recommendations"])
         })
         
         # JSON 파싱
         import json
-        import pandas as pd
         try:
             report_json = json.loads(result.content)
-            state.analysis_result = {
-                "user_analysis": state.user_data,
-                "exercise_plan": state.exercise_recommendations,
+            analysis_result = {
+                "user_analysis": state["user_data"],
+                "exercise_plan": state["exercise_recommendations"],
                 "comprehensive_report": report_json,
-                "generated_at": str(pd.Timestamp.now())
+                "generated_at": str(datetime.now())
             }
             logger.info("최종 보고서 생성 완료")
         except json.JSONDecodeError:
             logger.warning("보고서 JSON 파싱 실패, 기본 보고서 생성")
-            state.analysis_result = {
-                "user_analysis": state.user_data,
-                "exercise_plan": state.exercise_recommendations,
+            record_llm_fallback("create_report")
+            analysis_result = {
+                "user_analysis": state["user_data"],
+                "exercise_plan": state["exercise_recommendations"],
                 "comprehensive_report": {
                     "executive_summary": "개인 맞춤형 운동 계획이 수립되었습니다.",
                     "motivation_message": "꾸준한 운동으로 건강한 삶을 만들어보세요!"
                 }
             }
         
-        return state
+        return {"analysis_result": analysis_result}
         
     except Exception as e:
         logger.error(f"최종 보고서 생성 실패: {str(e)}")
-        state.error_message = f"보고서 생성 오류: {str(e)}"
-        return state
+        return {"error_message": f"보고서 생성 오류: {str(e)}"}
+
+def exercise_name(exercise: Dict[str, Any]) -> str:
+    """운동 이름 (Spring 운동 목록은 title, 기본 운동 목록은 name)"""
+    return str(exercise.get("title") or exercise.get("name") or exercise.get("id"))
+
+def compact_exercise_list(exercises: List[Dict[str, Any]]) -> str:
+    """프롬프트용 운동 목록 ([id, 이름, 분류] 배열의 한 줄 JSON - 설명/방법 등은 계획에 쓰지 않으므로 제외)"""
+    return dumps([[exercise["id"], exercise_name(exercise), exercise.get("category", "")] for exercise in exercises]).decode("utf-8")
+
+def expand_compact_plan(compact: Dict[str, Any], exercises: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    압축 계획 인코딩을 기존 운동 계획 응답 형식으로 복원
+    
+    모델은 키/요일/운동명을 반복하는 중첩 JSON 대신 위치 기반 배열만 출력하고
+    (출력 토큰 약 1/3 이하), 운동명/요일명/고정 값은 서버에서 채웁니다.
+    
+    Raises:
+        ValueError, TypeError, IndexError: 형식이 맞지 않거나 목록에 없는 운동 ID가 있는 경우
+    """
+    names = {_exercise_key(exercise["id"]): exercise_name(exercise) for exercise in exercises}
+    unknown_ids = sorted({
+        _exercise_key(exercise_id)
+        for _, workouts in compact["w"]
+        for _, day_exercises in workouts
+        for exercise_id, *_ in day_exercises
+        if _exercise_key(exercise_id) not in names
+    })
+    if unknown_ids:
+        raise ValueError(f"목록에 없는 운동 ID: {unknown_ids}")
+    weekly_sessions, session_minutes, primary_goals, progression = compact["o"]
+    
+    weekly_plans = {}
+    for week_number, (focus, workouts) in enumerate(compact["w"], start=1):
+        weekly_plans[f"week_{week_number}"] = {
+            "focus": focus,
+            "workouts": [
+                {
+                    "day": DAY_NAMES.get(int(day), str(day)),
+                    "exercises": [
+                        {
+                            "name": names[_exercise_key(exercise_id)],
+                            "sets": int(sets),
+                            "reps": _expand_reps(reps),
+                            "rest_seconds": int(rest_seconds)
+                        }
+                        for exercise_id, sets, reps, rest_seconds in day_exercises
+                    ]
+                }
+                for day, day_exercises in workouts
+            ]
+        }
+    if not weekly_plans:
+        raise ValueError("주차별 계획이 비어 있음")
+    
+    return {
+        "program_overview": {
+            "duration_weeks": len(weekly_plans),
+            "weekly_sessions": weekly_sessions,
+            "session_duration_minutes": session_minutes,
+            "primary_goals": list(primary_goals),
+            "difficulty_progression": progression
+        },
+        "weekly_plans": weekly_plans,
+        "nutrition_tips": list(compact.get("n", [])),
+        "progress_tracking": {"measurement_points": list(compact.get("m", []))},
+        "safety_guidelines": list(compact.get("s", []))
+    }
+
+def _exercise_key(exercise_id: Any) -> str:
+    """운동 ID 비교용 문자열 (Spring ID가 숫자가 아니어도 되도록, 모델이 5.0처럼 출력한 정수는 5로)"""
+    if isinstance(exercise_id, float) and exercise_id.is_integer():
+        exercise_id = int(exercise_id)
+    return str(exercise_id)
+
+def _expand_reps(reps: Any) -> str:
+    """반복 값 복원 (12 -> "12회", "30s" -> "30초")"""
+    if isinstance(reps, (int, float)):
+        return f"{int(reps)}회"
+    text = str(reps)
+    if text.endswith("s") and text[:-1].isdigit():
+        return f"{text[:-1]}초"
+    return text
 
 # 그래프 구성
 def create_exercise_analysis_graph():
@@ -285,10 +359,10 @@ def create_exercise_analysis_graph():
     workflow = StateGraph(ExerciseAnalysisState)
     
     # 노드 추가
-    workflow.add_node("collect_data", collect_user_data_node)
-    workflow.add_node("analyze_fitness", analyze_fitness_level_node)
-    workflow.add_node("generate_plan", generate_exercise_plan_node)
-    workflow.add_node("create_report", create_final_report_node)
+    workflow.add_node("collect_data", instrument_node("exercise_analysis", "collect_data", collect_user_data_node))
+    workflow.add_node("analyze_fitness", instrument_node("exercise_analysis", "analyze_fitness", analyze_fitness_level_node))
+    workflow.add_node("generate_plan", instrument_node("exercise_analysis", "generate_plan", generate_exercise_plan_node))
+    workflow.add_node("create_report", instrument_node("exercise_analysis", "create_report", create_final_report_node))
     
     # 엣지 설정
     workflow.set_entry_point("collect_data")
@@ -297,7 +371,16 @@ def create_exercise_analysis_graph():
     workflow.add_edge("generate_plan", "create_report")
     workflow.add_edge("create_report", END)
     
-    return workflow.compile()
+    return workflow.compile(checkpointer=graph_checkpointer.saver)
+
+# 전역 그래프 인스턴스 (첫 사용 시 컴파일)
+@lru_cache(maxsize=1)
+def get_exercise_analysis_graph():
+    """컴파일된 운동 분석 그래프 반환"""
+    return create_exercise_analysis_graph()
 
-# 전역 그래프 인스턴스
-exercise_analysis_graph = create_exercise_analysis_graph()
\ No newline at end of file
+def __getattr__(name: str):
+    # 기존 `exercise_analysis_graph` 임포트 호환
+    if name == "exercise_analysis_graph":
+        return get_exercise_analysis_graph()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
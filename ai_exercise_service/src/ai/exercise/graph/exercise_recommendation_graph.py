@@ -1,20 +1,16 @@
 from typing import Dict, Any, List, TypedDict
 from langgraph.graph import StateGraph, END
-from langchain_openai import ChatOpenAI
-from langchain_core.prompts import ChatPromptTemplate
-from dotenv import load_dotenv
-import sys
-import os
-sys.path.append(os.path.join(os.path.dirname(__file__), '../../../..'))
-
-# .env 파일 로드
-load_dotenv(os.path.join(os.path.dirname(__file__), '../../../..', '.env'))
-
+from functools import lru_cache
 import logging
 import json
 import random
 
 logger = logging.getLogger(__name__)
+from ai_exercise_service.src.util.llm.client_factory import get_chat_model
+from ai_exercise_service.src.util.llm.call_policy import llm_call_policy
+from ai_exercise_service.src.util.llm.token_budget import token_budget
+from ai_exercise_service.src.util.llm.prompt_registry import prompt_registry
+from ai_exercise_service.src.util.monitoring.metrics import instrument_node, record_llm_fallback
 
 class ExerciseRecommendationState(TypedDict):
     """운동 추천 상태 관리"""
@@ -26,8 +22,101 @@ class ExerciseRecommendationState(TypedDict):
     final_recommendation: Dict[str, Any]
     error_message: str
 
-# LLM 초기화
-llm = ChatOpenAI(model="gpt-4o-mini", temperature=0.1)
+# LLM 초기화 (첫 호출 시 생성)
+def get_llm():
+    return get_chat_model(temperature=0.1)
+
+# 프롬프트 (노드별 고정 지시사항/출력 형식이 앞, 요청 데이터는 마지막)
+prompt_registry.register_graph(
+    "exercise_recommendation",
+    preamble=(
+        "공통 규칙:"
+        "\n- 모든 응답은 한국어로 작성"
+        "\n- JSON 형식을 요구하는 작업은 마크다운 코드 블록 없이 JSON 객체만 출력"
+    ),
+    tasks={
+        "analyze_calorie_intake": {
+            "instructions": (
+                "당신은 영양학 전문가입니다. 사용자의 일일 칼로리 섭취량을 분석하여 운동 필요성을 평가하세요."
+                "\n\n분석 기준:"
+                "\n- 성인 기초대사율: 1500kcal"
+                "\n- 권장 일일 칼로리: 1800-2200kcal"
+                "\n- 운동을 통한 칼로리 소모 필요성 판단"
+                "\n- 사용자의 건강상태 고려"
+            ),
+            "output": (
+                "{{\n"
+                "  \"intake_status\": \"매우부족/부족/적정/과다/매우과다\",\n"
+                "  \"target_burn_calories\": 권장소모칼로리,\n"
+                "  \"analysis_reason\": \"상세한 분석 이유\",\n"
+                "  \"health_advice\": \"건강 관리 조언\",\n"
+                "  \"exercise_intensity\": \"가벼움/보통/적극적\",\n"
+                "  \"recommended_duration\": 권장운동시간분\n"
+                "}}"
+            ),
+            "data": (
+                "오늘 총 섭취 칼로리: {daily_calories}kcal\n"
+                "식사별 상세 내역: {meal_breakdown}"
+            )
+        },
+        "select_exercises": {
+            "instructions": (
+                "당신은 전문 피트니스 트레이너입니다. 사용자의 칼로리 분석 결과를 바탕으로 "
+                "이용 가능한 운동 목록에서 가장 적합한 운동 조합을 선택하여 추천하세요."
+                "\n\n선택 기준:"
+                "\n- 칼로리 소모 목표 달성"
+                "\n- 운동 강도와 사용자 상태 적합성"
+                "\n- 실현 가능한 운동 시간과 난이도"
+                "\n- 다양한 운동 부위 고려"
+                "\n\n운동 데이터 구조: id, category(MOVING/STRETCH/ETC), duration(분), title, description, method"
+            ),
+            "output": (
+                "{{\n"
+                "  \"selected_exercises\": [\n"
+                "    {{\n"
+                "      \"id\": 운동ID,\n"
+                "      \"title\": \"운동제목\",\n"
+                "      \"category\": \"MOVING/STRETCH/ETC\",\n"
+                "      \"recommended_duration\": 추천시간분,\n"
+                "      \"description\": \"운동설명\",\n"
+                "      \"method\": \"실행방법\",\n"
+                "      \"expected_calories\": 예상소모칼로리,\n"
+                "      \"selection_reason\": \"선택이유\"\n"
+                "    }}\n"
+                "  ],\n"
+                "  \"total_expected_burn\": 총예상소모칼로리,\n"
+                "  \"total_duration\": 총운동시간분,\n"
+                "  \"workout_balance\": \"운동균형평가\",\n"
+                "  \"difficulty_level\": \"초급/중급/고급\"\n"
+                "}}"
+            ),
+            "data": (
+                "칼로리 분석 결과:\n{analysis}\n\n"
+                "이용 가능한 운동 목록:\n{exercises}"
+            )
+        },
+        "generate_final_recommendation": {
+            "instructions": (
+                "당신은 친근한 피트니스 코치입니다. 사용자에게 따뜻하고 격려하는 톤으로 운동 추천 메시지를 작성하세요."
+                "\n\n메시지 스타일:"
+                "\n- 친근하고 격려하는 톤"
+                "\n- 구체적인 칼로리 수치 포함"
+                "\n- 실행 가능한 동기부여"
+                "\n- 간결하지만 따뜻한 표현"
+            ),
+            "output": (
+                "다음 형식의 문장 하나만 작성 (JSON 아님, 다른 문구 추가 금지)\n"
+                "정확한 형식: \"오늘은 XXXkcal 섭취하셨네요! 이 운동을 통해 XXkcal만큼 운동해 보아요!\"\n"
+                "섭취 칼로리가 0인 경우에도: \"오늘은 0kcal 섭취하셨네요! 이 운동을 통해 XXkcal만큼 운동해 보아요!\""
+            ),
+            "data": (
+                "사용자 칼로리 섭취: {daily_calories}kcal\n"
+                "분석 결과: {analysis}\n"
+                "선택된 운동: {selection}"
+            )
+        }
+    }
+)
 
 def analyze_calorie_intake_node(state: ExerciseRecommendationState) -> Dict[str, Any]:
     """칼로리 섭취량 분석 노드"""
@@ -37,30 +126,9 @@ def analyze_calorie_intake_node(state: ExerciseRecommendationState) -> Dict[str,
         daily_calories = state["user_calorie_data"].get("daily_calories", 0)
         meal_breakdown = state["user_calorie_data"].get("meal_breakdown", [])
         
-        analysis_prompt = ChatPromptTemplate.from_messages([
-            ("system",
-             "당신은 영양학 전문가입니다. 사용자의 일일 칼로리 섭취량을 분석하여 운동 필요성을 평가하세요."
-             "\n\n분석 기준:"
-             "\n- 성인 기초대사율: 1500kcal"
-             "\n- 권장 일일 칼로리: 1800-2200kcal"
-             "\n- 운동을 통한 칼로리 소모 필요성 판단"
-             "\n- 사용자의 건강상태 고려"),
-            ("human",
-             "오늘 총 섭취 칼로리: {daily_calories}kcal\n"
-             "식사별 상세 내역: {meal_breakdown}\n\n"
-             "위 데이터를 분석하여 다음 JSON 형식으로 평가해주세요:\n"
-             "{{\n"
-             "  \"intake_status\": \"매우부족/부족/적정/과다/매우과다\",\n"
-             "  \"target_burn_calories\": 권장소모칼로리,\n"
-             "  \"analysis_reason\": \"상세한 분석 이유\",\n"
-             "  \"health_advice\": \"건강 관리 조언\",\n"
-             "  \"exercise_intensity\": \"가벼움/보통/적극적\",\n"
-             "  \"recommended_duration\": 권장운동시간분\n"
-             "}}")
-        ])
+        analysis_prompt = prompt_registry.get("exercise_recommendation", "analyze_calorie_intake")
         
-        chain = analysis_prompt | llm
-        result = chain.invoke({
+        result = llm_call_policy.invoke("analyze_calorie_intake", analysis_prompt, get_llm(), {
             "daily_calories": daily_calories,
             "meal_breakdown": str(meal_breakdown)
         })
@@ -72,42 +140,9 @@ def analyze_calorie_intake_node(state: ExerciseRecommendationState) -> Dict[str,
             return {"calorie_analysis": analysis_json}
         except json.JSONDecodeError:
             logger.warning("칼로리 분석 JSON 파싱 실패, 기본값 사용")
+            record_llm_fallback("analyze_calorie_intake")
             # 기본 분석 로직
-            if daily_calories == 0:
-                intake_status = "매우부족"
-                target_burn = 0
-                intensity = "가벼움"
-                duration = 10
-            elif daily_calories <= 800:
-                intake_status = "매우부족" 
-                target_burn = 30
-                intensity = "가벼움"
-                duration = 15
-            elif daily_calories <= 1500:
-                intake_status = "부족"
-                target_burn = 50
-                intensity = "보통"
-                duration = 20
-            elif daily_calories <= 2000:
-                intake_status = "적정"
-                target_burn = 100
-                intensity = "보통"
-                duration = 25
-            else:
-                intake_status = "과다"
-                target_burn = 150 + (daily_calories - 2000) * 0.3
-                intensity = "적극적"
-                duration = 30
-                
-            analysis_json = {
-                "intake_status": intake_status,
-                "target_burn_calories": target_burn,
-                "analysis_reason": f"{daily_calories}kcal 섭취로 {intake_status} 상태",
-                "health_advice": "균형잡힌 식단과 적절한 운동을 권장합니다",
-                "exercise_intensity": intensity,
-                "recommended_duration": duration
-            }
-            return {"calorie_analysis": analysis_json}
+            return {"calorie_analysis": _rule_based_calorie_analysis(daily_calories)}
             
     except Exception as e:
         logger.error(f"칼로리 분석 실패: {str(e)}")
@@ -122,44 +157,16 @@ def select_exercises_node(state: ExerciseRecommendationState) -> Dict[str, Any]:
         exercises = state["available_exercises"]
         daily_calories = state["user_calorie_data"].get("daily_calories", 0)
         
-        selection_prompt = ChatPromptTemplate.from_messages([
-            ("system",
-             "당신은 전문 피트니스 트레이너입니다. 사용자의 칼로리 분석 결과를 바탕으로 "
-             "가장 적합한 운동을 선택하여 추천하세요."
-             "\n\n선택 기준:"
-             "\n- 칼로리 소모 목표 달성"
-             "\n- 운동 강도와 사용자 상태 적합성"
-             "\n- 실현 가능한 운동 시간과 난이도"
-             "\n- 다양한 운동 부위 고려"),
-            ("human",
-             "칼로리 분석 결과:\n{analysis}\n\n"
-             "이용 가능한 운동 목록:\n{exercises}\n\n"
-             "위 분석과 운동 목록을 바탕으로 최적의 운동 조합을 다음 JSON 형식으로 추천해주세요.\n"
-             "운동 데이터 구조: id, category(MOVING/STRETCH/ETC), duration(분), title, description, method\n\n"
-             "{{\n"
-             "  \"selected_exercises\": [\n"
-             "    {{\n"
-             "      \"id\": 운동ID,\n"
-             "      \"title\": \"운동제목\",\n"
-             "      \"category\": \"MOVING/STRETCH/ETC\",\n"
-             "      \"recommended_duration\": 추천시간분,\n"
-             "      \"description\": \"운동설명\",\n"
-             "      \"method\": \"실행방법\",\n"
-             "      \"expected_calories\": 예상소모칼로리,\n"
-             "      \"selection_reason\": \"선택이유\"\n"
-             "    }}\n"
-             "  ],\n"
-             "  \"total_expected_burn\": 총예상소모칼로리,\n"
-             "  \"total_duration\": 총운동시간분,\n"
-             "  \"workout_balance\": \"운동균형평가\",\n"
-             "  \"difficulty_level\": \"초급/중급/고급\"\n"
-             "}}")
-        ])
+        selection_prompt = prompt_registry.get("exercise_recommendation", "select_exercises")
         
-        chain = selection_prompt | llm
-        result = chain.invoke({
+        # 운동 목록이 예산을 넘으면 목록 뒤쪽부터 줄임 (섹션 하나짜리 컨텍스트)
+        exercise_context = token_budget.fit_context(
+            "select_exercises", selection_prompt, {"analysis": str(analysis)}, "exercises",
+            {"exercises": exercises}, ["exercises"]
+        ).get("exercises", [])
+        result = llm_call_policy.invoke("select_exercises", selection_prompt, get_llm(), {
             "analysis": str(analysis),
-            "exercises": str(exercises)
+            "exercises": str(exercise_context)
         })
         
         # JSON 파싱
@@ -169,6 +176,7 @@ def select_exercises_node(state: ExerciseRecommendationState) -> Dict[str, Any]:
             return {"exercise_selection": selection_json}
         except json.JSONDecodeError:
             logger.warning("운동 선택 JSON 파싱 실패, 기본 선택 사용")
+            record_llm_fallback("select_exercises")
             # 기본 운동 선택 로직
             return {"exercise_selection": _fallback_exercise_selection(analysis, exercises, daily_calories)}
             
@@ -185,27 +193,9 @@ def generate_final_recommendation_node(state: ExerciseRecommendationState) -> Di
         analysis = state["calorie_analysis"]
         selection = state["exercise_selection"]
         
-        recommendation_prompt = ChatPromptTemplate.from_messages([
-            ("system",
-             "당신은 친근한 피트니스 코치입니다. 사용자에게 따뜻하고 격려하는 톤으로 "
-             "운동 추천 메시지를 작성하세요."
-             "\n\n메시지 스타일:"
-             "\n- 친근하고 격려하는 톤"
-             "\n- 구체적인 칼로리 수치 포함"
-             "\n- 실행 가능한 동기부여"
-             "\n- 간결하지만 따뜻한 표현"),
-            ("human",
-             "사용자 칼로리 섭취: {daily_calories}kcal\n"
-             "분석 결과: {analysis}\n"
-             "선택된 운동: {selection}\n\n"
-             "위 정보를 바탕으로 다음 형식으로만 메시지를 작성해주세요.\n"
-             "정확한 형식: \"오늘은 XXXkcal 섭취하셨네요! 이 운동을 통해 XXkcal만큼 운동해 보아요!\"\n"
-             "섭취 칼로리가 0인 경우에도: \"오늘은 0kcal 섭취하셨네요! 이 운동을 통해 XXkcal만큼 운동해 보아요!\"\n"
-             "반드시 이 형식만 사용하고 다른 문구는 추가하지 마세요.")
-        ])
+        recommendation_prompt = prompt_registry.get("exercise_recommendation", "generate_final_recommendation")
         
-        chain = recommendation_prompt | llm
-        result = chain.invoke({
+        result = llm_call_policy.invoke("generate_final_recommendation", recommendation_prompt, get_llm(), {
             "daily_calories": daily_calories,
             "analysis": str(analysis),
             "selection": str(selection)
@@ -227,6 +217,58 @@ def generate_final_recommendation_node(state: ExerciseRecommendationState) -> Di
         logger.error(f"최종 추천 생성 실패: {str(e)}")
         return {"error_message": f"최종 추천 생성 오류: {str(e)}"}
 
+def _rule_based_calorie_analysis(daily_calories: float) -> Dict[str, Any]:
+    """칼로리 구간별 규칙 기반 섭취 분석 (LLM 분석 대체)"""
+    if daily_calories == 0:
+        intake_status = "매우부족"
+        target_burn = 0
+        intensity = "가벼움"
+        duration = 10
+    elif daily_calories <= 800:
+        intake_status = "매우부족" 
+        target_burn = 30
+        intensity = "가벼움"
+        duration = 15
+    elif daily_calories <= 1500:
+        intake_status = "부족"
+        target_burn = 50
+        intensity = "보통"
+        duration = 20
+    elif daily_calories <= 2000:
+        intake_status = "적정"
+        target_burn = 100
+        intensity = "보통"
+        duration = 25
+    else:
+        intake_status = "과다"
+        target_burn = 150 + (daily_calories - 2000) * 0.3
+        intensity = "적극적"
+        duration = 30
+        
+    return {
+        "intake_status": intake_status,
+        "target_burn_calories": target_burn,
+        "analysis_reason": f"{daily_calories}kcal 섭취로 {intake_status} 상태",
+        "health_advice": "균형잡힌 식단과 적절한 운동을 권장합니다",
+        "exercise_intensity": intensity,
+        "recommended_duration": duration
+    }
+
+def build_rule_based_recommendation(daily_calories: float, exercises: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    LLM 호출 없이 만드는 운동 추천 (브라운아웃 시 사용)
+    
+    칼로리 구간 규칙 → 기본 운동 선택 로직 → 고정 형식 메시지 순으로
+    그래프의 최종 추천과 같은 구조를 반환합니다.
+    """
+    analysis = _rule_based_calorie_analysis(daily_calories)
+    selection = _fallback_exercise_selection(analysis, exercises, daily_calories)
+    total_burn = int(selection.get("total_expected_burn", 0))
+    return {
+        "message": f"오늘은 {int(daily_calories)}kcal 섭취하셨네요! 이 운동을 통해 {total_burn}kcal만큼 운동해 보아요!",
+        "recommended_exercises": selection.get("selected_exercises", [])
+    }
+
 def _fallback_exercise_selection(analysis: Dict[str, Any], exercises: List[Dict[str, Any]], daily_calories: float) -> Dict[str, Any]:
     """AI 파싱 실패시 사용할 기본 운동 선택 로직"""
     try:
@@ -375,9 +417,9 @@ def create_exercise_recommendation_graph():
     workflow = StateGraph(ExerciseRecommendationState)
     
     # 노드 추가
-    workflow.add_node("analyze_calorie_intake", analyze_calorie_intake_node)
-    workflow.add_node("select_exercises", select_exercises_node)
-    workflow.add_node("generate_final_recommendation", generate_final_recommendation_node)
+    workflow.add_node("analyze_calorie_intake", instrument_node("exercise_recommendation", "analyze_calorie_intake", analyze_calorie_intake_node))
+    workflow.add_node("select_exercises", instrument_node("exercise_recommendation", "select_exercises", select_exercises_node))
+    workflow.add_node("generate_final_recommendation", instrument_node("exercise_recommendation", "generate_final_recommendation", generate_final_recommendation_node))
     
     # 엣지 설정
     workflow.set_entry_point("analyze_calorie_intake")
@@ -387,5 +429,14 @@ def create_exercise_recommendation_graph():
     
     return workflow.compile()
 
-# 전역 그래프 인스턴스
-exercise_recommendation_graph = create_exercise_recommendation_graph()
\ No newline at end of file
+# 전역 그래프 인스턴스 (첫 사용 시 컴파일)
+@lru_cache(maxsize=1)
+def get_exercise_recommendation_graph():
+    """컴파일된 운동 추천 그래프 반환"""
+    return create_exercise_recommendation_graph()
+
+def __getattr__(name: str):
+    # 기존 `exercise_recommendation_graph` 임포트 호환
+    if name == "exercise_recommendation_graph":
+        return get_exercise_recommendation_graph()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,42 @@
+from fastapi import APIRouter, Header, HTTPException, status
+from pydantic import BaseModel, ConfigDict, Field
+from typing import Optional
+import logging
+
+from ai_exercise_service.src.ai.exercise.service.recommendation_refresh_service import recommendation_refresh_service
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/internal/events", tags=["Internal Events"], include_in_schema=False)
+
+
+class EaterRecordEvent(BaseModel):
+    """Spring 식사 기록 변경 이벤트"""
+    model_config = ConfigDict(populate_by_name=True, coerce_numbers_to_str=True)
+
+    # Spring API 경로에 들어가므로 ID 형식만 허용
+    user_id: str = Field(alias="userId", pattern=r"^[A-Za-z0-9_-]{1,64}$")
+    date: Optional[str] = Field(None, pattern=r"^\d{4}-\d{2}-\d{2}$")  # YYYY-MM-DD, 없으면 오늘
+
+
+@router.post("/eater-record", status_code=status.HTTP_202_ACCEPTED)
+async def eater_record_changed(
+    event: EaterRecordEvent,
+    x_internal_token: Optional[str] = Header(None)
+):
+    """
+    식사 기록 변경 알림 (Spring -> AI 서버)
+
+    사용자별로 묶어서 오늘의 운동 추천을 백그라운드에서 다시 계산합니다.
+    """
+    outcome = await recommendation_refresh_service.handle_eater_record_changed(
+        event.user_id, event.date, x_internal_token
+    )
+    if outcome == "rejected":
+        logger.warning(f"인증되지 않은 식사 기록 변경 이벤트 거부: 사용자 {event.user_id}")
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="내부 이벤트 인증 실패"
+        )
+    logger.info(f"식사 기록 변경 이벤트 수신: 사용자 {event.user_id} ({outcome})")
+    return {"accepted": True, "outcome": outcome}
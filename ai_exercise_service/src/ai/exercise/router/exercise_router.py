@@ -1,11 +1,10 @@
-from fastapi import APIRouter, Depends, HTTPException
-from typing import List, Dict, Any
-import sys
-import os
-sys.path.append(os.path.join(os.path.dirname(__file__), '../../../..'))
-
+from fastapi import APIRouter, Depends, Header, HTTPException, Response
+from typing import List, Dict, Any, Optional
 from ai_exercise_service.src.util.services.auth_service import auth_service
 from ai_exercise_service.src.ai.exercise.service.exercise_recommendation_service import exercise_recommendation_service
+from ai_exercise_service.src.util.cache.result_store import etag_for, etag_matches
+from ai_exercise_service.src.util.serialization.json_codec import FastJSONResponse
+from ai_exercise_service.src.util.services.admission import AdmissionRejected
 import logging
 
 logger = logging.getLogger(__name__)
@@ -13,14 +12,7 @@ logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api/exercises", tags=["Exercises"])
 
 
-@router.post("/recommend")
-async def recommend_exercises_auto(
-    user_id: str = Depends(auth_service.get_user_id_from_token),
-    token: str = Depends(auth_service.verify_token)
-):
-    """
-    사용자의 오늘 칼로리 섭취량을 자동으로 가져와서 운동 추천 (권장)
-    """
+async def _recommend_auto(user_id: str, token: str) -> Dict[str, Any]:
     try:
         logger.info(f"자동 운동 추천 요청: 사용자 {user_id}")
         
@@ -37,9 +29,44 @@ async def recommend_exercises_auto(
                 detail=result["error"]
             )
             
+    except AdmissionRejected:
+        # 수용 제어 미들웨어가 Retry-After와 함께 503으로 응답
+        raise
     except Exception as e:
         logger.error(f"자동 운동 추천 실패: {str(e)}")
         raise HTTPException(
             status_code=500,
             detail=f"자동 운동 추천 중 오류가 발생했습니다: {str(e)}"
         )
+
+
+@router.post("/recommend")
+async def recommend_exercises_auto(
+    user_id: str = Depends(auth_service.get_user_id_from_token),
+    token: str = Depends(auth_service.verify_token)
+):
+    """
+    사용자의 오늘 칼로리 섭취량을 자동으로 가져와서 운동 추천 (권장)
+    """
+    result = await _recommend_auto(user_id, token)
+    return FastJSONResponse(result, headers={"ETag": etag_for(result)})
+
+
+@router.get("/recommend")
+async def get_exercise_recommendation(
+    user_id: str = Depends(auth_service.get_user_id_from_token),
+    token: str = Depends(auth_service.verify_token),
+    if_none_match: Optional[str] = Header(None)
+):
+    """
+    오늘의 운동 추천 조회 (조건부 요청 지원)
+    
+    같은 날 칼로리 섭취량과 운동 목록이 그대로면 저장된 추천을 돌려주고,
+    If-None-Match가 ETag와 같으면 본문 없이 304를 응답합니다.
+    """
+    result = await _recommend_auto(user_id, token)
+    etag = etag_for(result)
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+    return FastJSONResponse(result, headers=headers)
@@ -1,26 +1,31 @@
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 import asyncio
-import sys
-import os
-sys.path.append(os.path.join(os.path.dirname(__file__), '../../..'))
 
 import logging
 
 logger = logging.getLogger(__name__)
-from ai_exercise_service.src.ai.exercise.graph.exercise_analysis_graph import exercise_analysis_graph, ExerciseAnalysisState
+from ai_exercise_service.config.settings import settings
+from ai_exercise_service.src.ai.exercise.service.exercise_recommendation_service import exercise_recommendation_service
+from ai_exercise_service.src.util.graph.checkpoint import graph_checkpointer
+from ai_exercise_service.src.util.monitoring.tracing import traced
 
 class ExerciseAnalysisService:
     """운동 분석 서비스"""
     
-    def __init__(self):
-        self.graph = exercise_analysis_graph
+    @property
+    def graph(self):
+        """운동 분석 그래프 (첫 사용 시 컴파일)"""
+        from ai_exercise_service.src.ai.exercise.graph.exercise_analysis_graph import get_exercise_analysis_graph
+        return get_exercise_analysis_graph()
     
-    async def analyze_user_fitness(self, user_data: Dict[str, Any]) -> Dict[str, Any]:
+    @traced("exercise_analysis.analyze_user_fitness")
+    async def analyze_user_fitness(self, user_data: Dict[str, Any], token: Optional[str] = None) -> Dict[str, Any]:
         """
         사용자 체력 분석 및 개인 맞춤 운동 계획 생성
         
         Args:
             user_data: 사용자 기본 정보
+            token: 운동 목록 조회용 인증 토큰 (없으면 서비스 토큰)
             
         Returns:
             종합 운동 분석 결과
@@ -28,19 +33,32 @@ class ExerciseAnalysisService:
         try:
             logger.info(f"사용자 체력 분석 시작: {user_data.get('user_id', 'unknown')}")
             
+            # 운동 계획은 운동 추천과 같은 운동 목록(공유 캐시 → Spring, 실패 시 기본 목록)에서 선택
+            exercises = await exercise_recommendation_service._get_exercises_from_spring(
+                token or settings.internal_service_token
+            )
+            
             # 초기 상태 생성
-            initial_state = ExerciseAnalysisState()
-            initial_state.user_data = user_data
+            initial_state = {
+                "user_data": user_data,
+                "exercise_catalog": exercises,
+                "exercise_recommendations": {},
+                "analysis_result": {},
+                "error_message": ""
+            }
             
-            # 그래프 실행
-            result = await asyncio.to_thread(self.graph.invoke, initial_state)
+            # 그래프 실행 (같은 입력의 재시도는 마지막 성공 노드부터 재개,
+            # 운동 목록이 바뀌면 이전 목록이 담긴 체크포인트를 재개하지 않도록 목록 버전도 키에 포함)
+            catalog_version = exercise_recommendation_service._catalog_version(exercises)
+            config = graph_checkpointer.thread_config("exercise_analysis", user_data, catalog_version)
+            result = await asyncio.to_thread(graph_checkpointer.run, self.graph, initial_state, config)
             
             # 에러 체크
-            if result.error_message:
-                logger.error(f"운동 분석 중 오류: {result.error_message}")
+            if result["error_message"]:
+                logger.error(f"운동 분석 중 오류: {result['error_message']}")
                 return {
                     "success": False,
-                    "error": result.error_message,
+                    "error": result["error_message"],
                     "analysis_result": {}
                 }
             
@@ -48,7 +66,7 @@ class ExerciseAnalysisService:
             return {
                 "success": True,
                 "error": "",
-                "analysis_result": result.analysis_result
+                "analysis_result": result["analysis_result"]
             }
             
         except Exception as e:
@@ -1,20 +1,37 @@
 import asyncio
 import httpx
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Tuple
 import logging
 from datetime import datetime
 import os
-import sys
-sys.path.append(os.path.join(os.path.dirname(__file__), '../../..'))
 
-# .env 파일 로드
-from dotenv import load_dotenv
-load_dotenv(os.path.join(os.path.dirname(__file__), '../../../..', '.env'))
+from ai_exercise_service.config.settings import settings
+from ai_exercise_service.src.util.cache.shared_cache import shared_cache
+from ai_exercise_service.src.util.cache.result_store import fingerprint, recommendation_store
+from ai_exercise_service.src.util.serialization.json_codec import response_json
+from ai_exercise_service.src.util.services.spring_client import create_spring_client
+from ai_exercise_service.src.util.services.deadline import DeadlineExceeded, run_within_deadline
+from ai_exercise_service.src.util.services.admission import AdmissionRejected, admission_controller
+from ai_exercise_service.src.util.llm.brownout import brownout_controller
+from ai_exercise_service.src.util.monitoring.tracing import traced
+from ai_exercise_service.src.util.monitoring.metrics import record_llm_fallback
 
 logger = logging.getLogger(__name__)
 
-# LangGraph 임포트
-from ai.exercise.graph.exercise_recommendation_graph import exercise_recommendation_graph, ExerciseRecommendationState
+# 칼로리 조회 실패 시 기본값 (평균 성인 하루 권장 칼로리)
+DEFAULT_DAILY_CALORIES = 2000.0
+
+# 운동 목록 조회 실패 시 기본 운동 목록
+DEFAULT_EXERCISES = [
+    {"id": 1, "name": "걷기", "category": "유산소", "calories_per_minute": 5, "difficulty": "초급"},
+    {"id": 2, "name": "조깅", "category": "유산소", "calories_per_minute": 10, "difficulty": "중급"},
+    {"id": 3, "name": "런닝", "category": "유산소", "calories_per_minute": 15, "difficulty": "고급"},
+    {"id": 4, "name": "푸시업", "category": "근력", "calories_per_minute": 8, "difficulty": "중급"},
+    {"id": 5, "name": "스쿼트", "category": "근력", "calories_per_minute": 6, "difficulty": "초급"},
+    {"id": 6, "name": "플랭크", "category": "코어", "calories_per_minute": 4, "difficulty": "중급"},
+    {"id": 7, "name": "버피", "category": "전신", "calories_per_minute": 12, "difficulty": "고급"},
+    {"id": 8, "name": "자전거", "category": "유산소", "calories_per_minute": 8, "difficulty": "중급"}
+]
 
 class ExerciseRecommendationService:
     """사용자 칼로리 기반 운동 추천 서비스 - LangGraph 기반"""
@@ -22,8 +39,14 @@ class ExerciseRecommendationService:
     def __init__(self):
         self.spring_url = os.getenv("SPRING_SERVER_URL", "http://localhost:8080")
         self.timeout = float(os.getenv("SPRING_API_TIMEOUT", 30.0))
-        self.graph = exercise_recommendation_graph
     
+    @property
+    def graph(self):
+        """운동 추천 그래프 (첫 사용 시 컴파일)"""
+        from ai_exercise_service.src.ai.exercise.graph.exercise_recommendation_graph import get_exercise_recommendation_graph
+        return get_exercise_recommendation_graph()
+    
+    @traced("exercise_recommendation.recommend_auto")
     async def recommend_exercises_auto(self, user_id: str, token: str) -> Dict[str, Any]:
         """
         사용자의 오늘 칼로리 섭취량을 자동으로 가져와서 운동 추천
@@ -39,23 +62,41 @@ class ExerciseRecommendationService:
             logger.info(f"자동 운동 추천 시작: 사용자 {user_id}")
             
             # 1. 오늘 칼로리 섭취량 가져오기
-            daily_calories = await self._get_today_calories(user_id, token)
+            daily_calories, calories_fallback = await self._get_today_calories(user_id, token)
             
             # 2. Spring에서 운동 목록 가져오기
-            exercises = await self._get_exercises_from_spring(token)
+            exercises, exercises_fallback = await self._fetch_exercises(token)
             
-            # 3. LangGraph를 통한 AI 기반 운동 추천
-            recommendation = await self._ai_recommend_exercises(daily_calories, exercises, user_id)
+            # 3. 같은 날 같은 칼로리/운동 목록으로 만든 추천이 있으면 LLM 호출 없이 재사용
+            store_key = self._store_key(user_id)
+            input_fingerprint = fingerprint(daily_calories, self._catalog_version(exercises))
+            if settings.recommendation_store_enabled:
+                stored = await recommendation_store.get(store_key, input_fingerprint)
+                if stored is not None:
+                    logger.info(f"저장된 운동 추천 사용: 사용자 {user_id}, 칼로리 {daily_calories}")
+                    return stored
             
-            logger.info(f"자동 운동 추천 완료: 사용자 {user_id}, 칼로리 {daily_calories}")
-            return {
+            # 4. LangGraph를 통한 AI 기반 운동 추천
+            recommendation, degraded_mode = await self._ai_recommend_exercises(daily_calories, exercises, user_id)
+            
+            result = {
                 "success": True,
                 "user_id": user_id,
                 "daily_calories": daily_calories,
                 "data_source": "auto_fetched",
-                "recommendation": recommendation
+                "recommendation": recommendation,
+                "degraded_mode": degraded_mode
             }
+            # 대체 경로 결과나 기본값 입력으로 만든 결과는 저장하지 않아 다음 요청에서 정상 추천을 다시 시도
+            storable = degraded_mode is None and not calories_fallback and not exercises_fallback
+            if settings.recommendation_store_enabled and storable:
+                await recommendation_store.put(store_key, input_fingerprint, result)
+            
+            logger.info(f"자동 운동 추천 완료: 사용자 {user_id}, 칼로리 {daily_calories}")
+            return result
             
+        except AdmissionRejected:
+            raise
         except Exception as e:
             logger.error(f"자동 운동 추천 실패: {str(e)}")
             return {
@@ -64,6 +105,7 @@ class ExerciseRecommendationService:
                 "recommendation": {}
             }
 
+    @traced("exercise_recommendation.recommend_by_calories")
     async def recommend_exercises_by_calories(self, user_id: str, token: str, daily_calories: float) -> Dict[str, Any]:
         """
         사용자가 오늘 먹은 칼로리를 기반으로 운동 추천
@@ -83,16 +125,19 @@ class ExerciseRecommendationService:
             exercises = await self._get_exercises_from_spring(token)
             
             # 2. LangGraph를 통한 AI 기반 운동 추천
-            recommendation = await self._ai_recommend_exercises(daily_calories, exercises, user_id)
+            recommendation, degraded_mode = await self._ai_recommend_exercises(daily_calories, exercises, user_id)
             
             logger.info(f"운동 추천 완료: 사용자 {user_id}")
             return {
                 "success": True,
                 "user_id": user_id,
                 "daily_calories": daily_calories,
-                "recommendation": recommendation
+                "recommendation": recommendation,
+                "degraded_mode": degraded_mode
             }
             
+        except AdmissionRejected:
+            raise
         except Exception as e:
             logger.error(f"운동 추천 실패: {str(e)}")
             return {
@@ -101,20 +146,40 @@ class ExerciseRecommendationService:
                 "recommendation": {}
             }
     
-    async def _get_today_calories(self, user_id: str, token: str) -> float:
-        """Spring API에서 사용자의 오늘 칼로리 섭취량 조회"""
+    @staticmethod
+    def _store_key(user_id: str, date: Optional[str] = None) -> str:
+        """추천 결과 저장 키 (사용자, 날짜)"""
+        return f"{user_id}:{date or datetime.now().strftime('%Y-%m-%d')}"
+    
+    @staticmethod
+    def _catalog_version(exercises: List[Dict[str, Any]]) -> str:
+        """운동 목록 버전 (목록이 바뀌면 저장된 추천을 쓰지 않도록 내용 해시 사용)"""
+        return fingerprint(exercises)[:12]
+    
+    async def invalidate_stored_recommendation(self, user_id: str, date: Optional[str] = None) -> None:
+        """저장된 추천 결과 삭제 (식사 기록 변경 시)"""
+        await recommendation_store.invalidate(self._store_key(user_id, date))
+    
+    @traced("exercise_recommendation.get_today_calories")
+    async def _get_today_calories(self, user_id: str, token: str) -> Tuple[float, bool]:
+        """
+        Spring API에서 사용자의 오늘 칼로리 섭취량 조회
+        
+        Returns:
+            (칼로리, 조회 실패로 기본값을 썼는지 여부)
+        """
         try:
             headers = {"Authorization": f"Bearer {token}"}
             today = datetime.now().strftime("%Y-%m-%d")
             
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
+            async with create_spring_client("exercise_recommendation", self.timeout) as client:
                 response = await client.get(
                     f"{self.spring_url}/eater/user/{user_id}/date/{today}",
                     headers=headers
                 )
                 
                 if response.status_code == 200:
-                    api_response = response.json()
+                    api_response = response_json(response)
                     # Spring API 응답 구조 확인: {"data": {...}} 또는 직접 데이터
                     data = api_response.get("data", api_response)
                     
@@ -127,58 +192,81 @@ class ExerciseRecommendationService:
                     
                     if isinstance(calories, (int, float)) and calories > 0:
                         logger.info(f"사용자 {user_id}의 오늘({today}) 칼로리: {calories}kcal")
-                        return float(calories)
+                        return float(calories), False
                     else:
-                        logger.info(f"사용자 {user_id}의 오늘({today}) 식사 기록 없거나 칼로리 0: {data}")
+                        logger.info(f"사용자 {user_id}의 오늘({today}) 식사 기록 없거나 칼로리 0")
+                        # 응답 전체는 DEBUG에서만 문자열로 만듦
+                        logger.debug("칼로리 조회 응답 (사용자 %s): %s", user_id, data)
                         # 식사 기록이 없을 때 0 반환
-                        return 0.0
+                        return 0.0, False
                         
                 elif response.status_code == 404:
                     logger.info(f"사용자 {user_id}의 오늘({today}) 식사 기록 없음")
-                    return 0.0
+                    return 0.0, False
                 else:
                     logger.warning(f"칼로리 조회 실패: {response.status_code}")
-                    return 0.0
+                    return 0.0, True
                     
         except Exception as e:
             logger.error(f"오늘 칼로리 조회 실패: {str(e)}")
             # 기본값 반환 (평균 성인 하루 권장 칼로리)
-            return 2000.0
+            return DEFAULT_DAILY_CALORIES, True
     
     async def _get_exercises_from_spring(self, token: str) -> List[Dict[str, Any]]:
-        """Spring API에서 운동 목록 조회"""
+        """Spring API에서 운동 목록 조회 (실패 시 기본 운동 목록)"""
+        exercises, _ = await self._fetch_exercises(token)
+        return exercises
+    
+    @traced("exercise_recommendation.get_exercises")
+    async def _fetch_exercises(self, token: str) -> Tuple[List[Dict[str, Any]], bool]:
+        """
+        Spring API에서 운동 목록 조회 (사용자와 무관하므로 워커 간 공유 캐시 사용)
+        
+        Returns:
+            (운동 목록, 조회 실패로 기본 목록을 썼는지 여부)
+        """
         try:
+            cached = await shared_cache.aget("catalog", "exercises")
+            if cached is not None:
+                return cached, False
+            
             headers = {"Authorization": f"Bearer {token}"}
             
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
+            async with create_spring_client("exercise_recommendation", self.timeout) as client:
                 response = await client.get(
                     f"{self.spring_url}/exercises",
                     headers=headers
                 )
                 response.raise_for_status()
-                api_response = response.json()
+                api_response = response_json(response)
                 # Spring API 응답 구조: {"data": [...]}
                 exercises = api_response.get("data", [])
                 
                 logger.info(f"Spring에서 운동 {len(exercises)}개 조회 완료")
-                return exercises
+                await shared_cache.aset("catalog", "exercises", exercises, settings.catalog_cache_ttl_seconds)
+                return exercises, False
                 
         except Exception as e:
             logger.error(f"운동 목록 조회 실패: {str(e)}")
             # 기본 운동 목록 반환
-            return [
-                {"id": 1, "name": "걷기", "category": "유산소", "calories_per_minute": 5, "difficulty": "초급"},
-                {"id": 2, "name": "조깅", "category": "유산소", "calories_per_minute": 10, "difficulty": "중급"},
-                {"id": 3, "name": "런닝", "category": "유산소", "calories_per_minute": 15, "difficulty": "고급"},
-                {"id": 4, "name": "푸시업", "category": "근력", "calories_per_minute": 8, "difficulty": "중급"},
-                {"id": 5, "name": "스쿼트", "category": "근력", "calories_per_minute": 6, "difficulty": "초급"},
-                {"id": 6, "name": "플랭크", "category": "코어", "calories_per_minute": 4, "difficulty": "중급"},
-                {"id": 7, "name": "버피", "category": "전신", "calories_per_minute": 12, "difficulty": "고급"},
-                {"id": 8, "name": "자전거", "category": "유산소", "calories_per_minute": 8, "difficulty": "중급"}
-            ]
+            return list(DEFAULT_EXERCISES), True
     
-    async def _ai_recommend_exercises(self, daily_calories: float, exercises: List[Dict[str, Any]], user_id: str) -> Dict[str, Any]:
-        """LangGraph를 사용한 AI 기반 운동 추천"""
+    @traced("exercise_recommendation.run_graph")
+    async def _ai_recommend_exercises(
+        self, daily_calories: float, exercises: List[Dict[str, Any]], user_id: str
+    ) -> Tuple[Dict[str, Any], Optional[str]]:
+        """
+        LangGraph를 사용한 AI 기반 운동 추천
+        
+        Returns:
+            (추천 결과, 대체 경로 사용 시 그 사유 - brownout/deadline/llm_error, 정상이면 None)
+        """
+        if brownout_controller.is_degraded():
+            # LLM 과부하 시 그래프를 건너뛰고 규칙 기반 추천
+            from ai_exercise_service.src.ai.exercise.graph.exercise_recommendation_graph import build_rule_based_recommendation
+            record_llm_fallback("exercise_recommendation", "brownout")
+            return build_rule_based_recommendation(daily_calories, exercises), "brownout"
+        
         try:
             logger.info(f"LangGraph 기반 운동 추천 시작: 사용자 {user_id}, 칼로리 {daily_calories}")
             
@@ -190,7 +278,7 @@ class ExerciseRecommendationService:
             ]
             
             # LangGraph 상태 초기화
-            initial_state: ExerciseRecommendationState = {
+            initial_state = {
                 "request_params": {
                     "user_id": user_id,
                     "analysis_date": datetime.now().strftime("%Y-%m-%d")
@@ -206,25 +294,38 @@ class ExerciseRecommendationService:
                 "error_message": ""
             }
             
-            # LangGraph 실행
-            result = await self.graph.ainvoke(initial_state)
+            # LangGraph 실행 (LLM 수용 제어 자리를 잡은 뒤, 요청 시간 예산을 넘기면 취소하고 기본 추천 사용)
+            async with admission_controller.admit():
+                result = await run_within_deadline(
+                    self.graph.ainvoke(initial_state),
+                    reserve_seconds=settings.deadline_fallback_reserve_seconds
+                )
             
             # 에러 체크
             if result["error_message"]:
                 logger.error(f"LangGraph 실행 중 오류: {result['error_message']}")
+                record_llm_fallback("exercise_recommendation", "graph_error")
                 # 기본 응답 반환
-                return self._create_fallback_recommendation(daily_calories, exercises)
+                return self._create_fallback_recommendation(daily_calories, exercises), "llm_error"
             
             # 최종 추천 결과 반환
             final_recommendation = result["final_recommendation"]
             logger.info(f"LangGraph 운동 추천 완료: 사용자 {user_id}")
             
-            return final_recommendation
+            return final_recommendation, None
             
+        except AdmissionRejected:
+            # 대체 추천 대신 미들웨어가 Retry-After와 함께 503으로 응답
+            raise
+        except DeadlineExceeded as e:
+            logger.warning(f"AI 운동 추천 시간 초과, 기본 추천 사용: {str(e)}")
+            record_llm_fallback("exercise_recommendation", "deadline")
+            return self._create_fallback_recommendation(daily_calories, exercises), "deadline"
         except Exception as e:
             logger.error(f"AI 운동 추천 실패: {str(e)}")
+            record_llm_fallback("exercise_recommendation", "exception")
             # 오류 시 기본 추천 반환
-            return self._create_fallback_recommendation(daily_calories, exercises)
+            return self._create_fallback_recommendation(daily_calories, exercises), "llm_error"
     
     def _create_fallback_recommendation(self, daily_calories: float, exercises: List[Dict[str, Any]]) -> Dict[str, Any]:
         """AI 추천 실패시 사용할 기본 추천"""
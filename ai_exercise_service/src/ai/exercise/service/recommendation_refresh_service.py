@@ -0,0 +1,172 @@
+import asyncio
+import contextvars
+import time
+from typing import Any, Dict, Optional, Set
+import logging
+from datetime import datetime
+
+from ai_exercise_service.config.settings import settings
+from ai_exercise_service.src.ai.exercise.service.exercise_recommendation_service import exercise_recommendation_service
+from ai_exercise_service.src.util.cache.shared_cache import SharedCache, shared_cache
+from ai_exercise_service.src.util.monitoring.metrics import RECOMPUTE_EVENTS, RECOMPUTE_RUNS
+from ai_exercise_service.src.util.services.auth_service import auth_service
+
+logger = logging.getLogger(__name__)
+
+# 사용자별 재계산 예약 상태를 두는 공유 캐시 네임스페이스
+_NAMESPACE = "recompute"
+
+
+class RecommendationRefreshService:
+    """
+    식사 기록 변경 이벤트 기반 운동 추천 백그라운드 재계산
+
+    사용자별로 마지막 이벤트 후 debounce 시간 동안 조용하면 한 번만 재계산하고
+    (이벤트가 계속 와도 첫 이벤트 후 max_delay 안에는 실행), 재계산 중 들어온 이벤트는
+    끝난 뒤 한 번 더 예약합니다. 결과는 추천 결과 저장소에 저장되어
+    사용자 요청은 대부분 미리 계산된 추천을 받습니다.
+
+    예약 상태(pending/running/done)는 워커 간 공유 캐시에 두고 한 트랜잭션에서 바꾸므로,
+    같은 사용자의 이벤트가 여러 워커로 나뉘어 와도 재계산은 한 워커에서 한 번만 실행됩니다.
+    각 워커는 예약 시각에 타이머만 두고, 시각이 되면 상태를 running으로 바꾼 워커만 실행합니다.
+    """
+
+    def __init__(self, cache: SharedCache = shared_cache):
+        self.cache = cache
+        self.debounce_seconds = settings.recompute_debounce_seconds
+        self.max_delay_seconds = settings.recompute_max_delay_seconds
+        # 실행 중 상태가 이보다 오래되면 워커가 종료된 것으로 보고 새로 예약
+        self.lease_seconds = settings.recompute_lease_seconds
+        self._ttl_seconds = self.max_delay_seconds + self.lease_seconds
+        # 사용자 ID -> 이 워커의 예약 타이머
+        self._timers: Dict[str, asyncio.TimerHandle] = {}
+        self._tasks: Set[asyncio.Task] = set()
+        self._semaphore = asyncio.Semaphore(settings.recompute_concurrency)
+
+    async def handle_eater_record_changed(
+        self, user_id: str, date: Optional[str] = None, event_token: Optional[str] = None
+    ) -> str:
+        """
+        식사 기록 변경 이벤트 처리
+
+        서비스 토큰으로 임의 사용자의 추천을 다시 계산하므로 인증된 이벤트만 처리합니다.
+
+        Returns:
+            처리 결과 (scheduled, coalesced, invalidated, ignored, rejected)
+        """
+        today = datetime.now().strftime("%Y-%m-%d")
+        if not auth_service.verify_internal_token(event_token):
+            outcome = "rejected"
+        elif date and date != today:
+            # 오늘 추천만 미리 계산하고 지난 날짜는 저장된 결과만 삭제
+            await exercise_recommendation_service.invalidate_stored_recommendation(user_id, date)
+            outcome = "ignored"
+        elif not settings.recompute_enabled or not settings.internal_service_token:
+            await exercise_recommendation_service.invalidate_stored_recommendation(user_id)
+            outcome = "invalidated"
+        else:
+            outcome = await self.schedule(user_id)
+
+        RECOMPUTE_EVENTS.labels(outcome).inc()
+        return outcome
+
+    async def schedule(self, user_id: str) -> str:
+        """재계산 예약 (이미 예약되어 있으면 예약 시각을 미루고 합침, 실행 중이면 끝난 뒤 한 번 더)"""
+        now = time.time()
+        outcome = "scheduled"
+
+        def apply(record: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+            nonlocal outcome
+            state = (record or {}).get("state")
+            if state == "pending":
+                outcome = "coalesced"
+                return {**record, "due_at": min(now + self.debounce_seconds, record["first_seen"] + self.max_delay_seconds)}
+            if state == "running" and now - record["started_at"] < self.lease_seconds:
+                outcome = "coalesced"
+                return {**record, "dirty": True}
+            outcome = "scheduled"
+            return {"state": "pending", "first_seen": now, "due_at": now + self.debounce_seconds, "dirty": False}
+
+        record = await self.cache.aupdate(_NAMESPACE, user_id, apply, self._ttl_seconds)
+        if record is None:
+            # 공유 캐시 오류 시 다음 사용자 요청에서 새로 계산하도록 무효화만
+            await exercise_recommendation_service.invalidate_stored_recommendation(user_id)
+            return "invalidated"
+        if record["state"] == "pending":
+            self._arm(user_id, record["due_at"])
+        return outcome
+
+    def _arm(self, user_id: str, due_at: float) -> None:
+        """이 워커에 예약 시각 타이머 설정 (이미 있으면 교체)"""
+        handle = self._timers.pop(user_id, None)
+        if handle is not None:
+            handle.cancel()
+        loop = asyncio.get_running_loop()
+        # 이벤트 요청의 deadline/trace 컨텍스트를 물려받지 않도록 빈 컨텍스트에서 실행
+        self._timers[user_id] = loop.call_later(
+            max(0.0, due_at - time.time()), self._start, user_id, context=contextvars.Context()
+        )
+
+    def _start(self, user_id: str) -> None:
+        self._timers.pop(user_id, None)
+        task = asyncio.create_task(self._claim_and_recompute(user_id))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _claim_and_recompute(self, user_id: str) -> None:
+        now = time.time()
+        claimed = False
+
+        def claim(record: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+            nonlocal claimed
+            if not record or record.get("state") != "pending" or record["due_at"] > now:
+                return None
+            claimed = True
+            return {**record, "state": "running", "started_at": now, "dirty": False}
+
+        record = await self.cache.aupdate(_NAMESPACE, user_id, claim, self._ttl_seconds)
+        if not claimed:
+            # 다른 워커로 온 이벤트가 예약을 미뤘으면 새 시각에 다시 확인 (이미 실행 중/완료면 무시)
+            if record is not None and record.get("state") == "pending":
+                self._arm(user_id, record["due_at"])
+            return
+
+        try:
+            await self._recompute(user_id)
+        finally:
+            def finish(record: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+                if record and record.get("dirty"):
+                    # 실행 중 들어온 이벤트는 최신 기록으로 한 번 더 실행
+                    finished_at = time.time()
+                    return {"state": "pending", "first_seen": finished_at, "due_at": finished_at + self.debounce_seconds, "dirty": False}
+                return {"state": "done"}
+
+            record = await self.cache.aupdate(_NAMESPACE, user_id, finish, self._ttl_seconds)
+            if record is not None and record["state"] == "pending":
+                self._arm(user_id, record["due_at"])
+
+    async def _recompute(self, user_id: str) -> None:
+        try:
+            async with self._semaphore:
+                logger.info(f"운동 추천 백그라운드 재계산 시작: 사용자 {user_id}")
+                result = await exercise_recommendation_service.recommend_exercises_auto(
+                    user_id, settings.internal_service_token
+                )
+            status = "success" if result["success"] else "error"
+            RECOMPUTE_RUNS.labels(status).inc()
+            logger.info(f"운동 추천 백그라운드 재계산 완료: 사용자 {user_id} ({status})")
+        except Exception as e:
+            RECOMPUTE_RUNS.labels("error").inc()
+            logger.error(f"운동 추천 백그라운드 재계산 실패: {str(e)}")
+
+    async def shutdown(self) -> None:
+        """이 워커의 예약 타이머 취소 및 실행 중인 재계산 종료 대기 (예약은 다음 이벤트에서 다시 잡힘)"""
+        for handle in self._timers.values():
+            handle.cancel()
+        self._timers.clear()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+
+# 전역 추천 재계산 서비스 인스턴스
+recommendation_refresh_service = RecommendationRefreshService()
@@ -1,19 +1,16 @@
 from typing import Dict, Any, List, TypedDict
 from langgraph.graph import StateGraph, END
-from langchain_openai import ChatOpenAI
-from langchain_core.prompts import ChatPromptTemplate
-from dotenv import load_dotenv
-import sys
-import os
-sys.path.append(os.path.join(os.path.dirname(__file__), '../../../..'))
-
-# .env 파일 로드
-load_dotenv(os.path.join(os.path.dirname(__file__), '../../../..', '.env'))
-
+from functools import lru_cache
 import logging
 
 logger = logging.getLogger(__name__)
+from ai_exercise_service.src.util.llm.client_factory import get_chat_model
+from ai_exercise_service.src.util.llm.call_policy import llm_call_policy
+from ai_exercise_service.src.util.llm.token_budget import token_budget
+from ai_exercise_service.src.util.llm.prompt_registry import prompt_registry
+from ai_exercise_service.src.util.monitoring.metrics import instrument_node, record_llm_fallback
 from ai_exercise_service.src.util.services.meal_data_service import meal_data_service
+from ai_exercise_service.src.util.graph.checkpoint import current_request_token, graph_checkpointer
 
 class MealAnalysisState(TypedDict):
     """급식 분석 상태 관리"""
@@ -24,15 +21,160 @@ class MealAnalysisState(TypedDict):
     final_report: Dict[str, Any]
     error_message: str
 
-# LLM 초기화 - 더 창의적인 응답을 위해 temperature 증가
-llm = ChatOpenAI(model="gpt-4o-mini", temperature=0.7)
+# 토큰 예산 초과 시 먼저 줄일 급식 데이터 섹션 (앞쪽부터)
+PROCESS_DATA_TRIM_PRIORITY = [
+    "user_daily_data",
+    "monthly_menus",
+    "low_participation_analysis",
+    "menu_rankings",
+    "meal_amounts",
+    "meal_participation_rates"
+]
+NUTRITION_TRIM_PRIORITY = ["meal_amount_statistics", "monthly_statistics", "monthly_menus"]
+
+# LLM 초기화 - 더 창의적인 응답을 위해 temperature 증가 (첫 호출 시 생성)
+def get_llm():
+    return get_chat_model(temperature=0.7)
+
+# 급식 원본 데이터를 받는 노드에 붙이는 데이터 구조 설명
+MEAL_DATA_GUIDE = (
+    "\n\n급식 데이터 주요 항목: monthly_menus(날짜별 메뉴), meal_participation_rates(참여율), "
+    "menu_rankings(메뉴 평점 순위), low_participation_analysis(저참여 분석), "
+    "user_daily_data(일별 사용자 데이터), meal_amounts(급식량 평가)"
+    "\n- meal_amounts.data는 개별 평가가 아닌 날짜/식사 유형별 평가 수 목록 "
+    "[{{date, mealType, FEW, SUITABLE, MUCH}}] (date가 null이면 식단 날짜 없는 평가), meal_amounts.statistics는 월간 합계"
+    "(total_evaluations, rating_counts, rating_percentages, meal_type_ratings)"
+)
+
+# 프롬프트 (노드별 고정 지시사항/출력 형식이 앞, 요청 데이터는 마지막)
+prompt_registry.register_graph(
+    "meal_analysis",
+    preamble=(
+        "공통 규칙:"
+        "\n- 모든 응답은 한국어로 작성"
+        "\n- 반드시 제공된 데이터의 수치와 메뉴명만 사용하고 없는 값을 만들어내지 않기"
+    ),
+    tasks={
+        "process_data": {
+            "instructions": (
+                "당신은 데이터 분석 전문 영양사입니다. 급식 데이터를 정확히 분석하여 친근한 말투로 맞춤형 피드백을 작성하세요."
+                "\n\n중요 규칙:"
+                "\n- 반드시 제공된 실제 데이터의 수치와 메뉴명을 정확히 사용할 것"
+                "\n- 일반적인 조언 금지 - 오직 이 데이터에서 나온 구체적 분석만"
+                "\n- 친근한 말투: '~에요', '~예요', '~어요' 사용"
+                "\n- 인사말 금지, 바로 내용으로 시작"
+                "\n\n분석 필수사항:"
+                "\n- 정확한 참여율 수치 언급"
+                "\n- 구체적인 메뉴명과 점수 언급"
+                "\n- 학년별 차이점 구체적 분석"
+                "\n- 특정 날짜의 특이사항 언급"
+                "\n- 급식량 평가 분석 (FEW/SUITABLE/MUCH 비율과 식사별 특성, "
+                "날짜별 평가 수에서 FEW 또는 MUCH가 두드러진 날짜/식사)"
+                "\n- 데이터 기반 개선안 제시"
+                + MEAL_DATA_GUIDE
+            ),
+            "output": (
+                "JSON이 아닌 자연스러운 피드백 텍스트\n"
+                "반드시 포함해야 할 내용:\n"
+                "1. 실제 데이터의 구체적인 수치 (참여율, 칼로리, 인기 메뉴 점수 등)\n"
+                "2. 실제 메뉴명을 언급한 구체적 분석\n"
+                "3. 학년별 참여율 차이에 대한 구체적 언급\n"
+                "4. 날짜별 패턴이나 특이사항\n"
+                "5. 급식량 평가 분석 (FEW/SUITABLE/MUCH 비율, 식사별 급식량 특성, 평가가 치우친 날짜)\n"
+                "6. 데이터 기반의 실질적 개선 제안\n"
+                "매번 다른 관점으로 분석하고, 일반적인 조언 대신 이 데이터에서만 나올 수 있는 "
+                "구체적이고 특별한 인사이트를 제공하세요."
+            ),
+            "data": "급식 데이터:\n{raw_data}"
+        },
+        "analyze_nutrition": {
+            "instructions": (
+                "당신은 영양학 전문가입니다. 급식 메뉴 데이터를 바탕으로 영양 균형과 품질을 분석하세요."
+                "\n\n분석 기준:"
+                "\n- 5대 영양소 균형 (탄수화물, 단백질, 지방, 비타민, 무기질)"
+                "\n- 연령대별 권장 영양소 충족도"
+                "\n- 식품군별 다양성 평가"
+                "\n- 건강한 식습관 형성 기여도"
+                + MEAL_DATA_GUIDE
+            ),
+            "output": (
+                "{{\n"
+                "  \"nutritional_balance\": {{\n"
+                "    \"overall_score\": 전체영양점수1to10,\n"
+                "    \"carbohydrate_ratio\": 탄수화물비율퍼센트,\n"
+                "    \"protein_ratio\": 단백질비율퍼센트,\n"
+                "    \"fat_ratio\": 지방비율퍼센트,\n"
+                "    \"balance_assessment\": \"균형상태평가\"\n"
+                "  }},\n"
+                "  \"calorie_analysis\": {{\n"
+                "    \"estimated_daily_calories\": 일일제공칼로리추정,\n"
+                "    \"age_appropriate\": \"연령대적절성평가\",\n"
+                "    \"portion_size_assessment\": \"분량적절성평가\"\n"
+                "  }},\n"
+                "  \"food_group_diversity\": {{\n"
+                "    \"grain_products\": \"곡물류제공현황\",\n"
+                "    \"vegetables\": \"채소류제공현황\",\n"
+                "    \"proteins\": \"단백질식품제공현황\",\n"
+                "    \"dairy\": \"유제품제공현황\",\n"
+                "    \"fruits\": \"과일류제공현황\",\n"
+                "    \"diversity_score\": 다양성점수1to10\n"
+                "  }},\n"
+                "  \"health_impact\": {{\n"
+                "    \"positive_aspects\": [\"건강에좋은점들\"],\n"
+                "    \"improvement_areas\": [\"개선필요영역들\"],\n"
+                "    \"nutritional_goals\": [\"영양목표달성현황들\"]\n"
+                "  }},\n"
+                "  \"seasonal_considerations\": {{\n"
+                "    \"seasonal_foods\": [\"계절식품활용현황\"],\n"
+                "    \"freshness_indicators\": \"신선도지표평가\"\n"
+                "  }}\n"
+                "}}"
+            ),
+            "data": (
+                "급식 메뉴 및 운영 데이터:\n{meal_data}\n\n"
+                "전처리된 분석 데이터:\n{processed_data}"
+            )
+        },
+        # 여러 달 리뷰 (meal_range_graph): 월별 요약(map) 후 한 번에 종합(reduce)
+        "summarize_month": {
+            "instructions": (
+                "여러 달 급식 리뷰에 쓸 수 있도록 한 달 급식 데이터를 짧게 요약하세요."
+                "\n\n요약 규칙:"
+                "\n- 3문장 이내"
+                "\n- 평균 평점, 참여율, 급식량 평가(FEW/SUITABLE/MUCH) 비율 중 데이터에 있는 수치 포함"
+                "\n- 가장 높은/낮은 평가를 받은 메뉴명 포함"
+                "\n- 인사말, 조언, 개선안 없이 사실만"
+                + MEAL_DATA_GUIDE
+            ),
+            "output": "자연스러운 요약 텍스트 (3문장 이내, JSON 아님)",
+            "data": "{period} 급식 데이터:\n{raw_data}"
+        },
+        "combine_months": {
+            "instructions": (
+                "당신은 학기/연간 급식 리뷰를 작성하는 영양사입니다. 월별 요약과 지표를 비교해 기간 전체를 평가하세요."
+                "\n\n분석 필수사항:"
+                "\n- 평균 평점/급식량 평가의 월별 추세 (개선 또는 악화된 달 명시)"
+                "\n- 반복해서 좋은/나쁜 평가를 받은 메뉴"
+                "\n- 특이했던 달과 그 이유"
+                "\n- 다음 기간을 위한 데이터 기반 개선안"
+                "\n- 친근한 말투: '~에요', '~예요', '~어요' 사용, 인사말 금지"
+                "\n- 월별 요약에 있는 수치와 메뉴명만 사용"
+            ),
+            "output": "JSON이 아닌 자연스러운 리뷰 텍스트",
+            "data": "분석 기간: {period}\n\n월별 요약:\n{monthly_summaries}"
+        }
+    }
+)
 
 async def collect_meal_data_node(state: MealAnalysisState) -> Dict[str, Any]:
-    """급식 데이터 수집 노드"""
+    """급식 데이터 수집 노드 (서비스가 이미 수집한 데이터를 넘겼으면 그대로 사용)"""
+    if state.get("raw_meal_data"):
+        logger.info("전달받은 급식 데이터 사용")
+        return {}
     try:
         logger.info("급식 데이터 수집 시작")
         
-        token = state["request_params"].get("token")
+        token = current_request_token()
         year = state["request_params"].get("year")
         month = state["request_params"].get("month")
         
@@ -51,37 +193,12 @@ def process_meal_data_node(state: MealAnalysisState) -> Dict[str, Any]:
     try:
         logger.info("급식 데이터 전처리 시작")
         
-        processing_prompt = ChatPromptTemplate.from_messages([
-            ("system",
-             "당신은 데이터 분석 전문 영양사입니다. 급식 데이터를 정확히 분석하여 친근한 말투로 맞춤형 피드백을 작성하세요."
-             "\n\n중요 규칙:"
-             "\n- 반드시 제공된 실제 데이터의 수치와 메뉴명을 정확히 사용할 것"
-             "\n- 일반적인 조언 금지 - 오직 이 데이터에서 나온 구체적 분석만"
-             "\n- 친근한 말투: '~에요', '~예요', '~어요' 사용"
-             "\n- 인사말 금지, 바로 내용으로 시작"
-             "\n\n분석 필수사항:"
-             "\n- 정확한 참여율 수치 언급"
-             "\n- 구체적인 메뉴명과 점수 언급"  
-             "\n- 학년별 차이점 구체적 분석"
-             "\n- 특정 날짜의 특이사항 언급"
-             "\n- 급식량 평가 분석 (FEW/SUITABLE/MUCH 비율과 식사별 특성)"
-             "\n- 데이터 기반 개선안 제시"),
-            ("human",
-             "급식 데이터:\n{raw_data}\n\n"
-             "위 급식 데이터를 정확히 분석해서 친근한 말투('~에요', '~예요')로 맞춤형 피드백을 작성해주세요.\n\n"
-             "반드시 포함해야 할 내용:\n"
-             "1. 실제 데이터의 구체적인 수치 (참여율, 칼로리, 인기 메뉴 점수 등)\n"
-             "2. 실제 메뉴명을 언급한 구체적 분석\n"
-             "3. 학년별 참여율 차이에 대한 구체적 언급\n"
-             "4. 날짜별 패턴이나 특이사항\n"
-             "5. 급식량 평가 분석 (FEW/SUITABLE/MUCH 비율, 식사별 급식량 특성)\n"
-             "6. 데이터 기반의 실질적 개선 제안\n\n"
-             "중요: 매번 다른 관점으로 분석하고, 일반적인 조언 대신 이 데이터에서만 나올 수 있는 "
-             "구체적이고 특별한 인사이트를 제공해주세요. 실제 수치와 메뉴명을 정확히 활용하세요.")
-        ])
-        
-        chain = processing_prompt | llm
-        result = chain.invoke({"raw_data": str(state["raw_meal_data"])})
+        processing_prompt = prompt_registry.get("meal_analysis", "process_data")
+        
+        raw_data = token_budget.fit_context(
+            "process_data", processing_prompt, {}, "raw_data", state["raw_meal_data"], PROCESS_DATA_TRIM_PRIORITY
+        )
+        result = llm_call_policy.invoke("process_data", processing_prompt, get_llm(), {"raw_data": str(raw_data)})
         
         # 자연스러운 텍스트 피드백 저장
         feedback_text = result.content.strip()
@@ -102,55 +219,23 @@ def analyze_nutrition_node(state: MealAnalysisState) -> Dict[str, Any]:
     try:
         logger.info("영양 상태 분석 시작")
         
-        nutrition_prompt = ChatPromptTemplate.from_messages([
-            ("system",
-             "당신은 영양학 전문가입니다. 급식 메뉴 데이터를 바탕으로 영양 균형과 품질을 분석하세요."
-             "\n\n분석 기준:"
-             "\n- 5대 영양소 균형 (탄수화물, 단백질, 지방, 비타민, 무기질)"
-             "\n- 연령대별 권장 영양소 충족도"
-             "\n- 식품군별 다양성 평가"
-             "\n- 건강한 식습관 형성 기여도"),
-            ("human",
-             "급식 메뉴 및 운영 데이터:\n{meal_data}\n\n"
-             "전처리된 분석 데이터:\n{processed_data}\n\n"
-             "위 데이터를 바탕으로 영양학적 분석을 다음 JSON 형식으로 제공해주세요:\n"
-             "{{\n"
-             "  \"nutritional_balance\": {{\n"
-             "    \"overall_score\": 전체영양점수1to10,\n"
-             "    \"carbohydrate_ratio\": 탄수화물비율퍼센트,\n"
-             "    \"protein_ratio\": 단백질비율퍼센트,\n"
-             "    \"fat_ratio\": 지방비율퍼센트,\n"
-             "    \"balance_assessment\": \"균형상태평가\"\n"
-             "  }},\n"
-             "  \"calorie_analysis\": {{\n"
-             "    \"estimated_daily_calories\": 일일제공칼로리추정,\n"
-             "    \"age_appropriate\": \"연령대적절성평가\",\n"
-             "    \"portion_size_assessment\": \"분량적절성평가\"\n"
-             "  }},\n"
-             "  \"food_group_diversity\": {{\n"
-             "    \"grain_products\": \"곡물류제공현황\",\n"
-             "    \"vegetables\": \"채소류제공현황\",\n"
-             "    \"proteins\": \"단백질식품제공현황\",\n"
-             "    \"dairy\": \"유제품제공현황\",\n"
-             "    \"fruits\": \"과일류제공현황\",\n"
-             "    \"diversity_score\": 다양성점수1to10\n"
-             "  }},\n"
-             "  \"health_impact\": {{\n"
-             "    \"positive_aspects\": [\"건강에좋은점들\"],\n"
-             "    \"improvement_areas\": [\"개선필요영역들\"],\n"
-             "    \"nutritional_goals\": [\"영양목표달성현황들\"]\n"
-             "  }},\n"
-             "  \"seasonal_considerations\": {{\n"
-             "    \"seasonal_foods\": [\"계절식품활용현황\"],\n"
-             "    \"freshness_indicators\": \"신선도지표평가\"\n"
-             "  }}\n"
-             "}}")
-        ])
-        
-        chain = nutrition_prompt | llm
-        result = chain.invoke({
-            "meal_data": str(state["raw_meal_data"]),
-            "processed_data": str(state["processed_data"])
+        nutrition_prompt = prompt_registry.get("meal_analysis", "analyze_nutrition")
+        
+        # 전처리 노드에 보낸 원본 전체를 다시 보내지 않고 영양 분석에 필요한 섹션만 사용
+        raw_meal_data = state["raw_meal_data"]
+        nutrition_context = {
+            "monthly_menus": raw_meal_data.get("monthly_menus", {}),
+            "monthly_statistics": raw_meal_data.get("monthly_statistics", {}),
+            "meal_amount_statistics": (raw_meal_data.get("meal_amounts") or {}).get("statistics", {})
+        }
+        processed_data = str(state["processed_data"])
+        meal_data = token_budget.fit_context(
+            "analyze_nutrition", nutrition_prompt, {"processed_data": processed_data}, "meal_data",
+            nutrition_context, NUTRITION_TRIM_PRIORITY
+        )
+        result = llm_call_policy.invoke("analyze_nutrition", nutrition_prompt, get_llm(), {
+            "meal_data": str(meal_data),
+            "processed_data": processed_data
         })
         
         # JSON 파싱 (마크다운 제거 후)
@@ -169,6 +254,7 @@ def analyze_nutrition_node(state: MealAnalysisState) -> Dict[str, Any]:
             return {"nutritional_analysis": nutrition_json}
         except json.JSONDecodeError as e:
             logger.warning(f"영양 분석 JSON 파싱 실패: {result.content[:200]}... 오류: {e}")
+            record_llm_fallback("analyze_nutrition")
             nutritional_analysis = {
                 "nutritional_balance": {
                     "overall_score": 7,
@@ -214,10 +300,10 @@ def create_meal_analysis_graph():
     workflow = StateGraph(MealAnalysisState)
     
     # 노드 추가
-    workflow.add_node("collect_meal_data", collect_meal_data_node)
-    workflow.add_node("process_data", process_meal_data_node)
-    workflow.add_node("analyze_nutrition", analyze_nutrition_node)
-    workflow.add_node("generate_recommendations", generate_improvement_recommendations_node)
+    workflow.add_node("collect_meal_data", instrument_node("meal_analysis", "collect_meal_data", collect_meal_data_node))
+    workflow.add_node("process_data", instrument_node("meal_analysis", "process_data", process_meal_data_node))
+    workflow.add_node("analyze_nutrition", instrument_node("meal_analysis", "analyze_nutrition", analyze_nutrition_node))
+    workflow.add_node("generate_recommendations", instrument_node("meal_analysis", "generate_recommendations", generate_improvement_recommendations_node))
     
     # 엣지 설정
     workflow.set_entry_point("collect_meal_data")
@@ -226,7 +312,16 @@ def create_meal_analysis_graph():
     workflow.add_edge("analyze_nutrition", "generate_recommendations")
     workflow.add_edge("generate_recommendations", END)
     
-    return workflow.compile()
+    return workflow.compile(checkpointer=graph_checkpointer.saver)
+
+# 전역 그래프 인스턴스 (첫 사용 시 컴파일)
+@lru_cache(maxsize=1)
+def get_meal_analysis_graph():
+    """컴파일된 급식 분석 그래프 반환"""
+    return create_meal_analysis_graph()
 
-# 전역 그래프 인스턴스
-meal_analysis_graph = create_meal_analysis_graph()
\ No newline at end of file
+def __getattr__(name: str):
+    # 기존 `meal_analysis_graph` 임포트 호환
+    if name == "meal_analysis_graph":
+        return get_meal_analysis_graph()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
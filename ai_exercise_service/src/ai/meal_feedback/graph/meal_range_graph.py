@@ -0,0 +1,207 @@
+import asyncio
+import contextvars
+import operator
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Annotated, Any, Dict, Iterator, List, Optional, Tuple, TypedDict
+from langgraph.graph import StateGraph, START, END
+from langgraph.types import Send
+from functools import lru_cache
+import logging
+
+logger = logging.getLogger(__name__)
+from ai_exercise_service.config.settings import settings
+from ai_exercise_service.src.ai.meal_feedback.graph.meal_analysis_graph import PROCESS_DATA_TRIM_PRIORITY, get_llm
+from ai_exercise_service.src.util.cache.result_store import fingerprint, meal_summary_store
+from ai_exercise_service.src.util.cache.shared_cache import shared_cache
+from ai_exercise_service.src.util.llm.call_policy import llm_call_policy
+from ai_exercise_service.src.util.llm.prompt_registry import prompt_registry
+from ai_exercise_service.src.util.llm.token_budget import token_budget
+from ai_exercise_service.src.util.monitoring.metrics import MEAL_MONTH_SUMMARIES, instrument_node, record_llm_fallback
+from ai_exercise_service.src.util.serialization.json_codec import dumps
+from ai_exercise_service.src.util.services.meal_data_service import meal_data_service
+from ai_exercise_service.src.util.services.meal_data_summary import summarize_raw_meal_data
+from ai_exercise_service.src.util.graph.checkpoint import current_request_token, graph_checkpointer
+
+# 실행 중 완료된 월별 요약 (시간 초과 시 부분 결과용, 서비스가 실행마다 새 목록을 설정)
+_completed_summaries: contextvars.ContextVar[Optional[List[Dict[str, Any]]]] = contextvars.ContextVar(
+    "meal_range_completed_summaries", default=None
+)
+
+@contextmanager
+def collect_month_summaries() -> Iterator[List[Dict[str, Any]]]:
+    """이 블록에서 실행한 그래프의 월별 요약 노드가 끝날 때마다 결과를 모으는 목록"""
+    summaries: List[Dict[str, Any]] = []
+    token = _completed_summaries.set(summaries)
+    try:
+        yield summaries
+    finally:
+        _completed_summaries.reset(token)
+
+def _month_done(summary: Dict[str, Any]) -> Dict[str, Any]:
+    completed = _completed_summaries.get()
+    if completed is not None:
+        completed.append(summary)
+    return {"month_summaries": [summary]}
+
+class MealRangeState(TypedDict):
+    """여러 달 급식 리뷰 상태 관리"""
+    request_params: Dict[str, Any]
+    # 월별 요약 노드가 병렬로 추가 (map 결과)
+    month_summaries: Annotated[List[Dict[str, Any]], operator.add]
+    final_report: Dict[str, Any]
+    error_message: str
+
+class MonthTask(TypedDict):
+    """월별 요약 노드 입력 (Send)"""
+    year: int
+    month: int
+
+def period_label(year: int, month: int) -> str:
+    return f"{year:04d}-{month:02d}"
+
+def fan_out_months(state: MealRangeState) -> List[Send]:
+    """요청 기간의 달마다 요약 노드를 병렬 실행"""
+    return [
+        Send("summarize_month", {"year": year, "month": month})
+        for year, month in state["request_params"]["months"]
+    ]
+
+def _month_metrics(raw_meal_data: Dict[str, Any]) -> Dict[str, Any]:
+    """reduce 단계에서 달끼리 비교할 핵심 지표 (LLM 없이 계산)"""
+    metrics: Dict[str, Any] = {}
+    average_rating = raw_meal_data.get("monthly_rating", {}).get("average_rating")
+    if isinstance(average_rating, (int, float)) and average_rating:
+        metrics["average_rating"] = round(average_rating, 2)
+
+    menus = raw_meal_data.get("menu_rankings", {}).get("data", {}).get("menus", [])
+    if menus:
+        ranked = sorted(menus, key=lambda menu: menu.get("averageRating", 0))
+        metrics["top_menu"] = f"{ranked[-1].get('menuName')}({ranked[-1].get('averageRating', 0)}점)"
+        metrics["lowest_menu"] = f"{ranked[0].get('menuName')}({ranked[0].get('averageRating', 0)}점)"
+
+    percentages = raw_meal_data.get("meal_amounts", {}).get("statistics", {}).get("rating_percentages", {})
+    if percentages:
+        metrics["meal_amount_percentages"] = percentages
+    return metrics
+
+def _summarize_with_llm(period: str, raw_meal_data: Dict[str, Any]) -> str:
+    summary_prompt = prompt_registry.get("meal_analysis", "summarize_month")
+    raw_data = token_budget.fit_context(
+        "summarize_month", summary_prompt, {"period": period}, "raw_data", raw_meal_data, PROCESS_DATA_TRIM_PRIORITY
+    )
+    result = llm_call_policy.invoke("summarize_month", summary_prompt, get_llm(), {
+        "period": period,
+        "raw_data": str(raw_data)
+    })
+    return result.content.strip()
+
+async def _month_meal_data(token: str, year: int, month: int) -> Tuple[Dict[str, Any], List[str]]:
+    """
+    월간 급식 데이터와 조회 실패 항목 목록
+
+    지난달 데이터는 거의 바뀌지 않으므로 정상 수집한 스냅샷을 공유 캐시에 두고
+    재사용합니다 (같은 기간을 다시 요청해도 Spring을 달마다 다시 호출하지 않음).
+    """
+    period = period_label(year, month)
+    now = datetime.now()
+    past_month = (year, month) < (now.year, now.month)
+    if past_month:
+        snapshot = await shared_cache.aget("meal_data_snapshot", period)
+        if snapshot is not None:
+            return snapshot, []
+
+    raw_meal_data, fallback_sources = await meal_data_service.collect_monthly_meal_data(token, year, month)
+    if past_month and not fallback_sources:
+        await shared_cache.aset("meal_data_snapshot", period, raw_meal_data, settings.meal_range_snapshot_ttl_seconds)
+    return raw_meal_data, fallback_sources
+
+async def summarize_month_node(task: MonthTask) -> Dict[str, Any]:
+    """월별 요약 노드 (map) - 데이터가 그대로면 저장된 요약 재사용"""
+    year, month = task["year"], task["month"]
+    period = period_label(year, month)
+    try:
+        raw_meal_data, fallback_sources = await _month_meal_data(current_request_token(), year, month)
+    except Exception as e:
+        logger.error(f"월별 급식 데이터 수집 실패 ({period}): {str(e)}")
+        return _month_done({"period": period, "error": str(e)})
+
+    data_fingerprint = fingerprint(raw_meal_data)
+    cached = await meal_summary_store.get(period, data_fingerprint)
+    if cached is not None:
+        MEAL_MONTH_SUMMARIES.labels("hit").inc()
+        return _month_done(cached)
+
+    MEAL_MONTH_SUMMARIES.labels("miss").inc()
+    summary = {"period": period, "metrics": _month_metrics(raw_meal_data)}
+    try:
+        # LLM 호출은 동기 정책 코드이므로 워커 스레드에서 (노드 컨텍스트/deadline 유지)
+        summary["summary"] = await asyncio.to_thread(_summarize_with_llm, period, raw_meal_data)
+        # 일부 데이터를 빈 값으로 대체한 달의 요약은 저장하지 않음 (정상 데이터 요약이 덮이지 않도록)
+        if not fallback_sources:
+            await meal_summary_store.put(period, data_fingerprint, summary)
+        logger.info(f"월별 급식 요약 생성: {period}")
+    except Exception as e:
+        logger.error(f"월별 급식 요약 실패, 규칙 기반 요약 사용 ({period}): {str(e)}")
+        record_llm_fallback("summarize_month")
+        summary["summary"] = summarize_raw_meal_data(raw_meal_data, year, month) or "요약할 급식 데이터가 없어요."
+    return _month_done(summary)
+
+def combine_months_node(state: MealRangeState) -> Dict[str, Any]:
+    """월별 요약 종합 노드 (reduce) - 압축된 요약만 한 번에 전달"""
+    try:
+        period = state["request_params"]["period"]
+        summaries = sorted(state["month_summaries"], key=lambda summary: summary["period"])
+        available = [summary for summary in summaries if summary.get("summary")]
+        if not available:
+            return {"error_message": "요약할 수 있는 월별 급식 데이터가 없습니다"}
+
+        logger.info(f"여러 달 급식 리뷰 종합 시작: {period} ({len(available)}개월)")
+        monthly_summaries = "\n".join(
+            f"- {summary['period']}: {summary['summary']} 지표: {dumps(summary.get('metrics', {})).decode('utf-8')}"
+            for summary in available
+        )
+        try:
+            review_prompt = prompt_registry.get("meal_analysis", "combine_months")
+            result = llm_call_policy.invoke("combine_months", review_prompt, get_llm(), {
+                "period": period,
+                "monthly_summaries": monthly_summaries
+            })
+            message = result.content.strip()
+        except Exception as e:
+            logger.error(f"여러 달 급식 리뷰 생성 실패, 월별 요약 사용: {str(e)}")
+            record_llm_fallback("combine_months")
+            message = "\n".join(f"{summary['period']}: {summary['summary']}" for summary in available)
+
+        return {"final_report": {
+            "analysis_period": period,
+            "message": message,
+            "monthly_summaries": [
+                {key: summary[key] for key in ("period", "summary", "metrics", "error") if key in summary}
+                for summary in summaries
+            ]
+        }}
+
+    except Exception as e:
+        logger.error(f"여러 달 급식 리뷰 종합 실패: {str(e)}")
+        return {"error_message": f"급식 리뷰 종합 오류: {str(e)}"}
+
+# 그래프 구성
+def create_meal_range_graph():
+    """여러 달 급식 리뷰 LangGraph 생성 (월별 요약 병렬 map → 종합 reduce)"""
+    workflow = StateGraph(MealRangeState)
+
+    workflow.add_node("summarize_month", instrument_node("meal_range", "summarize_month", summarize_month_node))
+    workflow.add_node("combine_months", instrument_node("meal_range", "combine_months", combine_months_node))
+
+    workflow.add_conditional_edges(START, fan_out_months, ["summarize_month"])
+    workflow.add_edge("summarize_month", "combine_months")
+    workflow.add_edge("combine_months", END)
+
+    return workflow.compile(checkpointer=graph_checkpointer.saver)
+
+# 전역 그래프 인스턴스 (첫 사용 시 컴파일)
+@lru_cache(maxsize=1)
+def get_meal_range_graph():
+    """컴파일된 여러 달 급식 리뷰 그래프 반환"""
+    return create_meal_range_graph()
@@ -1,16 +1,57 @@
-from fastapi import APIRouter, Depends, HTTPException
-import sys
-import os
-sys.path.append(os.path.join(os.path.dirname(__file__), '../../../..'))
-
+from fastapi import APIRouter, Depends, HTTPException, Query
 from ai_exercise_service.src.util.services.auth_service import auth_service
-from ai_exercise_service.src.ai.meal_feedback.service.diet_feedback_service import generate_diet_feedback_sync
+from ai_exercise_service.src.ai.meal_feedback.service.diet_feedback_service import (
+    diet_feedback_service,
+    generate_diet_feedback_sync,
+    month_range
+)
+from ai_exercise_service.src.util.services.admission import AdmissionRejected
 import logging
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/meal-feedback", tags=["Meal Feedback"])
 
+MONTH_PATTERN = r"^\d{4}-\d{2}$"
+
+@router.post("/range")
+async def get_range_diet_feedback(
+    start: str = Query(..., pattern=MONTH_PATTERN, description="시작 월 (YYYY-MM)"),
+    end: str = Query(..., pattern=MONTH_PATTERN, description="종료 월 (YYYY-MM, 포함)"),
+    token: str = Depends(auth_service.verify_token)
+):
+    """
+    여러 달(학기/연간) 급식 데이터 기반 AI 리뷰 생성
+    """
+    start_month = tuple(int(part) for part in start.split("-"))
+    end_month = tuple(int(part) for part in end.split("-"))
+    try:
+        month_range(start_month, end_month)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    try:
+        logger.info(f"여러 달 급식 리뷰 요청: {start} ~ {end}")
+        
+        result = await diet_feedback_service.generate_range_feedback(start_month, end_month, token)
+        if result["success"]:
+            return result["feedback_result"]
+        return {
+            "analysis_period": f"{start} ~ {end}",
+            "error": result["error"],
+            "message": "데이터 분석 중 오류가 발생했습니다."
+        }
+        
+    except AdmissionRejected:
+        # 수용 제어 미들웨어가 Retry-After와 함께 503으로 응답
+        raise
+    except Exception as e:
+        logger.error(f"여러 달 급식 리뷰 생성 실패: {str(e)}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"급식 리뷰 생성 중 오류가 발생했습니다: {str(e)}"
+        )
+
 @router.post("/{year}/{month}")
 async def get_diet_feedback(
     year: int,
@@ -29,6 +70,9 @@ async def get_diet_feedback(
         logger.info(f"급식 피드백 생성 완료")
         return feedback
         
+    except AdmissionRejected:
+        # 수용 제어 미들웨어가 Retry-After와 함께 503으로 응답
+        raise
     except Exception as e:
         logger.error(f"급식 피드백 생성 실패: {str(e)}")
         raise HTTPException(
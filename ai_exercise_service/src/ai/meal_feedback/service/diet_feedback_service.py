@@ -1,21 +1,90 @@
 import asyncio
-from typing import Dict, Any
-import sys
-import os
-sys.path.append(os.path.join(os.path.dirname(__file__), '../../..'))
+from typing import Dict, Any, List, Optional, Tuple
 
 import logging
 
 logger = logging.getLogger(__name__)
-from ai.meal_feedback.graph.meal_analysis_graph import meal_analysis_graph, MealAnalysisState
+from ai_exercise_service.config.settings import settings
+from ai_exercise_service.src.ai.meal_feedback.service.feedback_variant_pool import feedback_variant_pool
+from ai_exercise_service.src.util.cache.result_store import fingerprint
+from ai_exercise_service.src.util.graph.checkpoint import graph_checkpointer, request_credentials
+from ai_exercise_service.src.util.monitoring.metrics import MEAL_FEEDBACK_VARIANTS, record_llm_fallback
+from ai_exercise_service.src.util.monitoring.tracing import traced
+from ai_exercise_service.src.util.services.admission import AdmissionRejected, admission_controller
+from ai_exercise_service.src.util.services.deadline import DeadlineExceeded, run_within_deadline
+from ai_exercise_service.src.util.services.meal_data_service import meal_data_service
+from ai_exercise_service.src.util.services.meal_data_summary import summarize_raw_meal_data
 
 class DietFeedbackService:
     """급식 피드백 서비스"""
     
-    def __init__(self):
-        self.graph = meal_analysis_graph
+    @property
+    def graph(self):
+        """급식 분석 그래프 (첫 사용 시 컴파일)"""
+        from ai_exercise_service.src.ai.meal_feedback.graph.meal_analysis_graph import get_meal_analysis_graph
+        return get_meal_analysis_graph()
     
-    async def generate_comprehensive_feedback(self, year: int, month: int, token: str) -> Dict[str, Any]:
+    @property
+    def range_graph(self):
+        """여러 달 급식 리뷰 그래프 (첫 사용 시 컴파일)"""
+        from ai_exercise_service.src.ai.meal_feedback.graph.meal_range_graph import get_meal_range_graph
+        return get_meal_range_graph()
+    
+    @traced("diet_feedback.get")
+    async def get_feedback(self, year: int, month: int, token: str) -> Dict[str, Any]:
+        """
+        변형 풀 기반 급식 피드백 조회
+        
+        급식 데이터(LLM 호출 없음)로 지문을 계산해 풀에 변형이 있으면 그중 하나를 반환하고,
+        없으면(첫 조회 또는 데이터 변경) 이번 요청에서 생성해 풀에 넣습니다.
+        모자란 변형은 백그라운드에서 채웁니다. 수집한 데이터를 그래프에 그대로 넘겨 다시 조회하지 않고,
+        일부 조회가 실패한 데이터로는 풀을 조회하거나 바꾸지 않습니다.
+        """
+        if not settings.meal_feedback_variants_enabled:
+            return await self.generate_comprehensive_feedback(year, month, token)
+        
+        try:
+            raw_meal_data, fallback_sources = await meal_data_service.collect_monthly_meal_data(token, year, month)
+        except Exception as e:
+            logger.error(f"급식 피드백 변형 풀 조회 실패: {str(e)}")
+            return await self.generate_comprehensive_feedback(year, month, token)
+        
+        if fallback_sources:
+            MEAL_FEEDBACK_VARIANTS.labels("skipped").inc()
+            logger.warning(f"급식 데이터 일부 조회 실패로 변형 풀 미사용: {year}년 {month}월")
+            return await self.generate_comprehensive_feedback(year, month, token, raw_meal_data)
+        
+        data_fingerprint = fingerprint(raw_meal_data)
+        
+        async def generate_variant():
+            # 백그라운드 생성은 사용자 요청 밖에서 실행되므로 사용자 토큰 대신 서비스 토큰 사용
+            # (같은 지문의 데이터를 넘기므로 Spring을 다시 호출하지 않음)
+            result = await self.generate_comprehensive_feedback(
+                year, month, settings.internal_service_token, raw_meal_data
+            )
+            return result["feedback_result"] if _poolable(result) else None
+        
+        variant = await feedback_variant_pool.pick(year, month, data_fingerprint, generate_variant)
+        if variant is not None:
+            MEAL_FEEDBACK_VARIANTS.labels("hit").inc()
+            logger.info(f"급식 피드백 변형 풀 사용: {year}년 {month}월")
+            return {"success": True, "error": "", "feedback_result": variant}
+        
+        MEAL_FEEDBACK_VARIANTS.labels("miss").inc()
+        result = await self.generate_comprehensive_feedback(year, month, token, raw_meal_data)
+        if _poolable(result):
+            await feedback_variant_pool.add(year, month, data_fingerprint, result["feedback_result"])
+            feedback_variant_pool.fill(year, month, data_fingerprint, generate_variant)
+        return result
+    
+    @traced("diet_feedback.generate")
+    async def generate_comprehensive_feedback(
+        self,
+        year: int,
+        month: int,
+        token: str,
+        raw_meal_data: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
         """
         LangGraph를 사용한 종합적인 급식 피드백 생성
         
@@ -23,6 +92,7 @@ class DietFeedbackService:
             year: 분석 대상 연도
             month: 분석 대상 월
             token: 인증 토큰
+            raw_meal_data: 이미 수집한 월간 급식 데이터 (있으면 그래프에서 다시 수집하지 않음)
             
         Returns:
             종합 급식 분석 결과
@@ -31,21 +101,35 @@ class DietFeedbackService:
             logger.info(f"종합 급식 분석 시작: {year}년 {month}월")
             
             # 초기 상태 생성
-            initial_state: MealAnalysisState = {
+            initial_state = {
                 "request_params": {
                     "year": year,
-                    "month": month,
-                    "token": token
+                    "month": month
                 },
-                "raw_meal_data": {},
+                "raw_meal_data": raw_meal_data or {},
                 "processed_data": {},
                 "nutritional_analysis": {},
                 "final_report": {},
                 "error_message": ""
             }
             
-            # 그래프 실행 (비동기)
-            result = await self.graph.ainvoke(initial_state)
+            # 그래프 실행 (비동기, 같은 요청의 재시도는 마지막 성공 노드부터 재개)
+            # 급식 데이터는 사용자와 무관하므로 스레드 키는 기간과 전달받은 데이터 지문으로만 만들고,
+            # 토큰은 체크포인트에 남지 않도록 실행 컨텍스트로 전달
+            config = graph_checkpointer.thread_config(
+                "meal_feedback", year, month, fingerprint(raw_meal_data) if raw_meal_data else None
+            )
+            try:
+                with request_credentials(token):
+                    async with admission_controller.admit():
+                        result = await run_within_deadline(
+                            graph_checkpointer.arun(self.graph, initial_state, config),
+                            reserve_seconds=settings.deadline_fallback_reserve_seconds
+                        )
+            except DeadlineExceeded as e:
+                # 남은 단계는 취소하고 마지막 체크포인트까지의 결과로 응답 (재시도 시 이어서 실행)
+                logger.warning(f"급식 분석 시간 초과, 부분 결과 사용: {str(e)}")
+                return await self._partial_feedback(config, year, month)
             
             # 에러 체크
             if result["error_message"]:
@@ -63,6 +147,8 @@ class DietFeedbackService:
                 "feedback_result": result["final_report"]
             }
             
+        except AdmissionRejected:
+            raise
         except Exception as e:
             logger.error(f"급식 피드백 서비스 오류: {str(e)}")
             return {
@@ -71,6 +157,153 @@ class DietFeedbackService:
                 "feedback_result": {}
             }
 
+    @traced("diet_feedback.range")
+    async def generate_range_feedback(
+        self,
+        start: Tuple[int, int],
+        end: Tuple[int, int],
+        token: str
+    ) -> Dict[str, Any]:
+        """
+        여러 달(학기/연간) 급식 리뷰 생성
+        
+        달마다 데이터 수집과 요약(map)을 병렬로 실행하고 압축된 월별 요약만 모아
+        LLM 한 번으로 종합(reduce)하므로 지연시간은 가장 느린 한 달 + 종합 한 번 수준입니다.
+        데이터가 그대로인 달은 저장된 월별 요약을 재사용합니다.
+        
+        Args:
+            start: 시작 (연도, 월)
+            end: 종료 (연도, 월, 포함)
+            token: 인증 토큰
+            
+        Returns:
+            여러 달 급식 리뷰 결과
+        """
+        months = month_range(start, end)
+        period = f"{start[0]}년 {start[1]}월 ~ {end[0]}년 {end[1]}월"
+        try:
+            logger.info(f"여러 달 급식 리뷰 시작: {period} ({len(months)}개월)")
+            
+            initial_state = {
+                "request_params": {
+                    "months": months,
+                    "period": period
+                },
+                "month_summaries": [],
+                "final_report": {},
+                "error_message": ""
+            }
+            
+            from ai_exercise_service.src.ai.meal_feedback.graph.meal_range_graph import collect_month_summaries
+            
+            config = graph_checkpointer.thread_config("meal_feedback_range", months)
+            # 월별 요약은 한 단계(superstep)에서 병렬로 끝나 체크포인트에는 단계가 끝나야 반영되므로
+            # 시간 초과 시 부분 결과는 노드가 완료될 때마다 모은 목록에서 만듦
+            with collect_month_summaries() as completed_summaries, request_credentials(token):
+                try:
+                    async with admission_controller.admit():
+                        result = await run_within_deadline(
+                            graph_checkpointer.arun(self.range_graph, initial_state, config),
+                            reserve_seconds=settings.deadline_fallback_reserve_seconds
+                        )
+                except DeadlineExceeded as e:
+                    logger.warning(f"여러 달 급식 리뷰 시간 초과, 부분 결과 사용: {str(e)}")
+                    return self._partial_range_feedback(completed_summaries, period)
+            
+            if result["error_message"]:
+                logger.error(f"여러 달 급식 리뷰 중 오류: {result['error_message']}")
+                return {
+                    "success": False,
+                    "error": result["error_message"],
+                    "feedback_result": {}
+                }
+            
+            logger.info(f"여러 달 급식 리뷰 완료: {period}")
+            return {
+                "success": True,
+                "error": "",
+                "feedback_result": result["final_report"]
+            }
+            
+        except AdmissionRejected:
+            raise
+        except Exception as e:
+            logger.error(f"여러 달 급식 리뷰 서비스 오류: {str(e)}")
+            return {
+                "success": False,
+                "error": f"분석 중 오류 발생: {str(e)}",
+                "feedback_result": {}
+            }
+    
+    def _partial_range_feedback(self, summaries: List[Dict[str, Any]], period: str) -> Dict[str, Any]:
+        """시간 초과 시 그때까지 끝난 월별 요약으로 만드는 리뷰"""
+        available = sorted(
+            (summary for summary in summaries if summary.get("summary")), key=lambda summary: summary["period"]
+        )
+        if not available:
+            record_llm_fallback("meal_feedback_range", "deadline")
+            return {
+                "success": False,
+                "error": "요청 시간 예산 내에 급식 리뷰를 완료하지 못했습니다",
+                "feedback_result": {}
+            }
+        
+        record_llm_fallback("meal_feedback_range", "deadline_partial")
+        return {"success": True, "error": "", "feedback_result": {
+            "analysis_period": period,
+            "message": "\n".join(f"{summary['period']}: {summary['summary']}" for summary in available),
+            "monthly_summaries": available,
+            "partial": True
+        }}
+
+    async def _partial_feedback(self, config: Dict[str, Any], year: int, month: int) -> Dict[str, Any]:
+        """시간 초과 시 마지막 체크포인트 상태에서 만들 수 있는 최선의 피드백"""
+        values = {}
+        if graph_checkpointer.saver is not None:
+            try:
+                values = (await self.graph.aget_state(config)).values
+            except Exception as e:
+                logger.error(f"체크포인트 상태 조회 실패: {str(e)}")
+        
+        if values.get("final_report"):
+            return {"success": True, "error": "", "feedback_result": values["final_report"]}
+        
+        feedback_message = values.get("processed_data", {}).get("feedback_message")
+        if feedback_message:
+            record_llm_fallback("meal_feedback", "deadline_partial")
+            return {"success": True, "error": "", "feedback_result": {"message": feedback_message, "partial": True}}
+        
+        summary = summarize_raw_meal_data(values.get("raw_meal_data") or {}, year, month)
+        if summary:
+            record_llm_fallback("meal_feedback", "deadline_summary")
+            return {"success": True, "error": "", "feedback_result": {"message": summary, "partial": True}}
+        
+        record_llm_fallback("meal_feedback", "deadline")
+        return {
+            "success": False,
+            "error": "요청 시간 예산 내에 급식 분석을 완료하지 못했습니다",
+            "feedback_result": {}
+        }
+
+
+def _poolable(result: Dict[str, Any]) -> bool:
+    """변형 풀에 넣을 수 있는 결과인지 (실패/시간 초과 부분 결과 제외)"""
+    return result["success"] and bool(result["feedback_result"]) and not result["feedback_result"].get("partial")
+
+
+def month_range(start: Tuple[int, int], end: Tuple[int, int]) -> List[Tuple[int, int]]:
+    """시작~종료 월(포함) 목록 (잘못된 범위나 최대 개월 수 초과 시 ValueError)"""
+    for year, month in (start, end):
+        if not 1 <= month <= 12:
+            raise ValueError(f"잘못된 월: {year}-{month}")
+    first, last = start[0] * 12 + start[1] - 1, end[0] * 12 + end[1] - 1
+    if last < first:
+        raise ValueError("종료 월이 시작 월보다 앞섭니다")
+    if last - first + 1 > settings.meal_feedback_range_max_months:
+        raise ValueError(f"최대 {settings.meal_feedback_range_max_months}개월까지 조회할 수 있습니다")
+    return [(index // 12, index % 12 + 1) for index in range(first, last + 1)]
+
+
 # 전역 서비스 인스턴스
 diet_feedback_service = DietFeedbackService()
 
@@ -79,7 +312,7 @@ async def generate_diet_feedback_sync(year: int, month: int, token: str):
     기존 호환성을 위한 래퍼 함수
     """
     try:
-        result = await diet_feedback_service.generate_comprehensive_feedback(year, month, token)
+        result = await diet_feedback_service.get_feedback(year, month, token)
         
         if result["success"]:
             return result["feedback_result"]
@@ -91,6 +324,8 @@ async def generate_diet_feedback_sync(year: int, month: int, token: str):
                 "message": "데이터 분석 중 오류가 발생했습니다."
             }
             
+    except AdmissionRejected:
+        raise
     except Exception as e:
         logger.error(f"래퍼 함수 오류: {str(e)}")
         return {
@@ -0,0 +1,142 @@
+import asyncio
+import contextvars
+import random
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set
+import logging
+
+from ai_exercise_service.config.settings import settings
+from ai_exercise_service.src.util.cache.result_store import ResultStore, meal_feedback_store
+from ai_exercise_service.src.util.monitoring.metrics import MEAL_FEEDBACK_VARIANT_FILLS
+
+logger = logging.getLogger(__name__)
+
+
+class FeedbackVariantPool:
+    """
+    월간 급식 피드백 변형 풀
+
+    process_data 노드는 매번 다른 관점의 피드백을 만들도록 되어 있어 결과 하나만 캐시하면
+    같은 피드백만 반복됩니다. (연, 월)마다 피드백 N개를 결과 저장소에 모아 두고 조회 시
+    돌아가며(또는 무작위로) 하나를 반환하며, 모자란 변형은 백그라운드에서 채웁니다.
+    급식 데이터가 바뀌면 새 지문으로 첫 변형을 저장할 때 풀이 교체되고 다시 채워집니다.
+    """
+
+    def __init__(self, store: ResultStore = meal_feedback_store):
+        self.store = store
+        self.size = max(1, settings.meal_feedback_variant_count)
+        self.selection = settings.meal_feedback_variant_selection
+        # 순환 위치는 워커별로 관리 (조회마다 공유 저장소에 쓰지 않도록)
+        self._cursors: Dict[str, int] = {}
+        self._filling: Dict[str, asyncio.Task] = {}
+
+    @staticmethod
+    def key(year: int, month: int) -> str:
+        return f"{year:04d}-{month:02d}"
+
+    async def variants(self, year: int, month: int, data_fingerprint: str) -> List[Dict[str, Any]]:
+        pool = await self.store.get(self.key(year, month), data_fingerprint)
+        return (pool or {}).get("variants", [])
+
+    async def pick(
+        self,
+        year: int,
+        month: int,
+        data_fingerprint: str,
+        generate: Optional[Callable[[], Awaitable[Optional[Dict[str, Any]]]]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """풀에서 변형 하나 선택 (풀이 비었거나 데이터가 바뀌었으면 None, 풀이 덜 찼으면 generate로 채움)"""
+        variants = await self.variants(year, month, data_fingerprint)
+        if not variants:
+            return None
+        if generate is not None and len(variants) < self.size:
+            self.fill(year, month, data_fingerprint, generate)
+        if self.selection == "random":
+            return random.choice(variants)
+
+        key = self.key(year, month)
+        cursor = self._cursors.get(key, random.randrange(len(variants)))
+        self._cursors[key] = cursor + 1
+        return variants[cursor % len(variants)]
+
+    async def add(self, year: int, month: int, data_fingerprint: str, feedback: Dict[str, Any]) -> int:
+        """
+        변형 추가 (같은 내용은 한 번만, 풀 크기 초과분은 버림) 후 풀 크기 반환
+
+        여러 워커가 동시에 추가해도 변형이 사라지지 않도록 읽기와 쓰기를 한 트랜잭션에서 처리합니다.
+        """
+        def append(pool: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+            variants = (pool or {}).get("variants", [])
+            if feedback in variants or len(variants) >= self.size:
+                return None
+            return {"variants": variants + [feedback]}
+
+        pool = await self.store.update(self.key(year, month), data_fingerprint, append)
+        return len((pool or {}).get("variants", []))
+
+    def fill(
+        self,
+        year: int,
+        month: int,
+        data_fingerprint: str,
+        generate: Callable[[], Awaitable[Optional[Dict[str, Any]]]]
+    ) -> bool:
+        """
+        모자란 변형을 백그라운드에서 생성 (이미 채우는 중이면 무시)
+
+        Args:
+            generate: 피드백 하나를 생성하는 함수 (실패 시 None)
+
+        Returns:
+            새로 시작했는지 여부
+        """
+        key = self.key(year, month)
+        if key in self._filling:
+            return False
+
+        # 요청의 deadline/trace 컨텍스트를 물려받지 않도록 빈 컨텍스트에서 실행
+        task = asyncio.get_running_loop().create_task(
+            self._fill(year, month, data_fingerprint, generate), context=contextvars.Context()
+        )
+        self._filling[key] = task
+        task.add_done_callback(lambda _: self._filling.pop(key, None))
+        return True
+
+    async def _fill(
+        self,
+        year: int,
+        month: int,
+        data_fingerprint: str,
+        generate: Callable[[], Awaitable[Optional[Dict[str, Any]]]]
+    ) -> None:
+        key = self.key(year, month)
+        # 생성이 계속 실패하거나 같은 결과만 나와도 끝나도록 시도 횟수 제한
+        for _ in range(self.size):
+            count = len(await self.variants(year, month, data_fingerprint))
+            if count >= self.size:
+                break
+            try:
+                feedback = await generate()
+            except Exception as e:
+                feedback = None
+                logger.error(f"급식 피드백 변형 생성 실패 ({key}): {str(e)}")
+            if feedback is None:
+                MEAL_FEEDBACK_VARIANT_FILLS.labels("error").inc()
+                break
+            count = await self.add(year, month, data_fingerprint, feedback)
+            MEAL_FEEDBACK_VARIANT_FILLS.labels("success").inc()
+            logger.info(f"급식 피드백 변형 생성 ({key}): {count}/{self.size}")
+
+    async def invalidate(self, year: int, month: int) -> None:
+        await self.store.invalidate(self.key(year, month))
+
+    async def shutdown(self) -> None:
+        """채우는 중인 변형 생성 취소"""
+        tasks: Set[asyncio.Task] = set(self._filling.values())
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+
+# 전역 급식 피드백 변형 풀 인스턴스
+feedback_variant_pool = FeedbackVariantPool()
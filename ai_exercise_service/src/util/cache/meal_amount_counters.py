@@ -0,0 +1,135 @@
+import os
+import sqlite3
+import threading
+import time
+from collections import Counter
+from typing import Any, Dict, List, Tuple
+import logging
+
+from ai_exercise_service.config.settings import settings
+from ai_exercise_service.src.util.cache.shared_cache import SERVICE_ROOT
+
+logger = logging.getLogger(__name__)
+
+RATINGS = ("FEW", "SUITABLE", "MUCH")
+# 식단 날짜가 없는 평가의 날짜 키
+_UNDATED = ""
+
+
+class MealAmountCounters:
+    """
+    급식량 평가 증분 집계 저장소 (공유 캐시와 같은 SQLite 파일, 워커 간 공유)
+
+    평가 레코드를 날짜/식사 유형/평가별 카운터로 누적하고, 반영한 가장 큰 레코드 id를
+    워터마크로 저장합니다. 이후에는 워터마크보다 큰 id만 카운터에 더하므로 비용은 새 레코드
+    수에만 비례합니다. 기존 평가의 수정/삭제는 id로 알 수 없으므로 주기적으로 전체 재집계합니다.
+    식단 날짜(meal.mealDate)가 없는 평가는 어느 달인지 알 수 없으므로 날짜 없는 카운터에 모아
+    모든 달의 조회 결과에 포함합니다 (전체 평가를 집계하던 기존 동작과 같게 누락 없이).
+    반영은 한 트랜잭션(BEGIN IMMEDIATE)에서 워터마크를 다시 읽고 처리해 워커가 동시에
+    같은 레코드를 받아도 한 번만 더해집니다.
+    """
+
+    def __init__(self, path: str):
+        self.path = path if os.path.isabs(path) else os.path.join(SERVICE_ROOT, path)
+        self._local = threading.local()
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS meal_amount_counts ("
+                "meal_date TEXT NOT NULL, meal_type TEXT NOT NULL, rating TEXT NOT NULL, count INTEGER NOT NULL, "
+                "PRIMARY KEY (meal_date, meal_type, rating))"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS meal_amount_sync ("
+                "id INTEGER PRIMARY KEY CHECK (id = 1), watermark INTEGER NOT NULL, rebuilt_at REAL NOT NULL)"
+            )
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def sync_state(self) -> Tuple[int, float]:
+        """(워터마크, 마지막 전체 재집계 시각) - 한 번도 집계하지 않았으면 (0, 0.0)"""
+        row = self._connection().execute("SELECT watermark, rebuilt_at FROM meal_amount_sync WHERE id = 1").fetchone()
+        return (row[0], row[1]) if row else (0, 0.0)
+
+    def needs_rebuild(self) -> bool:
+        return self.rebuild_due(self.sync_state()[1])
+
+    @staticmethod
+    def rebuild_due(rebuilt_at: float) -> bool:
+        """마지막 전체 재집계 시각 기준 재집계 필요 여부"""
+        return not rebuilt_at or time.time() - rebuilt_at >= settings.meal_amount_rebuild_seconds
+
+    def apply(self, records: List[Dict[str, Any]], rebuild: bool = False) -> int:
+        """
+        평가 레코드를 카운터에 반영하고 반영한 레코드 수 반환
+
+        Args:
+            records: Spring /meal-amount 레코드 (워터마크 이하 id는 건너뜀)
+            rebuild: 전체 이력으로 카운터를 새로 만들지 여부 (id 없는 레코드는 이때만 반영)
+        """
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute("SELECT watermark, rebuilt_at FROM meal_amount_sync WHERE id = 1").fetchone()
+            watermark, rebuilt_at = row if row else (0, 0.0)
+            if rebuild:
+                conn.execute("DELETE FROM meal_amount_counts")
+                watermark, rebuilt_at = 0, time.time()
+
+            deltas: Counter = Counter()
+            latest = watermark
+            for amount_data in records:
+                record_id = amount_data.get("id")
+                if isinstance(record_id, int):
+                    if record_id <= watermark:
+                        continue
+                    latest = max(latest, record_id)
+                elif not rebuild:
+                    continue
+                rating = amount_data.get("rating", "SUITABLE")
+                if rating not in RATINGS:
+                    continue
+                meal = amount_data.get("meal") or {}
+                deltas[(meal.get("mealDate") or _UNDATED, meal.get("mealType") or "", rating)] += 1
+
+            conn.executemany(
+                "INSERT INTO meal_amount_counts (meal_date, meal_type, rating, count) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (meal_date, meal_type, rating) DO UPDATE SET count = count + excluded.count",
+                [(meal_date, meal_type, rating, count) for (meal_date, meal_type, rating), count in deltas.items()]
+            )
+            conn.execute(
+                "INSERT OR REPLACE INTO meal_amount_sync (id, watermark, rebuilt_at) VALUES (1, ?, ?)",
+                (latest, rebuilt_at)
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return sum(deltas.values())
+
+    def month_counts(self, year: int, month: int) -> List[Dict[str, Any]]:
+        """해당 월의 날짜/식사 유형별 평가 수 (날짜 없는 평가는 date가 None인 항목으로 맨 앞에, 이후 날짜순)"""
+        rows = self._connection().execute(
+            "SELECT meal_date, meal_type, rating, count FROM meal_amount_counts "
+            "WHERE meal_date LIKE ? OR meal_date = ? ORDER BY meal_date, meal_type",
+            (f"{year:04d}-{month:02d}-%", _UNDATED)
+        ).fetchall()
+        daily: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        for meal_date, meal_type, rating, count in rows:
+            entry = daily.setdefault(
+                (meal_date, meal_type),
+                {"date": meal_date or None, "mealType": meal_type, **{key: 0 for key in RATINGS}}
+            )
+            entry[rating] = count
+        return list(daily.values())
+
+
+# 전역 급식량 평가 카운터 인스턴스
+meal_amount_counters = MealAmountCounters(settings.shared_cache_path)
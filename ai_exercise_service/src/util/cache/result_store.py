@@ -0,0 +1,97 @@
+import hashlib
+import json
+import time
+from typing import Any, Callable, Dict, Optional
+import logging
+
+from ai_exercise_service.config.settings import settings
+from ai_exercise_service.src.util.cache.shared_cache import SharedCache, shared_cache
+from ai_exercise_service.src.util.serialization.json_codec import dumps
+
+logger = logging.getLogger(__name__)
+
+
+def fingerprint(*parts: Any) -> str:
+    """결과를 만든 입력값 지문 (입력이 바뀌면 저장된 결과를 쓰지 않음)"""
+    return hashlib.sha256(
+        json.dumps(parts, sort_keys=True, ensure_ascii=False, default=str).encode("utf-8")
+    ).hexdigest()[:32]
+
+
+def etag_for(value: Any) -> str:
+    """응답 본문 기준 강한 ETag"""
+    return f'"{hashlib.sha256(dumps(value)).hexdigest()[:32]}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match 헤더가 etag와 일치하는지 (목록/약한 비교/* 지원)"""
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or any(tag.removeprefix("W/") == etag for tag in candidates)
+
+
+class ResultStore:
+    """
+    비싼 파이프라인 결과 저장소 (워커 간 공유 캐시 기반)
+
+    키마다 결과 하나와 그 결과를 만든 입력 지문을 저장하고,
+    조회 시 지문이 같을 때만 결과를 돌려줍니다. 지문이 다르면 저장된 결과는 지우지 않고
+    새 결과를 저장할 때 덮어씁니다 (일시적으로 다른 입력으로 조회해도 정상 결과가 남도록).
+    대체 경로(기본값)로 만든 입력의 결과는 호출하는 쪽에서 저장하지 않습니다.
+    """
+
+    def __init__(self, namespace: str, ttl_seconds: float, cache: SharedCache = shared_cache):
+        self.namespace = namespace
+        self.ttl_seconds = ttl_seconds
+        self.cache = cache
+
+    async def get(self, key: str, input_fingerprint: str) -> Optional[Dict[str, Any]]:
+        record = await self.cache.aget(self.namespace, key)
+        if record is None:
+            return None
+        if record.get("fingerprint") != input_fingerprint:
+            logger.info(f"저장된 결과의 입력이 달라 사용하지 않음 ({self.namespace}): {key}")
+            return None
+        return record["result"]
+
+    async def put(self, key: str, input_fingerprint: str, result: Any) -> None:
+        record = {"fingerprint": input_fingerprint, "result": result, "stored_at": time.time()}
+        await self.cache.aset(self.namespace, key, record, self.ttl_seconds)
+
+    async def update(
+        self, key: str, input_fingerprint: str, update_fn: Callable[[Optional[Any]], Optional[Any]]
+    ) -> Optional[Any]:
+        """
+        저장된 결과를 한 트랜잭션에서 읽고 바꿔 저장 (워커 간 읽기-수정-쓰기 경합 방지)
+
+        Args:
+            update_fn: 같은 지문의 현재 결과(없으면 None)를 받아 새 결과를 반환 (None이면 저장하지 않음)
+
+        Returns:
+            갱신 후 같은 지문의 결과 (없으면 None)
+        """
+        def apply(record: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+            current = record["result"] if record and record.get("fingerprint") == input_fingerprint else None
+            result = update_fn(current)
+            if result is None:
+                return None
+            return {"fingerprint": input_fingerprint, "result": result, "stored_at": time.time()}
+
+        record = await self.cache.aupdate(self.namespace, key, apply, self.ttl_seconds)
+        if record is None or record.get("fingerprint") != input_fingerprint:
+            return None
+        return record["result"]
+
+    async def invalidate(self, key: str) -> None:
+        await self.cache.adelete(self.namespace, key)
+
+
+# 사용자별 일일 운동 추천 결과 저장소
+recommendation_store = ResultStore("recommendation", settings.recommendation_store_ttl_seconds)
+
+# (연, 월)별 급식 피드백 변형 풀 저장소
+meal_feedback_store = ResultStore("meal_feedback", settings.meal_feedback_store_ttl_seconds)
+
+# (연, 월)별 여러 달 리뷰용 월간 급식 요약 저장소
+meal_summary_store = ResultStore("meal_summary", settings.meal_feedback_store_ttl_seconds)
@@ -0,0 +1,157 @@
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+import logging
+
+from ai_exercise_service.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+SERVICE_ROOT = os.path.join(os.path.dirname(__file__), '../../..')
+
+
+class SharedCache:
+    """
+    워커 프로세스 간 공유 캐시 (SQLite WAL, 네임스페이스별 TTL)
+
+    gunicorn 워커가 여러 개여도 인증/운동 목록/LLM 응답 캐시 적중률이
+    워커 수만큼 나뉘지 않도록 같은 파일을 공유합니다.
+    WAL 모드에서 읽기는 쓰기에 막히지 않으므로 조회는 이벤트 루프에서 바로 수행하고,
+    쓰기만 스레드로 넘깁니다. 연결은 스레드/프로세스별로 따로 엽니다 (fork 안전).
+    """
+
+    def __init__(self, path: str, gc_interval_seconds: int = 600):
+        self.path = path if os.path.isabs(path) else os.path.join(SERVICE_ROOT, path)
+        self.gc_interval_seconds = gc_interval_seconds
+        self._local = threading.local()
+        self._last_gc = time.time()
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache ("
+                "namespace TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL, expires_at REAL NOT NULL, "
+                "PRIMARY KEY (namespace, key))"
+            )
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def get(self, namespace: str, key: str) -> Optional[Any]:
+        """만료되지 않은 값 조회 (없으면 None)"""
+        try:
+            row = self._connection().execute(
+                "SELECT value FROM cache WHERE namespace = ? AND key = ? AND expires_at > ?",
+                (namespace, key, time.time())
+            ).fetchone()
+            return json.loads(row[0]) if row else None
+        except Exception as e:
+            logger.error(f"공유 캐시 조회 오류: {str(e)}")
+            return None
+
+    def set(self, namespace: str, key: str, value: Any, ttl_seconds: float) -> None:
+        """값 저장 (JSON 직렬화 가능한 값)"""
+        try:
+            self._connection().execute(
+                "INSERT OR REPLACE INTO cache (namespace, key, value, expires_at) VALUES (?, ?, ?, ?)",
+                (namespace, key, json.dumps(value, ensure_ascii=False, default=str), time.time() + ttl_seconds)
+            )
+            self._maybe_purge()
+        except Exception as e:
+            logger.error(f"공유 캐시 저장 오류: {str(e)}")
+
+    def update(
+        self, namespace: str, key: str, update_fn: Callable[[Optional[Any]], Optional[Any]], ttl_seconds: float
+    ) -> Optional[Any]:
+        """
+        한 트랜잭션에서 값을 읽고 바꿔 저장 (워커가 동시에 갱신해도 서로의 변경을 덮어쓰지 않음)
+
+        Args:
+            update_fn: 현재 값(없거나 만료되면 None)을 받아 새 값을 반환 (None이면 저장하지 않음)
+
+        Returns:
+            트랜잭션 이후의 값 (오류 시 None)
+        """
+        try:
+            conn = self._connection()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute(
+                    "SELECT value FROM cache WHERE namespace = ? AND key = ? AND expires_at > ?",
+                    (namespace, key, time.time())
+                ).fetchone()
+                current = json.loads(row[0]) if row else None
+                value = update_fn(current)
+                if value is not None:
+                    conn.execute(
+                        "INSERT OR REPLACE INTO cache (namespace, key, value, expires_at) VALUES (?, ?, ?, ?)",
+                        (namespace, key, json.dumps(value, ensure_ascii=False, default=str), time.time() + ttl_seconds)
+                    )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+            return current if value is None else value
+        except Exception as e:
+            logger.error(f"공유 캐시 갱신 오류: {str(e)}")
+            return None
+
+    def delete(self, namespace: str, key: str) -> None:
+        try:
+            self._connection().execute("DELETE FROM cache WHERE namespace = ? AND key = ?", (namespace, key))
+        except Exception as e:
+            logger.error(f"공유 캐시 삭제 오류: {str(e)}")
+
+    def clear(self, namespace: str) -> None:
+        """네임스페이스 전체 삭제"""
+        try:
+            self._connection().execute("DELETE FROM cache WHERE namespace = ?", (namespace,))
+        except Exception as e:
+            logger.error(f"공유 캐시 삭제 오류: {str(e)}")
+
+    def purge_expired(self) -> int:
+        """만료된 항목 삭제"""
+        cursor = self._connection().execute("DELETE FROM cache WHERE expires_at <= ?", (time.time(),))
+        if cursor.rowcount:
+            logger.info(f"만료된 공유 캐시 {cursor.rowcount}건 삭제")
+        return cursor.rowcount
+
+    def namespace_counts(self) -> Dict[str, int]:
+        """네임스페이스별 유효 항목 수 (시작 시 연결을 열고 페이지 캐시를 데우는 용도 겸용)"""
+        rows = self._connection().execute(
+            "SELECT namespace, COUNT(*) FROM cache WHERE expires_at > ? GROUP BY namespace", (time.time(),)
+        ).fetchall()
+        return dict(rows)
+
+    def _maybe_purge(self) -> None:
+        now = time.time()
+        if now - self._last_gc >= self.gc_interval_seconds:
+            self._last_gc = now
+            self.purge_expired()
+
+    async def aget(self, namespace: str, key: str) -> Optional[Any]:
+        return self.get(namespace, key)
+
+    async def aset(self, namespace: str, key: str, value: Any, ttl_seconds: float) -> None:
+        await asyncio.to_thread(self.set, namespace, key, value, ttl_seconds)
+
+    async def aupdate(
+        self, namespace: str, key: str, update_fn: Callable[[Optional[Any]], Optional[Any]], ttl_seconds: float
+    ) -> Optional[Any]:
+        return await asyncio.to_thread(self.update, namespace, key, update_fn, ttl_seconds)
+
+    async def adelete(self, namespace: str, key: str) -> None:
+        await asyncio.to_thread(self.delete, namespace, key)
+
+
+# 전역 공유 캐시 인스턴스
+shared_cache = SharedCache(settings.shared_cache_path)
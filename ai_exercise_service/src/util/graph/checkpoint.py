@@ -0,0 +1,202 @@
+import asyncio
+import contextvars
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import weakref
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+import logging
+
+from ai_exercise_service.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+SERVICE_ROOT = os.path.join(os.path.dirname(__file__), '../../..')
+
+# 그래프 노드가 Spring 호출에 쓰는 요청 인증 토큰
+# (체크포인트 상태와 config는 SQLite에 저장되므로 토큰은 실행 컨텍스트로만 전달)
+_request_token: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("graph_request_token", default=None)
+
+
+@contextmanager
+def request_credentials(token: Optional[str]) -> Iterator[None]:
+    """이 블록에서 실행한 그래프의 노드가 current_request_token()으로 읽을 인증 토큰 설정"""
+    reset_token = _request_token.set(token)
+    try:
+        yield
+    finally:
+        _request_token.reset(reset_token)
+
+
+def current_request_token() -> Optional[str]:
+    """실행 중인 그래프 요청의 인증 토큰 (request_credentials 밖에서는 None)"""
+    return _request_token.get()
+
+
+class GraphCheckpointer:
+    """
+    LangGraph 체크포인트 관리
+
+    - 요청 입력값에서 thread_id를 만들어 같은 요청의 재시도가 같은 스레드를 사용하도록 함
+    - 실패한 실행은 마지막으로 성공한 노드 이후부터 재개
+    - 성공한 스레드는 즉시 삭제, 방치된 스레드는 TTL 기준으로 정리
+    - 인증 토큰 같은 자격 증명은 상태/thread_id에 넣지 않고 request_credentials로 전달
+
+    같은 스레드의 동시 실행은 워커 프로세스 안에서만 직렬화합니다 (asyncio.Lock).
+    gunicorn 워커 여러 개가 같은 thread_id를 동시에 실행하면 각자 실행되어 LLM을 중복 호출할 수 있고,
+    체크포인트는 나중에 기록한 실행 기준으로 재개됩니다.
+    """
+
+    def __init__(self):
+        self.enabled = settings.checkpoint_enabled
+        self.ttl_seconds = settings.checkpoint_ttl_seconds
+        self.gc_interval_seconds = settings.checkpoint_gc_interval_seconds
+        self.db_path = settings.checkpoint_db_path
+        if not os.path.isabs(self.db_path):
+            self.db_path = os.path.join(SERVICE_ROOT, self.db_path)
+        self._saver = None
+        self._saver_lock = threading.Lock()
+        self._last_gc = 0.0
+        self._thread_locks: "weakref.WeakValueDictionary[str, asyncio.Lock]" = weakref.WeakValueDictionary()
+        # preload 후 fork된 워커가 부모의 SQLite 연결을 공유하지 않도록 연결을 다시 엶
+        os.register_at_fork(after_in_child=self._reopen_after_fork)
+
+    def _reopen_after_fork(self) -> None:
+        self._saver_lock = threading.Lock()
+        self._thread_locks = weakref.WeakValueDictionary()
+        if self._saver is not None:
+            # 컴파일된 그래프가 같은 saver 객체를 참조하므로 연결만 교체
+            self._saver.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._saver.lock = threading.Lock()
+
+    @property
+    def saver(self):
+        """그래프 compile에 전달할 체크포인터 (비활성화 시 None)"""
+        if not self.enabled:
+            return None
+        with self._saver_lock:
+            if self._saver is None:
+                from ai_exercise_service.src.util.graph.sqlite_saver import ThreadedSqliteSaver
+
+                os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+                conn = sqlite3.connect(self.db_path, check_same_thread=False)
+                self._saver = ThreadedSqliteSaver(conn)
+                with self._saver.cursor() as cur:
+                    cur.execute(
+                        "CREATE TABLE IF NOT EXISTS checkpoint_threads ("
+                        "thread_id TEXT PRIMARY KEY, updated_at REAL NOT NULL)"
+                    )
+                logger.info(f"그래프 체크포인트 저장소 초기화: {self.db_path}")
+            return self._saver
+
+    def thread_config(self, graph_name: str, *parts: Any) -> Dict[str, Any]:
+        """요청 입력값 기반 thread_id config 생성"""
+        digest = hashlib.sha256(
+            json.dumps(parts, sort_keys=True, ensure_ascii=False, default=str).encode("utf-8")
+        ).hexdigest()[:32]
+        return {"configurable": {"thread_id": f"{graph_name}:{digest}"}}
+
+    def run(self, graph, initial_state: Dict[str, Any], config: Dict[str, Any]) -> Dict[str, Any]:
+        """동기 그래프 실행 (체크포인트 재개 포함)"""
+        if self.saver is None:
+            return graph.invoke(initial_state)
+
+        thread_id = config["configurable"]["thread_id"]
+        self._touch(thread_id)
+        resume_config = self._find_resume_config(graph.get_state(config), graph.get_state_history(config))
+        if resume_config:
+            logger.info(f"체크포인트에서 그래프 재개: {thread_id}")
+            result = graph.invoke(None, resume_config)
+        else:
+            result = graph.invoke(initial_state, config)
+
+        self._finish(thread_id, result)
+        return result
+
+    async def arun(self, graph, initial_state: Dict[str, Any], config: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        비동기 그래프 실행 (체크포인트 재개 포함)
+
+        같은 thread_id의 동시 요청은 이 프로세스 안에서만 순서대로 실행합니다 (워커 간에는 잠그지 않음).
+        """
+        if self.saver is None:
+            return await graph.ainvoke(initial_state)
+
+        thread_id = config["configurable"]["thread_id"]
+        lock = self._thread_locks.get(thread_id)
+        if lock is None:
+            lock = asyncio.Lock()
+            self._thread_locks[thread_id] = lock
+
+        async with lock:
+            await asyncio.to_thread(self._touch, thread_id)
+            snapshot = await graph.aget_state(config)
+            history = [past async for past in graph.aget_state_history(config)] if snapshot.values else []
+            resume_config = self._find_resume_config(snapshot, history)
+            if resume_config:
+                logger.info(f"체크포인트에서 그래프 재개: {thread_id}")
+                result = await graph.ainvoke(None, resume_config)
+            else:
+                result = await graph.ainvoke(initial_state, config)
+
+            await asyncio.to_thread(self._finish, thread_id, result)
+            return result
+
+    def _find_resume_config(self, snapshot, history) -> Optional[Dict[str, Any]]:
+        """재개할 체크포인트 config 탐색 (없으면 새로 실행)"""
+        if not snapshot.values:
+            return None
+
+        # 중간에 프로세스가 종료된 경우: 마지막 체크포인트에서 이어서 실행
+        if not snapshot.values.get("error_message"):
+            return snapshot.config if snapshot.next else None
+
+        # 노드가 실패한 경우: 오류가 기록되기 전 마지막 체크포인트에서 실행
+        for past in history:
+            if past.next and past.values and not past.values.get("error_message"):
+                return past.config
+        return None
+
+    def _finish(self, thread_id: str, result: Dict[str, Any]) -> None:
+        """성공한 스레드 정리 및 주기적 TTL 정리"""
+        if not result.get("error_message"):
+            self.saver.delete_thread(thread_id)
+            with self.saver.cursor() as cur:
+                cur.execute("DELETE FROM checkpoint_threads WHERE thread_id = ?", (thread_id,))
+
+        if time.time() - self._last_gc >= self.gc_interval_seconds:
+            self.purge_expired()
+
+    def _touch(self, thread_id: str) -> None:
+        with self.saver.cursor() as cur:
+            cur.execute(
+                "INSERT INTO checkpoint_threads (thread_id, updated_at) VALUES (?, ?) "
+                "ON CONFLICT(thread_id) DO UPDATE SET updated_at = excluded.updated_at",
+                (thread_id, time.time())
+            )
+
+    def purge_expired(self) -> int:
+        """TTL이 지난 체크포인트 스레드 삭제"""
+        self._last_gc = time.time()
+        if self.saver is None:
+            return 0
+
+        cutoff = self._last_gc - self.ttl_seconds
+        with self.saver.cursor() as cur:
+            cur.execute("SELECT thread_id FROM checkpoint_threads WHERE updated_at < ?", (cutoff,))
+            expired = [row[0] for row in cur.fetchall()]
+            for thread_id in expired:
+                cur.execute("DELETE FROM checkpoints WHERE thread_id = ?", (thread_id,))
+                cur.execute("DELETE FROM writes WHERE thread_id = ?", (thread_id,))
+                cur.execute("DELETE FROM checkpoint_threads WHERE thread_id = ?", (thread_id,))
+
+        if expired:
+            logger.info(f"만료된 체크포인트 스레드 {len(expired)}개 삭제")
+        return len(expired)
+
+# 전역 체크포인터 인스턴스
+graph_checkpointer = GraphCheckpointer()
@@ -0,0 +1 @@
+# llm 유틸 패키지 초기화 파일
\ No newline at end of file
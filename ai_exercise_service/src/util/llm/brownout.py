@@ -0,0 +1,123 @@
+import collections
+import threading
+import time
+from contextlib import contextmanager
+from typing import Deque, Iterator, Optional, Tuple
+import logging
+
+from ai_exercise_service.config.settings import settings
+from ai_exercise_service.src.util.monitoring.metrics import BROWNOUT_ACTIVE, BROWNOUT_TRANSITIONS, LLM_IN_FLIGHT
+
+logger = logging.getLogger(__name__)
+
+
+class BrownoutController:
+    """
+    LLM 과부하 감지 및 규칙 기반 경로 전환 (워커 프로세스 단위)
+
+    최근 window_seconds 동안의 LLM 호출 결과로 다음 지표를 계산합니다.
+    - 진행 중인 LLM 호출 수 (대기열 깊이)
+    - 오류율
+    - p95 지연시간
+    하나라도 진입 임계값을 넘으면 브라운아웃에 들어가고, 최소 min_hold_seconds가 지난 뒤
+    모든 지표가 진입 임계값 × exit_ratio 아래로 내려가야 복귀합니다 (히스테리시스).
+    """
+
+    def __init__(self):
+        self.enabled = settings.brownout_enabled
+        self.window_seconds = settings.brownout_window_seconds
+        self.min_samples = settings.brownout_min_samples
+        self.enter_in_flight = settings.brownout_enter_llm_in_flight
+        self.enter_error_rate = settings.brownout_enter_error_rate
+        self.enter_p95 = settings.brownout_enter_p95_seconds
+        self.exit_ratio = settings.brownout_exit_ratio
+        self.min_hold_seconds = settings.brownout_min_hold_seconds
+
+        self.active = False
+        self.reason = ""
+        self.entered_at = 0.0
+        self.in_flight = 0
+        # (완료 시각, 지연시간, 성공 여부)
+        self._samples: Deque[Tuple[float, float, bool]] = collections.deque()
+        self._lock = threading.Lock()
+        BROWNOUT_ACTIVE.set(0)
+
+    @contextmanager
+    def track_call(self) -> Iterator[None]:
+        """
+        LLM 호출 하나를 진행 중으로 집계 (호출 정책에서 invoke를 감쌈)
+
+        콜백(on_llm_end/on_llm_error)은 취소된 호출에서 오지 않을 수 있어 진행 중 수가
+        새어 나가므로 실제 호출 구간을 try/finally로 집계합니다.
+        """
+        start = time.perf_counter()
+        ok = False
+        self.llm_started()
+        try:
+            yield
+            ok = True
+        finally:
+            self.llm_finished(time.perf_counter() - start, ok)
+
+    def llm_started(self) -> None:
+        with self._lock:
+            self.in_flight += 1
+        LLM_IN_FLIGHT.inc()
+
+    def llm_finished(self, latency: float, ok: bool) -> None:
+        with self._lock:
+            self.in_flight = max(self.in_flight - 1, 0)
+            self._samples.append((time.monotonic(), latency, ok))
+        LLM_IN_FLIGHT.dec()
+
+    def _window_stats(self, now: float) -> Tuple[int, float, Optional[float]]:
+        """(표본 수, 오류율, p95 지연시간)"""
+        while self._samples and now - self._samples[0][0] > self.window_seconds:
+            self._samples.popleft()
+        count = len(self._samples)
+        if count == 0:
+            return 0, 0.0, None
+        errors = sum(1 for _, _, ok in self._samples if not ok)
+        latencies = sorted(latency for _, latency, _ in self._samples)
+        return count, errors / count, latencies[min(count - 1, int(count * 0.95))]
+
+    def _overload_reason(self, ratio: float, now: float) -> str:
+        """임계값 × ratio를 넘은 지표 (없으면 빈 문자열)"""
+        count, error_rate, p95 = self._window_stats(now)
+        if self.in_flight >= self.enter_in_flight * ratio:
+            return "llm_queue"
+        if count >= self.min_samples:
+            if error_rate >= self.enter_error_rate * ratio:
+                return "error_rate"
+            if p95 is not None and p95 >= self.enter_p95 * ratio:
+                return "latency"
+        return ""
+
+    def is_degraded(self) -> bool:
+        """지금 요청을 규칙 기반 경로로 처리해야 하는지 판단"""
+        if not self.enabled:
+            return False
+        now = time.monotonic()
+        with self._lock:
+            if not self.active:
+                reason = self._overload_reason(1.0, now)
+                if reason:
+                    self._transition(True, reason, now)
+            elif now - self.entered_at >= self.min_hold_seconds and not self._overload_reason(self.exit_ratio, now):
+                self._transition(False, self.reason, now)
+            return self.active
+
+    def _transition(self, active: bool, reason: str, now: float) -> None:
+        self.active = active
+        self.reason = reason
+        if active:
+            self.entered_at = now
+            logger.warning(f"브라운아웃 시작 ({reason}): 운동 추천을 규칙 기반으로 전환")
+        else:
+            logger.info(f"브라운아웃 종료 ({reason}): LLM 기반 추천 재개")
+        BROWNOUT_ACTIVE.set(1 if active else 0)
+        BROWNOUT_TRANSITIONS.labels("active" if active else "normal", reason).inc()
+
+
+# 전역 브라운아웃 컨트롤러 인스턴스
+brownout_controller = BrownoutController()
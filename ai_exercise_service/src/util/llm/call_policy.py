@@ -0,0 +1,174 @@
+import contextvars
+import random
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Dict, Optional, Tuple
+import logging
+
+import httpx
+
+from ai_exercise_service.config.settings import settings
+from ai_exercise_service.src.util.llm.brownout import brownout_controller
+from ai_exercise_service.src.util.llm.token_budget import token_budget
+from ai_exercise_service.src.util.monitoring.metrics import LLM_HEDGES, LLM_RETRIES
+from ai_exercise_service.src.util.services.deadline import DeadlineExceeded, check_deadline, remaining
+from ai_exercise_service.src.util.services.resilience import LatencyTracker
+
+logger = logging.getLogger(__name__)
+
+# 재시도할 openai 예외 (openai 임포트를 첫 LLM 호출 시점으로 미루기 위해 이름으로 비교)
+_TRANSIENT_ERROR_NAMES = {"APIConnectionError", "APITimeoutError", "RateLimitError", "InternalServerError"}
+
+
+def is_transient(error: BaseException) -> bool:
+    """재시도하면 성공할 수 있는 오류인지 (타임아웃, 연결 오류, 429, 5xx)"""
+    if isinstance(error, DeadlineExceeded):
+        return False
+    if isinstance(error, (TimeoutError, httpx.TransportError)):
+        return True
+    return any(cls.__name__ in _TRANSIENT_ERROR_NAMES for cls in type(error).__mro__)
+
+
+class LLMCallPolicy:
+    """
+    LangGraph 노드의 LLM 호출 정책
+
+    - 노드별 타임아웃 (요청 deadline이 더 짧으면 남은 시간)과 최대 출력 토큰
+    - 일시적 오류는 지수 백오프 + full jitter로 재시도
+    - 헤지: 노드의 최근 p90만큼 기다려도 응답이 없으면 같은 요청을 한 번 더 보내고 먼저 온 응답 사용
+
+    노드는 동기 함수라 진행 중인 HTTP 호출을 중단할 수 없으므로, 진 쪽 요청은 시작 전이면 취소하고
+    이미 실행 중이면 결과를 버립니다 (자체 타임아웃 안에 끝남).
+    """
+
+    def __init__(self):
+        self.default_timeout = settings.llm_default_timeout_seconds
+        self.node_timeouts = settings.llm_node_timeout_seconds
+        self.node_max_tokens = settings.llm_node_max_tokens
+        self.max_retries = settings.llm_max_retries
+        self.retry_base = settings.llm_retry_base_seconds
+        self.retry_max = settings.llm_retry_max_seconds
+        self.hedging_enabled = settings.llm_hedging_enabled
+        self.hedge_percentile = settings.llm_hedge_percentile
+        self.hedge_min_samples = settings.llm_hedge_min_samples
+        self.hedge_min_delay = settings.llm_hedge_min_delay_seconds
+        self._latencies: Dict[str, LatencyTracker] = {}
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def timeout_for(self, node: str) -> float:
+        timeout = self.node_timeouts.get(node, self.default_timeout)
+        left = remaining()
+        return timeout if left is None else min(timeout, left)
+
+    def call_options(self, node: str, timeout: float) -> Dict[str, Any]:
+        """모델 호출 인자 (타임아웃, 노드별 최대 출력 토큰)"""
+        options: Dict[str, Any] = {"timeout": timeout}
+        if node in self.node_max_tokens:
+            options["max_tokens"] = self.node_max_tokens[node]
+        return options
+
+    def hedge_delay(self, node: str) -> Optional[float]:
+        """헤지 요청 발송까지 기다릴 시간 (비활성화 또는 샘플 부족이면 None)"""
+        if not self.hedging_enabled:
+            return None
+        with self._lock:
+            tracker = self._latencies.get(node)
+            if tracker is None or len(tracker) < self.hedge_min_samples:
+                return None
+            return max(tracker.percentile(self.hedge_percentile), self.hedge_min_delay)
+
+    def invoke(self, node: str, prompt, llm, inputs: Dict[str, Any]):
+        """prompt | llm 체인을 정책에 따라 호출 (재시도 후에도 실패하면 마지막 예외 발생)"""
+        token_budget.record_estimate(node, prompt, inputs)
+        attempt = 0
+        while True:
+            check_deadline(f"LLM 호출 ({node})")
+            timeout = self.timeout_for(node)
+            chain = prompt | llm.bind(**self.call_options(node, timeout))
+            try:
+                return self._attempt(node, chain, inputs, timeout)
+            except Exception as e:
+                if attempt >= self.max_retries or not is_transient(e):
+                    raise
+                backoff = random.uniform(0, min(self.retry_max, self.retry_base * 2 ** attempt))
+                left = remaining()
+                if left is not None and left <= backoff:
+                    raise
+                attempt += 1
+                LLM_RETRIES.labels(node, type(e).__name__).inc()
+                logger.warning(f"LLM 호출 재시도 ({node}, {attempt}/{self.max_retries}, {backoff:.2f}초 후): {str(e)}")
+                time.sleep(backoff)
+
+    def _attempt(self, node: str, chain, inputs: Dict[str, Any], timeout: float):
+        delay = self.hedge_delay(node)
+        if delay is None or delay >= timeout:
+            start = time.perf_counter()
+            with brownout_controller.track_call():
+                result = chain.invoke(inputs)
+            self._record(node, time.perf_counter() - start)
+            return result
+
+        primary = self._submit(chain, inputs)
+        done, _ = wait([primary], timeout=delay)
+        if done:
+            return self._result(node, primary)
+
+        LLM_HEDGES.labels(node, "fired").inc()
+        logger.info(f"LLM 헤지 요청 발송 ({node}, {delay:.2f}초 경과)")
+        hedge = self._submit(chain, inputs)
+        pending = {primary, hedge}
+        ends_at = time.monotonic() + timeout
+        error: Optional[BaseException] = None
+        while pending:
+            done, pending = wait(pending, timeout=max(0.0, ends_at - time.monotonic()), return_when=FIRST_COMPLETED)
+            if not done:
+                break
+            for future in done:
+                if future.exception() is not None:
+                    error = future.exception()
+                    continue
+                for loser in pending:
+                    loser.cancel()
+                if future is hedge:
+                    LLM_HEDGES.labels(node, "won").inc()
+                return self._result(node, future)
+        for loser in pending:
+            loser.cancel()
+        raise error or TimeoutError(f"LLM 호출 시간 초과 ({node}, {timeout:.1f}초)")
+
+    def _submit(self, chain, inputs: Dict[str, Any]) -> "Future[Tuple[Any, float]]":
+        # 노드 스레드의 컨텍스트(LangGraph 콜백/메타데이터, deadline, trace)를 그대로 전달
+        context = contextvars.copy_context()
+
+        def run() -> Tuple[Any, float]:
+            start = time.perf_counter()
+            with brownout_controller.track_call():
+                result = chain.invoke(inputs)
+            return result, time.perf_counter() - start
+
+        return self._pool().submit(context.run, run)
+
+    def _result(self, node: str, future: "Future[Tuple[Any, float]]"):
+        result, duration = future.result()
+        self._record(node, duration)
+        return result
+
+    def _record(self, node: str, seconds: float) -> None:
+        with self._lock:
+            tracker = self._latencies.get(node)
+            if tracker is None:
+                tracker = self._latencies[node] = LatencyTracker()
+            tracker.add(seconds)
+
+    def _pool(self) -> ThreadPoolExecutor:
+        # gunicorn preload 후 fork된 워커에서 스레드를 만들도록 첫 헤지 시점에 생성
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(thread_name_prefix="llm-call")
+            return self._executor
+
+
+# 전역 LLM 호출 정책 인스턴스
+llm_call_policy = LLMCallPolicy()
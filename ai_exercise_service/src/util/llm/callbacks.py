@@ -0,0 +1,96 @@
+import time
+from typing import Any, Dict, Optional
+import logging
+
+from langchain_core.callbacks import BaseCallbackHandler
+
+from ai_exercise_service.src.util.monitoring.metrics import LLM_ERRORS, LLM_LATENCY, LLM_TOKENS, current_request_usage
+from ai_exercise_service.src.util.monitoring.tracing import start_span
+
+logger = logging.getLogger(__name__)
+
+# 취소된 호출은 종료 콜백이 오지 않을 수 있으므로 이보다 오래된 시작 기록은 정리 (span은 timeout으로 종료)
+_STALE_RUN_SECONDS = 600.0
+
+
+class LLMMetricsCallbackHandler(BaseCallbackHandler):
+    """LLM 호출 지연시간/토큰 사용량/span 수집 콜백 (노드명은 LangGraph 메타데이터에서 추출)"""
+
+    run_inline = True
+
+    def __init__(self, model: str):
+        self.model = model
+        self._started: Dict[Any, tuple] = {}
+
+    def on_chat_model_start(self, serialized, messages, *, run_id, metadata: Optional[Dict[str, Any]] = None, **kwargs):
+        node = (metadata or {}).get("langgraph_node", "unknown")
+        llm_span = start_span(f"llm {self.model}", node=node)
+        now = time.perf_counter()
+        self._prune(now)
+        self._started[run_id] = (node, now, llm_span)
+
+    def _prune(self, now: float) -> None:
+        for stale_id, (_, start, stale_span) in list(self._started.items()):
+            if now - start > _STALE_RUN_SECONDS:
+                self._started.pop(stale_id, None)
+                if stale_span is not None:
+                    stale_span.end("timeout")
+
+    def on_llm_end(self, response, *, run_id, **kwargs):
+        node, start, llm_span = self._started.pop(run_id, ("unknown", None, None))
+        if start is not None:
+            latency = time.perf_counter() - start
+            LLM_LATENCY.labels(node, self.model).observe(latency)
+
+        usage = _extract_usage(response)
+        if usage:
+            LLM_TOKENS.labels(node, self.model, "prompt").inc(usage.get("input_tokens", 0))
+            LLM_TOKENS.labels(node, self.model, "completion").inc(usage.get("output_tokens", 0))
+            # 입력 토큰 중 프롬프트 캐시(공통 접두사)로 처리된 토큰
+            LLM_TOKENS.labels(node, self.model, "cached").inc(usage.get("cached_tokens", 0))
+            request_usage = current_request_usage()
+            if request_usage is not None:
+                request_usage.add(node, usage)
+            logger.info(
+                f"LLM 토큰 사용 ({node}, {self.model}): 입력 {usage.get('input_tokens', 0)}, "
+                f"출력 {usage.get('output_tokens', 0)}, 캐시 {usage.get('cached_tokens', 0)}"
+            )
+        if llm_span is not None:
+            llm_span.set_attribute("input_tokens", usage.get("input_tokens", 0))
+            llm_span.set_attribute("output_tokens", usage.get("output_tokens", 0))
+            llm_span.set_attribute("cached_tokens", usage.get("cached_tokens", 0))
+            llm_span.end()
+
+    def on_llm_error(self, error, *, run_id, **kwargs):
+        node, start, llm_span = self._started.pop(run_id, ("unknown", None, None))
+        if start is not None:
+            latency = time.perf_counter() - start
+            LLM_LATENCY.labels(node, self.model).observe(latency)
+        LLM_ERRORS.labels(node, self.model).inc()
+        if llm_span is not None:
+            llm_span.set_attribute("error", str(error)[:200])
+            llm_span.end("error")
+
+
+def _extract_usage(response) -> Dict[str, int]:
+    """LLMResult에서 토큰 사용량 추출 (cached_tokens: 프롬프트 캐시 적중 입력 토큰)"""
+    try:
+        message = response.generations[0][0].message
+        usage_metadata = getattr(message, "usage_metadata", None)
+        if usage_metadata:
+            return {
+                "input_tokens": usage_metadata.get("input_tokens", 0),
+                "output_tokens": usage_metadata.get("output_tokens", 0),
+                "cached_tokens": (usage_metadata.get("input_token_details") or {}).get("cache_read", 0) or 0
+            }
+    except (AttributeError, IndexError):
+        pass
+
+    token_usage = (response.llm_output or {}).get("token_usage") or {}
+    if token_usage:
+        return {
+            "input_tokens": token_usage.get("prompt_tokens", 0),
+            "output_tokens": token_usage.get("completion_tokens", 0),
+            "cached_tokens": (token_usage.get("prompt_tokens_details") or {}).get("cached_tokens", 0) or 0
+        }
+    return {}
@@ -0,0 +1,88 @@
+from functools import lru_cache
+from typing import Any, Callable, Optional
+import logging
+
+from ai_exercise_service.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+# 벤치마크/재생 모드에서 실제 모델 대신 사용할 팩토리 (temperature, model) -> chat model
+_model_override: Optional[Callable[[float, str], Any]] = None
+
+
+def override_chat_model(factory: Optional[Callable[[float, str], Any]]) -> None:
+    """채팅 모델 생성 함수 교체 (None이면 실제 ChatOpenAI 사용)"""
+    global _model_override
+    _model_override = factory
+
+
+def get_chat_model(temperature: float, model: str = "gpt-4o-mini"):
+    """
+    채팅 모델 반환 (첫 호출 시 생성 후 재사용, 요청 deadline이 있으면 남은 시간을 타임아웃으로 사용)
+
+    langchain_openai 임포트와 클라이언트 생성을 첫 LLM 호출 시점으로 미뤄
+    서버 시작 시간을 줄입니다.
+    """
+    if _model_override is not None:
+        chat_model = _model_override(temperature, model)
+    else:
+        from ai_exercise_service.src.util.replay.cassette import cassette
+        if cassette.replaying:
+            chat_model = _create_replay_model(temperature, model)
+        else:
+            chat_model = _create_chat_model(temperature, model)
+    return _bind_deadline(chat_model)
+
+
+def _bind_deadline(chat_model):
+    """요청 deadline이 있으면 남은 시간을 호출 타임아웃으로 전달 (남은 시간이 없으면 호출하지 않음)"""
+    from ai_exercise_service.src.util.services.deadline import check_deadline, remaining
+
+    left = remaining()
+    if left is None:
+        return chat_model
+    check_deadline("LLM 호출")
+    return chat_model.bind(timeout=left)
+
+
+@lru_cache(maxsize=None)
+def _create_chat_model(temperature: float, model: str):
+    from langchain_openai import ChatOpenAI
+    from ai_exercise_service.src.util.llm.callbacks import LLMMetricsCallbackHandler
+
+    from ai_exercise_service.src.util.replay.cassette import cassette
+
+    callbacks = [LLMMetricsCallbackHandler(model)]
+    if cassette.recording:
+        from ai_exercise_service.src.util.replay.llm import LLMRecordingCallbackHandler
+        callbacks.append(LLMRecordingCallbackHandler(cassette, model))
+
+    cache = None
+    if settings.llm_cache_enabled and temperature == 0:
+        from ai_exercise_service.src.util.cache.shared_cache import shared_cache
+        from ai_exercise_service.src.util.llm.llm_cache import SharedLLMCache
+        cache = SharedLLMCache(shared_cache, settings.llm_cache_ttl_seconds)
+
+    logger.info(f"LLM 클라이언트 생성: {model} (temperature={temperature})")
+    return ChatOpenAI(
+        model=model,
+        temperature=temperature,
+        callbacks=callbacks,
+        cache=cache,
+        # 재시도는 노드별 호출 정책(call_policy)에서 처리
+        max_retries=0
+    )
+
+
+@lru_cache(maxsize=None)
+def _create_replay_model(temperature: float, model: str):
+    from ai_exercise_service.src.util.llm.callbacks import LLMMetricsCallbackHandler
+    from ai_exercise_service.src.util.replay.cassette import cassette
+    from ai_exercise_service.src.util.replay.llm import ReplayChatModel
+
+    logger.info(f"카세트 재생 모델 사용: {model} (temperature={temperature})")
+    return ReplayChatModel(
+        cassette=cassette,
+        model_name=model,
+        callbacks=[LLMMetricsCallbackHandler(f"replay-{model}")]
+    )
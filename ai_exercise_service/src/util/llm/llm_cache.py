@@ -0,0 +1,50 @@
+import hashlib
+import re
+from typing import Any, Optional, Sequence
+import logging
+
+from langchain_core.caches import BaseCache
+from langchain_core.load import dumps, loads
+from langchain_core.outputs import Generation
+
+from ai_exercise_service.src.util.cache.shared_cache import SharedCache
+
+logger = logging.getLogger(__name__)
+
+# 요청마다 달라지는 deadline 타임아웃은 캐시 키에서 제외
+_TIMEOUT_PARAM = re.compile(r"\('timeout', [^)]*\)(, )?")
+
+
+class SharedLLMCache(BaseCache):
+    """
+    LLM 응답 캐시 (워커 간 공유 캐시 사용)
+
+    같은 프롬프트/모델 설정에 같은 응답을 기대할 수 있는 temperature 0 모델에만 붙입니다.
+    """
+
+    namespace = "llm"
+
+    def __init__(self, cache: SharedCache, ttl_seconds: float):
+        self.cache = cache
+        self.ttl_seconds = ttl_seconds
+
+    @staticmethod
+    def _key(prompt: str, llm_string: str) -> str:
+        llm_string = _TIMEOUT_PARAM.sub("", llm_string)
+        return hashlib.sha256(f"{llm_string}\n{prompt}".encode("utf-8")).hexdigest()
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[Sequence[Generation]]:
+        value = self.cache.get(self.namespace, self._key(prompt, llm_string))
+        if value is None:
+            return None
+        try:
+            return loads(value)
+        except Exception as e:
+            logger.error(f"LLM 캐시 역직렬화 오류: {str(e)}")
+            return None
+
+    def update(self, prompt: str, llm_string: str, return_val: Sequence[Generation]) -> None:
+        self.cache.set(self.namespace, self._key(prompt, llm_string), dumps(list(return_val)), self.ttl_seconds)
+
+    def clear(self, **kwargs: Any) -> None:
+        self.cache.clear(self.namespace)
@@ -0,0 +1,80 @@
+from typing import Dict, List
+import logging
+
+from langchain_core.prompts import ChatPromptTemplate
+
+from ai_exercise_service.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+class PromptRegistry:
+    """
+    그래프별 프롬프트 등록소 (모듈 로드 시 한 번만 컴파일)
+
+    프롬프트는 [노드 고정 system 메시지] + [요청 데이터 human 메시지]로 구성합니다.
+    system 메시지(공통 규칙 + 노드 지시사항 + 출력 형식)는 요청이 달라도 바이트 단위로 같고
+    요청마다 바뀌는 데이터는 항상 마지막에 두므로, 접두사가 OpenAI 프롬프트 캐시 최소 길이
+    (1024토큰)를 넘는 노드는 캐시에 걸립니다.
+
+    그래프의 모든 노드 지시사항을 한 접두사에 모으면 캐시 최소 길이는 넘지만 호출마다 다른 노드의
+    지시사항까지 보내게 되어, 캐시 할인(gpt-4o-mini 50%)을 받아도 노드별 프롬프트보다 입력 토큰
+    비용이 커지므로 노드별 system 메시지를 사용합니다.
+    """
+
+    def __init__(self):
+        self._prefixes: Dict[str, Dict[str, str]] = {}
+        self._prompts: Dict[str, Dict[str, ChatPromptTemplate]] = {}
+
+    def register_graph(self, graph: str, preamble: str, tasks: Dict[str, Dict[str, str]]) -> None:
+        """
+        그래프 프롬프트 등록
+
+        Args:
+            graph: 그래프명
+            preamble: 모든 노드에 공통인 형식 규칙 (노드마다 system 메시지 앞에 붙음)
+            tasks: 노드명 -> {"instructions": 지시사항, "output": 출력 형식, "data": 요청 데이터 템플릿}
+                   (지시사항/출력 형식은 고정 문자열, 중괄호는 {{ }}로 이스케이프)
+        """
+        prefixes: Dict[str, str] = {}
+        prompts: Dict[str, ChatPromptTemplate] = {}
+        for node, task in tasks.items():
+            sections: List[str] = [preamble, task["instructions"], f"출력 형식:\n{task['output']}"]
+            prefix = "\n\n".join(section for section in sections if section)
+            # 토큰 계산용으로 실제 전송되는 형태(이스케이프 해제) 보관
+            prefixes[node] = prefix.replace("{{", "{").replace("}}", "}")
+            prompts[node] = ChatPromptTemplate.from_messages([
+                ("system", prefix),
+                ("human", task["data"])
+            ])
+        self._prefixes[graph] = prefixes
+        self._prompts[graph] = prompts
+
+    def get(self, graph: str, node: str) -> ChatPromptTemplate:
+        return self._prompts[graph][node]
+
+    def prefix_tokens(self) -> Dict[str, Dict[str, int]]:
+        """그래프/노드별 고정 접두사 토큰 수"""
+        from ai_exercise_service.src.util.llm.token_budget import token_budget
+        from ai_exercise_service.src.util.monitoring.metrics import LLM_PROMPT_PREFIX_TOKENS
+
+        counts: Dict[str, Dict[str, int]] = {}
+        for graph, prefixes in self._prefixes.items():
+            counts[graph] = {}
+            for node, prefix in prefixes.items():
+                counts[graph][node] = token_budget.counter.count(prefix)
+                LLM_PROMPT_PREFIX_TOKENS.labels(graph, node).set(counts[graph][node])
+
+        cacheable = sorted(
+            f"{graph}.{node}" for graph, nodes in counts.items()
+            for node, count in nodes.items() if count >= settings.llm_prompt_cache_min_tokens
+        )
+        logger.info(
+            f"프롬프트 캐시 최소 길이({settings.llm_prompt_cache_min_tokens}토큰) 이상 접두사: "
+            f"{', '.join(cacheable) or '없음'}"
+        )
+        return counts
+
+
+# 전역 프롬프트 등록소 인스턴스
+prompt_registry = PromptRegistry()
@@ -0,0 +1,137 @@
+import threading
+from typing import Any, Dict, List, Optional
+import logging
+
+from ai_exercise_service.config.settings import settings
+from ai_exercise_service.src.util.monitoring.metrics import LLM_PROMPT_TOKENS_ESTIMATED, LLM_CONTEXT_TRIMS
+
+logger = logging.getLogger(__name__)
+
+# 메시지마다 붙는 역할/구분 토큰 근사값
+_MESSAGE_OVERHEAD_TOKENS = 4
+
+
+class TokenCounter:
+    """
+    로컬 토크나이저 기반 토큰 수 계산
+
+    tiktoken 인코딩 파일을 받을 수 없는 환경(오프라인)에서는 한글 1자 ≈ 1토큰,
+    그 외 4자 ≈ 1토큰으로 근사합니다.
+    """
+
+    def __init__(self, encoding_name: str):
+        self.encoding_name = encoding_name
+        self._encoding = None
+        self._unavailable = False
+        self._lock = threading.Lock()
+
+    def load(self) -> bool:
+        """인코딩 로드 (최초 1회, 첫 실행 시 인코딩 파일 다운로드 가능)"""
+        with self._lock:
+            if self._encoding is None and not self._unavailable:
+                try:
+                    import tiktoken
+                    self._encoding = tiktoken.get_encoding(self.encoding_name)
+                except Exception as e:
+                    self._unavailable = True
+                    logger.warning(f"토크나이저 로드 실패, 근사값 사용: {str(e)[:200]}")
+            return self._encoding is not None
+
+    def count(self, text: str) -> int:
+        if self.load():
+            return len(self._encoding.encode(text, disallowed_special=()))
+        hangul = sum(1 for ch in text if "가" <= ch <= "힣")
+        return hangul + (len(text) - hangul + 3) // 4
+
+
+class TokenBudget:
+    """
+    노드별 프롬프트 토큰 예산
+
+    구조화된 컨텍스트(dict)를 섹션 단위로 받아, 프롬프트가 예산을 넘으면
+    우선순위가 낮은 섹션부터 줄입니다 (리스트는 절반씩 자르고, 더 줄일 수 없으면 섹션 제거).
+    """
+
+    def __init__(self):
+        self.counter = TokenCounter(settings.llm_tokenizer_encoding)
+        self.default_budget = settings.llm_default_prompt_token_budget
+        self.node_budgets = settings.llm_prompt_token_budget
+
+    def budget_for(self, node: str) -> int:
+        return self.node_budgets.get(node, self.default_budget)
+
+    def estimate_prompt_tokens(self, prompt, inputs: Dict[str, Any]) -> int:
+        messages = prompt.format_messages(**inputs)
+        return sum(self.counter.count(str(message.content)) + _MESSAGE_OVERHEAD_TOKENS for message in messages)
+
+    def record_estimate(self, node: str, prompt, inputs: Dict[str, Any]) -> int:
+        """전송 전 프롬프트 토큰 수 추정 및 기록"""
+        tokens = self.estimate_prompt_tokens(prompt, inputs)
+        LLM_PROMPT_TOKENS_ESTIMATED.labels(node).observe(tokens)
+        logger.info(f"프롬프트 예상 토큰 ({node}): {tokens}")
+        return tokens
+
+    def fit_context(
+        self,
+        node: str,
+        prompt,
+        inputs: Dict[str, Any],
+        context_key: str,
+        sections: Dict[str, Any],
+        priority: List[str]
+    ) -> Dict[str, Any]:
+        """
+        예산 안에 들어가도록 섹션을 줄인 컨텍스트 반환 (프롬프트에는 str()로 들어간다고 가정)
+
+        Args:
+            node: 노드명 (예산 조회, 메트릭 라벨)
+            prompt: 노드의 ChatPromptTemplate
+            inputs: context_key를 제외한 나머지 프롬프트 변수
+            context_key: 컨텍스트가 들어갈 프롬프트 변수명
+            sections: 섹션명 -> 값
+            priority: 줄일 순서 (앞쪽일수록 먼저 줄임, 목록에 없는 섹션은 줄이지 않음)
+        """
+        budget = self.budget_for(node)
+        context = dict(sections)
+        fixed_tokens = self.estimate_prompt_tokens(prompt, {**inputs, context_key: ""})
+
+        def total() -> int:
+            return fixed_tokens + self.counter.count(str(context))
+
+        tokens = total()
+        if budget and tokens > budget:
+            original = tokens
+            for name in priority:
+                while name in context and tokens > budget:
+                    shrunk = _shrink(context[name])
+                    if shrunk is None:
+                        del context[name]
+                        LLM_CONTEXT_TRIMS.labels(node, name, "dropped").inc()
+                    else:
+                        context[name] = shrunk
+                        LLM_CONTEXT_TRIMS.labels(node, name, "truncated").inc()
+                    tokens = total()
+                if tokens <= budget:
+                    break
+            logger.info(f"프롬프트 컨텍스트 축소 ({node}): {original} -> {tokens} 토큰 (예산 {budget})")
+
+        return context
+
+
+def _shrink(value: Any) -> Optional[Any]:
+    """값을 대략 절반으로 줄인 복사본 (더 줄일 수 없으면 None)"""
+    if isinstance(value, list):
+        return value[:len(value) // 2] if len(value) > 1 else None
+    if isinstance(value, dict):
+        # 가장 큰 하위 값을 줄임 (예: {"data": [...], "statistics": {...}}의 data)
+        candidates = sorted(value, key=lambda key: len(str(value[key])), reverse=True)
+        for key in candidates:
+            shrunk = _shrink(value[key])
+            if shrunk is not None:
+                return {**value, key: shrunk}
+        return None
+    return None
+
+
+# 전역 토큰 예산 인스턴스
+token_budget = TokenBudget()
@@ -0,0 +1,269 @@
+import atexit
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import sys
+import threading
+import time
+import zlib
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Dict, List, Optional, TextIO, Tuple
+
+from ai_exercise_service.config.settings import settings
+from ai_exercise_service.src.util.monitoring.metrics import LOG_RECORDS_DROPPED
+from ai_exercise_service.src.util.monitoring.tracing import current_span, get_request_id
+from ai_exercise_service.src.util.serialization import json_codec
+
+# 같은 모듈이 경로에 따라 다른 이름으로 임포트되므로(ai_exercise_service.src.ai..., src.ai..., ai...)
+# 규칙은 이 접두사를 뗀 이름으로 비교
+_NAME_PREFIXES = ("ai_exercise_service.", "src.")
+# 이 레벨 이상은 샘플링/속도 제한 없이 항상 기록
+_ALWAYS_KEEP_LEVEL = logging.WARNING
+_TEXT_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - [%(request_id)s] %(message)s"
+
+
+def _normalize(name: str) -> str:
+    for prefix in _NAME_PREFIXES:
+        if name.startswith(prefix):
+            name = name[len(prefix):]
+    return name
+
+
+class RequestContextFilter(logging.Filter):
+    """로그를 남긴 스레드에서 요청 ID/trace/span ID를 레코드에 기록 (큐에 넣기 전)"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        span = current_span()
+        record.request_id = get_request_id() or "-"
+        record.trace_id = span.trace.trace_id if span is not None else None
+        record.span_id = span.span_id if span is not None else None
+        return True
+
+
+class HotPathFilter(logging.Filter):
+    """
+    로거별 샘플링/속도 제한 (WARNING 미만 레코드만)
+
+    - 샘플링: 요청 ID 해시로 결정해 한 요청의 로그는 모두 남기거나 모두 버림
+      (요청 밖 로그는 무작위)
+    - 속도 제한: 로거 규칙별 초당 최대 레코드 수 (토큰 버킷, 버스트 = 초당 한도)
+
+    규칙 키는 접두사를 뗀 로거 이름이며 하위 로거에도 적용됩니다 (가장 긴 키 우선).
+    """
+
+    def __init__(self, sample_rates: Dict[str, float], rate_limits: Dict[str, float]):
+        super().__init__()
+        self.sample_rates = {_normalize(key): rate for key, rate in sample_rates.items()}
+        self.rate_limits = {_normalize(key): limit for key, limit in rate_limits.items()}
+        self._buckets: Dict[str, Tuple[float, float]] = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= _ALWAYS_KEEP_LEVEL:
+            return True
+        sample_key, limit_key = self._rules(record.name)
+        if sample_key is not None and not self._sampled(self.sample_rates[sample_key], record):
+            LOG_RECORDS_DROPPED.labels(sample_key, "sampled").inc()
+            return False
+        if limit_key is not None and not self._take(limit_key):
+            LOG_RECORDS_DROPPED.labels(limit_key, "rate_limited").inc()
+            return False
+        return True
+
+    @lru_cache(maxsize=1024)
+    def _rules(self, name: str) -> Tuple[Optional[str], Optional[str]]:
+        name = _normalize(name)
+        return _longest_match(name, self.sample_rates), _longest_match(name, self.rate_limits)
+
+    @staticmethod
+    def _sampled(rate: float, record: logging.LogRecord) -> bool:
+        if rate >= 1.0:
+            return True
+        request_id = getattr(record, "request_id", "-")
+        if request_id == "-":
+            return random.random() < rate
+        return zlib.crc32(request_id.encode("utf-8")) / 0xFFFFFFFF < rate
+
+    def _take(self, key: str) -> bool:
+        limit = self.rate_limits[key]
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.get(key, (limit, now))
+            tokens = min(limit, tokens + (now - updated) * limit)
+            allowed = tokens >= 1.0
+            self._buckets[key] = (tokens - 1.0 if allowed else tokens, now)
+        return allowed
+
+
+def _longest_match(name: str, rules: Dict[str, float]) -> Optional[str]:
+    matches = [key for key in rules if name == key or name.startswith(key + ".")]
+    return max(matches, key=len) if matches else None
+
+
+class JsonFormatter(logging.Formatter):
+    """한 레코드를 한 줄 JSON으로 (요청 ID/trace ID로 trace JSONL과 연결)"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "request_id": getattr(record, "request_id", "-"),
+            "pid": record.process,
+            "thread": record.threadName
+        }
+        trace_id = getattr(record, "trace_id", None)
+        if trace_id:
+            entry["trace_id"] = trace_id
+            entry["span_id"] = record.span_id
+        if record.exc_text:
+            entry["exc_info"] = record.exc_text
+        if record.stack_info:
+            entry["stack_info"] = record.stack_info
+        return json_codec.dumps(entry).decode("utf-8")
+
+
+class _EnqueueHandler(logging.handlers.QueueHandler):
+    """호출 스레드에서는 메시지 확정과 예외 문자열화만 하고 포맷/쓰기는 전용 스레드에서"""
+
+    def __init__(self, pipeline: "LogPipeline"):
+        super().__init__(None)
+        self.pipeline = pipeline
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # 인자/트레이스백 객체는 다른 스레드로 넘기지 않음
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        self.pipeline.submit(record)
+
+
+class LogPipeline:
+    """
+    비동기 로그 파이프라인 (워커 프로세스별)
+
+    루트 로거에는 큐 핸들러만 두어 로그 호출 스레드(이벤트 루프 포함)는 큐에 넣기만 하고,
+    전용 스레드가 모아서 포맷한 뒤 한 번에 쓰고 flush합니다. 큐가 가득 차면 WARNING 미만
+    레코드는 버리고 메트릭으로 셉니다 (이벤트 루프를 막지 않음).
+    """
+
+    def __init__(self):
+        self.enabled = settings.log_async_enabled
+        self.batch_size = settings.log_batch_size
+        self._queue: "queue.Queue" = queue.Queue(maxsize=settings.log_queue_size)
+        self._stream: TextIO = sys.stderr
+        self._formatter: logging.Formatter = logging.Formatter(_TEXT_FORMAT)
+        self._handler: Optional[logging.Handler] = None
+        self._worker: Optional[threading.Thread] = None
+        self._worker_lock = threading.Lock()
+        # preload 후 fork된 워커에는 쓰기 스레드가 없으므로 새로 시작하도록 초기화
+        os.register_at_fork(after_in_child=self._reset_after_fork)
+
+    def _reset_after_fork(self) -> None:
+        self._queue = queue.Queue(maxsize=self._queue.maxsize)
+        self._worker = None
+        self._worker_lock = threading.Lock()
+
+    def configure(self, stream: TextIO = sys.stderr) -> None:
+        """루트 로거 핸들러 설정 (logging.basicConfig 대체, 앱 임포트 시 한 번 호출)"""
+        self._stream = stream
+        self._formatter = JsonFormatter() if settings.log_format == "json" else logging.Formatter(_TEXT_FORMAT)
+
+        if self.enabled:
+            handler: logging.Handler = _EnqueueHandler(self)
+            atexit.register(self.flush)
+        else:
+            handler = logging.StreamHandler(stream)
+            handler.setFormatter(self._formatter)
+        handler.addFilter(RequestContextFilter())
+        handler.addFilter(HotPathFilter(settings.log_sample_rates, settings.log_rate_limits))
+
+        # 두 형식 모두 호출 위치(파일/줄)와 프로세스 이름을 쓰지 않으므로 레코드마다 계산하지 않음
+        logging._srcfile = None
+        logging.logMultiprocessing = False
+
+        root = logging.getLogger()
+        for existing in list(root.handlers):
+            root.removeHandler(existing)
+        root.addHandler(handler)
+        root.setLevel(settings.log_level.upper())
+        self._handler = handler
+
+    def capture_uvicorn(self) -> None:
+        """uvicorn 로거도 같은 파이프라인으로 (uvicorn이 로깅을 설정한 뒤, lifespan에서 호출)"""
+        if self._handler is None or not settings.log_capture_uvicorn:
+            return
+        for name in ("uvicorn", "uvicorn.error", "uvicorn.access"):
+            uvicorn_logger = logging.getLogger(name)
+            uvicorn_logger.handlers.clear()
+            uvicorn_logger.propagate = True
+
+    def submit(self, record: logging.LogRecord) -> None:
+        self._ensure_worker()
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            if record.levelno < _ALWAYS_KEEP_LEVEL:
+                LOG_RECORDS_DROPPED.labels(_normalize(record.name), "queue_full").inc()
+                return
+            # 경고 이상은 잃지 않도록 잠깐 대기
+            try:
+                self._queue.put(record, timeout=0.1)
+            except queue.Full:
+                LOG_RECORDS_DROPPED.labels(_normalize(record.name), "queue_full").inc()
+
+    def flush(self, timeout: float = 2.0) -> None:
+        """대기 중인 레코드를 모두 쓸 때까지 대기 (종료 시)"""
+        deadline = time.monotonic() + timeout
+        while self._worker is not None and self._queue.unfinished_tasks and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+    def _ensure_worker(self) -> None:
+        if self._worker is not None:
+            return
+        with self._worker_lock:
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._run, name="log-writer", daemon=True)
+                self._worker.start()
+
+    def _run(self) -> None:
+        while True:
+            batch: List[logging.LogRecord] = [self._queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                self._write(batch)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    def _write(self, batch: List[logging.LogRecord]) -> None:
+        lines = []
+        for record in batch:
+            try:
+                lines.append(self._formatter.format(record))
+            except Exception as e:
+                lines.append(f"로그 포맷 실패 ({record.name}): {str(e)}")
+        try:
+            self._stream.write("\n".join(lines) + "\n")
+            self._stream.flush()
+        except Exception:
+            # 출력 스트림 오류는 로그로 남길 곳이 없으므로 무시 (다음 배치에서 재시도)
+            pass
+
+
+# 전역 로그 파이프라인 인스턴스
+log_pipeline = LogPipeline()
@@ -0,0 +1,171 @@
+import asyncio
+import os
+import sys
+import threading
+import time
+import traceback
+from typing import Any, Dict, List, Optional
+import logging
+
+from ai_exercise_service.config.settings import settings
+from ai_exercise_service.src.util.monitoring.metrics import EVENT_LOOP_BLOCKS, EVENT_LOOP_LAG, EVENT_LOOP_LAG_QUANTILE
+from ai_exercise_service.src.util.services.resilience import LatencyTracker
+
+logger = logging.getLogger(__name__)
+
+SERVICE_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../.."))
+# 지연 백분위 게이지로 내보낼 값
+LAG_QUANTILES = (50, 90, 99)
+
+
+class EventLoopMonitor:
+    """
+    이벤트 루프 지연 모니터 및 블로킹 호출 탐지기 (워커 프로세스별)
+
+    - 샘플러 태스크: interval마다 sleep이 예정보다 늦게 깨어난 시간(루프 지연)을 기록
+    - 감시 스레드: 샘플러가 threshold 이상 깨어나지 못하면 그 순간 루프 스레드의 스택을 캡처해
+      루프를 붙잡고 있는 코드 위치(서비스 코드 기준)와 실행 중인 태스크를 로그/메트릭으로 남김
+
+    같은 위치의 스택 로그는 log_interval마다 한 번만 남기고 횟수는 메트릭으로 셉니다.
+    """
+
+    def __init__(self):
+        self.enabled = settings.loop_monitor_enabled
+        self.interval = settings.loop_monitor_interval_seconds
+        self.threshold = settings.loop_monitor_block_threshold_seconds
+        self.log_interval = settings.loop_monitor_log_interval_seconds
+        self.dump_all_threads = settings.loop_monitor_dump_all_threads
+        self._lags = LatencyTracker(settings.loop_monitor_window)
+        self._lags_lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread_id: Optional[int] = None
+        self._heartbeat = 0.0
+        self._task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+        self._last_logged: Dict[str, float] = {}
+        self._blocks: Dict[str, Dict[str, Any]] = {}
+
+    def start(self) -> None:
+        """현재 이벤트 루프 감시 시작 (lifespan에서 호출)"""
+        if not self.enabled or self._task is not None:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._heartbeat = time.monotonic()
+        self._stopped.clear()
+        self._task = self._loop.create_task(self._sample(), name="event-loop-monitor")
+        self._watchdog = threading.Thread(target=self._watch, name="event-loop-watchdog", daemon=True)
+        self._watchdog.start()
+        logger.info(f"이벤트 루프 모니터 시작 (샘플 간격 {self.interval}초, 블로킹 기준 {self.threshold}초)")
+
+    async def stop(self) -> None:
+        self._stopped.set()
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _sample(self) -> None:
+        updated = time.monotonic()
+        while True:
+            expected = time.monotonic() + self.interval
+            self._heartbeat = time.monotonic()
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            self._heartbeat = now
+            lag = max(0.0, now - expected)
+            EVENT_LOOP_LAG.observe(lag)
+            with self._lags_lock:
+                self._lags.add(lag)
+            # 백분위 게이지는 초당 한 번만 갱신 (정렬 비용)
+            if now - updated >= 1.0:
+                updated = now
+                for pct, value in self.lag_percentiles().items():
+                    EVENT_LOOP_LAG_QUANTILE.labels(str(pct)).set(value)
+
+    def _watch(self) -> None:
+        """루프 밖 스레드에서 heartbeat가 멈췄는지 확인하고 멈춘 동안 한 번 스택 캡처"""
+        reported_heartbeat = None
+        while not self._stopped.wait(self.threshold / 2):
+            heartbeat = self._heartbeat
+            # 정상이어도 heartbeat는 최대 interval만큼 오래될 수 있음
+            stalled = time.monotonic() - heartbeat - self.interval
+            if stalled < self.threshold or heartbeat == reported_heartbeat:
+                continue
+            reported_heartbeat = heartbeat
+            try:
+                self._report_block(stalled)
+            except Exception as e:
+                logger.error(f"이벤트 루프 블로킹 스택 캡처 실패: {str(e)}")
+
+    def _report_block(self, stalled: float) -> None:
+        frame = sys._current_frames().get(self._loop_thread_id)
+        if frame is None:
+            return
+        stack = traceback.extract_stack(frame)
+        site = _blocking_site(stack)
+        task = asyncio.tasks._current_tasks.get(self._loop)
+
+        EVENT_LOOP_BLOCKS.labels(site).inc()
+        record = self._blocks.setdefault(site, {"count": 0, "max_stalled_seconds": 0.0})
+        record["count"] += 1
+        record["max_stalled_seconds"] = round(max(record["max_stalled_seconds"], stalled), 3)
+        record["task"] = _describe_task(task)
+
+        now = time.monotonic()
+        if now - self._last_logged.get(site, 0.0) < self.log_interval:
+            return
+        self._last_logged[site] = now
+
+        message = (
+            f"이벤트 루프 블로킹 감지 ({stalled:.2f}초 이상, {site}, 태스크 {record['task']}):\n"
+            + "".join(traceback.format_list(stack))
+        )
+        if self.dump_all_threads:
+            message += _other_thread_stacks(self._loop_thread_id)
+        logger.warning(message)
+
+    def lag_percentiles(self) -> Dict[int, float]:
+        with self._lags_lock:
+            return {pct: round(self._lags.percentile(pct) or 0.0, 4) for pct in LAG_QUANTILES}
+
+    def status(self) -> Dict[str, Any]:
+        """디버그 엔드포인트용 요약 (최근 지연 백분위, 위치별 블로킹 횟수)"""
+        return {
+            "enabled": self.enabled,
+            "running": self._task is not None,
+            "lag_seconds": {f"p{pct}": value for pct, value in self.lag_percentiles().items()},
+            "blocking_sites": dict(sorted(self._blocks.items(), key=lambda item: -item[1]["count"]))
+        }
+
+
+def _blocking_site(stack: List[traceback.FrameSummary]) -> str:
+    """스택에서 루프를 붙잡은 서비스 코드 위치 (없으면 가장 안쪽 프레임)"""
+    for frame in reversed(stack):
+        filename = os.path.abspath(frame.filename)
+        if filename.startswith(SERVICE_ROOT) and filename != os.path.abspath(__file__):
+            return f"{os.path.relpath(filename, SERVICE_ROOT)}:{frame.name}"
+    innermost = stack[-1]
+    return f"{os.path.basename(innermost.filename)}:{innermost.name}"
+
+
+def _describe_task(task: Optional[asyncio.Task]) -> str:
+    if task is None:
+        return "없음 (콜백)"
+    coro = task.get_coro()
+    return f"{task.get_name()} {getattr(coro, '__qualname__', type(coro).__name__)}"
+
+
+def _other_thread_stacks(loop_thread_id: int) -> str:
+    names = {thread.ident: thread.name for thread in threading.enumerate()}
+    sections = []
+    for thread_id, frame in sys._current_frames().items():
+        if thread_id == loop_thread_id:
+            continue
+        sections.append(f"\n--- 스레드 {names.get(thread_id, thread_id)} ---\n" + "".join(traceback.format_stack(frame)))
+    return "".join(sections)
+
+
+# 전역 이벤트 루프 모니터 인스턴스
+loop_monitor = EventLoopMonitor()
@@ -0,0 +1,367 @@
+import contextvars
+import functools
+import inspect
+import os
+import re
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+import logging
+
+from prometheus_client import CONTENT_TYPE_LATEST, Counter, Gauge, Histogram, generate_latest
+
+from ai_exercise_service.src.util.monitoring.profiler import request_profiler
+from ai_exercise_service.src.util.monitoring.tracing import span
+
+logger = logging.getLogger(__name__)
+
+# 수 초~수십 초 단위 LLM/그래프 호출까지 포함하는 버킷
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0)
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "라우트별 HTTP 요청 처리 시간",
+    ["method", "route", "status"],
+    buckets=LATENCY_BUCKETS
+)
+GRAPH_NODE_LATENCY = Histogram(
+    "graph_node_duration_seconds",
+    "LangGraph 노드별 실행 시간",
+    ["graph", "node", "outcome"],
+    buckets=LATENCY_BUCKETS
+)
+SPRING_LATENCY = Histogram(
+    "spring_request_duration_seconds",
+    "Spring API 호출 시간 (엔드포인트 경로별)",
+    ["service", "method", "path"],
+    buckets=LATENCY_BUCKETS
+)
+SPRING_REQUESTS = Counter(
+    "spring_requests_total",
+    "Spring API 호출 수 (응답 상태별)",
+    ["service", "method", "path", "status"]
+)
+SPRING_CIRCUIT_STATE = Gauge(
+    "spring_circuit_state",
+    "Spring 엔드포인트별 서킷 상태 (0=closed, 1=half_open, 2=open)",
+    ["method", "path"],
+    multiprocess_mode="livemax"
+)
+SPRING_CIRCUIT_TRANSITIONS = Counter(
+    "spring_circuit_transitions_total",
+    "Spring 엔드포인트별 서킷 상태 전환 수",
+    ["method", "path", "state"]
+)
+SPRING_HEDGES = Counter(
+    "spring_hedged_requests_total",
+    "Spring 헤지 요청 수 (fired=추가 요청 발송, won=추가 요청이 먼저 응답)",
+    ["method", "path", "result"]
+)
+ADMISSION_IN_FLIGHT = Gauge(
+    "admission_in_flight_requests",
+    "라우트 분류별 처리 중인 요청 수",
+    ["route_class"],
+    multiprocess_mode="livesum"
+)
+ADMISSION_QUEUE_DEPTH = Gauge(
+    "admission_queue_depth",
+    "라우트 분류별 대기열 길이",
+    ["route_class"],
+    multiprocess_mode="livesum"
+)
+ADMISSION_QUEUE_WAIT = Histogram(
+    "admission_queue_wait_seconds",
+    "처리 시작 전 대기열에서 기다린 시간",
+    ["route_class"],
+    buckets=LATENCY_BUCKETS
+)
+ADMISSION_REJECTED = Counter(
+    "admission_rejected_total",
+    "대기열 초과로 거절(503)한 요청 수",
+    ["route_class", "reason"]
+)
+BROWNOUT_ACTIVE = Gauge(
+    "brownout_active",
+    "브라운아웃(규칙 기반 추천 전환) 상태 (1=전환 중)",
+    multiprocess_mode="livemax"
+)
+BROWNOUT_TRANSITIONS = Counter(
+    "brownout_transitions_total",
+    "브라운아웃 상태 전환 수",
+    ["state", "reason"]
+)
+LLM_IN_FLIGHT = Gauge(
+    "llm_in_flight_calls",
+    "진행 중인 LLM 호출 수",
+    multiprocess_mode="livesum"
+)
+LLM_LATENCY = Histogram(
+    "llm_call_duration_seconds",
+    "LLM 호출 시간",
+    ["node", "model"],
+    buckets=LATENCY_BUCKETS
+)
+LLM_TOKENS = Counter(
+    "llm_tokens_total",
+    "LLM 토큰 사용량",
+    ["node", "model", "kind"]
+)
+# 프롬프트/요청 단위 토큰 수 버킷
+TOKEN_BUCKETS = (100, 250, 500, 1000, 2000, 4000, 8000, 16000, 32000, 64000, 128000)
+
+LLM_PROMPT_TOKENS_ESTIMATED = Histogram(
+    "llm_prompt_tokens_estimated",
+    "전송 전 로컬 토크나이저로 추정한 노드별 프롬프트 토큰 수",
+    ["node"],
+    buckets=TOKEN_BUCKETS
+)
+LLM_CONTEXT_TRIMS = Counter(
+    "llm_context_trims_total",
+    "토큰 예산 초과로 줄이거나 제거한 컨텍스트 섹션 수",
+    ["node", "section", "action"]
+)
+LLM_PROMPT_PREFIX_TOKENS = Gauge(
+    "llm_prompt_prefix_tokens",
+    "노드별 프롬프트 고정 접두사(system 메시지) 토큰 수 (프롬프트 캐시 대상)",
+    ["graph", "node"],
+    multiprocess_mode="livemax"
+)
+REQUEST_TOKENS = Histogram(
+    "http_request_llm_tokens",
+    "요청 하나가 사용한 LLM 토큰 수",
+    ["route", "kind"],
+    buckets=TOKEN_BUCKETS
+)
+EVENT_LOOP_LAG = Histogram(
+    "event_loop_lag_seconds",
+    "이벤트 루프 지연 (예정보다 늦게 깨어난 시간)",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+)
+EVENT_LOOP_LAG_QUANTILE = Gauge(
+    "event_loop_lag_quantile_seconds",
+    "최근 샘플 기준 이벤트 루프 지연 백분위 (워커별 최댓값)",
+    ["quantile"],
+    multiprocess_mode="livemax"
+)
+EVENT_LOOP_BLOCKS = Counter(
+    "event_loop_blocking_total",
+    "이벤트 루프를 기준 시간 이상 붙잡은 횟수 (코드 위치별)",
+    ["site"]
+)
+LOG_RECORDS_DROPPED = Counter(
+    "log_records_dropped_total",
+    "버린 로그 레코드 수 (sampled: 샘플링 제외, rate_limited: 속도 제한, queue_full: 큐 초과)",
+    ["logger", "reason"]
+)
+LLM_ERRORS = Counter(
+    "llm_errors_total",
+    "LLM 호출 실패 수",
+    ["node", "model"]
+)
+LLM_FALLBACKS = Counter(
+    "llm_fallback_total",
+    "LLM 결과 대신 기본값/규칙 기반 결과를 사용한 횟수",
+    ["node", "reason"]
+)
+LLM_RETRIES = Counter(
+    "llm_retries_total",
+    "일시적 오류로 인한 LLM 재시도 수",
+    ["node", "error"]
+)
+LLM_HEDGES = Counter(
+    "llm_hedges_total",
+    "LLM 헤지 요청 수 (fired: 발송, won: 헤지 응답이 먼저 도착)",
+    ["node", "outcome"]
+)
+RECOMPUTE_EVENTS = Counter(
+    "recommendation_recompute_events_total",
+    "식사 기록 변경 이벤트 처리 결과 (scheduled/coalesced/invalidated/ignored/rejected)",
+    ["outcome"]
+)
+MEAL_FEEDBACK_VARIANTS = Counter(
+    "meal_feedback_variant_lookups_total",
+    "급식 피드백 변형 풀 조회 결과 (hit: 풀에서 응답, miss: 요청에서 생성, skipped: 일부 데이터 조회 실패로 풀 미사용)",
+    ["outcome"]
+)
+MEAL_MONTH_SUMMARIES = Counter(
+    "meal_month_summary_lookups_total",
+    "여러 달 급식 리뷰의 월별 요약 조회 결과 (hit: 저장된 요약 사용, miss: LLM 요약 생성)",
+    ["outcome"]
+)
+MEAL_AMOUNT_RECORDS = Counter(
+    "meal_amount_sync_records_total",
+    "급식량 평가 증분 집계 레코드 수 (fetched: Spring에서 받음, applied: 카운터에 새로 반영)",
+    ["outcome"]
+)
+MEAL_FEEDBACK_VARIANT_FILLS = Counter(
+    "meal_feedback_variant_fills_total",
+    "백그라운드 급식 피드백 변형 생성 수",
+    ["status"]
+)
+RECOMPUTE_RUNS = Counter(
+    "recommendation_recompute_runs_total",
+    "백그라운드 운동 추천 재계산 실행 수",
+    ["status"]
+)
+
+
+class RequestTokenUsage:
+    """요청 하나의 노드별 토큰 사용량 (노드 스레드/헤지 호출에서 함께 갱신)"""
+
+    def __init__(self):
+        self.by_node: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def add(self, node: str, usage: Dict[str, int]) -> None:
+        with self._lock:
+            totals = self.by_node.setdefault(node, {"input_tokens": 0, "output_tokens": 0, "cached_tokens": 0})
+            for key in totals:
+                totals[key] += int(usage.get(key, 0) or 0)
+
+    def totals(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                key: sum(node_usage[key] for node_usage in self.by_node.values())
+                for key in ("input_tokens", "output_tokens", "cached_tokens")
+            }
+
+
+_request_usage: contextvars.ContextVar[Optional[RequestTokenUsage]] = contextvars.ContextVar(
+    "request_token_usage", default=None
+)
+
+
+def start_request_usage() -> contextvars.Token:
+    """현재 요청의 토큰 사용량 집계 시작 (미들웨어에서 호출)"""
+    return _request_usage.set(RequestTokenUsage())
+
+
+def current_request_usage() -> Optional[RequestTokenUsage]:
+    return _request_usage.get()
+
+
+def reset_request_usage(token: contextvars.Token) -> None:
+    _request_usage.reset(token)
+
+
+# 경로 파라미터를 템플릿으로 치환해 라벨 카디널리티를 제한
+_DATE_SEGMENT = re.compile(r"^\d{4}-\d{2}(-\d{2})?$")
+
+
+def normalize_path(path: str) -> str:
+    """/eater/user/12/date/2025-03-01 -> /eater/user/{id}/date/{date}"""
+    segments = []
+    for segment in path.split("/"):
+        if segment.isdigit():
+            segments.append("{id}")
+        elif _DATE_SEGMENT.match(segment):
+            segments.append("{date}")
+        else:
+            segments.append(segment)
+    return "/".join(segments)
+
+
+def observe_spring_call(service: str, method: str, path: str, status: str, duration: float) -> None:
+    """Spring 호출 지연시간 및 상태 기록"""
+    SPRING_LATENCY.labels(service, method, path).observe(duration)
+    SPRING_REQUESTS.labels(service, method, path, status).inc()
+
+
+def record_llm_fallback(node: str, reason: str = "json_parse") -> None:
+    """LLM 결과 대신 기본값 경로가 사용된 횟수 기록"""
+    LLM_FALLBACKS.labels(node, reason).inc()
+
+
+def instrument_node(graph: str, node: str, func: Callable) -> Callable:
+    """LangGraph 노드 실행 시간 측정 및 span 기록 래퍼 (sync/async 노드 모두 지원)"""
+    def _outcome(result: Any) -> str:
+        return "error" if isinstance(result, dict) and result.get("error_message") else "ok"
+
+    if inspect.iscoroutinefunction(func):
+        @functools.wraps(func)
+        async def async_wrapper(state):
+            start = time.perf_counter()
+            outcome = "exception"
+            try:
+                with span(f"node {graph}.{node}") as node_span:
+                    result = await func(state)
+                    outcome = _outcome(result)
+                    if node_span is not None and outcome == "error":
+                        node_span.status = "error"
+                return result
+            finally:
+                GRAPH_NODE_LATENCY.labels(graph, node, outcome).observe(time.perf_counter() - start)
+        return async_wrapper
+
+    @functools.wraps(func)
+    def wrapper(state):
+        start = time.perf_counter()
+        outcome = "exception"
+        try:
+            # 동기 노드는 워커 스레드에서 실행되므로 프로파일 중인 요청이면 이 스레드도 샘플링
+            with request_profiler.profiled_thread(), span(f"node {graph}.{node}") as node_span:
+                result = func(state)
+                outcome = _outcome(result)
+                if node_span is not None and outcome == "error":
+                    node_span.status = "error"
+            return result
+        finally:
+            GRAPH_NODE_LATENCY.labels(graph, node, outcome).observe(time.perf_counter() - start)
+    return wrapper
+
+
+class MetricsMiddleware:
+    """라우트 템플릿 기준 요청 지연시간 측정 ASGI 미들웨어"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status_code = [500]
+        usage_token = start_request_usage()
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status_code[0] = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get("route")
+            route_path = getattr(route, "path", None) or "unmatched"
+            REQUEST_LATENCY.labels(scope["method"], route_path, str(status_code[0])).observe(
+                time.perf_counter() - start
+            )
+            usage = current_request_usage()
+            reset_request_usage(usage_token)
+            if usage.by_node:
+                totals = usage.totals()
+                REQUEST_TOKENS.labels(route_path, "prompt").observe(totals["input_tokens"])
+                REQUEST_TOKENS.labels(route_path, "completion").observe(totals["output_tokens"])
+                REQUEST_TOKENS.labels(route_path, "cached").observe(totals["cached_tokens"])
+                logger.info(
+                    f"요청 토큰 사용량 {route_path}: 입력 {totals['input_tokens']} (캐시 {totals['cached_tokens']}), "
+                    f"출력 {totals['output_tokens']} "
+                    f"(노드별 {usage.by_node})"
+                )
+
+
+def render_metrics() -> tuple:
+    """
+    Prometheus 텍스트 포맷 (본문, content-type)
+
+    gunicorn 멀티 워커 실행 시(PROMETHEUS_MULTIPROC_DIR 설정) 모든 워커의 값을 합쳐 반환합니다.
+    """
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import CollectorRegistry, multiprocess
+
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(), CONTENT_TYPE_LATEST
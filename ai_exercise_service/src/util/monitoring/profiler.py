@@ -0,0 +1,242 @@
+import asyncio
+import contextvars
+import hmac
+import os
+import random
+import re
+import sys
+import threading
+import time
+import weakref
+from collections import Counter
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Dict, Iterator, List, Optional, Set
+import logging
+
+from ai_exercise_service.config.settings import settings
+from ai_exercise_service.src.util.monitoring.tracing import current_span, get_request_id
+
+logger = logging.getLogger(__name__)
+
+SERVICE_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../.."))
+PROFILE_HEADER = "x-profile"
+_SAFE_ID = re.compile(r"[^A-Za-z0-9_.-]")
+
+
+class ProfileSession:
+    """요청 하나의 프로파일 (요청에 속한 태스크/스레드에서 수집한 스택 샘플)"""
+
+    def __init__(self, request_id: str, path: str):
+        self.request_id = request_id
+        self.path = path
+        self.started = time.perf_counter()
+        self.tasks: "weakref.WeakSet[asyncio.Task]" = weakref.WeakSet()
+        self.threads: Dict[int, int] = {}
+        self.samples: Counter = Counter()
+        self.sample_count = 0
+
+
+_active_session: contextvars.ContextVar[Optional[ProfileSession]] = contextvars.ContextVar(
+    "profile_session", default=None
+)
+
+
+class RequestProfiler:
+    """
+    요청 단위 통계적 프로파일러 (관리자 헤더로 켜는 opt-in 방식)
+
+    샘플러 스레드가 interval마다 모든 스레드의 스택을 읽고, 프로파일 중인 요청에 속한 것만
+    folded 스택(flamegraph.pl, speedscope, inferno 호환)으로 모읍니다.
+    - 이벤트 루프 스레드: 실행 중인 태스크가 요청 컨텍스트에서 만들어진 태스크일 때
+    - 워커 스레드: 요청 컨텍스트에서 실행 중인 동기 그래프 노드
+    결과는 요청 ID 이름의 파일로 저장하고 응답 헤더/trace span에 연결합니다.
+    """
+
+    def __init__(self):
+        self.enabled = settings.profiling_enabled
+        self.admin_token = settings.profiling_admin_token
+        self.sample_rate = settings.profiling_sample_rate
+        self.interval = settings.profiling_interval_ms / 1000
+        self.routes = settings.profiling_routes
+        self.max_samples = settings.profiling_max_samples
+        self.output_dir = settings.profiling_output_dir
+        if not os.path.isabs(self.output_dir):
+            self.output_dir = os.path.join(SERVICE_ROOT, self.output_dir)
+        self._sessions: Set[ProfileSession] = set()
+        self._lock = threading.Lock()
+        self._sampler: Optional[threading.Thread] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread_id: Optional[int] = None
+
+    def install(self) -> None:
+        """현재 이벤트 루프에 태스크 추적용 task factory 설치 (lifespan에서 호출)"""
+        if not self.enabled or not self.admin_token:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        previous = self._loop.get_task_factory()
+
+        def task_factory(loop, coro, **kwargs):
+            task = previous(loop, coro, **kwargs) if previous else asyncio.Task(coro, loop=loop, **kwargs)
+            # 명시적 컨텍스트로 만든 태스크(백그라운드 작업)는 그 컨텍스트 기준
+            context = kwargs.get("context")
+            session = context.get(_active_session) if context is not None else _active_session.get()
+            if session is not None:
+                session.tasks.add(task)
+            return task
+
+        self._loop.set_task_factory(task_factory)
+        logger.info(f"요청 프로파일링 활성화 (샘플 간격 {self.interval * 1000:.0f}ms, 샘플링 {self.sample_rate})")
+
+    def should_profile(self, path: str, header_value: Optional[str]) -> bool:
+        if not self.enabled or not self.admin_token or self._loop is None or not header_value:
+            return False
+        if not any(path.startswith(route) for route in self.routes):
+            return False
+        if not hmac.compare_digest(header_value.encode("utf-8"), self.admin_token.encode("utf-8")):
+            logger.warning(f"프로파일 요청 헤더 불일치: {path}")
+            return False
+        return random.random() < self.sample_rate
+
+    def start(self, path: str) -> ProfileSession:
+        session = ProfileSession(get_request_id() or f"req-{time.time_ns()}", path)
+        session.tasks.add(asyncio.current_task())
+        with self._lock:
+            self._sessions.add(session)
+            if self._sampler is None:
+                self._sampler = threading.Thread(target=self._sample, name="request-profiler", daemon=True)
+                self._sampler.start()
+        return session
+
+    def finish(self, session: ProfileSession) -> None:
+        with self._lock:
+            self._sessions.discard(session)
+
+    @contextmanager
+    def profiled_thread(self) -> Iterator[None]:
+        """프로파일 중인 요청의 작업을 실행하는 동안 현재 스레드를 샘플링 대상으로 등록"""
+        session = _active_session.get()
+        if session is None:
+            yield
+            return
+        thread_id = threading.get_ident()
+        session.threads[thread_id] = session.threads.get(thread_id, 0) + 1
+        try:
+            yield
+        finally:
+            session.threads[thread_id] -= 1
+            if not session.threads[thread_id]:
+                del session.threads[thread_id]
+
+    def _sample(self) -> None:
+        names: Dict[int, str] = {}
+        while True:
+            time.sleep(self.interval)
+            with self._lock:
+                sessions = list(self._sessions)
+                if not sessions:
+                    self._sampler = None
+                    return
+            frames = sys._current_frames()
+            loop_task = asyncio.tasks._current_tasks.get(self._loop)
+            for session in sessions:
+                if session.sample_count >= self.max_samples:
+                    continue
+                if loop_task is not None and loop_task in session.tasks:
+                    frame = frames.get(self._loop_thread_id)
+                    if frame is not None:
+                        self._record(session, "event-loop", frame)
+                for thread_id in list(session.threads):
+                    frame = frames.get(thread_id)
+                    if frame is None:
+                        continue
+                    if thread_id not in names:
+                        names = {thread.ident: thread.name for thread in threading.enumerate()}
+                    self._record(session, names.get(thread_id, str(thread_id)), frame)
+
+    def _record(self, session: ProfileSession, thread_name: str, frame) -> None:
+        labels: List[str] = []
+        while frame is not None:
+            labels.append(_frame_label(frame.f_code.co_filename, frame.f_code.co_name, frame.f_code.co_firstlineno))
+            frame = frame.f_back
+        labels.append(f"thread {thread_name}")
+        session.samples[";".join(reversed(labels))] += 1
+        session.sample_count += 1
+
+    def write(self, session: ProfileSession) -> Optional[str]:
+        """folded 스택 파일 저장 후 경로 반환 (샘플이 없으면 None)"""
+        if not session.samples:
+            return None
+        os.makedirs(self.output_dir, exist_ok=True)
+        path = os.path.join(self.output_dir, f"{_SAFE_ID.sub('_', session.request_id)}.folded")
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, count in session.samples.most_common():
+                f.write(f"{stack} {count}\n")
+        return path
+
+
+@lru_cache(maxsize=4096)
+def _frame_label(filename: str, name: str, first_line: int) -> str:
+    path = os.path.abspath(filename)
+    if path.startswith(SERVICE_ROOT):
+        path = os.path.relpath(path, SERVICE_ROOT)
+    elif "site-packages" + os.sep in path:
+        path = path.split("site-packages" + os.sep, 1)[1]
+    else:
+        path = os.path.basename(path)
+    return f"{name} ({path}:{first_line})".replace(";", ":")
+
+
+# 전역 요청 프로파일러 인스턴스
+request_profiler = RequestProfiler()
+
+
+class ProfilingMiddleware:
+    """관리자 헤더가 있는 요청을 샘플링해 프로파일하는 ASGI 미들웨어 (TracingMiddleware 안쪽)"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not request_profiler.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        header_value = None
+        for key, value in scope.get("headers", []):
+            if key.decode("latin-1").lower() == PROFILE_HEADER:
+                header_value = value.decode("latin-1")
+                break
+        if not request_profiler.should_profile(scope["path"], header_value):
+            await self.app(scope, receive, send)
+            return
+
+        session = request_profiler.start(scope["path"])
+        token = _active_session.set(session)
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", [])) + [
+                    (b"x-profile-id", session.request_id.encode("latin-1"))
+                ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _active_session.reset(token)
+            request_profiler.finish(session)
+            elapsed = time.perf_counter() - session.started
+            try:
+                path = await asyncio.to_thread(request_profiler.write, session)
+            except Exception as e:
+                path = None
+                logger.error(f"요청 프로파일 저장 실패: {str(e)}")
+            root_span = current_span()
+            if root_span is not None and path:
+                root_span.set_attribute("profile", os.path.basename(path))
+            logger.info(
+                f"요청 프로파일 저장 ({session.request_id}, {scope['path']}, {elapsed:.2f}초, "
+                f"샘플 {session.sample_count}개): {path}"
+            )
@@ -0,0 +1,357 @@
+import abc
+import contextvars
+import functools
+import json
+import os
+import queue
+import random
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional
+import logging
+
+from ai_exercise_service.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+SERVICE_ROOT = os.path.join(os.path.dirname(__file__), '../../..')
+SERVICE_NAME = "let-ai-server"
+REQUEST_ID_HEADER = "x-request-id"
+
+
+class Span:
+    """단일 작업 구간 (시작/종료 시각, 부모 span, 속성)"""
+
+    __slots__ = ("trace", "span_id", "parent_id", "name", "start_ns", "end_ns", "attributes", "status")
+
+    def __init__(self, trace: "Trace", name: str, parent_id: Optional[str], attributes: Dict[str, Any]):
+        self.trace = trace
+        self.span_id = uuid.uuid4().hex[:16]
+        self.parent_id = parent_id
+        self.name = name
+        self.start_ns = time.time_ns()
+        self.end_ns = 0
+        self.attributes = attributes
+        self.status = "ok"
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def end(self, status: Optional[str] = None) -> None:
+        if self.end_ns:
+            return
+        if status:
+            self.status = status
+        self.end_ns = time.time_ns()
+        self.trace.spans.append(self)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "trace_id": self.trace.trace_id,
+            "request_id": self.trace.request_id,
+            "span_id": self.span_id,
+            "parent_span_id": self.parent_id,
+            "name": self.name,
+            "start_ns": self.start_ns,
+            "end_ns": self.end_ns,
+            "duration_ms": round((self.end_ns - self.start_ns) / 1e6, 3),
+            "status": self.status,
+            "attributes": self.attributes
+        }
+
+
+class Trace:
+    """요청 하나에 속한 span 모음"""
+
+    __slots__ = ("trace_id", "request_id", "sampled", "spans")
+
+    def __init__(self, request_id: Optional[str], sampled: bool):
+        self.trace_id = uuid.uuid4().hex
+        self.request_id = request_id or self.trace_id
+        self.sampled = sampled
+        self.spans: List[Span] = []
+
+
+_current_trace: contextvars.ContextVar[Optional[Trace]] = contextvars.ContextVar("current_trace", default=None)
+_current_span: contextvars.ContextVar[Optional[Span]] = contextvars.ContextVar("current_span", default=None)
+
+
+def get_request_id() -> Optional[str]:
+    """현재 요청 ID (요청 컨텍스트 밖이면 None)"""
+    trace = _current_trace.get()
+    return trace.request_id if trace else None
+
+
+def current_span() -> Optional[Span]:
+    """현재 컨텍스트의 span (미들웨어에서는 요청 루트 span)"""
+    return _current_span.get()
+
+
+def start_span(name: str, **attributes: Any) -> Optional[Span]:
+    """
+    현재 span의 자식 span 시작 (컨텍스트 전환 없음)
+
+    콜백처럼 시작/종료 지점이 분리된 곳에서 사용하며, 반드시 end()를 호출해야 합니다.
+    """
+    trace = _current_trace.get()
+    if trace is None:
+        return None
+    parent = _current_span.get()
+    return Span(trace, name, parent.span_id if parent else None, attributes)
+
+
+@contextmanager
+def span(name: str, **attributes: Any) -> Iterator[Optional[Span]]:
+    """현재 span의 자식 span을 열고 블록 동안 현재 span으로 설정"""
+    current = start_span(name, **attributes)
+    if current is None:
+        yield None
+        return
+
+    token = _current_span.set(current)
+    try:
+        yield current
+    except BaseException:
+        current.end("error")
+        raise
+    finally:
+        _current_span.reset(token)
+        current.end()
+
+
+def traced(name: str) -> Callable:
+    """async 함수 전체를 span으로 기록하는 데코레이터"""
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            with span(name):
+                return await func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def inject_headers(headers) -> None:
+    """다운스트림 호출 헤더에 요청 ID와 W3C traceparent 추가"""
+    trace = _current_trace.get()
+    if trace is None:
+        return
+    parent = _current_span.get()
+    headers["X-Request-ID"] = trace.request_id
+    if parent is not None:
+        headers["traceparent"] = f"00-{trace.trace_id}-{parent.span_id}-{'01' if trace.sampled else '00'}"
+
+
+class SpanExporter(abc.ABC):
+    """완료된 trace를 백그라운드 스레드에서 내보내는 기본 클래스 (export만 구현)"""
+
+    def __init__(self, max_queue_size: int = 1000):
+        self._queue: "queue.Queue[List[Dict[str, Any]]]" = queue.Queue(maxsize=max_queue_size)
+        self._worker: Optional[threading.Thread] = None
+        self._worker_lock = threading.Lock()
+        # preload 후 fork된 워커에는 내보내기 스레드가 없으므로 새로 시작하도록 초기화
+        os.register_at_fork(after_in_child=self._reset_after_fork)
+
+    def _reset_after_fork(self) -> None:
+        self._queue = queue.Queue(maxsize=self._queue.maxsize)
+        self._worker = None
+        self._worker_lock = threading.Lock()
+
+    def submit(self, spans: List[Dict[str, Any]]) -> None:
+        self._ensure_worker()
+        try:
+            self._queue.put_nowait(spans)
+        except queue.Full:
+            logger.warning("트레이스 내보내기 큐가 가득 차 trace를 버립니다")
+
+    def flush(self, timeout: float = 5.0) -> None:
+        """대기 중인 trace를 모두 내보낼 때까지 대기"""
+        deadline = time.monotonic() + timeout
+        while self._queue.unfinished_tasks and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+    @abc.abstractmethod
+    def export(self, spans: List[Dict[str, Any]]) -> None:
+        """trace 하나의 span 목록을 내보냄 (내보내기 스레드에서 호출)"""
+
+    def _ensure_worker(self) -> None:
+        if self._worker is not None:
+            return
+        with self._worker_lock:
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._run, name="span-exporter", daemon=True)
+                self._worker.start()
+
+    def _run(self) -> None:
+        while True:
+            spans = self._queue.get()
+            try:
+                self.export(spans)
+            except Exception as e:
+                logger.warning(f"트레이스 내보내기 실패: {str(e)}")
+            finally:
+                self._queue.task_done()
+
+
+class JsonlSpanExporter(SpanExporter):
+    """span을 한 줄씩 JSONL 파일에 기록"""
+
+    def __init__(self, path: str):
+        super().__init__()
+        self.path = path if os.path.isabs(path) else os.path.join(SERVICE_ROOT, path)
+
+    def export(self, spans: List[Dict[str, Any]]) -> None:
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as f:
+            for item in spans:
+                f.write(json.dumps(item, ensure_ascii=False, default=str) + "\n")
+
+
+class OtlpHttpSpanExporter(SpanExporter):
+    """OTLP/HTTP JSON 형식으로 수집기(/v1/traces)에 전송"""
+
+    def __init__(self, endpoint: str):
+        super().__init__()
+        self.endpoint = endpoint
+
+    def export(self, spans: List[Dict[str, Any]]) -> None:
+        import httpx
+
+        response = httpx.post(self.endpoint, json=to_otlp_payload(spans), timeout=5.0)
+        response.raise_for_status()
+
+
+def to_otlp_payload(spans: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """내부 span 목록을 OTLP JSON (ExportTraceServiceRequest) 형태로 변환"""
+    def attribute(key: str, value: Any) -> Dict[str, Any]:
+        if isinstance(value, bool):
+            return {"key": key, "value": {"boolValue": value}}
+        if isinstance(value, int):
+            return {"key": key, "value": {"intValue": str(value)}}
+        if isinstance(value, float):
+            return {"key": key, "value": {"doubleValue": value}}
+        return {"key": key, "value": {"stringValue": str(value)}}
+
+    otlp_spans = []
+    for item in spans:
+        otlp_span = {
+            "traceId": item["trace_id"],
+            "spanId": item["span_id"],
+            "name": item["name"],
+            "kind": 1,
+            "startTimeUnixNano": str(item["start_ns"]),
+            "endTimeUnixNano": str(item["end_ns"]),
+            "attributes": [attribute("request_id", item["request_id"])]
+            + [attribute(k, v) for k, v in item["attributes"].items()],
+            "status": {"code": 2 if item["status"] == "error" else 1}
+        }
+        if item["parent_span_id"]:
+            otlp_span["parentSpanId"] = item["parent_span_id"]
+        otlp_spans.append(otlp_span)
+
+    return {
+        "resourceSpans": [{
+            "resource": {"attributes": [attribute("service.name", SERVICE_NAME)]},
+            "scopeSpans": [{"scope": {"name": "let-ai.tracing"}, "spans": otlp_spans}]
+        }]
+    }
+
+
+class Tracer:
+    """
+    요청 단위 span 추적기
+
+    - 요청 시작 시 샘플링 여부를 결정하고, 느린 요청은 샘플링과 무관하게 항상 내보냄
+    - span은 요청이 끝날 때 한 번에 내보내 요청 경로의 I/O를 피함
+    """
+
+    def __init__(self):
+        self.enabled = settings.tracing_enabled
+        self.sample_rate = settings.trace_sample_rate
+        self.slow_threshold_ns = int(settings.trace_slow_threshold_seconds * 1e9)
+        self._exporter: Optional[SpanExporter] = None
+
+    @property
+    def exporter(self) -> SpanExporter:
+        if self._exporter is None:
+            if settings.trace_exporter == "otlp":
+                self._exporter = OtlpHttpSpanExporter(settings.trace_otlp_endpoint)
+            else:
+                self._exporter = JsonlSpanExporter(settings.trace_jsonl_path)
+        return self._exporter
+
+    @exporter.setter
+    def exporter(self, exporter: SpanExporter) -> None:
+        self._exporter = exporter
+
+    def start_trace(self, request_id: Optional[str] = None, name: str = "request", **attributes: Any):
+        """요청 trace와 루트 span 시작, (루트 span, 컨텍스트 토큰) 반환"""
+        if not self.enabled:
+            return None, None
+        trace = Trace(request_id, random.random() < self.sample_rate)
+        trace_token = _current_trace.set(trace)
+        root = Span(trace, name, None, attributes)
+        span_token = _current_span.set(root)
+        return root, (trace_token, span_token)
+
+    def end_trace(self, root: Optional[Span], tokens, status: Optional[str] = None) -> None:
+        """루트 span 종료 후 샘플링/지연시간 기준으로 내보내기"""
+        if root is None:
+            return
+        trace_token, span_token = tokens
+        _current_span.reset(span_token)
+        _current_trace.reset(trace_token)
+        root.end(status)
+
+        trace = root.trace
+        if trace.sampled or root.end_ns - root.start_ns >= self.slow_threshold_ns:
+            self.exporter.submit([item.to_dict() for item in trace.spans])
+
+# 전역 트레이서 인스턴스
+tracer = Tracer()
+
+
+class TracingMiddleware:
+    """요청 ID 전파 및 요청 루트 span 생성 ASGI 미들웨어"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = None
+        for key, value in scope.get("headers", []):
+            if key.decode("latin-1").lower() == REQUEST_ID_HEADER:
+                request_id = value.decode("latin-1")[:128]
+                break
+
+        root, tokens = tracer.start_trace(
+            request_id, name=f"{scope['method']} {scope['path']}", method=scope["method"], path=scope["path"]
+        )
+        if root is None:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                root.set_attribute("status_code", message["status"])
+                headers = list(message.get("headers", []))
+                headers.append((b"x-request-id", root.trace.request_id.encode("latin-1")))
+                message["headers"] = headers
+            await send(message)
+
+        status = None
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except BaseException:
+            status = "error"
+            raise
+        finally:
+            route = scope.get("route")
+            if getattr(route, "path", None):
+                root.name = f"{scope['method']} {route.path}"
+            tracer.end_trace(root, tokens, status)
@@ -0,0 +1,207 @@
+import asyncio
+import hashlib
+import itertools
+import json
+import os
+import re
+import threading
+import time
+from typing import Any, Dict, List, Optional
+import logging
+
+import httpx
+
+from ai_exercise_service.config.settings import settings
+from ai_exercise_service.src.util.monitoring.metrics import normalize_path
+
+logger = logging.getLogger(__name__)
+
+SERVICE_ROOT = os.path.join(os.path.dirname(__file__), '../../..')
+
+# 녹화 시 값을 가릴 JSON 키 (대소문자 무시, 토큰 사용량 키 input_tokens 등은 제외)
+SENSITIVE_KEY_PATTERN = re.compile(
+    r"^(token|(access|refresh|id|auth)_?token|password|secret|authorization|cookie|api_?key)$",
+    re.IGNORECASE
+)
+# 본문 문자열에 섞인 Bearer 토큰/JWT
+SENSITIVE_TEXT_PATTERNS = [
+    re.compile(r"Bearer\s+[A-Za-z0-9\-._~+/]+=*"),
+    re.compile(r"eyJ[A-Za-z0-9_\-]+\.[A-Za-z0-9_\-]+\.[A-Za-z0-9_\-]+"),
+]
+REDACTED = "[REDACTED]"
+# 응답 헤더 중 재생에 필요한 것만 저장
+KEPT_RESPONSE_HEADERS = ("content-type",)
+
+
+def redact(value: Any) -> Any:
+    """JSON 값에서 토큰/비밀번호 등 민감 정보를 가림"""
+    if isinstance(value, dict):
+        return {
+            key: REDACTED if SENSITIVE_KEY_PATTERN.search(str(key)) else redact(item)
+            for key, item in value.items()
+        }
+    if isinstance(value, list):
+        return [redact(item) for item in value]
+    if isinstance(value, str):
+        for pattern in SENSITIVE_TEXT_PATTERNS:
+            value = pattern.sub(REDACTED, value)
+        return value
+    return value
+
+
+def prompt_hash(text: str) -> str:
+    """프롬프트 원문 대신 저장하는 해시 (재생 시 정확 일치 판단용)"""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+
+
+class Cassette:
+    """
+    Spring 응답과 LLM 응답을 녹화/재생하는 카세트 (JSONL, 한 줄에 한 상호작용)
+
+    - record: 실제 호출 결과를 민감 정보를 가린 뒤 파일에 추가
+    - replay: 파일에서 같은 요청(정확 일치 → 정규화 경로/노드명 순)을 찾아
+      녹화 당시 소요시간 × timing_scale 만큼 기다린 뒤 돌려줌
+      같은 키에 여러 응답이 있으면 순서대로 돌아가며 사용
+    """
+
+    def __init__(self, path: str, mode: str = "off", timing_scale: float = 1.0):
+        self.path = path if os.path.isabs(path) else os.path.join(SERVICE_ROOT, path)
+        self.mode = mode
+        self.timing_scale = timing_scale
+        self._write_lock = threading.Lock()
+        self._index_lock = threading.Lock()
+        self._index: Optional[Dict[str, List[Dict[str, Any]]]] = None
+        self._cursors: Dict[str, Any] = {}
+
+    @property
+    def recording(self) -> bool:
+        return self.mode == "record"
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == "replay"
+
+    def append(self, entry: Dict[str, Any]) -> None:
+        """상호작용 한 건 기록"""
+        line = json.dumps(redact(entry), ensure_ascii=False)
+        with self._write_lock:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+
+    def _load(self) -> Dict[str, List[Dict[str, Any]]]:
+        with self._index_lock:
+            if self._index is None:
+                index: Dict[str, List[Dict[str, Any]]] = {}
+                if os.path.exists(self.path):
+                    with open(self.path, encoding="utf-8") as f:
+                        for line in f:
+                            if not line.strip():
+                                continue
+                            entry = json.loads(line)
+                            for key in entry.get("keys", []):
+                                index.setdefault(key, []).append(entry)
+                else:
+                    logger.warning(f"카세트 파일 없음: {self.path}")
+                self._index = index
+                logger.info(f"카세트 로드: {self.path} ({len(index)}개 키)")
+            return self._index
+
+    def lookup(self, keys: List[str]) -> Optional[Dict[str, Any]]:
+        """앞쪽 키부터 찾아 해당 키의 응답을 순환하며 반환"""
+        index = self._load()
+        for key in keys:
+            entries = index.get(key)
+            if entries:
+                with self._index_lock:
+                    cursor = self._cursors.setdefault(key, itertools.cycle(range(len(entries))))
+                    return entries[next(cursor)]
+        return None
+
+    def delay_seconds(self, entry: Dict[str, Any]) -> float:
+        return max(entry.get("elapsed_ms", 0.0), 0.0) * self.timing_scale / 1000
+
+
+def http_keys(method: str, url: httpx.URL) -> List[str]:
+    """정확 일치(경로+쿼리) → 정규화 경로 순의 조회 키"""
+    query = "&".join(sorted(f"{k}={v}" for k, v in url.params.multi_items()))
+    return [
+        f"http {method} {url.path}?{query}",
+        f"http {method} {normalize_path(url.path)}",
+    ]
+
+
+def llm_keys(node: str, prompt_digest: str) -> List[str]:
+    """정확 일치(노드+프롬프트 해시) → 노드명 순의 조회 키"""
+    return [f"llm {node} {prompt_digest}", f"llm {node}"]
+
+
+class RecordingTransport(httpx.AsyncBaseTransport):
+    """실제 응답을 카세트에 기록하는 트랜스포트 (요청 헤더는 저장하지 않음)"""
+
+    def __init__(self, cassette: Cassette, transport: httpx.AsyncBaseTransport):
+        self.cassette = cassette
+        self._transport = transport
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        start = time.perf_counter()
+        response = await self._transport.handle_async_request(request)
+        body = await response.aread()
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        await response.aclose()
+
+        headers = {k: v for k, v in response.headers.items() if k.lower() in KEPT_RESPONSE_HEADERS}
+        try:
+            payload = {"json": json.loads(body)} if body else {"text": ""}
+        except ValueError:
+            payload = {"text": body.decode("utf-8", errors="replace")}
+
+        entry = {
+            "kind": "http",
+            "keys": http_keys(request.method, request.url),
+            "elapsed_ms": round(elapsed_ms, 2),
+            "response": {"status_code": response.status_code, "headers": headers, **payload},
+        }
+        try:
+            await asyncio.to_thread(self.cassette.append, entry)
+        except Exception as e:
+            logger.error(f"카세트 기록 오류: {str(e)}")
+
+        # 본문을 이미 읽었으므로 디코딩된 내용으로 새 응답 구성
+        return httpx.Response(response.status_code, headers=headers, content=body, request=request)
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+class ReplayTransport(httpx.AsyncBaseTransport):
+    """카세트의 응답을 녹화 당시 지연시간(배율 적용)으로 돌려주는 트랜스포트"""
+
+    def __init__(self, cassette: Cassette):
+        self.cassette = cassette
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        entry = self.cassette.lookup(http_keys(request.method, request.url))
+        if entry is None:
+            logger.warning(f"카세트에 없는 요청: {request.method} {request.url.path}")
+            return httpx.Response(404, json={"message": "cassette miss"}, request=request)
+
+        delay = self.cassette.delay_seconds(entry)
+        if delay:
+            await asyncio.sleep(delay)
+
+        recorded = entry["response"]
+        if "json" in recorded:
+            content = json.dumps(recorded["json"], ensure_ascii=False).encode("utf-8")
+        else:
+            content = recorded.get("text", "").encode("utf-8")
+        return httpx.Response(
+            recorded["status_code"], headers=recorded.get("headers", {}), content=content, request=request
+        )
+
+
+cassette = Cassette(
+    os.path.join(settings.cassette_dir, f"{settings.cassette_name}.jsonl"),
+    mode=settings.replay_mode,
+    timing_scale=settings.replay_timing_scale,
+)
@@ -0,0 +1,88 @@
+import asyncio
+import time
+from typing import Any, Dict, List, Optional
+import logging
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+from ai_exercise_service.src.util.llm.callbacks import _extract_usage
+from ai_exercise_service.src.util.replay.cassette import Cassette, llm_keys, prompt_hash
+
+logger = logging.getLogger(__name__)
+
+
+def _prompt_text(messages: List[BaseMessage]) -> str:
+    return "\n".join(f"{message.type}:{message.content}" for message in messages)
+
+
+class LLMRecordingCallbackHandler(BaseCallbackHandler):
+    """노드별 LLM 응답을 카세트에 기록하는 콜백 (프롬프트는 해시만 저장)"""
+
+    run_inline = True
+
+    def __init__(self, cassette: Cassette, model: str):
+        self.cassette = cassette
+        self.model = model
+        self._started: Dict[Any, tuple] = {}
+
+    def on_chat_model_start(self, serialized, messages, *, run_id, metadata: Optional[Dict[str, Any]] = None, **kwargs):
+        node = (metadata or {}).get("langgraph_node", "unknown")
+        self._started[run_id] = (node, prompt_hash(_prompt_text(messages[0])), time.perf_counter())
+
+    def on_llm_end(self, response, *, run_id, **kwargs):
+        node, digest, start = self._started.pop(run_id, ("unknown", "", time.perf_counter()))
+        try:
+            entry = {
+                "kind": "llm",
+                "keys": llm_keys(node, digest),
+                "model": self.model,
+                "elapsed_ms": round((time.perf_counter() - start) * 1000, 2),
+                "response": {"text": response.generations[0][0].text, "usage": _extract_usage(response)},
+            }
+            self.cassette.append(entry)
+        except Exception as e:
+            logger.error(f"LLM 카세트 기록 오류: {str(e)}")
+
+    def on_llm_error(self, error, *, run_id, **kwargs):
+        self._started.pop(run_id, None)
+
+
+class ReplayChatModel(BaseChatModel):
+    """카세트에 녹화된 노드별 응답을 돌려주는 채팅 모델"""
+
+    cassette: Any
+    model_name: str = "replay"
+
+    @property
+    def _llm_type(self) -> str:
+        return "cassette-replay"
+
+    def _lookup(self, messages: List[BaseMessage], run_manager) -> tuple:
+        node = (getattr(run_manager, "metadata", None) or {}).get("langgraph_node", "unknown")
+        entry = self.cassette.lookup(llm_keys(node, prompt_hash(_prompt_text(messages))))
+        if entry is None:
+            raise ValueError(f"카세트에 없는 LLM 호출: {node}")
+
+        recorded = entry["response"]
+        message = AIMessage(content=recorded["text"])
+        usage = recorded.get("usage") or {}
+        if usage:
+            message.usage_metadata = {
+                "input_tokens": usage.get("input_tokens", 0),
+                "output_tokens": usage.get("output_tokens", 0),
+                "total_tokens": usage.get("input_tokens", 0) + usage.get("output_tokens", 0)
+            }
+        return ChatResult(generations=[ChatGeneration(message=message)]), self.cassette.delay_seconds(entry)
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs: Any) -> ChatResult:
+        result, delay = self._lookup(messages, run_manager)
+        time.sleep(delay)
+        return result
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs: Any) -> ChatResult:
+        result, delay = self._lookup(messages, run_manager)
+        await asyncio.sleep(delay)
+        return result
@@ -0,0 +1 @@
+# serialization 패키지 초기화 파일
\ No newline at end of file
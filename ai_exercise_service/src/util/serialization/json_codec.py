@@ -0,0 +1,49 @@
+import json
+from typing import Any, Union
+import logging
+
+import httpx
+from starlette.responses import JSONResponse
+
+from ai_exercise_service.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+try:
+    import orjson
+except ImportError:  # orjson이 없으면 표준 json 사용
+    orjson = None
+
+BACKEND = "orjson" if orjson is not None and settings.fast_json_enabled else "json"
+
+# 숫자 키 dict(예: 학년별 통계)도 그대로 직렬화
+_ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS if orjson is not None else 0
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """JSON 역직렬화"""
+    if BACKEND == "orjson":
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj: Any) -> bytes:
+    """JSON 직렬화 (UTF-8, 한글 이스케이프 없음, 알 수 없는 타입은 문자열로)"""
+    if BACKEND == "orjson":
+        return orjson.dumps(obj, default=str, option=_ORJSON_OPTIONS)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"), default=str).encode("utf-8")
+
+
+def response_json(response: httpx.Response) -> Any:
+    """Spring 응답 본문 디코딩 (`response.json()` 대체)"""
+    return loads(response.content)
+
+
+class FastJSONResponse(JSONResponse):
+    """설정된 JSON 백엔드로 응답 본문을 렌더링하는 JSONResponse"""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+logger.debug(f"JSON 백엔드: {BACKEND}")
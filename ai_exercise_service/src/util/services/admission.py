@@ -0,0 +1,328 @@
+import asyncio
+import collections
+import contextvars
+import math
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Deque, Dict, Optional
+import logging
+
+from ai_exercise_service.config.settings import settings
+from ai_exercise_service.src.util.cache.shared_cache import shared_cache
+from ai_exercise_service.src.util.monitoring.metrics import (
+    ADMISSION_IN_FLIGHT,
+    ADMISSION_QUEUE_DEPTH,
+    ADMISSION_QUEUE_WAIT,
+    ADMISSION_REJECTED,
+)
+from ai_exercise_service.src.util.serialization.json_codec import FastJSONResponse
+from ai_exercise_service.src.util.services.deadline import remaining
+
+logger = logging.getLogger(__name__)
+
+# 런타임 한도 변경을 워커 간에 공유하는 공유 캐시 위치
+_LIMITS_NAMESPACE = "admission"
+_LIMITS_KEY = "limits"
+
+# 현재 요청의 라우트 분류 (미들웨어가 설정, 요청 밖 백그라운드 작업은 None)
+_request_route_class: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar(
+    "admission_route_class", default=None
+)
+
+
+class AdmissionRejected(Exception):
+    """대기열이 가득 찼거나 대기 시간 초과"""
+
+    def __init__(self, reason: str, retry_after: int):
+        super().__init__(reason)
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class AdmissionLimiter:
+    """
+    라우트 분류 하나의 동시 처리 제한 + FIFO 대기열
+
+    처리 중인 요청이 limit개면 대기열에서 순서대로 기다리고,
+    대기열이 가득 찼거나 max_queue_seconds(또는 요청 deadline)까지 자리가 나지 않으면 거절합니다.
+    """
+
+    def __init__(self, route_class: str, limit: int, queue_size: int, max_queue_seconds: float):
+        self.route_class = route_class
+        self.limit = limit
+        self.queue_size = queue_size
+        self.max_queue_seconds = max_queue_seconds
+        self.active = 0
+        self._waiters: Deque[asyncio.Future] = collections.deque()
+        # 최근 처리 시간 지수 이동 평균 (Retry-After 계산용)
+        self._service_time = 1.0
+
+    def retry_after(self) -> int:
+        """대기열이 비워질 때까지 예상 시간 (초)"""
+        estimate = self._service_time * (len(self._waiters) + 1) / max(self.limit, 1)
+        return max(1, min(30, math.ceil(estimate)))
+
+    def _update_gauges(self) -> None:
+        ADMISSION_IN_FLIGHT.labels(self.route_class).set(self.active)
+        ADMISSION_QUEUE_DEPTH.labels(self.route_class).set(len(self._waiters))
+
+    def _reject(self, reason: str) -> AdmissionRejected:
+        ADMISSION_REJECTED.labels(self.route_class, reason).inc()
+        logger.warning(f"요청 거절 ({self.route_class}): {reason}, 처리 중 {self.active}, 대기 {len(self._waiters)}")
+        return AdmissionRejected(reason, self.retry_after())
+
+    async def acquire(self) -> None:
+        if self.active < self.limit and not self._waiters:
+            self.active += 1
+            self._update_gauges()
+            ADMISSION_QUEUE_WAIT.labels(self.route_class).observe(0.0)
+            return
+
+        if len(self._waiters) >= self.queue_size:
+            raise self._reject("queue_full")
+
+        wait_seconds = self.max_queue_seconds
+        left = remaining()
+        if left is not None:
+            wait_seconds = min(wait_seconds, left)
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self._update_gauges()
+        started = time.perf_counter()
+        try:
+            # release()가 자리를 넘겨주면 active가 이미 증가된 상태로 깨어남
+            await asyncio.wait_for(asyncio.shield(waiter), timeout=max(wait_seconds, 0.0))
+        except asyncio.TimeoutError:
+            if waiter.done() and not waiter.cancelled():
+                # 시간 초과와 동시에 자리를 받은 경우는 그대로 처리
+                pass
+            else:
+                waiter.cancel()
+                raise self._reject("queue_timeout")
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                self.release(0.0)
+            else:
+                waiter.cancel()
+            raise
+        finally:
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+            self._update_gauges()
+        ADMISSION_QUEUE_WAIT.labels(self.route_class).observe(time.perf_counter() - started)
+
+    def set_limits(self, limit: int, queue_size: int) -> None:
+        """한도 변경 (늘어난 자리는 대기자에게 바로 넘기고, 줄어든 경우 처리 중인 요청은 끝날 때까지 유지)"""
+        if (limit, queue_size) == (self.limit, self.queue_size):
+            return
+        logger.info(f"요청 수용 한도 변경 ({self.route_class}): 동시 {self.limit} -> {limit}, 대기열 {self.queue_size} -> {queue_size}")
+        self.limit = limit
+        self.queue_size = queue_size
+        while self.active < self.limit and self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self.active += 1
+                waiter.set_result(None)
+        self._update_gauges()
+
+    def release(self, service_seconds: Optional[float] = None) -> None:
+        if service_seconds:
+            self._service_time = 0.8 * self._service_time + 0.2 * service_seconds
+        # 한도가 줄었으면 넘기지 않고 반납 (처리 중인 요청 수가 새 한도로 내려올 때까지)
+        while self._waiters and self.active <= self.limit:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                # 자리를 대기자에게 그대로 넘김 (active 유지)
+                waiter.set_result(None)
+                self._update_gauges()
+                return
+        self.active -= 1
+        self._update_gauges()
+
+
+class AdmissionController:
+    """
+    라우트 분류별 LLM 작업 수용 제어 (워커 프로세스별)
+
+    요청 전체가 아니라 LLM 그래프를 실제로 실행하는 구간만 admit()으로 감싸므로
+    저장된 추천/피드백 변형 조회, 304 응답처럼 LLM을 호출하지 않는 요청은 자리를 쓰지 않습니다.
+    라우트 분류는 미들웨어가 요청 경로로 정하고, 요청 밖 백그라운드 작업(재계산, 변형 채우기)은
+    각자의 동시 실행 제한을 따르므로 여기서 제한하지 않습니다.
+
+    한도는 재시작 없이 set_limits()로 바꿀 수 있습니다. 변경은 공유 캐시에 저장되어 다른 워커도
+    refresh_seconds 안에 반영하고, 설정값으로 되돌리려면 reset_limits()를 호출합니다.
+    """
+
+    def __init__(self):
+        self.enabled = settings.admission_enabled
+        self.refresh_seconds = settings.admission_limits_refresh_seconds
+        self.override_ttl_seconds = settings.admission_limits_override_ttl_seconds
+        self.route_classes = sorted(settings.admission_route_classes.items(), key=lambda item: -len(item[0]))
+        self.limiters: Dict[str, AdmissionLimiter] = {
+            route_class: AdmissionLimiter(
+                route_class,
+                limit=self._default_limits(route_class)["limit"],
+                queue_size=self._default_limits(route_class)["queue_size"],
+                max_queue_seconds=settings.admission_max_queue_seconds,
+            )
+            for route_class in set(settings.admission_route_classes.values())
+        }
+        self._task: Optional[asyncio.Task] = None
+
+    @staticmethod
+    def _default_limits(route_class: str) -> Dict[str, int]:
+        return {
+            "limit": settings.admission_concurrency.get(route_class, 8),
+            "queue_size": settings.admission_queue_size.get(route_class, 16),
+        }
+
+    def route_class(self, path: str) -> Optional[str]:
+        for prefix, route_class in self.route_classes:
+            if path.startswith(prefix):
+                return route_class
+        return None
+
+    @asynccontextmanager
+    async def admit(self) -> AsyncIterator[None]:
+        """
+        현재 요청의 LLM 작업 구간 수용 제어 (요청 밖이거나 비활성화면 그대로 실행)
+
+        Raises:
+            AdmissionRejected: 대기열이 가득 찼거나 대기 시간 초과 (미들웨어가 503으로 응답)
+        """
+        route_class = _request_route_class.get()
+        limiter = self.limiters.get(route_class) if self.enabled and route_class else None
+        if limiter is None:
+            yield
+            return
+
+        await limiter.acquire()
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            limiter.release(time.perf_counter() - started)
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            route_class: {
+                "limit": limiter.limit,
+                "queue_size": limiter.queue_size,
+                "active": limiter.active,
+                "waiting": len(limiter._waiters),
+            }
+            for route_class, limiter in sorted(self.limiters.items())
+        }
+
+    def _apply(self, overrides: Dict[str, Dict[str, int]]) -> None:
+        for route_class, limiter in self.limiters.items():
+            limits = {**self._default_limits(route_class), **overrides.get(route_class, {})}
+            limiter.set_limits(limits["limit"], limits["queue_size"])
+
+    async def set_limits(self, route_class: str, limit: Optional[int] = None, queue_size: Optional[int] = None) -> Dict[str, Any]:
+        """
+        라우트 분류 한도 변경 (모든 워커에 적용, 지정하지 않은 값은 유지)
+
+        Raises:
+            ValueError: 알 수 없는 라우트 분류이거나 한도가 잘못된 경우
+        """
+        if route_class not in self.limiters:
+            raise ValueError(f"알 수 없는 라우트 분류: {route_class}")
+        if (limit is not None and limit < 1) or (queue_size is not None and queue_size < 0):
+            raise ValueError("동시 처리 수는 1 이상, 대기열 크기는 0 이상이어야 합니다")
+
+        def apply(overrides: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+            overrides = dict(overrides or {})
+            current = {**self._default_limits(route_class), **overrides.get(route_class, {})}
+            if limit is not None:
+                current["limit"] = limit
+            if queue_size is not None:
+                current["queue_size"] = queue_size
+            overrides[route_class] = current
+            return overrides
+
+        overrides = await shared_cache.aupdate(_LIMITS_NAMESPACE, _LIMITS_KEY, apply, self.override_ttl_seconds)
+        if overrides is None:
+            raise RuntimeError("공유 캐시에 한도 변경을 저장하지 못했습니다")
+        self._apply(overrides)
+        return self.status()
+
+    async def reset_limits(self) -> Dict[str, Any]:
+        """런타임 한도 변경을 지우고 설정값으로 복귀"""
+        await shared_cache.adelete(_LIMITS_NAMESPACE, _LIMITS_KEY)
+        self._apply({})
+        return self.status()
+
+    async def refresh(self) -> None:
+        """공유 캐시의 런타임 한도 변경을 이 워커에 반영"""
+        overrides = await shared_cache.aget(_LIMITS_NAMESPACE, _LIMITS_KEY)
+        self._apply(overrides or {})
+
+    def start(self) -> None:
+        """한도 변경 주기 반영 시작 (lifespan에서 호출)"""
+        if not self.enabled or self._task is not None:
+            return
+        self._task = asyncio.get_running_loop().create_task(self._refresh_loop(), name="admission-limits-refresh")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _refresh_loop(self) -> None:
+        while True:
+            try:
+                await self.refresh()
+            except Exception as e:
+                logger.error(f"요청 수용 한도 갱신 실패: {str(e)}")
+            await asyncio.sleep(self.refresh_seconds)
+
+
+class AdmissionMiddleware:
+    """
+    요청의 라우트 분류 지정 및 수용 거절 응답 미들웨어
+
+    설정된 경로 접두사(route class)로 요청을 분류만 하고 자리는 잡지 않습니다. 서비스가 LLM 그래프를
+    실행할 때 admission_controller.admit()으로 자리를 잡으며, 대기열이 가득 차거나 대기 시간이 지나
+    AdmissionRejected가 올라오면 폭주 시 모든 요청이 OpenAI 앞에 쌓여 느려지는 대신
+    Retry-After와 함께 503으로 빠르게 거절합니다.
+    """
+
+    def __init__(self, app, controller: Optional[AdmissionController] = None):
+        self.app = app
+        self.controller = controller or admission_controller
+
+    async def __call__(self, scope, receive, send):
+        route_class = self.controller.route_class(scope["path"]) if scope["type"] == "http" else None
+        if route_class is None:
+            await self.app(scope, receive, send)
+            return
+
+        response_started = False
+
+        async def send_wrapper(message):
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        token = _request_route_class.set(route_class)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except AdmissionRejected as e:
+            if response_started:
+                raise
+            response = FastJSONResponse(
+                {"detail": "요청이 많아 잠시 후 다시 시도해주세요"},
+                status_code=503,
+                headers={"Retry-After": str(e.retry_after)}
+            )
+            await response(scope, receive, send)
+        finally:
+            _request_route_class.reset(token)
+
+
+# 전역 요청 수용 제어 인스턴스
+admission_controller = AdmissionController()
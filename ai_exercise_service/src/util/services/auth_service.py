@@ -1,10 +1,18 @@
-from fastapi import HTTPException, status
+from fastapi import Header, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from fastapi import Depends
 import httpx
+import hashlib
+import hmac
 import logging
 import jwt
 import os
+from typing import Any, Dict, Optional, Tuple
+
+from ai_exercise_service.config.settings import settings
+from ai_exercise_service.src.util.cache.shared_cache import shared_cache
+from ai_exercise_service.src.util.serialization.json_codec import response_json
+from ai_exercise_service.src.util.services.spring_client import create_spring_client
 
 logger = logging.getLogger(__name__)
 
@@ -14,6 +22,35 @@ class AuthService:
     def __init__(self):
         self.spring_url = os.getenv("SPRING_SERVER_URL", "http://localhost:8080")
         self.timeout = float(os.getenv("SPRING_API_TIMEOUT", 30.0))
+        self.cache_ttl = settings.auth_cache_ttl_seconds
+    
+    async def _fetch_current_user(self, token: str) -> Tuple[int, Dict[str, Any]]:
+        """
+        Spring 서버 /users/me 조회 (성공 응답은 워커 간 공유 캐시에 저장)
+        
+        한 요청에서 토큰 검증과 사용자 ID 조회가 모두 일어나도 Spring 호출은 한 번만 합니다.
+        
+        Returns:
+            (응답 상태 코드, 응답의 data 필드)
+        """
+        cache_key = hashlib.sha256(token.encode("utf-8")).hexdigest()
+        cached = await shared_cache.aget("auth", cache_key)
+        if cached is not None:
+            return 200, cached
+        
+        async with create_spring_client("auth", self.timeout) as client:
+            response = await client.get(
+                f"{self.spring_url}/users/me",
+                headers={"Authorization": f"Bearer {token}"}
+            )
+        
+        if response.status_code != 200:
+            return response.status_code, {}
+        
+        # Spring API 응답 구조: {"data": {"userId": 12, ...}}
+        data = response_json(response).get("data", {})
+        await shared_cache.aset("auth", cache_key, data, self.cache_ttl)
+        return 200, data
     
     async def verify_token(self, credentials: HTTPAuthorizationCredentials = Depends(security)) -> str:
         """
@@ -22,22 +59,18 @@ class AuthService:
         token = credentials.credentials
         
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.get(
-                    f"{self.spring_url}/users/me",
-                    headers={"Authorization": f"Bearer {token}"}
+            status_code, _ = await self._fetch_current_user(token)
+            
+            if status_code == 200:
+                logger.info("토큰 검증 성공")
+                return token
+            else:
+                logger.warning(f"토큰 검증 실패: {status_code}")
+                raise HTTPException(
+                    status_code=status.HTTP_401_UNAUTHORIZED,
+                    detail="유효하지 않은 토큰입니다",
+                    headers={"WWW-Authenticate": "Bearer"},
                 )
-                
-                if response.status_code == 200:
-                    logger.info("토큰 검증 성공")
-                    return token
-                else:
-                    logger.warning(f"토큰 검증 실패: {response.status_code}")
-                    raise HTTPException(
-                        status_code=status.HTTP_401_UNAUTHORIZED,
-                        detail="유효하지 않은 토큰입니다",
-                        headers={"WWW-Authenticate": "Bearer"},
-                    )
                     
         except httpx.RequestError as e:
             logger.error(f"인증 서버 연결 실패: {str(e)}")
@@ -59,30 +92,23 @@ class AuthService:
         token = credentials.credentials
         
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.get(
-                    f"{self.spring_url}/users/me",
-                    headers={"Authorization": f"Bearer {token}"}
-                )
+            status_code, data = await self._fetch_current_user(token)
+            
+            if status_code == 200:
+                user_id = data.get("userId") or data.get("id") or data.get("user_id")
                 
-                if response.status_code == 200:
-                    user_data = response.json()
-                    # Spring API 응답 구조: {"data": {"userId": 12, ...}}
-                    data = user_data.get("data", {})
-                    user_id = data.get("userId") or data.get("id") or data.get("user_id")
-                    
-                    if not user_id:
-                        raise HTTPException(
-                            status_code=status.HTTP_400_BAD_REQUEST,
-                            detail="사용자 정보에서 ID를 찾을 수 없습니다"
-                        )
-                    
-                    return str(user_id)
-                else:
+                if not user_id:
                     raise HTTPException(
-                        status_code=status.HTTP_401_UNAUTHORIZED,
-                        detail="유효하지 않은 토큰입니다"
+                        status_code=status.HTTP_400_BAD_REQUEST,
+                        detail="사용자 정보에서 ID를 찾을 수 없습니다"
                     )
+                
+                return str(user_id)
+            else:
+                raise HTTPException(
+                    status_code=status.HTTP_401_UNAUTHORIZED,
+                    detail="유효하지 않은 토큰입니다"
+                )
                     
         except httpx.RequestError as e:
             logger.error(f"사용자 정보 조회 실패: {str(e)}")
@@ -97,5 +123,18 @@ class AuthService:
                 detail="사용자 정보 처리 중 오류가 발생했습니다"
             )
 
+    def verify_internal_token(self, token: Optional[str]) -> bool:
+        """내부 API 인증 (X-Internal-Token 공유 비밀, 비밀이 설정되지 않았으면 항상 거부)"""
+        secret = settings.internal_webhook_secret
+        return bool(secret and token and hmac.compare_digest(token, secret))
+    
+    async def require_internal_token(self, x_internal_token: Optional[str] = Header(None)) -> None:
+        """내부 운영 API 의존성 (인증 실패 시 403)"""
+        if not self.verify_internal_token(x_internal_token):
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="내부 API 인증 실패"
+            )
+
 # 전역 인증 서비스 인스턴스
 auth_service = AuthService()
\ No newline at end of file
@@ -0,0 +1,126 @@
+import asyncio
+import contextvars
+import time
+from typing import Any, Awaitable, Optional
+import logging
+
+import httpx
+
+from ai_exercise_service.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+# 요청 종료 시각 (time.monotonic 기준, 없으면 무제한)
+_deadline: contextvars.ContextVar[Optional[float]] = contextvars.ContextVar("request_deadline", default=None)
+
+
+class DeadlineExceeded(Exception):
+    """요청 시간 예산 소진"""
+
+
+class SpringDeadlineExceeded(httpx.TimeoutException):
+    """시간 예산이 남지 않아 Spring 호출을 보내지 않음 (기존 httpx 예외 처리로 기본값 반환)"""
+
+
+def set_deadline(seconds: float) -> contextvars.Token:
+    """현재 컨텍스트에 seconds 후 만료되는 deadline 설정 (이미 더 짧은 deadline이 있으면 유지)"""
+    deadline = time.monotonic() + seconds
+    current = _deadline.get()
+    if current is not None:
+        deadline = min(deadline, current)
+    return _deadline.set(deadline)
+
+
+def reset_deadline(token: contextvars.Token) -> None:
+    _deadline.reset(token)
+
+
+def remaining() -> Optional[float]:
+    """남은 시간 (초, deadline이 없으면 None)"""
+    deadline = _deadline.get()
+    if deadline is None:
+        return None
+    return deadline - time.monotonic()
+
+
+def expired() -> bool:
+    left = remaining()
+    return left is not None and left <= 0
+
+
+def check_deadline(stage: str) -> None:
+    """남은 시간이 없으면 DeadlineExceeded"""
+    if expired():
+        raise DeadlineExceeded(f"시간 예산 소진: {stage}")
+
+
+def bounded_timeout(timeout: Optional[float]) -> Optional[float]:
+    """호출별 타임아웃을 남은 시간 이내로 제한"""
+    left = remaining()
+    if left is None:
+        return timeout
+    left = max(left, 0.0)
+    return left if timeout is None else min(timeout, left)
+
+
+async def run_within_deadline(awaitable: Awaitable[Any], reserve_seconds: float = 0.0) -> Any:
+    """
+    남은 시간(대체 응답을 만들 reserve_seconds 제외) 안에 끝나지 않으면 취소하고 DeadlineExceeded
+
+    deadline이 없으면 그대로 실행합니다.
+    """
+    left = remaining()
+    if left is None:
+        return await awaitable
+    budget = left - reserve_seconds
+    if budget <= 0:
+        if asyncio.iscoroutine(awaitable):
+            awaitable.close()
+        raise DeadlineExceeded("시간 예산 소진")
+    try:
+        return await asyncio.wait_for(awaitable, timeout=budget)
+    except asyncio.TimeoutError:
+        raise DeadlineExceeded(f"시간 예산 {budget:.2f}초 초과")
+
+
+def route_budget(path: str) -> float:
+    """라우트별 시간 예산 (가장 긴 접두사 일치, 없으면 기본값)"""
+    matched = ""
+    budget = settings.request_deadline_seconds
+    for prefix, seconds in settings.route_deadline_seconds.items():
+        if path.startswith(prefix) and len(prefix) > len(matched):
+            matched, budget = prefix, seconds
+    return budget
+
+
+class DeadlineMiddleware:
+    """
+    요청 deadline 설정 미들웨어
+
+    라우트별 설정값과 클라이언트가 보낸 남은 시간 헤더(기본 X-Request-Deadline-Ms) 중
+    짧은 값을 deadline으로 사용합니다. 하위 Spring/LLM 호출은 남은 시간만큼만 기다립니다.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self.header = settings.deadline_header.lower().encode("latin-1")
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        budget = route_budget(scope["path"])
+        for name, value in scope.get("headers", []):
+            if name == self.header:
+                try:
+                    budget = min(budget, float(value) / 1000)
+                except ValueError:
+                    logger.warning(f"잘못된 deadline 헤더: {value!r}")
+                break
+
+        token = set_deadline(budget)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            reset_deadline(token)
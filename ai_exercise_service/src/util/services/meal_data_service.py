@@ -1,25 +1,60 @@
 import asyncio
+import contextvars
 import httpx
 import calendar
 from datetime import datetime
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 import logging
 import os
 
+from ai_exercise_service.config.settings import settings
+from ai_exercise_service.src.util.cache.meal_amount_counters import RATINGS, meal_amount_counters
+from ai_exercise_service.src.util.monitoring.metrics import MEAL_AMOUNT_RECORDS
+from ai_exercise_service.src.util.serialization.json_codec import response_json
+from ai_exercise_service.src.util.services.spring_client import create_spring_client
+from ai_exercise_service.src.util.monitoring.tracing import traced
+
 logger = logging.getLogger(__name__)
 
+# 수집 중 조회 실패(서킷 차단 포함)로 기본값을 쓴 항목 (collect_monthly_meal_data 호출마다 새 목록)
+_fallback_sources: contextvars.ContextVar[Optional[List[str]]] = contextvars.ContextVar(
+    "meal_data_fallback_sources", default=None
+)
+
+def _record_fallback(source: str) -> None:
+    sources = _fallback_sources.get()
+    if sources is not None:
+        sources.append(source)
+
 class MealDataService:
     def __init__(self):
         self.spring_url = os.getenv("SPRING_SERVER_URL", "http://localhost:8080")
         self.timeout = float(os.getenv("SPRING_API_TIMEOUT", 30.0))
+        # 워터마크/재집계 여부 결정만 직렬화 (Spring 호출은 동시에, 반영은 BEGIN IMMEDIATE로 한 번만)
+        self._meal_amount_sync_lock = asyncio.Lock()
+        # 같은 워커의 동시 요청이 전체 이력을 중복으로 받지 않도록 재집계는 하나만
+        self._meal_amount_rebuilding = False
     
     async def get_monthly_meal_data(self, token: str, year: int, month: int) -> Dict[str, Any]:
         """
         Spring API에서 월간 급식 데이터를 수집합니다.
         """
+        raw_meal_data, _ = await self.collect_monthly_meal_data(token, year, month)
+        return raw_meal_data
+    
+    @traced("meal_data.get_monthly_meal_data")
+    async def collect_monthly_meal_data(self, token: str, year: int, month: int) -> Tuple[Dict[str, Any], List[str]]:
+        """
+        월간 급식 데이터 수집 (항목별 조회 실패는 빈 값으로 대체)
+        
+        Returns:
+            (월간 급식 데이터, 조회 실패로 빈 값을 쓴 항목 목록 - 비어 있지 않으면 결과를 저장하지 않음)
+        """
         headers = {"Authorization": f"Bearer {token}"}
+        fallback_sources: List[str] = []
         
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
+        async with create_spring_client("meal_data", self.timeout) as client:
+            context_token = _fallback_sources.set(fallback_sources)
             try:
                 # 1. 월별 평균 평점 조회
                 monthly_rating = await self._get_monthly_rating(client, headers, year, month)
@@ -43,7 +78,7 @@ class MealDataService:
                 low_participation = await self._get_low_participation_analysis(client, headers, year, month)
                 
                 # 8. 급식량 평가 데이터 조회
-                meal_amounts = await self._get_meal_amounts(client, headers)
+                meal_amounts = await self._get_meal_amounts(client, headers, year, month)
                 
                 # 종합 데이터 구성
                 comprehensive_data = {
@@ -57,12 +92,16 @@ class MealDataService:
                     "meal_amounts": meal_amounts
                 }
                 
+                if fallback_sources:
+                    logger.warning(f"급식 데이터 일부 조회 실패 ({year}년 {month}월): {', '.join(fallback_sources)}")
                 logger.info(f"종합 급식 데이터 수집 완료: {year}년 {month}월")
-                return comprehensive_data
+                return comprehensive_data, fallback_sources
                 
             except Exception as e:
                 logger.error(f"급식 데이터 수집 중 오류 발생: {str(e)}")
                 raise
+            finally:
+                _fallback_sources.reset(context_token)
     
     async def _get_monthly_rating(self, client: httpx.AsyncClient, headers: Dict[str, str], year: int, month: int) -> Dict[str, Any]:
         """월별 평균 평점 조회"""
@@ -74,7 +113,7 @@ class MealDataService:
             response.raise_for_status()
             
             # BaseResponse<Double> 구조에서 data 추출
-            api_response = response.json()
+            api_response = response_json(response)
             return {
                 "average_rating": api_response.get("data", 0.0),
                 "status": api_response.get("status", ""),
@@ -82,6 +121,7 @@ class MealDataService:
             }
         except Exception as e:
             logger.error(f"월별 평점 조회 실패: {str(e)}")
+            _record_fallback("monthly_rating")
             return {"average_rating": 0.0}
     
     async def _get_menu_rankings(self, client: httpx.AsyncClient, headers: Dict[str, str]) -> Dict[str, Any]:
@@ -98,7 +138,7 @@ class MealDataService:
                 )
                 response.raise_for_status()
                 
-                data = response.json()
+                data = response_json(response)
                 if not data.get("data", {}).get("menus"):
                     break
                     
@@ -127,6 +167,7 @@ class MealDataService:
             
         except Exception as e:
             logger.error(f"메뉴 순위 조회 실패: {str(e)}")
+            _record_fallback("menu_rankings")
             return {}
     
     async def _get_meal_participation_rates(self, client: httpx.AsyncClient, headers: Dict[str, str]) -> Dict[str, Any]:
@@ -137,9 +178,10 @@ class MealDataService:
                 headers=headers
             )
             response.raise_for_status()
-            return response.json()
+            return response_json(response)
         except Exception as e:
             logger.error(f"식사율 조회 실패: {str(e)}")
+            _record_fallback("meal_participation_rates")
             return {}
     
     async def _get_user_daily_data(self, client: httpx.AsyncClient, headers: Dict[str, str], user_id: str, year: int, month: int) -> List[Dict[str, Any]]:
@@ -158,7 +200,7 @@ class MealDataService:
                 )
                 
                 if response.status_code == 200:
-                    daily_data = response.json()
+                    daily_data = response_json(response)
                     daily_data["date"] = date_str
                     user_daily_data.append(daily_data)
                     
@@ -183,21 +225,24 @@ class MealDataService:
                     )
                     
                     if response.status_code == 200:
-                        menu_data = response.json()
+                        menu_data = response_json(response)
                         all_menus[meal_type] = menu_data
                         logger.info(f"{meal_type} 메뉴 조회 성공")
                     else:
                         logger.warning(f"{meal_type} 메뉴 조회 실패: {response.status_code}")
+                        _record_fallback(f"monthly_menus.{meal_type}")
                         all_menus[meal_type] = {}
                         
                 except Exception as e:
                     logger.error(f"{meal_type} 메뉴 조회 중 오류: {str(e)}")
+                    _record_fallback(f"monthly_menus.{meal_type}")
                     all_menus[meal_type] = {}
             
             return all_menus
             
         except Exception as e:
             logger.error(f"월간 메뉴 조회 실패: {str(e)}")
+            _record_fallback("monthly_menus")
             return {}
     
     async def _get_monthly_statistics(self, client: httpx.AsyncClient, headers: Dict[str, str], year: int, month: int) -> Dict[str, Any]:
@@ -208,9 +253,10 @@ class MealDataService:
                 headers=headers
             )
             response.raise_for_status()
-            return response.json()
+            return response_json(response)
         except Exception as e:
             logger.error(f"월별 통계 조회 실패: {str(e)}")
+            _record_fallback("monthly_statistics")
             return {}
     
     async def _get_low_participation_analysis(self, client: httpx.AsyncClient, headers: Dict[str, str], year: int, month: int) -> Dict[str, Any]:
@@ -223,57 +269,86 @@ class MealDataService:
                 params={"period": period}
             )
             response.raise_for_status()
-            return response.json()
+            return response_json(response)
         except Exception as e:
             logger.error(f"낮은 참여율 분석 실패: {str(e)}")
+            _record_fallback("low_participation_analysis")
             return {}
     
-    async def _get_meal_amounts(self, client: httpx.AsyncClient, headers: Dict[str, str]) -> Dict[str, Any]:
-        """급식량 평가 데이터 조회"""
+    async def _get_meal_amounts(self, client: httpx.AsyncClient, headers: Dict[str, str], year: int, month: int) -> Dict[str, Any]:
+        """급식량 평가 데이터 조회 (증분 집계된 날짜/식사 유형별 카운터 기준 월간 통계)"""
         try:
-            response = await client.get(
-                f"{self.spring_url}/meal-amount",
-                headers=headers
-            )
-            response.raise_for_status()
-            
-            api_response = response.json()
-            meal_amounts = api_response.get("data", [])
+            status, message = await self._sync_meal_amounts(client, headers)
+            daily_ratings = await asyncio.to_thread(meal_amount_counters.month_counts, year, month)
             
             # 급식량 평가 통계 계산
-            amount_stats = self._analyze_meal_amounts(meal_amounts)
+            amount_stats = self._analyze_meal_amounts(daily_ratings)
             
             return {
-                "data": meal_amounts,
+                "data": daily_ratings,
                 "statistics": amount_stats,
-                "status": api_response.get("status", 200),
-                "message": api_response.get("message", "급식량 평가 조회 성공")
+                "status": status,
+                "message": message
             }
         except Exception as e:
             logger.error(f"급식량 평가 조회 실패: {str(e)}")
+            _record_fallback("meal_amounts")
             return {}
     
-    def _analyze_meal_amounts(self, meal_amounts: List[Dict[str, Any]]) -> Dict[str, Any]:
-        """급식량 평가 데이터 분석"""
-        if not meal_amounts:
+    async def _sync_meal_amounts(self, client: httpx.AsyncClient, headers: Dict[str, str]) -> Tuple[int, str]:
+        """
+        워터마크 이후 급식량 평가 레코드를 받아 카운터에 반영
+        
+        Spring이 since 파라미터를 지원하면 새 레코드만 받고, 무시하면 전체 이력이 오더라도
+        워터마크 이하 id는 건너뜁니다. 재집계 주기가 지났으면 전체 이력으로 다시 집계합니다.
+        동시 요청이 같은 새 레코드를 받아도 apply가 트랜잭션 안에서 워터마크를 다시 확인하므로
+        한 번만 더해집니다.
+        """
+        async with self._meal_amount_sync_lock:
+            # SQLite 조회는 이벤트 루프를 막지 않도록 워커 스레드에서
+            watermark, rebuilt_at = await asyncio.to_thread(meal_amount_counters.sync_state)
+            rebuild = not self._meal_amount_rebuilding and meal_amount_counters.rebuild_due(rebuilt_at)
+            if rebuild:
+                self._meal_amount_rebuilding = True
+            params = {}
+            if not rebuild and settings.meal_amount_since_param:
+                params[settings.meal_amount_since_param] = watermark
+        
+        try:
+            response = await client.get(
+                f"{self.spring_url}/meal-amount",
+                headers=headers,
+                params=params
+            )
+            response.raise_for_status()
+            
+            api_response = response_json(response)
+            records = api_response.get("data", [])
+            applied = await asyncio.to_thread(meal_amount_counters.apply, records, rebuild)
+        finally:
+            if rebuild:
+                self._meal_amount_rebuilding = False
+        
+        MEAL_AMOUNT_RECORDS.labels("fetched").inc(len(records))
+        MEAL_AMOUNT_RECORDS.labels("applied").inc(applied)
+        if rebuild:
+            logger.info(f"급식량 평가 전체 재집계: {applied}건")
+        return api_response.get("status", 200), api_response.get("message", "급식량 평가 조회 성공")
+    
+    def _analyze_meal_amounts(self, daily_ratings: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """급식량 평가 데이터 분석 (날짜/식사 유형별 카운터 합산)"""
+        if not daily_ratings:
             return {}
         
         # 평가별 카운트
-        rating_counts = {"FEW": 0, "SUITABLE": 0, "MUCH": 0}
-        meal_type_ratings = {"조식": {"FEW": 0, "SUITABLE": 0, "MUCH": 0},
-                           "중식": {"FEW": 0, "SUITABLE": 0, "MUCH": 0},
-                           "석식": {"FEW": 0, "SUITABLE": 0, "MUCH": 0}}
+        rating_counts = {rating: 0 for rating in RATINGS}
+        meal_type_ratings = {meal_type: {rating: 0 for rating in RATINGS} for meal_type in ("조식", "중식", "석식")}
         
-        for amount_data in meal_amounts:
-            rating = amount_data.get("rating", "SUITABLE")
-            meal = amount_data.get("meal", {})
-            meal_type = meal.get("mealType", "")
-            
-            if rating in rating_counts:
-                rating_counts[rating] += 1
-            
-            if meal_type in meal_type_ratings and rating in meal_type_ratings[meal_type]:
-                meal_type_ratings[meal_type][rating] += 1
+        for entry in daily_ratings:
+            for rating in RATINGS:
+                rating_counts[rating] += entry[rating]
+                if entry["mealType"] in meal_type_ratings:
+                    meal_type_ratings[entry["mealType"]][rating] += entry[rating]
         
         total_evaluations = sum(rating_counts.values())
         
@@ -0,0 +1,22 @@
+from typing import Any, Dict
+
+
+def summarize_raw_meal_data(raw_meal_data: Dict[str, Any], year: int, month: int) -> str:
+    """수집된 급식 데이터만으로 만드는 규칙 기반 요약 (LLM 피드백 대체)"""
+    sentences = []
+    average_rating = raw_meal_data.get("monthly_rating", {}).get("average_rating")
+    if isinstance(average_rating, (int, float)) and average_rating:
+        sentences.append(f"{year}년 {month}월 급식 평균 평점은 {average_rating:.1f}점이에요.")
+    
+    menus = raw_meal_data.get("menu_rankings", {}).get("data", {}).get("menus", [])
+    if menus:
+        top_menu = max(menus, key=lambda menu: menu.get("averageRating", 0))
+        sentences.append(f"가장 인기 있었던 메뉴는 {top_menu.get('menuName')}({top_menu.get('averageRating', 0)}점)예요.")
+    
+    percentages = raw_meal_data.get("meal_amounts", {}).get("statistics", {}).get("rating_percentages", {})
+    if percentages:
+        sentences.append(
+            f"급식량 평가는 적당해요 {percentages.get('SUITABLE', 0)}%, 적어요 {percentages.get('FEW', 0)}%, "
+            f"많아요 {percentages.get('MUCH', 0)}%였어요."
+        )
+    return " ".join(sentences)
@@ -0,0 +1,222 @@
+import asyncio
+import collections
+import time
+from typing import Awaitable, Callable, Deque, Dict, Optional, Tuple
+import logging
+
+import httpx
+
+from ai_exercise_service.config.settings import settings
+from ai_exercise_service.src.util.services.deadline import expired
+from ai_exercise_service.src.util.monitoring.metrics import (
+    SPRING_CIRCUIT_STATE,
+    SPRING_CIRCUIT_TRANSITIONS,
+    SPRING_HEDGES,
+)
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+HALF_OPEN = "half_open"
+OPEN = "open"
+_STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+SendFunc = Callable[[httpx.Request], Awaitable[httpx.Response]]
+
+
+class CircuitOpenError(httpx.TransportError):
+    """서킷이 열려 있어 Spring 호출 없이 즉시 실패"""
+
+
+class CircuitBreaker:
+    """
+    엔드포인트 단위 서킷 브레이커
+
+    - closed: 정상 호출, 연속 실패가 임계값에 도달하면 open
+    - open: open_seconds 동안 호출 없이 즉시 실패
+    - half_open: 시험 호출 1건만 허용, 성공하면 closed / 실패하면 다시 open
+    """
+
+    def __init__(self, method: str, path: str, failure_threshold: int, open_seconds: float):
+        self.method = method
+        self.path = path
+        self.failure_threshold = failure_threshold
+        self.open_seconds = open_seconds
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._probe_in_flight = False
+        SPRING_CIRCUIT_STATE.labels(method, path).set(0)
+
+    def _transition(self, state: str) -> None:
+        if state == self.state:
+            return
+        logger.warning(f"Spring 서킷 상태 변경: {self.method} {self.path} {self.state} -> {state}")
+        self.state = state
+        SPRING_CIRCUIT_STATE.labels(self.method, self.path).set(_STATE_VALUES[state])
+        SPRING_CIRCUIT_TRANSITIONS.labels(self.method, self.path, state).inc()
+
+    def allow(self) -> bool:
+        """호출 허용 여부 (half-open 시험 호출 예약 포함)"""
+        if self.state == OPEN:
+            if time.monotonic() - self.opened_at < self.open_seconds:
+                return False
+            self._transition(HALF_OPEN)
+        if self.state == HALF_OPEN:
+            if self._probe_in_flight:
+                return False
+            self._probe_in_flight = True
+        return True
+
+    def release_probe(self) -> None:
+        """결과 없이 끝난 시험 호출 예약 해제"""
+        self._probe_in_flight = False
+
+    def record_success(self) -> None:
+        self._probe_in_flight = False
+        self.failures = 0
+        self._transition(CLOSED)
+
+    def record_failure(self) -> None:
+        self._probe_in_flight = False
+        self.failures += 1
+        if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+            self._transition(OPEN)
+
+
+class LatencyTracker:
+    """최근 성공 응답 지연시간 (헤지 지연 계산용)"""
+
+    def __init__(self, size: int = 200):
+        self._samples: Deque[float] = collections.deque(maxlen=size)
+
+    def add(self, seconds: float) -> None:
+        self._samples.append(seconds)
+
+    def percentile(self, pct: float) -> Optional[float]:
+        if not self._samples:
+            return None
+        ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+
+class SpringResilience:
+    """
+    Spring 호출 보호 계층 (엔드포인트별 서킷 브레이커 + 멱등 GET 헤지 요청)
+
+    Spring 장애 시 요청마다 30초 타임아웃을 기다리며 쌓이지 않도록 연속 실패한 엔드포인트는
+    즉시 실패시키고(CircuitOpenError, httpx.RequestError 계열이라 기존 예외 처리로 기본값 반환),
+    느린 GET은 최근 p95만큼 기다린 뒤 한 번 더 요청해 먼저 온 응답을 사용합니다.
+    """
+
+    def __init__(self):
+        self.circuit_enabled = settings.spring_circuit_enabled
+        self.hedging_enabled = settings.spring_hedging_enabled
+        self.failure_threshold = settings.spring_circuit_failure_threshold
+        self.open_seconds = settings.spring_circuit_open_seconds
+        self.hedge_min_delay = settings.spring_hedge_min_delay_ms / 1000
+        self.hedge_min_samples = settings.spring_hedge_min_samples
+        self._breakers: Dict[Tuple[str, str], CircuitBreaker] = {}
+        self._latencies: Dict[Tuple[str, str], LatencyTracker] = {}
+
+    def breaker(self, method: str, path: str) -> CircuitBreaker:
+        key = (method, path)
+        if key not in self._breakers:
+            self._breakers[key] = CircuitBreaker(method, path, self.failure_threshold, self.open_seconds)
+        return self._breakers[key]
+
+    def hedge_delay(self, method: str, path: str) -> Optional[float]:
+        """헤지 요청 발송까지 기다릴 시간 (샘플이 부족하거나 GET이 아니면 None)"""
+        tracker = self._latencies.get((method, path))
+        if not self.hedging_enabled or method != "GET" or tracker is None or len(tracker) < self.hedge_min_samples:
+            return None
+        return max(tracker.percentile(95), self.hedge_min_delay)
+
+    async def send(self, request: httpx.Request, path: str, send: SendFunc) -> httpx.Response:
+        """서킷 확인 후 (필요 시 헤지하여) 요청 전송"""
+        method = request.method
+        breaker = self.breaker(method, path) if self.circuit_enabled else None
+        if breaker is not None and not breaker.allow():
+            raise CircuitOpenError(f"Spring 서킷 open: {method} {path}", request=request)
+
+        start = time.perf_counter()
+        try:
+            delay = self.hedge_delay(method, path)
+            if delay is None:
+                response = await send(request)
+            else:
+                response = await self._hedged(request, path, send, delay)
+        except (httpx.TransportError, asyncio.TimeoutError):
+            if breaker is not None:
+                # 요청 시간 예산 때문에 줄어든 타임아웃은 Spring 장애로 보지 않음
+                if expired():
+                    breaker.release_probe()
+                else:
+                    breaker.record_failure()
+            raise
+        except BaseException:
+            # 취소 등 Spring 상태와 무관한 중단은 시험 호출 예약만 해제
+            if breaker is not None:
+                breaker.release_probe()
+            raise
+
+        if response.status_code >= 500:
+            if breaker is not None:
+                breaker.record_failure()
+        else:
+            if breaker is not None:
+                breaker.record_success()
+            self._latencies.setdefault((method, path), LatencyTracker()).add(time.perf_counter() - start)
+        return response
+
+    async def _hedged(self, request: httpx.Request, path: str, send: SendFunc, delay: float) -> httpx.Response:
+        primary = asyncio.create_task(send(request))
+        done, _ = await asyncio.wait({primary}, timeout=delay)
+        if done:
+            return primary.result()
+
+        SPRING_HEDGES.labels(request.method, path, "fired").inc()
+        hedge = asyncio.create_task(send(request))
+        pending = {primary, hedge}
+        winner = None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        winner = task
+                        if task is hedge:
+                            SPRING_HEDGES.labels(request.method, path, "won").inc()
+                        return task.result()
+            # 두 요청 모두 실패하면 먼저 보낸 요청의 예외를 전달
+            return primary.result()
+        finally:
+            # 같은 wait에서 함께 끝난 요청도 포함해 승자가 아닌 요청은 모두 정리
+            losers = [task for task in (primary, hedge) if task is not winner]
+            for task in losers:
+                task.cancel()
+            for task in losers:
+                await _discard(task)
+
+
+async def _discard(task: asyncio.Task) -> None:
+    """취소한 요청 정리 (이미 응답을 받았다면 연결 반환)"""
+    try:
+        response = await task
+    except asyncio.CancelledError:
+        # 이 요청만 취소된 것이면 무시하고, 바깥 태스크가 취소되는 중이면 전파
+        current = asyncio.current_task()
+        if current is not None and current.cancelling():
+            raise
+        return
+    except Exception:
+        return
+    await response.aclose()
+
+
+# 전역 Spring 호출 보호 인스턴스
+spring_resilience = SpringResilience()
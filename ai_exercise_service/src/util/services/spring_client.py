@@ -0,0 +1,128 @@
+import asyncio
+import time
+from typing import Optional
+import httpx
+import logging
+
+from ai_exercise_service.config.settings import settings
+
+from ai_exercise_service.src.util.monitoring.metrics import normalize_path, observe_spring_call
+from ai_exercise_service.src.util.monitoring.tracing import inject_headers, span
+from ai_exercise_service.src.util.replay.cassette import RecordingTransport, ReplayTransport, cassette
+from ai_exercise_service.src.util.services.deadline import SpringDeadlineExceeded, remaining
+from ai_exercise_service.src.util.services.resilience import CircuitOpenError, spring_resilience
+
+logger = logging.getLogger(__name__)
+
+
+class SpringTransport(httpx.AsyncBaseTransport):
+    """Spring API 호출 트랜스포트 (서킷 브레이커/헤지 요청, 지연시간·응답 상태 계측, span 및 요청 ID 전파)"""
+
+    def __init__(self, service: str, transport: httpx.AsyncBaseTransport = None):
+        self.service = service
+        self._transport = transport or httpx.AsyncHTTPTransport()
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        path = normalize_path(request.url.path)
+        start = time.perf_counter()
+        status = "error"
+        try:
+            with span(f"spring {request.method} {path}", service=self.service) as call_span:
+                inject_headers(request.headers)
+                _apply_deadline(request)
+                response = await spring_resilience.send(request, path, self._transport.handle_async_request)
+                status = str(response.status_code)
+                if call_span is not None:
+                    call_span.set_attribute("status_code", response.status_code)
+                    if response.status_code >= 500:
+                        call_span.status = "error"
+            return response
+        except CircuitOpenError:
+            status = "circuit_open"
+            raise
+        except SpringDeadlineExceeded:
+            status = "deadline"
+            raise
+        finally:
+            observe_spring_call(self.service, request.method, path, status, time.perf_counter() - start)
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+def _apply_deadline(request: httpx.Request) -> None:
+    """요청 deadline이 있으면 남은 시간으로 타임아웃을 줄이고, 남은 시간이 없으면 보내지 않음"""
+    left = remaining()
+    if left is None:
+        return
+    if left <= 0:
+        raise SpringDeadlineExceeded("시간 예산 소진으로 Spring 호출 생략", request=request)
+    timeout = request.extensions.get("timeout") or {}
+    request.extensions["timeout"] = {
+        key: left if value is None else min(value, left)
+        for key, value in {**{"connect": None, "read": None, "write": None, "pool": None}, **timeout}.items()
+    }
+
+
+class _SharedPoolTransport(httpx.AsyncBaseTransport):
+    """이벤트 루프별 공유 커넥션 풀 (클라이언트가 닫혀도 풀은 유지)"""
+
+    def __init__(self):
+        self.loop = asyncio.get_running_loop()
+        self._transport = httpx.AsyncHTTPTransport(
+            limits=httpx.Limits(
+                max_connections=settings.spring_pool_max_connections,
+                max_keepalive_connections=settings.spring_pool_max_keepalive,
+                keepalive_expiry=settings.spring_pool_keepalive_seconds
+            )
+        )
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        return await self._transport.handle_async_request(request)
+
+    async def aclose(self) -> None:
+        # 요청마다 만드는 AsyncClient가 종료될 때는 풀을 닫지 않음
+        pass
+
+    async def close_pool(self) -> None:
+        await self._transport.aclose()
+
+
+_shared_pool: Optional[_SharedPoolTransport] = None
+
+
+def _pool() -> _SharedPoolTransport:
+    """현재 이벤트 루프의 Spring 커넥션 풀 (루프가 바뀌면 새로 생성, fork된 워커 포함)"""
+    global _shared_pool
+    if _shared_pool is None or _shared_pool.loop is not asyncio.get_running_loop():
+        _shared_pool = _SharedPoolTransport()
+    return _shared_pool
+
+
+async def close_spring_pool() -> None:
+    """앱 종료 시 Spring 커넥션 풀 정리"""
+    global _shared_pool
+    if _shared_pool is not None:
+        pool, _shared_pool = _shared_pool, None
+        await pool.close_pool()
+
+
+def create_spring_client(service: str, timeout: float) -> httpx.AsyncClient:
+    """
+    Spring API 호출용 AsyncClient 생성
+
+    연결은 프로세스의 공유 커넥션 풀을 재사용해 요청마다 TCP 연결을 새로 맺지 않습니다.
+    녹화 모드에서는 실제 응답을 카세트에 기록하고, 재생 모드에서는 네트워크 대신
+    카세트의 응답을 돌려줍니다 (계측은 두 경우 모두 동일하게 적용).
+
+    Args:
+        service: 호출하는 서비스명 (메트릭 라벨)
+        timeout: 요청 타임아웃 (초)
+    """
+    if cassette.replaying:
+        inner = ReplayTransport(cassette)
+    elif cassette.recording:
+        inner = RecordingTransport(cassette, _pool())
+    else:
+        inner = _pool()
+    return httpx.AsyncClient(timeout=timeout, transport=SpringTransport(service, inner))
@@ -0,0 +1,190 @@
+import asyncio
+import os
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+import logging
+
+from ai_exercise_service.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+class WarmupService:
+    """
+    서버 시작 워밍업 (첫 사용자 요청이 초기화 비용을 떠안지 않도록)
+
+    - 그래프 컴파일, LLM 클라이언트 생성 (langchain_openai 임포트 포함), 토크나이저 로드
+    - 공유 캐시/체크포인트 SQLite 연결을 열고 만료 항목 정리
+    - Spring 커넥션 풀에 연결을 미리 열고 운동 목록을 공유 캐시에 적재
+
+    단계별 실패는 기록하고 나머지 단계는 계속 진행합니다. 필수 단계(warmup_required_steps)가
+    모두 성공해야 ready가 되며, 실패하거나 시간 초과로 끝나지 못한 필수 단계는
+    warmup_retry_seconds 간격으로 다시 실행합니다 (그동안 /ready는 단계별 실패와 함께 503).
+    """
+
+    def __init__(self):
+        self.ready = False
+        self.steps: Dict[str, str] = {}
+        self.failed: Dict[str, str] = {}
+        self.attempts = 0
+        self.duration_seconds: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        """워밍업을 백그라운드로 시작 (그동안 /health는 응답하고 /ready는 503)"""
+        if not settings.warmup_enabled:
+            self.ready = True
+            return
+        self._task = asyncio.create_task(self.run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    def _steps(self) -> Dict[str, Callable[[], Awaitable[Any]]]:
+        return {
+            "graphs": lambda: asyncio.to_thread(self._compile_graphs),
+            "llm_clients": lambda: asyncio.to_thread(self._create_llm_clients),
+            "tokenizer": lambda: asyncio.to_thread(self._load_tokenizer),
+            "prompts": lambda: asyncio.to_thread(self._measure_prompt_prefixes),
+            "persistent_store": self._open_persistent_store,
+            "spring": self._warm_spring
+        }
+
+    async def run(self) -> None:
+        started = time.perf_counter()
+        pending = self._steps()
+        while True:
+            self.attempts += 1
+            await self._run_steps(pending)
+            self.failed = {name: self.steps[name] for name in settings.warmup_required_steps if name in self.failed}
+            if self.duration_seconds is None:
+                self.duration_seconds = round(time.perf_counter() - started, 3)
+
+            if not self.failed:
+                self.ready = True
+                logger.info(f"워밍업 완료 ({round(time.perf_counter() - started, 3)}초): {self.steps}")
+                return
+
+            logger.warning(
+                f"워밍업 필수 단계 실패, {settings.warmup_retry_seconds}초 후 재시도 "
+                f"({self.attempts}회차): {self.failed}"
+            )
+            await asyncio.sleep(settings.warmup_retry_seconds)
+            pending = {name: step for name, step in self._steps().items() if name in self.failed}
+
+    async def _run_steps(self, steps: Dict[str, Callable[[], Awaitable[Any]]]) -> None:
+        for name in steps:
+            self.failed.pop(name, None)
+        try:
+            await asyncio.wait_for(
+                asyncio.gather(*(self._step(name, step()) for name, step in steps.items())),
+                timeout=settings.warmup_timeout_seconds
+            )
+        except asyncio.TimeoutError:
+            logger.warning(f"워밍업 시간 초과 ({settings.warmup_timeout_seconds}초), 남은 단계 중단")
+            for name in steps:
+                if name not in self.steps or self.steps[name] == "running":
+                    self.steps[name] = f"failed: timeout ({settings.warmup_timeout_seconds}s)"
+                    self.failed[name] = self.steps[name]
+
+    async def _step(self, name: str, awaitable) -> None:
+        started = time.perf_counter()
+        self.steps[name] = "running"
+        try:
+            detail = await awaitable
+            self.steps[name] = f"ok ({time.perf_counter() - started:.2f}s){f' {detail}' if detail else ''}"
+        except Exception as e:
+            self.steps[name] = f"failed: {str(e)}"
+            self.failed[name] = self.steps[name]
+            logger.error(f"워밍업 단계 실패 ({name}): {str(e)}")
+
+    def _compile_graphs(self) -> None:
+        from ai_exercise_service.src.ai.exercise.graph.exercise_analysis_graph import get_exercise_analysis_graph
+        from ai_exercise_service.src.ai.exercise.graph.exercise_recommendation_graph import get_exercise_recommendation_graph
+        from ai_exercise_service.src.ai.meal_feedback.graph.meal_analysis_graph import get_meal_analysis_graph
+        from ai_exercise_service.src.ai.meal_feedback.graph.meal_range_graph import get_meal_range_graph
+
+        get_exercise_analysis_graph()
+        get_exercise_recommendation_graph()
+        get_meal_analysis_graph()
+        get_meal_range_graph()
+
+    def _create_llm_clients(self) -> None:
+        from ai_exercise_service.src.ai.exercise.graph import exercise_analysis_graph, exercise_recommendation_graph
+        from ai_exercise_service.src.ai.meal_feedback.graph import meal_analysis_graph
+
+        # 노드가 사용하는 temperature별 클라이언트를 미리 생성 (이후 호출은 캐시된 인스턴스 재사용)
+        for module in (exercise_analysis_graph, exercise_recommendation_graph, meal_analysis_graph):
+            module.get_llm()
+
+    def _load_tokenizer(self) -> str:
+        from ai_exercise_service.src.util.llm.token_budget import token_budget
+
+        return token_budget.counter.encoding_name if token_budget.counter.load() else "approximate"
+
+    def _measure_prompt_prefixes(self) -> str:
+        from ai_exercise_service.src.ai.exercise.graph import exercise_analysis_graph, exercise_recommendation_graph  # noqa: F401 (프롬프트 등록)
+        from ai_exercise_service.src.ai.meal_feedback.graph import meal_analysis_graph  # noqa: F401
+        from ai_exercise_service.src.util.llm.prompt_registry import prompt_registry
+
+        return str(prompt_registry.prefix_tokens())
+
+    async def _open_persistent_store(self) -> str:
+        from ai_exercise_service.src.util.cache.shared_cache import shared_cache
+        from ai_exercise_service.src.util.graph.checkpoint import graph_checkpointer
+
+        # 공유 캐시 조회는 이벤트 루프 스레드 연결을 사용하므로 단건 조회로 루프 쪽 연결을 열고,
+        # 전체를 훑는 집계/정리는 스레드에서 실행
+        shared_cache.get("warmup", "probe")
+        counts = await asyncio.to_thread(shared_cache.namespace_counts)
+        await asyncio.to_thread(shared_cache.purge_expired)
+        await asyncio.to_thread(lambda: graph_checkpointer.saver)
+        return str(counts)
+
+    async def _warm_spring(self) -> str:
+        from ai_exercise_service.src.util.cache.shared_cache import shared_cache
+        from ai_exercise_service.src.util.services.spring_client import create_spring_client
+        from ai_exercise_service.src.ai.exercise.service.exercise_recommendation_service import exercise_recommendation_service
+
+        spring_url = os.getenv("SPRING_SERVER_URL", "http://localhost:8080")
+        token = settings.internal_service_token
+        headers = {"Authorization": f"Bearer {token}"} if token else {}
+
+        # 동시에 요청해 풀에 연결 여러 개를 열어 둠 (응답 상태는 무관)
+        async with create_spring_client("warmup", 5.0) as client:
+            results = await asyncio.gather(
+                *(client.get(f"{spring_url}/exercises", headers=headers)
+                  for _ in range(settings.warmup_spring_connections)),
+                return_exceptions=True
+            )
+        opened = sum(1 for result in results if not isinstance(result, Exception))
+        if settings.warmup_spring_connections and not opened:
+            errors = {type(result).__name__ for result in results if isinstance(result, Exception)}
+            raise ConnectionError(
+                f"Spring 연결 실패 (connections=0/{settings.warmup_spring_connections}, {', '.join(sorted(errors))})"
+            )
+
+        if token:
+            exercises = await exercise_recommendation_service._get_exercises_from_spring(token)
+            cached = await shared_cache.aget("catalog", "exercises")
+            catalog = f"{len(exercises)} exercises" if cached is not None else "fallback"
+        else:
+            catalog = "skipped (no service token)"
+            logger.warning("서비스 토큰(INTERNAL_SERVICE_TOKEN)이 없어 운동 목록 사전 적재 생략")
+        return f"connections={opened}/{settings.warmup_spring_connections}, catalog={catalog}"
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "ready": self.ready,
+            "duration_seconds": self.duration_seconds,
+            "attempts": self.attempts,
+            "steps": dict(self.steps),
+            "failed": dict(self.failed)
+        }
+
+
+# 전역 워밍업 서비스 인스턴스
+warmup_service = WarmupService()
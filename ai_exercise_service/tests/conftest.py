@@ -0,0 +1,18 @@
+import os
+import sys
+import tempfile
+
+# 설정은 임포트 시점에 환경 변수를 읽으므로 서비스 모듈보다 먼저 테스트용 경로 지정
+_WORK_DIR = tempfile.mkdtemp(prefix="ai_exercise_service_tests_")
+os.environ.setdefault("OPENAI_API_KEY", "test-key")
+os.environ["SPRING_SERVER_URL"] = "http://127.0.0.1:9"
+os.environ["SHARED_CACHE_PATH"] = os.path.join(_WORK_DIR, "shared_cache.sqlite")
+os.environ["CHECKPOINT_DB_PATH"] = os.path.join(_WORK_DIR, "graph_checkpoints.sqlite")
+os.environ["TRACE_JSONL_PATH"] = os.path.join(_WORK_DIR, "traces.jsonl")
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+# main.py/benchmarks는 서비스 디렉터리 기준, 서비스 모듈은 ai_exercise_service 패키지 경로로 임포트
+SERVICE_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for path in (os.path.dirname(SERVICE_ROOT), SERVICE_ROOT):
+    if path not in sys.path:
+        sys.path.insert(0, path)
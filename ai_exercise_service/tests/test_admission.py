@@ -0,0 +1,254 @@
+import asyncio
+
+import pytest
+
+from ai_exercise_service.src.util.services.admission import (
+    AdmissionController,
+    AdmissionLimiter,
+    AdmissionMiddleware,
+    AdmissionRejected,
+)
+
+
+def _limiter(limit: int = 1, queue_size: int = 2, max_queue_seconds: float = 1.0) -> AdmissionLimiter:
+    return AdmissionLimiter("test", limit=limit, queue_size=queue_size, max_queue_seconds=max_queue_seconds)
+
+
+@pytest.mark.asyncio
+async def test_acquire_within_limit_is_immediate():
+    limiter = _limiter(limit=2)
+    await limiter.acquire()
+    await limiter.acquire()
+    assert limiter.active == 2
+
+    limiter.release()
+    limiter.release()
+    assert limiter.active == 0
+
+
+@pytest.mark.asyncio
+async def test_waiters_are_admitted_in_fifo_order():
+    limiter = _limiter(limit=1, queue_size=3)
+    await limiter.acquire()
+    admitted = []
+
+    async def wait(name):
+        await limiter.acquire()
+        admitted.append(name)
+
+    tasks = [asyncio.create_task(wait(name)) for name in ("first", "second")]
+    await asyncio.sleep(0.01)
+    assert admitted == [] and len(limiter._waiters) == 2
+
+    limiter.release()
+    await asyncio.sleep(0.01)
+    assert admitted == ["first"] and limiter.active == 1
+
+    limiter.release()
+    await asyncio.gather(*tasks)
+    assert admitted == ["first", "second"] and limiter.active == 1
+
+    limiter.release()
+    assert limiter.active == 0
+
+
+@pytest.mark.asyncio
+async def test_rejects_when_queue_full():
+    limiter = _limiter(limit=1, queue_size=1)
+    await limiter.acquire()
+    waiter = asyncio.create_task(limiter.acquire())
+    await asyncio.sleep(0.01)
+
+    with pytest.raises(AdmissionRejected) as rejected:
+        await limiter.acquire()
+    assert rejected.value.reason == "queue_full"
+    assert 1 <= rejected.value.retry_after <= 30
+
+    limiter.release()
+    await waiter
+    limiter.release()
+    assert limiter.active == 0
+
+
+@pytest.mark.asyncio
+async def test_rejects_after_max_queue_seconds():
+    limiter = _limiter(limit=1, max_queue_seconds=0.05)
+    await limiter.acquire()
+
+    with pytest.raises(AdmissionRejected) as rejected:
+        await limiter.acquire()
+    assert rejected.value.reason == "queue_timeout"
+    assert not limiter._waiters
+
+    limiter.release()
+    assert limiter.active == 0
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_does_not_leak_slot():
+    limiter = _limiter(limit=1)
+    await limiter.acquire()
+    waiter = asyncio.create_task(limiter.acquire())
+    await asyncio.sleep(0.01)
+
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+    assert not limiter._waiters
+
+    limiter.release()
+    assert limiter.active == 0
+
+
+def test_retry_after_grows_with_queue_and_service_time():
+    limiter = _limiter(limit=1)
+    assert limiter.retry_after() == 1
+    limiter.release(service_seconds=11.0)
+    assert limiter.retry_after() == 3
+    limiter._service_time = 1000.0
+    assert limiter.retry_after() == 30
+
+
+@pytest.mark.asyncio
+async def test_raising_limit_admits_waiters():
+    limiter = _limiter(limit=1, queue_size=3)
+    await limiter.acquire()
+    waiters = [asyncio.create_task(limiter.acquire()) for _ in range(2)]
+    await asyncio.sleep(0.01)
+
+    limiter.set_limits(3, 3)
+    await asyncio.gather(*waiters)
+    assert limiter.active == 3 and not limiter._waiters
+
+    for _ in range(3):
+        limiter.release()
+    assert limiter.active == 0
+
+
+@pytest.mark.asyncio
+async def test_lowering_limit_drains_before_handing_over():
+    limiter = _limiter(limit=2, queue_size=3)
+    await limiter.acquire()
+    await limiter.acquire()
+    waiter = asyncio.create_task(limiter.acquire())
+    await asyncio.sleep(0.01)
+
+    limiter.set_limits(1, 3)
+    # 처리 중 요청은 유지하고, 처리 중 수가 새 한도로 내려온 뒤에 대기자에게 넘김
+    limiter.release()
+    await asyncio.sleep(0.01)
+    assert not waiter.done() and limiter.active == 1
+
+    limiter.release()
+    await waiter
+    assert limiter.active == 1
+
+    limiter.release()
+    assert limiter.active == 0
+
+
+def _controller(limit: int = 1, queue_size: int = 0) -> AdmissionController:
+    controller = AdmissionController()
+    controller.enabled = True
+    controller.route_classes = [("/api/llm", "test")]
+    controller.limiters = {"test": _limiter(limit=limit, queue_size=queue_size)}
+    controller._default_limits = lambda route_class: {"limit": limit, "queue_size": queue_size}
+    return controller
+
+
+async def _call(middleware, path):
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    await middleware({"type": "http", "path": path, "method": "GET", "headers": []}, receive, send)
+    return messages
+
+
+async def _respond(send, body=b"ok"):
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": body})
+
+
+@pytest.mark.asyncio
+async def test_admit_outside_request_does_not_take_slot():
+    controller = _controller()
+    async with controller.admit():
+        assert controller.limiters["test"].active == 0
+
+
+@pytest.mark.asyncio
+async def test_only_llm_work_takes_admission_slots():
+    controller = _controller(limit=1, queue_size=0)
+    release = asyncio.Event()
+
+    async def app(scope, receive, send):
+        if scope["path"].endswith("/stored"):
+            # 저장된 결과/304처럼 LLM을 호출하지 않는 응답
+            await _respond(send, b"stored")
+            return
+        async with controller.admit():
+            await release.wait()
+        await _respond(send)
+
+    middleware = AdmissionMiddleware(app, controller)
+
+    first = asyncio.create_task(_call(middleware, "/api/llm/run"))
+    await asyncio.sleep(0.01)
+    assert controller.limiters["test"].active == 1
+
+    stored = await _call(middleware, "/api/llm/stored")
+    assert stored[0]["status"] == 200, "자리가 없어도 LLM을 호출하지 않는 요청은 처리"
+
+    rejected = await _call(middleware, "/api/llm/run")
+    assert rejected[0]["status"] == 503
+    assert (b"retry-after", b"1") in rejected[0]["headers"]
+
+    release.set()
+    assert (await first)[0]["status"] == 200
+    assert controller.limiters["test"].active == 0
+
+
+@pytest.mark.asyncio
+async def test_rejection_after_response_started_propagates():
+    controller = _controller()
+
+    async def app(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        raise AdmissionRejected("queue_full", 1)
+
+    with pytest.raises(AdmissionRejected):
+        await _call(AdmissionMiddleware(app, controller), "/api/llm/run")
+
+
+@pytest.mark.asyncio
+async def test_runtime_limits_are_shared_through_cache():
+    controller = _controller(limit=1, queue_size=0)
+    other_worker = _controller(limit=1, queue_size=0)
+
+    status = await controller.set_limits("test", limit=4)
+    assert status["test"]["limit"] == 4 and status["test"]["queue_size"] == 0
+
+    await other_worker.refresh()
+    assert other_worker.limiters["test"].limit == 4
+
+    await controller.set_limits("test", queue_size=2)
+    await other_worker.refresh()
+    assert (other_worker.limiters["test"].limit, other_worker.limiters["test"].queue_size) == (4, 2)
+
+    await controller.reset_limits()
+    await other_worker.refresh()
+    assert (other_worker.limiters["test"].limit, other_worker.limiters["test"].queue_size) == (1, 0)
+
+
+@pytest.mark.asyncio
+async def test_set_limits_rejects_unknown_class_and_bad_values():
+    controller = _controller()
+    with pytest.raises(ValueError):
+        await controller.set_limits("unknown", limit=2)
+    with pytest.raises(ValueError):
+        await controller.set_limits("test", limit=0)
@@ -0,0 +1,121 @@
+import pytest
+
+from ai_exercise_service.src.util.llm.brownout import BrownoutController
+
+
+def _controller() -> BrownoutController:
+    controller = BrownoutController()
+    controller.enabled = True
+    controller.window_seconds = 60.0
+    controller.min_samples = 10
+    controller.enter_in_flight = 10
+    controller.enter_error_rate = 0.5
+    controller.enter_p95 = 2.0
+    controller.exit_ratio = 0.5
+    controller.min_hold_seconds = 30.0
+    return controller
+
+
+def _finish(controller: BrownoutController, count: int, latency: float = 0.1, ok: bool = True) -> None:
+    for _ in range(count):
+        controller.llm_started()
+        controller.llm_finished(latency, ok)
+
+
+def _expire_hold(controller: BrownoutController) -> None:
+    controller.entered_at -= controller.min_hold_seconds + 1
+
+
+def test_normal_load_is_not_degraded():
+    controller = _controller()
+    _finish(controller, 20)
+    assert not controller.is_degraded()
+
+
+def test_disabled_controller_never_degrades():
+    controller = _controller()
+    controller.enabled = False
+    controller.in_flight = 100
+    assert not controller.is_degraded()
+
+
+def test_enters_on_llm_queue_depth():
+    controller = _controller()
+    controller.in_flight = 10
+    assert controller.is_degraded()
+    assert controller.reason == "llm_queue"
+
+
+def test_enters_on_error_rate_only_with_enough_samples():
+    controller = _controller()
+    _finish(controller, 5, ok=False)
+    assert not controller.is_degraded(), "표본이 min_samples보다 적으면 오류율로 진입하지 않음"
+
+    _finish(controller, 5, ok=False)
+    assert controller.is_degraded()
+    assert controller.reason == "error_rate"
+
+
+def test_enters_on_p95_latency():
+    controller = _controller()
+    _finish(controller, 10, latency=0.1)
+    _finish(controller, 2, latency=3.0)
+    assert controller.is_degraded()
+    assert controller.reason == "latency"
+
+
+def test_holds_for_min_hold_seconds_after_recovery():
+    controller = _controller()
+    controller.in_flight = 10
+    assert controller.is_degraded()
+
+    controller.in_flight = 0
+    assert controller.is_degraded(), "min_hold_seconds 전에는 지표가 내려가도 유지"
+
+    _expire_hold(controller)
+    assert not controller.is_degraded()
+
+
+def test_exit_requires_metrics_below_exit_ratio():
+    controller = _controller()
+    controller.in_flight = 10
+    assert controller.is_degraded()
+    _expire_hold(controller)
+
+    # 진입 임계값 아래지만 복귀 임계값(10 × 0.5) 이상이면 유지
+    controller.in_flight = 6
+    assert controller.is_degraded()
+
+    controller.in_flight = 4
+    assert not controller.is_degraded()
+
+    # 복귀 후에는 다시 진입 임계값을 넘어야 진입
+    controller.in_flight = 6
+    assert not controller.is_degraded()
+
+
+def test_old_samples_leave_window():
+    controller = _controller()
+    _finish(controller, 10, ok=False)
+    assert controller.is_degraded()
+    _expire_hold(controller)
+
+    controller._samples = type(controller._samples)(
+        (finished_at - controller.window_seconds - 1, latency, ok)
+        for finished_at, latency, ok in controller._samples
+    )
+    assert not controller.is_degraded()
+
+
+def test_track_call_balances_in_flight_on_error():
+    controller = _controller()
+    with pytest.raises(RuntimeError):
+        with controller.track_call():
+            assert controller.in_flight == 1
+            raise RuntimeError("llm error")
+
+    with controller.track_call():
+        pass
+
+    assert controller.in_flight == 0
+    assert [ok for _, _, ok in controller._samples] == [False, True]
@@ -0,0 +1,151 @@
+import threading
+import time
+
+import httpx
+import pytest
+from langchain_core.messages import AIMessage
+from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.runnables import RunnableLambda
+from prometheus_client import REGISTRY
+
+from ai_exercise_service.config.settings import settings
+from ai_exercise_service.src.util.llm.call_policy import LLMCallPolicy, is_transient
+from ai_exercise_service.src.util.services.deadline import DeadlineExceeded, reset_deadline, set_deadline
+
+PROMPT = ChatPromptTemplate.from_messages([("human", "{question}")])
+INPUTS = {"question": "오늘 운동 추천"}
+
+
+class _FakeModel:
+    """호출마다 정해진 동작(지연/예외)을 순서대로 수행하는 LLM 대체 구현"""
+
+    def __init__(self, *behaviours):
+        self.behaviours = list(behaviours)
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def __call__(self, prompt_value, **options):
+        with self._lock:
+            index = len(self.calls)
+            self.calls.append(options)
+        behaviour = self.behaviours[min(index, len(self.behaviours) - 1)]
+        delay, error = behaviour if isinstance(behaviour, tuple) else (0.0, behaviour)
+        time.sleep(delay)
+        if error is not None:
+            raise error
+        return AIMessage(content=f"응답 {index}")
+
+    def bind(self, **options):
+        return RunnableLambda(self).bind(**options)
+
+
+def _sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+@pytest.fixture
+def policy(monkeypatch):
+    monkeypatch.setattr(settings, "llm_max_retries", 2)
+    monkeypatch.setattr(settings, "llm_retry_base_seconds", 0.01)
+    monkeypatch.setattr(settings, "llm_retry_max_seconds", 0.02)
+    monkeypatch.setattr(settings, "llm_default_timeout_seconds", 5.0)
+    monkeypatch.setattr(settings, "llm_node_timeout_seconds", {"short_node": 2.0})
+    monkeypatch.setattr(settings, "llm_node_max_tokens", {"short_node": 300})
+    monkeypatch.setattr(settings, "llm_hedging_enabled", True)
+    monkeypatch.setattr(settings, "llm_hedge_min_samples", 3)
+    monkeypatch.setattr(settings, "llm_hedge_min_delay_seconds", 0.05)
+    return LLMCallPolicy()
+
+
+def test_transient_errors_are_retried_with_counter(policy):
+    model = _FakeModel(httpx.ConnectError("연결 실패"), TimeoutError(), None)
+    before = _sample("llm_retries_total", node="retry_node", error="ConnectError")
+
+    result = policy.invoke("retry_node", PROMPT, model, INPUTS)
+
+    assert result.content == "응답 2"
+    assert len(model.calls) == 3
+    assert _sample("llm_retries_total", node="retry_node", error="ConnectError") == before + 1
+
+
+def test_permanent_errors_and_exhausted_retries_raise(policy):
+    model = _FakeModel(ValueError("잘못된 요청"))
+    with pytest.raises(ValueError):
+        policy.invoke("retry_node", PROMPT, model, INPUTS)
+    assert len(model.calls) == 1
+
+    model = _FakeModel(TimeoutError("계속 느림"))
+    with pytest.raises(TimeoutError):
+        policy.invoke("retry_node", PROMPT, model, INPUTS)
+    assert len(model.calls) == 1 + settings.llm_max_retries
+
+
+def test_node_timeout_and_max_tokens_are_bound_to_the_call(policy):
+    model = _FakeModel(None)
+    policy.invoke("short_node", PROMPT, model, INPUTS)
+    assert model.calls[0]["timeout"] == 2.0
+    assert model.calls[0]["max_tokens"] == 300
+
+    # 요청 deadline이 더 짧으면 남은 시간으로 줄임
+    token = set_deadline(1.0)
+    try:
+        policy.invoke("other_node", PROMPT, model, INPUTS)
+    finally:
+        reset_deadline(token)
+    assert 0 < model.calls[1]["timeout"] <= 1.0
+    assert "max_tokens" not in model.calls[1]
+
+
+def test_expired_deadline_skips_the_call(policy):
+    model = _FakeModel(None)
+    token = set_deadline(-1.0)
+    try:
+        with pytest.raises(DeadlineExceeded):
+            policy.invoke("retry_node", PROMPT, model, INPUTS)
+    finally:
+        reset_deadline(token)
+    assert model.calls == []
+    assert not is_transient(DeadlineExceeded("만료"))
+
+
+def test_hedge_needs_enough_latency_samples(policy):
+    assert policy.hedge_delay("hedge_node") is None
+    for seconds in (0.01, 0.02, 0.03):
+        policy._record("hedge_node", seconds)
+    # p90이 최소 지연보다 짧으면 최소 지연 사용
+    assert policy.hedge_delay("hedge_node") == pytest.approx(0.05)
+
+
+def test_slow_primary_is_hedged_and_hedge_wins(policy):
+    for _ in range(3):
+        policy._record("hedge_node", 0.05)
+    model = _FakeModel((0.5, None), (0.0, None))
+    fired = _sample("llm_hedges_total", node="hedge_node", outcome="fired")
+    won = _sample("llm_hedges_total", node="hedge_node", outcome="won")
+
+    started = time.perf_counter()
+    result = policy.invoke("hedge_node", PROMPT, model, INPUTS)
+
+    assert result.content == "응답 1"
+    assert time.perf_counter() - started < 0.4
+    assert _sample("llm_hedges_total", node="hedge_node", outcome="fired") == fired + 1
+    assert _sample("llm_hedges_total", node="hedge_node", outcome="won") == won + 1
+
+
+def test_fast_primary_is_not_hedged(policy):
+    for _ in range(3):
+        policy._record("fast_node", 0.2)
+    model = _FakeModel((0.0, None))
+    fired = _sample("llm_hedges_total", node="fast_node", outcome="fired")
+
+    assert policy.invoke("fast_node", PROMPT, model, INPUTS).content == "응답 0"
+    assert len(model.calls) == 1
+    assert _sample("llm_hedges_total", node="fast_node", outcome="fired") == fired
+
+
+def test_failed_primary_falls_back_to_hedge(policy):
+    for _ in range(3):
+        policy._record("hedge_node", 0.05)
+    model = _FakeModel((0.1, ValueError("primary 실패")), (0.2, None))
+
+    assert policy.invoke("hedge_node", PROMPT, model, INPUTS).content == "응답 1"
@@ -0,0 +1,191 @@
+import glob
+import sqlite3
+import time
+from typing import Any, Dict, TypedDict
+
+import pytest
+from langgraph.graph import END, START, StateGraph
+
+from ai_exercise_service.src.util.graph.checkpoint import (
+    GraphCheckpointer,
+    current_request_token,
+    request_credentials,
+)
+
+SECRET = "secret-bearer-token-for-tests"
+
+
+class _State(TypedDict):
+    request_params: Dict[str, Any]
+    steps: list
+    error_message: str
+
+
+@pytest.fixture
+def checkpointer(tmp_path):
+    checkpointer = GraphCheckpointer()
+    checkpointer.enabled = True
+    checkpointer.db_path = str(tmp_path / "checkpoints.sqlite")
+    checkpointer.gc_interval_seconds = 3600
+    checkpointer._last_gc = time.time()
+    return checkpointer
+
+
+def _build_graph(checkpointer, calls, fail_times=1):
+    """collect → analyze(처음 fail_times번 실패) → report 그래프"""
+    failures = {"left": fail_times}
+
+    async def collect(state):
+        calls.append(("collect", current_request_token()))
+        return {"steps": state["steps"] + ["collect"]}
+
+    async def analyze(state):
+        calls.append(("analyze", current_request_token()))
+        if failures["left"]:
+            failures["left"] -= 1
+            return {"error_message": "analyze failed"}
+        return {"steps": state["steps"] + ["analyze"]}
+
+    async def report(state):
+        calls.append(("report", current_request_token()))
+        return {"steps": state["steps"] + ["report"]}
+
+    workflow = StateGraph(_State)
+    workflow.add_node("collect", collect)
+    workflow.add_node("analyze", analyze)
+    workflow.add_node("report", report)
+    workflow.add_edge(START, "collect")
+    workflow.add_edge("collect", "analyze")
+    workflow.add_conditional_edges("analyze", lambda state: END if state["error_message"] else "report")
+    workflow.add_edge("report", END)
+    return workflow.compile(checkpointer=checkpointer.saver)
+
+
+def _initial_state():
+    return {"request_params": {"year": 2025, "month": 3}, "steps": [], "error_message": ""}
+
+
+def _checkpoint_rows(checkpointer, thread_id):
+    with checkpointer.saver.cursor() as cur:
+        cur.execute("SELECT COUNT(*) FROM checkpoints WHERE thread_id = ?", (thread_id,))
+        return cur.fetchone()[0]
+
+
+def _stored_bytes(db_path):
+    data = b""
+    for path in glob.glob(db_path + "*"):
+        with open(path, "rb") as db_file:
+            data += db_file.read()
+    return data
+
+
+def test_thread_config_is_stable_and_input_scoped(checkpointer):
+    first = checkpointer.thread_config("meal_feedback", 2025, 3)
+    assert first == checkpointer.thread_config("meal_feedback", 2025, 3)
+    assert first != checkpointer.thread_config("meal_feedback", 2025, 4)
+    assert first["configurable"]["thread_id"].startswith("meal_feedback:")
+
+
+@pytest.mark.asyncio
+async def test_failed_run_resumes_from_last_successful_node_then_purges(checkpointer):
+    calls = []
+    graph = _build_graph(checkpointer, calls)
+    config = checkpointer.thread_config("test_graph", 2025, 3)
+    thread_id = config["configurable"]["thread_id"]
+
+    failed = await checkpointer.arun(graph, _initial_state(), config)
+    assert failed["error_message"] == "analyze failed"
+    assert _checkpoint_rows(checkpointer, thread_id) > 0
+
+    result = await checkpointer.arun(graph, _initial_state(), config)
+
+    # 재시도는 collect를 다시 실행하지 않고 실패한 analyze부터 이어서 실행
+    assert [name for name, _ in calls] == ["collect", "analyze", "analyze", "report"]
+    assert result["steps"] == ["collect", "analyze", "report"]
+    assert not result["error_message"]
+    # 성공한 스레드는 즉시 삭제
+    assert _checkpoint_rows(checkpointer, thread_id) == 0
+
+
+@pytest.mark.asyncio
+async def test_purge_expired_removes_abandoned_threads(checkpointer):
+    graph = _build_graph(checkpointer, [])
+    config = checkpointer.thread_config("test_graph", "abandoned")
+    thread_id = config["configurable"]["thread_id"]
+    await checkpointer.arun(graph, _initial_state(), config)
+    assert checkpointer.purge_expired() == 0
+
+    with checkpointer.saver.cursor() as cur:
+        cur.execute(
+            "UPDATE checkpoint_threads SET updated_at = ? WHERE thread_id = ?",
+            (time.time() - checkpointer.ttl_seconds - 1, thread_id)
+        )
+    assert checkpointer.purge_expired() == 1
+    assert _checkpoint_rows(checkpointer, thread_id) == 0
+
+
+@pytest.mark.asyncio
+async def test_credentials_reach_nodes_but_are_not_checkpointed(checkpointer):
+    calls = []
+    graph = _build_graph(checkpointer, calls, fail_times=1)
+    config = checkpointer.thread_config("test_graph", 2025, 3)
+
+    with request_credentials(SECRET):
+        await checkpointer.arun(graph, _initial_state(), config)
+
+    assert calls == [("collect", SECRET), ("analyze", SECRET)]
+    assert current_request_token() is None
+    # 실패한 스레드의 체크포인트(상태, 메타데이터, 쓰기 기록)에 토큰이 남지 않음
+    assert _checkpoint_rows(checkpointer, config["configurable"]["thread_id"]) > 0
+    assert SECRET.encode() not in _stored_bytes(checkpointer.db_path)
+    assert SECRET not in str(config)
+
+
+@pytest.mark.asyncio
+async def test_meal_feedback_token_stays_out_of_checkpoints(monkeypatch):
+    from ai_exercise_service.src.ai.meal_feedback.service.diet_feedback_service import diet_feedback_service
+    from ai_exercise_service.src.util.graph.checkpoint import graph_checkpointer
+    from ai_exercise_service.src.util.services.meal_data_service import meal_data_service
+
+    received = []
+
+    async def failing_collect(token, year, month):
+        received.append(token)
+        raise RuntimeError("spring unavailable")
+
+    monkeypatch.setattr(meal_data_service, "get_monthly_meal_data", failing_collect)
+    result = await diet_feedback_service.generate_comprehensive_feedback(2019, 5, SECRET)
+
+    assert not result["success"]
+    assert received == [SECRET]
+    assert SECRET.encode() not in _stored_bytes(graph_checkpointer.db_path)
+
+
+@pytest.mark.asyncio
+async def test_range_feedback_passes_token_to_month_tasks(monkeypatch):
+    from ai_exercise_service.src.ai.meal_feedback.service.diet_feedback_service import diet_feedback_service
+    from ai_exercise_service.src.util.graph.checkpoint import graph_checkpointer
+    from ai_exercise_service.src.util.services.meal_data_service import meal_data_service
+
+    received = []
+
+    async def failing_collect(token, year, month):
+        received.append(token)
+        raise RuntimeError("spring unavailable")
+
+    monkeypatch.setattr(meal_data_service, "collect_monthly_meal_data", failing_collect)
+    await diet_feedback_service.generate_range_feedback((2018, 1), (2018, 2), SECRET)
+
+    assert received == [SECRET, SECRET]
+    assert SECRET.encode() not in _stored_bytes(graph_checkpointer.db_path)
+
+
+def test_stored_bytes_detects_plain_values(tmp_path):
+    """토큰 검사 보조 함수가 SQLite 파일의 평문 값을 실제로 찾는지 확인"""
+    db_path = str(tmp_path / "probe.sqlite")
+    conn = sqlite3.connect(db_path)
+    conn.execute("CREATE TABLE probe (value TEXT)")
+    conn.execute("INSERT INTO probe VALUES (?)", (SECRET,))
+    conn.commit()
+    conn.close()
+    assert SECRET.encode() in _stored_bytes(db_path)
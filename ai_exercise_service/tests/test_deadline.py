@@ -0,0 +1,142 @@
+import asyncio
+
+import httpx
+import pytest
+
+from ai_exercise_service.config.settings import settings
+from ai_exercise_service.src.util.services.deadline import (
+    DeadlineExceeded,
+    DeadlineMiddleware,
+    SpringDeadlineExceeded,
+    bounded_timeout,
+    check_deadline,
+    remaining,
+    reset_deadline,
+    route_budget,
+    run_within_deadline,
+    set_deadline,
+)
+from ai_exercise_service.src.util.services.spring_client import SpringTransport
+
+
+def test_nested_deadline_keeps_the_shorter_budget():
+    outer = set_deadline(1.0)
+    try:
+        inner = set_deadline(60.0)
+        assert remaining() <= 1.0
+        reset_deadline(inner)
+    finally:
+        reset_deadline(outer)
+    assert remaining() is None
+
+
+def test_bounded_timeout_caps_to_remaining_time():
+    assert bounded_timeout(30.0) == 30.0
+    token = set_deadline(2.0)
+    try:
+        assert bounded_timeout(30.0) <= 2.0
+        assert bounded_timeout(0.5) == 0.5
+        assert bounded_timeout(None) <= 2.0
+    finally:
+        reset_deadline(token)
+
+
+def test_check_deadline_raises_once_expired():
+    token = set_deadline(-1.0)
+    try:
+        with pytest.raises(DeadlineExceeded, match="LLM 호출"):
+            check_deadline("LLM 호출")
+        assert bounded_timeout(10.0) == 0.0
+    finally:
+        reset_deadline(token)
+
+
+@pytest.mark.asyncio
+async def test_run_within_deadline_cancels_slow_work():
+    cancelled = asyncio.Event()
+
+    async def slow():
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    token = set_deadline(0.3)
+    try:
+        with pytest.raises(DeadlineExceeded):
+            await run_within_deadline(slow(), reserve_seconds=0.25)
+    finally:
+        reset_deadline(token)
+    assert cancelled.is_set()
+
+
+@pytest.mark.asyncio
+async def test_run_within_deadline_skips_work_when_only_reserve_is_left():
+    started = []
+
+    async def work():
+        started.append(True)
+
+    token = set_deadline(0.1)
+    try:
+        with pytest.raises(DeadlineExceeded):
+            await run_within_deadline(work(), reserve_seconds=1.0)
+    finally:
+        reset_deadline(token)
+    assert started == []
+    assert await run_within_deadline(asyncio.sleep(0, result="done")) == "done"
+
+
+def test_route_budget_uses_longest_matching_prefix(monkeypatch):
+    monkeypatch.setattr(settings, "request_deadline_seconds", 10.0)
+    monkeypatch.setattr(settings, "route_deadline_seconds", {"/api": 20.0, "/api/meal-feedback": 45.0})
+
+    assert route_budget("/api/meal-feedback/2025/3") == 45.0
+    assert route_budget("/api/exercise/auto") == 20.0
+    assert route_budget("/health") == 10.0
+
+
+@pytest.mark.asyncio
+async def test_middleware_uses_the_shorter_of_route_and_header_budget(monkeypatch):
+    monkeypatch.setattr(settings, "route_deadline_seconds", {"/slow": 30.0})
+    seen = []
+
+    async def app(scope, receive, send):
+        seen.append(remaining())
+
+    middleware = DeadlineMiddleware(app)
+    header = settings.deadline_header.lower().encode("latin-1")
+    await middleware({"type": "http", "path": "/slow", "headers": [(header, b"1500")]}, None, None)
+    await middleware({"type": "http", "path": "/slow", "headers": [(header, b"soon")]}, None, None)
+
+    assert 0 < seen[0] <= 1.5
+    assert 1.5 < seen[1] <= 30.0
+    assert remaining() is None
+
+
+@pytest.mark.asyncio
+async def test_spring_calls_are_bounded_by_the_deadline():
+    sent = []
+
+    def spring(request):
+        sent.append(request.extensions["timeout"])
+        return httpx.Response(200, json={})
+
+    async with httpx.AsyncClient(transport=SpringTransport("test", httpx.MockTransport(spring)), timeout=30.0) as client:
+        token = set_deadline(2.0)
+        try:
+            await client.get("http://spring/exercises")
+        finally:
+            reset_deadline(token)
+
+        token = set_deadline(-1.0)
+        try:
+            with pytest.raises(SpringDeadlineExceeded):
+                await client.get("http://spring/exercises")
+        finally:
+            reset_deadline(token)
+
+    # 첫 요청의 타임아웃은 남은 시간으로 줄고, 두 번째 요청은 보내지 않음
+    assert len(sent) == 1
+    assert all(0 < value <= 2.0 for value in sent[0].values())
@@ -0,0 +1,93 @@
+import os
+import shutil
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+import pytest
+
+pytest.importorskip("gunicorn")
+pytest.importorskip("uvicorn_worker")
+
+SERVICE_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STARTUP_TIMEOUT_SECONDS = 60
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _wait_ready(process: subprocess.Popen, url: str) -> httpx.Response:
+    deadline = time.monotonic() + STARTUP_TIMEOUT_SECONDS
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            break
+        try:
+            return httpx.get(url, timeout=1.0)
+        except httpx.TransportError:
+            time.sleep(0.2)
+    return None
+
+
+@pytest.fixture
+def gunicorn_server():
+    """실제 `gunicorn -c gunicorn.conf.py main:app`을 워커 2개로 실행"""
+    work_dir = tempfile.mkdtemp(prefix="ai_exercise_service_gunicorn_")
+    # 존재하지 않는 디렉터리로 지정해 설정 파일이 preload 전에 만들어 주는지 확인
+    multiproc_dir = os.path.join(work_dir, "prometheus")
+    port = _free_port()
+    env = dict(
+        os.environ,
+        API_HOST="127.0.0.1",
+        API_PORT=str(port),
+        WEB_WORKERS="2",
+        WARMUP_ENABLED="false",
+        PROMETHEUS_MULTIPROC_DIR=multiproc_dir,
+        SHARED_CACHE_PATH=os.path.join(work_dir, "shared_cache.sqlite"),
+        CHECKPOINT_DB_PATH=os.path.join(work_dir, "graph_checkpoints.sqlite"),
+        TRACE_JSONL_PATH=os.path.join(work_dir, "traces.jsonl"),
+    )
+    env.pop("LET_AI_PROMETHEUS_DIR_READY", None)
+    log_path = os.path.join(work_dir, "gunicorn.log")
+    with open(log_path, "wb") as log_file:
+        process = subprocess.Popen(
+            [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "main:app"],
+            cwd=SERVICE_ROOT,
+            env=env,
+            stdout=log_file,
+            stderr=subprocess.STDOUT,
+        )
+    try:
+        yield process, f"http://127.0.0.1:{port}", log_path
+    finally:
+        process.send_signal(signal.SIGTERM)
+        try:
+            process.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def test_gunicorn_starts_and_serves_metrics(gunicorn_server):
+    """preload + 멀티프로세스 메트릭 구성으로 워커가 뜨고 /health, /metrics가 응답"""
+    process, base_url, log_path = gunicorn_server
+
+    response = _wait_ready(process, f"{base_url}/health")
+    with open(log_path, encoding="utf-8", errors="replace") as log_file:
+        log = log_file.read()
+    assert response is not None, f"gunicorn이 시작되지 않음:\n{log[-3000:]}"
+    assert response.status_code == 200
+    assert "FileNotFoundError" not in log
+    assert process.poll() is None
+
+    metrics = httpx.get(f"{base_url}/metrics", timeout=5.0)
+    assert metrics.status_code == 200
+    # 워커가 기록한 요청 메트릭이 멀티프로세스 디렉터리를 통해 합산되어 노출됨
+    assert "http_request_duration_seconds" in metrics.text
@@ -0,0 +1,22 @@
+from benchmarks.import_time import LAZY_MODULES, measure_import
+
+# benchmarks.import_time 기본 예산과 동일 (워커 시작/재시작 지연 회귀 방지)
+IMPORT_BUDGET_MS = 1000.0
+RUNS = 3
+
+
+def test_main_import_within_budget():
+    """새 인터프리터에서 `python -X importtime -c "import main"`의 최소 누적 시간이 예산 이내"""
+    runs = [measure_import("main") for _ in range(RUNS)]
+    best_us, modules = min(runs, key=lambda run: run[0])
+
+    assert best_us > 0, "importtime 출력에서 main 모듈을 찾지 못함"
+    slowest = sorted(modules.items(), key=lambda item: item[1], reverse=True)[1:6]
+    assert best_us / 1000 <= IMPORT_BUDGET_MS, f"main 임포트 {best_us / 1000:.1f}ms, 상위 모듈: {slowest}"
+
+
+def test_lazy_modules_not_imported_at_startup():
+    """LangGraph/LangChain/OpenAI 등은 첫 요청 시점까지 임포트하지 않음"""
+    _, modules = measure_import("main")
+    eager = sorted(name for name in modules if name.startswith(LAZY_MODULES))
+    assert not eager, f"시작 시점에 임포트된 지연 로딩 대상 모듈: {eager[:10]}"
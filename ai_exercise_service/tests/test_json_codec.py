@@ -0,0 +1,69 @@
+import datetime
+import json
+
+import httpx
+import pytest
+
+from ai_exercise_service.src.util.serialization import json_codec
+from ai_exercise_service.src.util.serialization.json_codec import FastJSONResponse, dumps, loads, response_json
+
+PAYLOAD = {
+    "message": "오늘은 1800kcal 섭취하셨네요!",
+    "grade_rates": {1: 91.5, 2: 88.0},
+    "generated_at": datetime.date(2025, 3, 1),
+    "items": [{"id": 5, "ok": True, "score": None}],
+}
+
+
+@pytest.fixture(params=["orjson", "json"])
+def backend(request, monkeypatch):
+    if request.param == "orjson" and json_codec.orjson is None:
+        pytest.skip("orjson 미설치")
+    monkeypatch.setattr(json_codec, "BACKEND", request.param)
+    return request.param
+
+
+def test_dumps_handles_korean_numeric_keys_and_dates(backend):
+    body = dumps(PAYLOAD)
+
+    assert isinstance(body, bytes)
+    # 한글은 이스케이프 없이 UTF-8로
+    assert "오늘은".encode("utf-8") in body
+    assert loads(body) == {
+        "message": "오늘은 1800kcal 섭취하셨네요!",
+        "grade_rates": {"1": 91.5, "2": 88.0},
+        "generated_at": "2025-03-01",
+        "items": [{"id": 5, "ok": True, "score": None}],
+    }
+
+
+def test_backends_agree_with_standard_json(backend):
+    assert loads(dumps(PAYLOAD)) == json.loads(json.dumps(PAYLOAD, default=str))
+
+
+def test_response_json_decodes_spring_bodies(backend):
+    response = httpx.Response(200, content='{"name": "김치찌개", "rating": 4.5}'.encode("utf-8"))
+    assert response_json(response) == {"name": "김치찌개", "rating": 4.5}
+
+
+def test_fast_json_response_renders_with_codec(backend):
+    response = FastJSONResponse({"grade": {3: "고학년"}})
+    assert response.headers["content-type"] == "application/json"
+    assert loads(response.body) == {"grade": {"3": "고학년"}}
+
+
+@pytest.mark.asyncio
+async def test_large_responses_are_gzipped_and_small_ones_are_not():
+    from main import app
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        small = await client.get("/health", headers={"Accept-Encoding": "gzip"})
+        large = await client.get("/metrics", headers={"Accept-Encoding": "gzip"})
+        plain = await client.get("/metrics", headers={"Accept-Encoding": "identity"})
+
+    assert "content-encoding" not in small.headers
+    assert small.json()["status"] == "healthy"
+    assert large.headers["content-encoding"] == "gzip"
+    # httpx가 자동으로 풀어 준 본문과 압축 전 크기 비교
+    assert int(large.headers["content-length"]) < len(large.content)
+    assert "content-encoding" not in plain.headers
@@ -0,0 +1,126 @@
+import io
+import json
+import logging
+import queue
+
+import pytest
+from prometheus_client import REGISTRY
+
+from ai_exercise_service.src.util.monitoring.log_pipeline import (
+    HotPathFilter,
+    JsonFormatter,
+    LogPipeline,
+    RequestContextFilter,
+    _EnqueueHandler,
+)
+from ai_exercise_service.src.util.monitoring.tracing import tracer
+
+
+def _record(name, level=logging.INFO, msg="칼로리 분석 완료", request_id="-"):
+    record = logging.LogRecord(name, level, __file__, 1, msg, None, None)
+    record.request_id = request_id
+    return record
+
+
+def _dropped(logger, reason):
+    return REGISTRY.get_sample_value("log_records_dropped_total", {"logger": logger, "reason": reason}) or 0.0
+
+
+@pytest.fixture
+def pipeline():
+    pipeline = LogPipeline()
+    pipeline._stream = io.StringIO()
+    pipeline._formatter = JsonFormatter()
+    return pipeline
+
+
+@pytest.fixture
+def traced(monkeypatch):
+    # 내보내지 않는 trace로 요청 컨텍스트만 만듦
+    monkeypatch.setattr(tracer, "enabled", True)
+    monkeypatch.setattr(tracer, "sample_rate", 0.0)
+    monkeypatch.setattr(tracer, "slow_threshold_ns", 10 ** 12)
+    return tracer
+
+
+def _logger(name, pipeline):
+    logger = logging.getLogger(name)
+    logger.handlers.clear()
+    handler = _EnqueueHandler(pipeline)
+    handler.addFilter(RequestContextFilter())
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    return logger
+
+
+def test_sampling_keeps_or_drops_whole_requests():
+    hot_path = HotPathFilter({"src.ai.exercise": 0.5}, {})
+    request_ids = [f"req-{i}" for i in range(200)]
+
+    first = [hot_path.filter(_record("src.ai.exercise.graph.node", request_id=rid)) for rid in request_ids]
+    second = [hot_path.filter(_record("ai_exercise_service.src.ai.exercise.service", request_id=rid)) for rid in request_ids]
+
+    # 같은 요청은 로거가 달라도 같은 결정, 전체로는 대략 비율만큼 남음
+    assert first == second
+    assert 50 < sum(first) < 150
+
+
+def test_warnings_bypass_sampling_and_rate_limits():
+    hot_path = HotPathFilter({"ai": 0.0}, {"ai": 1.0})
+    assert not hot_path.filter(_record("ai.exercise.graph", request_id="req-1"))
+    assert hot_path.filter(_record("ai.exercise.graph", level=logging.WARNING, request_id="req-1"))
+
+
+def test_rate_limit_uses_longest_matching_rule():
+    hot_path = HotPathFilter({}, {"ai": 100.0, "ai.meal_feedback.graph": 2.0})
+    before = _dropped("ai.meal_feedback.graph", "rate_limited")
+
+    kept = [hot_path.filter(_record("src.ai.meal_feedback.graph.meal_analysis_graph")) for _ in range(5)]
+    other = [hot_path.filter(_record("ai.exercise.graph")) for _ in range(5)]
+
+    assert kept == [True, True, False, False, False]
+    assert all(other)
+    assert _dropped("ai.meal_feedback.graph", "rate_limited") == before + 3
+
+
+def test_records_are_written_as_json_lines_with_request_id(pipeline, traced):
+    logger = _logger("test.log_pipeline.json", pipeline)
+    meals = {"date": "2025-03-01", "menu": ["밥"]}
+
+    root, tokens = traced.start_trace("req-42")
+    logger.info("식사 데이터: %s", meals)
+    meals["menu"].append("국")  # 큐에 넣을 때 메시지가 확정되어야 함
+    try:
+        raise ValueError("파싱 실패")
+    except ValueError:
+        logger.exception("운동 선택 실패")
+    traced.end_trace(root, tokens)
+    logger.info("요청 밖 로그")
+    pipeline.flush()
+
+    entries = [json.loads(line) for line in pipeline._stream.getvalue().splitlines()]
+    assert [entry["message"] for entry in entries] == [
+        "식사 데이터: {'date': '2025-03-01', 'menu': ['밥']}", "운동 선택 실패", "요청 밖 로그"
+    ]
+    assert entries[0]["request_id"] == "req-42"
+    assert entries[0]["trace_id"] == entries[1]["trace_id"]
+    assert entries[0]["thread"] == "MainThread"
+    assert "ValueError: 파싱 실패" in entries[1]["exc_info"]
+    assert entries[2]["request_id"] == "-"
+    assert "trace_id" not in entries[2]
+    # 한글은 이스케이프하지 않음
+    assert "\\u" not in pipeline._stream.getvalue()
+
+
+def test_full_queue_drops_info_records_without_blocking(pipeline):
+    pipeline._queue = queue.Queue(maxsize=1)
+    # 쓰기 스레드 없이 큐가 가득 찬 상태를 만듦
+    pipeline._worker = object()
+    before = _dropped("test.log_pipeline.full", "queue_full")
+
+    pipeline.submit(_record("test.log_pipeline.full"))
+    pipeline.submit(_record("test.log_pipeline.full"))
+
+    assert pipeline._queue.qsize() == 1
+    assert _dropped("test.log_pipeline.full", "queue_full") == before + 1
@@ -0,0 +1,101 @@
+import asyncio
+import logging
+import os
+import time
+import traceback
+
+import pytest
+from prometheus_client import REGISTRY
+
+from ai_exercise_service.src.util.monitoring.loop_monitor import SERVICE_ROOT, EventLoopMonitor, _blocking_site
+
+SITE = "tests/test_loop_monitor.py:_hold_the_loop"
+
+
+def _hold_the_loop(seconds):
+    # 이벤트 루프 안에서 동기 호출로 루프를 붙잡는 코드 (예: 노드 안의 chain.invoke)
+    time.sleep(seconds)
+
+
+@pytest.fixture
+def monitor():
+    monitor = EventLoopMonitor()
+    monitor.enabled = True
+    monitor.interval = 0.01
+    monitor.threshold = 0.1
+    monitor.log_interval = 60.0
+    monitor.dump_all_threads = True
+    return monitor
+
+
+@pytest.mark.asyncio
+async def test_blocking_call_is_reported_with_its_stack(monitor, caplog):
+    before = REGISTRY.get_sample_value("event_loop_blocking_total", {"site": SITE}) or 0.0
+    monitor.start()
+    try:
+        await asyncio.sleep(0.05)
+        with caplog.at_level(logging.WARNING, logger="ai_exercise_service.src.util.monitoring.loop_monitor"):
+            _hold_the_loop(0.4)
+            await asyncio.sleep(0.05)
+        status = monitor.status()
+    finally:
+        await monitor.stop()
+
+    assert status["running"] is True
+    assert status["blocking_sites"][SITE]["count"] == 1
+    assert status["blocking_sites"][SITE]["max_stalled_seconds"] >= monitor.threshold
+    # 지연 샘플에 블로킹 시간이 반영됨
+    assert status["lag_seconds"]["p99"] >= 0.2
+    assert REGISTRY.get_sample_value("event_loop_blocking_total", {"site": SITE}) == before + 1
+
+    message = next(record.getMessage() for record in caplog.records if "이벤트 루프 블로킹 감지" in record.getMessage())
+    assert SITE in message
+    assert "test_blocking_call_is_reported_with_its_stack" in message
+    assert "--- 스레드 event-loop-watchdog ---" in message
+    assert monitor.status()["running"] is False
+
+
+@pytest.mark.asyncio
+async def test_repeated_blocks_at_one_site_log_once(monitor, caplog):
+    monitor.start()
+    try:
+        with caplog.at_level(logging.WARNING, logger="ai_exercise_service.src.util.monitoring.loop_monitor"):
+            for _ in range(2):
+                await asyncio.sleep(0.05)
+                _hold_the_loop(0.3)
+            await asyncio.sleep(0.05)
+    finally:
+        await monitor.stop()
+
+    assert monitor.status()["blocking_sites"][SITE]["count"] == 2
+    assert sum("이벤트 루프 블로킹 감지" in record.getMessage() for record in caplog.records) == 1
+
+
+@pytest.mark.asyncio
+async def test_idle_loop_reports_no_blocking(monitor):
+    monitor.start()
+    try:
+        await asyncio.sleep(0.3)
+    finally:
+        await monitor.stop()
+
+    assert monitor.status()["blocking_sites"] == {}
+
+
+@pytest.mark.asyncio
+async def test_disabled_monitor_does_not_start(monitor):
+    monitor.enabled = False
+    monitor.start()
+    assert monitor.status()["running"] is False
+
+
+def test_blocking_site_prefers_service_code_over_library_frames():
+    service_file = os.path.join(SERVICE_ROOT, "src", "ai", "exercise", "graph", "exercise_recommendation_graph.py")
+    stack = [
+        traceback.FrameSummary(service_file, 10, "select_exercises_node"),
+        traceback.FrameSummary("/usr/lib/python3/site-packages/httpx/_client.py", 20, "send"),
+    ]
+    assert _blocking_site(stack) == "src/ai/exercise/graph/exercise_recommendation_graph.py:select_exercises_node"
+
+    library_only = [traceback.FrameSummary("/usr/lib/python3/json/encoder.py", 5, "encode")]
+    assert _blocking_site(library_only) == "encoder.py:encode"
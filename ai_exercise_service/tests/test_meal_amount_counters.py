@@ -0,0 +1,176 @@
+import threading
+
+import httpx
+import pytest
+
+from ai_exercise_service.config.settings import settings
+from ai_exercise_service.src.util.cache.meal_amount_counters import MealAmountCounters, meal_amount_counters
+from ai_exercise_service.src.util.services.meal_data_service import meal_data_service
+
+
+def _record(record_id, rating="SUITABLE", meal_type="중식", meal_date="2025-03-05"):
+    record = {"rating": rating, "meal": {"mealType": meal_type, "mealDate": meal_date}}
+    if record_id is not None:
+        record["id"] = record_id
+    return record
+
+
+def _totals(counters: MealAmountCounters, year: int, month: int):
+    totals = {"FEW": 0, "SUITABLE": 0, "MUCH": 0}
+    for entry in counters.month_counts(year, month):
+        for rating in totals:
+            totals[rating] += entry[rating]
+    return totals
+
+
+@pytest.fixture
+def counters(tmp_path):
+    return MealAmountCounters(str(tmp_path / "counters.sqlite"))
+
+
+def test_rebuild_counts_by_date_meal_type_and_rating(counters):
+    records = [
+        _record(1, "FEW", "조식", "2025-03-05"),
+        _record(2, "FEW", "조식", "2025-03-05"),
+        _record(3, "MUCH", "중식", "2025-03-05"),
+        _record(4, "SUITABLE", "석식", "2025-03-06"),
+        _record(5, "MUCH", "중식", "2025-04-01"),
+    ]
+    assert counters.apply(records, rebuild=True) == 5
+    assert counters.sync_state()[0] == 5
+
+    assert counters.month_counts(2025, 3) == [
+        {"date": "2025-03-05", "mealType": "조식", "FEW": 2, "SUITABLE": 0, "MUCH": 0},
+        {"date": "2025-03-05", "mealType": "중식", "FEW": 0, "SUITABLE": 0, "MUCH": 1},
+        {"date": "2025-03-06", "mealType": "석식", "FEW": 0, "SUITABLE": 1, "MUCH": 0},
+    ]
+    assert _totals(counters, 2025, 4) == {"FEW": 0, "SUITABLE": 0, "MUCH": 1}
+
+
+def test_incremental_apply_skips_records_at_or_below_watermark(counters):
+    counters.apply([_record(1), _record(2)], rebuild=True)
+
+    # Spring이 since 파라미터를 무시해 전체 이력이 와도 새 레코드만 반영
+    assert counters.apply([_record(1), _record(2), _record(3, "FEW")]) == 1
+    assert counters.sync_state()[0] == 3
+    assert counters.apply([_record(1), _record(2), _record(3, "FEW")]) == 0
+    assert _totals(counters, 2025, 3) == {"FEW": 1, "SUITABLE": 2, "MUCH": 0}
+
+
+def test_records_without_id_only_counted_on_rebuild(counters):
+    assert counters.apply([_record(None)], rebuild=True) == 1
+    assert counters.apply([_record(None)]) == 0
+    assert counters.sync_state()[0] == 0
+
+
+def test_records_without_meal_date_are_counted_in_every_month(counters):
+    undated = {"id": 3, "rating": "MUCH", "meal": {"mealType": "석식"}}
+    counters.apply([_record(1, "FEW", meal_date="2025-03-05"), _record(2, "FEW", meal_date="2025-04-01"), undated], rebuild=True)
+
+    # 어느 달 평가인지 알 수 없으므로 누락하지 않고 모든 달 조회에 포함 (기존 전체 집계와 같게)
+    march = counters.month_counts(2025, 3)
+    assert march[0] == {"date": None, "mealType": "석식", "FEW": 0, "SUITABLE": 0, "MUCH": 1}
+    assert _totals(counters, 2025, 3) == {"FEW": 1, "SUITABLE": 0, "MUCH": 1}
+    assert _totals(counters, 2025, 4) == {"FEW": 1, "SUITABLE": 0, "MUCH": 1}
+
+    counters.apply([{"id": 4, "rating": "FEW"}])
+    assert _totals(counters, 2025, 5) == {"FEW": 1, "SUITABLE": 0, "MUCH": 1}
+
+
+def test_unknown_ratings_are_ignored_but_advance_watermark(counters):
+    counters.apply([_record(1, "UNKNOWN")], rebuild=True)
+    assert counters.month_counts(2025, 3) == []
+    assert counters.sync_state()[0] == 1
+
+
+def test_rebuild_replaces_counts(counters):
+    counters.apply([_record(1, "FEW"), _record(2, "MUCH")], rebuild=True)
+    # 삭제/수정된 평가는 전체 재집계에서 반영
+    counters.apply([_record(2, "SUITABLE")], rebuild=True)
+    assert _totals(counters, 2025, 3) == {"FEW": 0, "SUITABLE": 1, "MUCH": 0}
+    assert counters.sync_state()[0] == 2
+
+
+def test_needs_rebuild_after_interval(counters, monkeypatch):
+    assert counters.needs_rebuild()
+    counters.apply([_record(1)], rebuild=True)
+    assert not counters.needs_rebuild()
+
+    # 증분 반영은 재집계 시각을 바꾸지 않음
+    rebuilt_at = counters.sync_state()[1]
+    counters.apply([_record(2)])
+    assert counters.sync_state()[1] == rebuilt_at
+
+    monkeypatch.setattr(settings, "meal_amount_rebuild_seconds", 0.0)
+    assert counters.needs_rebuild()
+
+
+def test_concurrent_applies_count_each_record_once(counters):
+    counters.apply([], rebuild=True)
+    records = [_record(record_id, "FEW") for record_id in range(1, 201)]
+    barrier = threading.Barrier(8)
+
+    def worker():
+        # 워커마다 별도 연결 (스레드 로컬)
+        barrier.wait()
+        counters.apply(records)
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert _totals(counters, 2025, 3)["FEW"] == 200
+    assert counters.sync_state()[0] == 200
+
+
+@pytest.mark.asyncio
+async def test_sync_requests_only_records_after_watermark():
+    history = [_record(1, "FEW", "조식"), _record(2, "MUCH", "중식"), _record(3, "SUITABLE", "석식")]
+    requested = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        after_id = request.url.params.get(settings.meal_amount_since_param)
+        requested.append(after_id)
+        records = [record for record in history if after_id is None or record["id"] > int(after_id)]
+        return httpx.Response(200, json={"status": 200, "message": "ok", "data": records})
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        first = await meal_data_service._get_meal_amounts(client, {}, 2025, 3)
+        history.append(_record(4, "FEW", "중식"))
+        second = await meal_data_service._get_meal_amounts(client, {}, 2025, 3)
+
+    assert requested == [None, "3"], "첫 조회는 전체 재집계, 이후는 워터마크 이후만 요청"
+    assert first["statistics"]["total_evaluations"] == 3
+    assert second["statistics"]["total_evaluations"] == 4
+    assert second["statistics"]["rating_counts"] == {"FEW": 2, "SUITABLE": 1, "MUCH": 1}
+    assert second["statistics"]["meal_type_ratings"]["중식"] == {"FEW": 1, "SUITABLE": 0, "MUCH": 1}
+    assert meal_amount_counters.sync_state()[0] == 4
+
+
+@pytest.mark.asyncio
+async def test_sync_keeps_sqlite_off_the_event_loop(monkeypatch):
+    loop_thread = threading.get_ident()
+    calls = []
+
+    def tracked(name):
+        original = getattr(meal_amount_counters, name)
+
+        def wrapper(*args, **kwargs):
+            calls.append((name, threading.get_ident() != loop_thread))
+            return original(*args, **kwargs)
+        monkeypatch.setattr(meal_amount_counters, name, wrapper)
+
+    for name in ("sync_state", "needs_rebuild", "apply", "month_counts"):
+        tracked(name)
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, json={"status": 200, "message": "ok", "data": [_record(100, "FEW")]})
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        result = await meal_data_service._get_meal_amounts(client, {}, 2025, 3)
+
+    assert result["statistics"]
+    assert {name for name, _ in calls} >= {"sync_state", "apply", "month_counts"}
+    assert all(off_loop for _, off_loop in calls), f"이벤트 루프에서 실행된 SQLite 호출: {calls}"
@@ -0,0 +1,118 @@
+import asyncio
+
+import pytest
+
+from ai_exercise_service.config.settings import settings
+from ai_exercise_service.src.ai.meal_feedback.service.diet_feedback_service import diet_feedback_service, month_range
+from ai_exercise_service.src.util.services.deadline import reset_deadline, set_deadline
+from ai_exercise_service.src.util.services.meal_data_service import meal_data_service
+
+
+def _raw_meal_data(year: int, month: int):
+    return {
+        "period": {"year": year, "month": month},
+        "monthly_rating": {"average_rating": 4.0 + month / 100},
+        "menu_rankings": {"data": {"menus": [
+            {"menuName": "김치찌개", "averageRating": 4.9},
+            {"menuName": "생선까스", "averageRating": 3.1},
+        ]}},
+        "meal_amounts": {"statistics": {"rating_percentages": {"FEW": 20.0, "SUITABLE": 70.0, "MUCH": 10.0}}},
+    }
+
+
+class _FakeMealData:
+    """월별 급식 데이터 수집 대체 (호출 기록, 달별 지연/대체 항목 지정)"""
+
+    def __init__(self, delays=None, fallbacks=None):
+        self.calls = []
+        self.delays = delays or {}
+        self.fallbacks = fallbacks or {}
+
+    async def __call__(self, token, year, month):
+        self.calls.append((year, month))
+        await asyncio.sleep(self.delays.get((year, month), 0.0))
+        return _raw_meal_data(year, month), list(self.fallbacks.get((year, month), []))
+
+
+@pytest.fixture(scope="module", autouse=True)
+def fake_llm():
+    from ai_exercise_service.src.util.llm.client_factory import override_chat_model
+    from benchmarks.fake_llm import install_fake_chat_model
+
+    install_fake_chat_model(ttft_ms=0.0, token_latency_ms=0.0)
+    yield
+    override_chat_model(None)
+
+
+def test_month_range_spans_years():
+    assert month_range((2024, 11), (2025, 2)) == [(2024, 11), (2024, 12), (2025, 1), (2025, 2)]
+    assert month_range((2025, 3), (2025, 3)) == [(2025, 3)]
+
+
+@pytest.mark.parametrize("start, end", [
+    ((2025, 0), (2025, 3)),
+    ((2025, 1), (2025, 13)),
+    ((2025, 3), (2025, 1)),
+])
+def test_month_range_rejects_invalid_ranges(start, end):
+    with pytest.raises(ValueError):
+        month_range(start, end)
+
+
+def test_month_range_limits_months(monkeypatch):
+    monkeypatch.setattr(settings, "meal_feedback_range_max_months", 3)
+    assert len(month_range((2025, 1), (2025, 3))) == 3
+    with pytest.raises(ValueError):
+        month_range((2025, 1), (2025, 4))
+
+
+@pytest.mark.asyncio
+async def test_range_feedback_summarizes_each_month_then_combines(monkeypatch):
+    fake = _FakeMealData()
+    monkeypatch.setattr(meal_data_service, "collect_monthly_meal_data", fake)
+
+    result = await diet_feedback_service.generate_range_feedback((2021, 11), (2022, 2), "token-map-reduce")
+
+    assert result["success"], result["error"]
+    report = result["feedback_result"]
+    assert sorted(fake.calls) == [(2021, 11), (2021, 12), (2022, 1), (2022, 2)]
+    assert [summary["period"] for summary in report["monthly_summaries"]] == [
+        "2021-11", "2021-12", "2022-01", "2022-02"
+    ]
+    assert all(summary["summary"] for summary in report["monthly_summaries"])
+    assert report["monthly_summaries"][0]["metrics"]["top_menu"] == "김치찌개(4.9점)"
+    assert report["message"]
+    assert "partial" not in report
+
+
+@pytest.mark.asyncio
+async def test_range_feedback_reuses_snapshots_except_fallback_months(monkeypatch):
+    fake = _FakeMealData(fallbacks={(2020, 2): ["menu_rankings"]})
+    monkeypatch.setattr(meal_data_service, "collect_monthly_meal_data", fake)
+
+    first = await diet_feedback_service.generate_range_feedback((2020, 1), (2020, 3), "token-snapshot-1")
+    assert first["success"], first["error"]
+    assert sorted(fake.calls) == [(2020, 1), (2020, 2), (2020, 3)]
+
+    # 정상 수집한 지난달은 스냅샷 재사용, 일부를 기본값으로 대체한 달만 다시 수집
+    fake.calls.clear()
+    second = await diet_feedback_service.generate_range_feedback((2020, 1), (2020, 3), "token-snapshot-2")
+    assert second["success"], second["error"]
+    assert fake.calls == [(2020, 2)]
+
+
+@pytest.mark.asyncio
+async def test_range_feedback_returns_completed_months_on_deadline(monkeypatch):
+    fake = _FakeMealData(delays={(2019, 3): 10.0})
+    monkeypatch.setattr(meal_data_service, "collect_monthly_meal_data", fake)
+
+    token = set_deadline(settings.deadline_fallback_reserve_seconds + 1.0)
+    try:
+        result = await diet_feedback_service.generate_range_feedback((2019, 1), (2019, 3), "token-deadline")
+    finally:
+        reset_deadline(token)
+
+    assert result["success"], result["error"]
+    report = result["feedback_result"]
+    assert report["partial"] is True
+    assert [summary["period"] for summary in report["monthly_summaries"]] == ["2019-01", "2019-02"]
@@ -0,0 +1,89 @@
+import httpx
+import pytest
+from prometheus_client import REGISTRY
+
+from ai_exercise_service.src.util.monitoring.metrics import (
+    current_request_usage,
+    instrument_node,
+    normalize_path,
+    observe_spring_call,
+    render_metrics,
+)
+
+
+def _sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+@pytest.mark.parametrize("path, expected", [
+    ("/eater/user/12/date/2025-03-01", "/eater/user/{id}/date/{date}"),
+    ("/meals/2025-03", "/meals/{date}"),
+    ("/exercises", "/exercises"),
+])
+def test_normalize_path_replaces_ids_and_dates(path, expected):
+    assert normalize_path(path) == expected
+
+
+def test_sync_node_records_latency_by_outcome():
+    node = instrument_node("test_graph", "sync_node", lambda state: {"error_message": state["error"]})
+    before_ok = _sample("graph_node_duration_seconds_count", graph="test_graph", node="sync_node", outcome="ok")
+    before_error = _sample("graph_node_duration_seconds_count", graph="test_graph", node="sync_node", outcome="error")
+
+    node({"error": ""})
+    node({"error": "실패"})
+
+    assert _sample("graph_node_duration_seconds_count", graph="test_graph", node="sync_node", outcome="ok") == before_ok + 1
+    assert _sample(
+        "graph_node_duration_seconds_count", graph="test_graph", node="sync_node", outcome="error"
+    ) == before_error + 1
+
+
+@pytest.mark.asyncio
+async def test_async_node_records_exceptions():
+    async def failing(state):
+        raise RuntimeError("boom")
+
+    node = instrument_node("test_graph", "async_node", failing)
+    labels = {"graph": "test_graph", "node": "async_node", "outcome": "exception"}
+    before = _sample("graph_node_duration_seconds_count", **labels)
+
+    with pytest.raises(RuntimeError):
+        await node({})
+
+    assert _sample("graph_node_duration_seconds_count", **labels) == before + 1
+
+
+def test_spring_calls_are_labelled_by_service_and_status():
+    labels = {"service": "test", "method": "GET", "path": "/exercises"}
+    before = _sample("spring_requests_total", status="200", **labels)
+
+    observe_spring_call("test", "GET", "/exercises", "200", 0.12)
+
+    assert _sample("spring_requests_total", status="200", **labels) == before + 1
+    assert _sample("spring_request_duration_seconds_count", **labels) >= 1
+
+
+@pytest.mark.asyncio
+async def test_middleware_labels_requests_by_route_template():
+    from main import app
+
+    labels = {"method": "GET", "route": "/health", "status": "200"}
+    before = _sample("http_request_duration_seconds_count", **labels)
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        response = await client.get("/health")
+        metrics = await client.get("/metrics")
+
+    assert response.status_code == 200
+    assert _sample("http_request_duration_seconds_count", **labels) == before + 1
+    assert metrics.status_code == 200
+    assert metrics.headers["content-type"].startswith("text/plain")
+    assert "http_request_duration_seconds_bucket" in metrics.text
+    # 요청이 끝나면 토큰 사용량 컨텍스트도 정리됨
+    assert current_request_usage() is None
+
+
+def test_render_metrics_returns_prometheus_text():
+    body, content_type = render_metrics()
+    assert content_type.startswith("text/plain")
+    assert b"graph_node_duration_seconds" in body
@@ -0,0 +1,122 @@
+import json
+
+import pytest
+
+from ai_exercise_service.src.ai.exercise.graph.exercise_analysis_graph import (
+    compact_exercise_list,
+    exercise_name,
+    expand_compact_plan,
+)
+
+# Spring 운동 목록 형식 (이름은 title)
+CATALOG = [
+    {"id": 11, "title": "스쿼트", "category": "근력", "description": "하체 운동"},
+    {"id": 12, "title": "플랭크", "category": "코어"},
+    {"id": 13, "name": "걷기", "category": "유산소"},
+]
+
+COMPACT_PLAN = {
+    "o": [3, 40, ["근력강화"], "주마다 세트 증가"],
+    "w": [
+        ["기초 적응", [[1, [[11, 3, 12, 60], [12, 2, "30s", 45]]], [3, [[13, 1, "600s", 0]]]]],
+        ["근력 강화", [[2, [[11, 4, 10, 90]]]]],
+    ],
+    "n": ["충분한 수분 섭취"],
+    "m": ["체중"],
+    "s": ["통증 시 중단"],
+}
+
+
+def test_exercise_name_prefers_title():
+    assert exercise_name(CATALOG[0]) == "스쿼트"
+    assert exercise_name(CATALOG[2]) == "걷기"
+    assert exercise_name({"id": 99}) == "99"
+
+
+def test_compact_exercise_list_keeps_only_id_name_category():
+    assert json.loads(compact_exercise_list(CATALOG)) == [
+        [11, "스쿼트", "근력"], [12, "플랭크", "코어"], [13, "걷기", "유산소"]
+    ]
+
+
+def test_expand_compact_plan_restores_full_format():
+    plan = expand_compact_plan(COMPACT_PLAN, CATALOG)
+
+    assert plan["program_overview"] == {
+        "duration_weeks": 2,
+        "weekly_sessions": 3,
+        "session_duration_minutes": 40,
+        "primary_goals": ["근력강화"],
+        "difficulty_progression": "주마다 세트 증가",
+    }
+    week_1 = plan["weekly_plans"]["week_1"]
+    assert week_1["focus"] == "기초 적응"
+    assert [workout["day"] for workout in week_1["workouts"]] == ["월요일", "수요일"]
+    assert week_1["workouts"][0]["exercises"] == [
+        {"name": "스쿼트", "sets": 3, "reps": "12회", "rest_seconds": 60},
+        {"name": "플랭크", "sets": 2, "reps": "30초", "rest_seconds": 45},
+    ]
+    assert week_1["workouts"][1]["exercises"][0]["reps"] == "600초"
+    assert plan["weekly_plans"]["week_2"]["workouts"][0]["day"] == "화요일"
+    assert plan["nutrition_tips"] == ["충분한 수분 섭취"]
+    assert plan["progress_tracking"] == {"measurement_points": ["체중"]}
+    assert plan["safety_guidelines"] == ["통증 시 중단"]
+
+
+def test_expand_compact_plan_rejects_unknown_exercise_ids():
+    compact = {**COMPACT_PLAN, "w": [["기초 적응", [[1, [[11, 3, 12, 60], [5, 3, 10, 60], [7, 1, 10, 0]]]]]]}
+    with pytest.raises(ValueError, match=r"\['5', '7'\]"):
+        expand_compact_plan(compact, CATALOG)
+
+
+def test_expand_compact_plan_accepts_non_numeric_ids():
+    catalog = [{"id": "ex-squat", "title": "스쿼트"}, {"id": "a1b2", "title": "플랭크"}]
+    compact = {**COMPACT_PLAN, "w": [["기초 적응", [[1, [["ex-squat", 3, 12, 60], ["a1b2", 2, "30s", 45]]]]]]}
+    exercises = expand_compact_plan(compact, catalog)["weekly_plans"]["week_1"]["workouts"][0]["exercises"]
+    assert [exercise["name"] for exercise in exercises] == ["스쿼트", "플랭크"]
+
+
+def test_expand_compact_plan_matches_numeric_ids_across_types():
+    # Spring은 문자열 ID, 모델은 숫자(또는 5.0 형태)로 출력해도 같은 운동
+    catalog = [{"id": "11", "title": "스쿼트"}, {"id": 12, "title": "플랭크"}]
+    compact = {**COMPACT_PLAN, "w": [["기초 적응", [[1, [[11, 3, 12, 60], ["12", 2, "30s", 45], [11.0, 1, 10, 0]]]]]]}
+    exercises = expand_compact_plan(compact, catalog)["weekly_plans"]["week_1"]["workouts"][0]["exercises"]
+    assert [exercise["name"] for exercise in exercises] == ["스쿼트", "플랭크", "스쿼트"]
+
+
+@pytest.mark.asyncio
+async def test_analysis_thread_key_changes_with_catalog(monkeypatch):
+    from ai_exercise_service.src.ai.exercise.service import exercise_analysis_service as module
+    from ai_exercise_service.src.util.graph.checkpoint import graph_checkpointer
+
+    catalogs = [CATALOG, CATALOG, CATALOG + [{"id": 14, "title": "버피"}]]
+    thread_ids = []
+
+    async def fake_catalog(token):
+        return catalogs[len(thread_ids)]
+
+    def fake_run(graph, initial_state, config):
+        thread_ids.append(config["configurable"]["thread_id"])
+        return {"error_message": "", "analysis_result": {"catalog_size": len(initial_state["exercise_catalog"])}}
+
+    monkeypatch.setattr(module.exercise_recommendation_service, "_get_exercises_from_spring", fake_catalog)
+    monkeypatch.setattr(graph_checkpointer, "run", fake_run)
+    monkeypatch.setattr(module.ExerciseAnalysisService, "graph", property(lambda self: None))
+
+    user_data = {"user_id": "1", "age": 20, "weight": 60, "height": 170}
+    for _ in catalogs:
+        result = await module.exercise_analysis_service.analyze_user_fitness(user_data, "token")
+        assert result["success"], result["error"]
+
+    assert thread_ids[0] == thread_ids[1], "같은 입력과 운동 목록이면 같은 스레드에서 재개"
+    assert thread_ids[2] != thread_ids[0], "운동 목록이 바뀌면 이전 체크포인트를 재개하지 않음"
+
+
+@pytest.mark.parametrize("compact", [
+    {**COMPACT_PLAN, "w": []},
+    {"w": COMPACT_PLAN["w"]},
+    {**COMPACT_PLAN, "w": [["기초 적응", [[1, [[11, 3]]]]]]},
+])
+def test_expand_compact_plan_rejects_malformed_plans(compact):
+    with pytest.raises((ValueError, TypeError, KeyError, IndexError)):
+        expand_compact_plan(compact, CATALOG)
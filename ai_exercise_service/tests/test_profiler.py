@@ -0,0 +1,117 @@
+import asyncio
+import os
+import time
+from contextlib import contextmanager
+
+import pytest
+
+from ai_exercise_service.src.util.monitoring import profiler
+from ai_exercise_service.src.util.monitoring.profiler import ProfilingMiddleware, RequestProfiler
+
+ADMIN_TOKEN = "profile-secret"
+
+
+def _spin(seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+def _spin_in_thread():
+    with profiler.request_profiler.profiled_thread():
+        _spin(0.1)
+
+
+async def _spin_on_loop():
+    _spin(0.1)
+
+
+async def _app(scope, receive, send):
+    # 요청에서 만든 태스크와 동기 노드 스레드 모두 프로파일 대상
+    await asyncio.create_task(_spin_on_loop())
+    await asyncio.to_thread(_spin_in_thread)
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"{}"})
+
+
+@pytest.fixture
+def request_profiler(tmp_path, monkeypatch):
+    instance = RequestProfiler()
+    instance.enabled = True
+    instance.admin_token = ADMIN_TOKEN
+    instance.sample_rate = 1.0
+    instance.interval = 0.002
+    instance.output_dir = str(tmp_path)
+    monkeypatch.setattr(profiler, "request_profiler", instance)
+    return instance
+
+
+@contextmanager
+def _installed(instance):
+    """테스트 이벤트 루프에 task factory 설치 후 원래대로 복구"""
+    loop = asyncio.get_running_loop()
+    instance.install()
+    try:
+        yield instance
+    finally:
+        loop.set_task_factory(None)
+
+
+async def _call(path, headers):
+    sent = []
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {"type": "http", "path": path, "headers": [(k.encode(), v.encode()) for k, v in headers.items()]}
+    await ProfilingMiddleware(_app)(scope, None, send)
+    return dict(sent[0]["headers"])
+
+
+@pytest.mark.asyncio
+async def test_profiled_request_writes_folded_stacks_named_by_request_id(request_profiler, tmp_path):
+    with _installed(request_profiler):
+        headers = await _call("/api/exercises/recommend", {"X-Profile": ADMIN_TOKEN})
+
+    profile_id = headers[b"x-profile-id"].decode()
+    path = tmp_path / f"{profile_id}.folded"
+    lines = path.read_text(encoding="utf-8").splitlines()
+
+    stacks = {line.rsplit(" ", 1)[0]: int(line.rsplit(" ", 1)[1]) for line in lines}
+    assert all(count > 0 for count in stacks.values())
+    assert any(
+        stack.startswith("thread event-loop;") and "_spin_on_loop (tests/test_profiler.py:" in stack
+        for stack in stacks
+    )
+    assert any(
+        not stack.startswith("thread event-loop;") and "_spin_in_thread (tests/test_profiler.py:" in stack
+        for stack in stacks
+    )
+
+
+@pytest.mark.asyncio
+async def test_requests_without_a_valid_header_are_not_profiled(request_profiler, tmp_path):
+    with _installed(request_profiler):
+        assert b"x-profile-id" not in await _call("/api/exercises/recommend", {})
+        assert b"x-profile-id" not in await _call("/api/exercises/recommend", {"X-Profile": "wrong"})
+        assert b"x-profile-id" not in await _call("/health", {"X-Profile": ADMIN_TOKEN})
+    assert os.listdir(tmp_path) == []
+
+
+@pytest.mark.asyncio
+async def test_sample_rate_limits_profiled_requests(request_profiler):
+    with _installed(request_profiler):
+        request_profiler.sample_rate = 0.0
+        assert not request_profiler.should_profile("/api/meal-feedback/2025/3", ADMIN_TOKEN)
+        request_profiler.sample_rate = 1.0
+        assert request_profiler.should_profile("/api/meal-feedback/2025/3", ADMIN_TOKEN)
+
+
+def test_profiling_needs_an_admin_token_and_an_installed_loop():
+    instance = RequestProfiler()
+    instance.enabled = True
+    instance.admin_token = ""
+    assert not instance.should_profile("/api/exercises/recommend", "")
+    # 이벤트 루프에 설치되지 않았으면 관리자 토큰이 있어도 프로파일하지 않음
+    instance.admin_token = ADMIN_TOKEN
+    assert not instance.should_profile("/api/exercises/recommend", ADMIN_TOKEN)
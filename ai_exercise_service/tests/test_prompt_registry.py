@@ -0,0 +1,83 @@
+import pytest
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration, LLMResult
+
+from ai_exercise_service.src.util.llm.callbacks import _extract_usage
+from ai_exercise_service.src.util.llm.prompt_registry import PromptRegistry, prompt_registry
+
+# 그래프 모듈 임포트 시 프롬프트가 등록됨
+from ai_exercise_service.src.ai.exercise.graph import exercise_analysis_graph, exercise_recommendation_graph  # noqa: F401
+from ai_exercise_service.src.ai.meal_feedback.graph import meal_analysis_graph  # noqa: F401
+
+GRAPHS = ["exercise_recommendation", "exercise_analysis", "meal_analysis"]
+
+
+@pytest.fixture
+def registry():
+    registry = PromptRegistry()
+    registry.register_graph("demo", preamble="공통 규칙: 한국어", tasks={
+        "first": {"instructions": "첫 번째 작업 지시", "output": "{{\"a\": 1}}", "data": "데이터: {value}"},
+        "second": {"instructions": "두 번째 작업 지시", "output": "텍스트", "data": "입력: {value}"},
+    })
+    return registry
+
+
+def test_system_message_holds_only_the_node_instructions(registry):
+    system, human = registry.get("demo", "first").format_messages(value="x")
+
+    assert system.content == "공통 규칙: 한국어\n\n첫 번째 작업 지시\n\n출력 형식:\n{\"a\": 1}"
+    assert "두 번째 작업 지시" not in system.content
+    assert human.content == "데이터: x"
+
+
+def test_request_data_only_changes_the_last_message(registry):
+    prompt = registry.get("demo", "second")
+    first = prompt.format_messages(value="1월")
+    second = prompt.format_messages(value="2월")
+
+    assert first[0].content == second[0].content
+    assert first[1].content != second[1].content
+
+
+def test_prefix_tokens_are_reported_per_node(registry):
+    counts = registry.prefix_tokens()
+
+    assert set(counts) == {"demo"}
+    assert set(counts["demo"]) == {"first", "second"}
+    assert all(count > 0 for count in counts["demo"].values())
+
+
+@pytest.mark.parametrize("graph", GRAPHS)
+def test_registered_nodes_carry_a_single_task(graph):
+    """노드마다 자기 지시사항/출력 형식만 보냄 (그래프 전체 지시사항을 매 호출에 보내지 않음)"""
+    prefixes = prompt_registry._prefixes[graph]
+    assert len(prefixes) > 1
+    for prefix in prefixes.values():
+        assert prefix.count("출력 형식:") == 1
+        assert "[작업:" not in prefix
+
+
+@pytest.mark.parametrize("graph", GRAPHS)
+def test_registered_prompts_do_not_add_unsourced_rules(graph):
+    """서비스 코드/원래 프롬프트에 없던 칼로리 구간/분당 소모량 규칙을 프롬프트에 넣지 않음"""
+    for prefix in prompt_registry._prefixes[graph].values():
+        assert "섭취 구간" not in prefix
+        assert "분당" not in prefix
+
+
+def test_extract_usage_reads_cached_tokens_from_usage_metadata():
+    message = AIMessage(content="ok", usage_metadata={
+        "input_tokens": 1500, "output_tokens": 20, "total_tokens": 1520,
+        "input_token_details": {"cache_read": 1024},
+    })
+    response = LLMResult(generations=[[ChatGeneration(message=message)]])
+
+    assert _extract_usage(response) == {"input_tokens": 1500, "output_tokens": 20, "cached_tokens": 1024}
+
+
+def test_extract_usage_reads_cached_tokens_from_token_usage():
+    response = LLMResult(generations=[[]], llm_output={"token_usage": {
+        "prompt_tokens": 1200, "completion_tokens": 10, "prompt_tokens_details": {"cached_tokens": 0},
+    }})
+
+    assert _extract_usage(response) == {"input_tokens": 1200, "output_tokens": 10, "cached_tokens": 0}
@@ -0,0 +1,152 @@
+import asyncio
+import functools
+from datetime import datetime, timedelta
+
+import httpx
+import pytest
+
+from ai_exercise_service.config.settings import settings
+from ai_exercise_service.src.ai.exercise.service.exercise_recommendation_service import exercise_recommendation_service
+from ai_exercise_service.src.ai.exercise.service.recommendation_refresh_service import RecommendationRefreshService
+from ai_exercise_service.src.util.cache.shared_cache import SharedCache
+
+SECRET = "webhook-secret"
+
+
+class _FakeRecommendations:
+    """추천 계산/무효화 호출만 기록하는 대체 구현"""
+
+    def __init__(self):
+        self.runs = []
+        self.invalidated = []
+        self.release = asyncio.Event()
+        self.release.set()
+
+    async def recommend_exercises_auto(self, user_id, token):
+        self.runs.append((user_id, token))
+        await self.release.wait()
+        return {"success": True}
+
+    async def invalidate_stored_recommendation(self, user_id, date=None):
+        self.invalidated.append((user_id, date))
+
+
+@pytest.fixture
+def fake(monkeypatch):
+    monkeypatch.setattr(settings, "recompute_enabled", True)
+    monkeypatch.setattr(settings, "recompute_debounce_seconds", 0.05)
+    monkeypatch.setattr(settings, "recompute_max_delay_seconds", 1.0)
+    monkeypatch.setattr(settings, "recompute_lease_seconds", 5.0)
+    monkeypatch.setattr(settings, "internal_webhook_secret", SECRET)
+    monkeypatch.setattr(settings, "internal_service_token", "service-token")
+
+    fake = _FakeRecommendations()
+    monkeypatch.setattr(exercise_recommendation_service, "recommend_exercises_auto", fake.recommend_exercises_auto)
+    monkeypatch.setattr(
+        exercise_recommendation_service, "invalidate_stored_recommendation", fake.invalidate_stored_recommendation
+    )
+    return fake
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return SharedCache(str(tmp_path / "shared_cache.sqlite"))
+
+
+async def _settle(*services):
+    """예약 타이머가 울리고 재계산 태스크가 끝날 때까지 대기"""
+    for _ in range(50):
+        await asyncio.sleep(0.05)
+        if not any(service._timers or service._tasks for service in services):
+            return
+
+
+@pytest.mark.asyncio
+async def test_burst_of_events_recomputes_once(fake, cache):
+    service = RecommendationRefreshService(cache)
+
+    outcomes = [await service.handle_eater_record_changed("12", None, SECRET) for _ in range(5)]
+    await _settle(service)
+
+    assert outcomes == ["scheduled"] + ["coalesced"] * 4
+    assert fake.runs == [("12", "service-token")]
+    assert cache.get("recompute", "12") == {"state": "done"}
+
+
+@pytest.mark.asyncio
+async def test_event_during_recompute_runs_once_more(fake, cache):
+    service = RecommendationRefreshService(cache)
+    fake.release.clear()
+
+    await service.handle_eater_record_changed("12", None, SECRET)
+    while not fake.runs:
+        await asyncio.sleep(0.01)
+    # 실행 중 이벤트는 끝난 뒤 최신 기록으로 한 번 더
+    assert await service.handle_eater_record_changed("12", None, SECRET) == "coalesced"
+    assert await service.handle_eater_record_changed("12", None, SECRET) == "coalesced"
+    fake.release.set()
+    await _settle(service)
+
+    assert len(fake.runs) == 2
+
+
+@pytest.mark.asyncio
+async def test_events_split_across_workers_recompute_once(fake, cache):
+    workers = [RecommendationRefreshService(cache), RecommendationRefreshService(cache)]
+
+    await workers[0].handle_eater_record_changed("12", None, SECRET)
+    await workers[1].handle_eater_record_changed("12", None, SECRET)
+    await workers[0].handle_eater_record_changed("13", None, SECRET)
+    await _settle(*workers)
+
+    assert sorted(user_id for user_id, _ in fake.runs) == ["12", "13"]
+
+
+@pytest.mark.asyncio
+async def test_unauthenticated_and_past_events_do_not_recompute(fake, cache):
+    service = RecommendationRefreshService(cache)
+    yesterday = (datetime.now() - timedelta(days=1)).strftime("%Y-%m-%d")
+
+    assert await service.handle_eater_record_changed("12", None, None) == "rejected"
+    assert await service.handle_eater_record_changed("12", None, "wrong") == "rejected"
+    assert await service.handle_eater_record_changed("12", yesterday, SECRET) == "ignored"
+    await _settle(service)
+
+    assert fake.runs == []
+    assert fake.invalidated == [("12", yesterday)]
+
+
+@pytest.mark.asyncio
+async def test_without_service_token_events_only_invalidate(fake, cache, monkeypatch):
+    monkeypatch.setattr(settings, "internal_service_token", "")
+    service = RecommendationRefreshService(cache)
+
+    assert await service.handle_eater_record_changed("12", None, SECRET) == "invalidated"
+    await _settle(service)
+
+    assert fake.runs == []
+    assert fake.invalidated == [("12", None)]
+
+
+@pytest.mark.asyncio
+async def test_local_publisher_drives_the_event_endpoint(fake, cache, monkeypatch):
+    from benchmarks import eater_events
+    from main import app
+    # main.py는 라우터를 서비스 디렉터리 기준(src.)으로 임포트
+    from src.ai.exercise.router import event_router
+
+    service = RecommendationRefreshService(cache)
+    monkeypatch.setattr(event_router, "recommendation_refresh_service", service)
+    monkeypatch.setattr(
+        eater_events.httpx, "AsyncClient", functools.partial(httpx.AsyncClient, transport=httpx.ASGITransport(app=app))
+    )
+
+    outcomes = await eater_events.publish("http://test", SECRET, ["12", "13"], burst=3, interval=0.0)
+    rejected = await eater_events.publish("http://test", "wrong", ["12"])
+    invalid = await eater_events.publish("http://test", SECRET, ["../admin"])
+    await _settle(service)
+
+    assert outcomes == {"scheduled": 2, "coalesced": 4}
+    assert rejected == {"http_403": 1}
+    assert invalid == {"http_422": 1}
+    assert sorted(user_id for user_id, _ in fake.runs) == ["12", "13"]
@@ -0,0 +1,233 @@
+import asyncio
+
+import httpx
+import pytest
+
+from ai_exercise_service.src.util.services import resilience
+from ai_exercise_service.src.util.services.resilience import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    CircuitBreaker,
+    CircuitOpenError,
+    SpringResilience,
+)
+
+PATH = "/api/test"
+
+
+def _request() -> httpx.Request:
+    return httpx.Request("GET", f"http://spring{PATH}")
+
+
+def _resilience(circuit: bool = True, hedging: bool = False) -> SpringResilience:
+    guard = SpringResilience()
+    guard.circuit_enabled = circuit
+    guard.hedging_enabled = hedging
+    guard.failure_threshold = 3
+    guard.open_seconds = 30.0
+    guard.hedge_min_delay = 0.01
+    guard.hedge_min_samples = 5
+    return guard
+
+
+def test_breaker_opens_after_consecutive_failures():
+    breaker = CircuitBreaker("GET", PATH, failure_threshold=3, open_seconds=30.0)
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == CLOSED and breaker.allow()
+
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    assert not breaker.allow()
+
+
+def test_breaker_success_resets_failure_count():
+    breaker = CircuitBreaker("GET", PATH, failure_threshold=3, open_seconds=30.0)
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state == CLOSED
+
+
+def test_breaker_half_open_allows_single_probe():
+    breaker = CircuitBreaker("GET", PATH, failure_threshold=1, open_seconds=30.0)
+    breaker.record_failure()
+
+    breaker.opened_at -= 31.0
+    assert breaker.allow()
+    assert breaker.state == HALF_OPEN
+    assert not breaker.allow(), "시험 호출이 진행 중이면 추가 호출은 거절"
+
+    breaker.record_failure()
+    assert breaker.state == OPEN
+
+    breaker.opened_at -= 31.0
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == CLOSED and breaker.allow()
+
+
+def test_breaker_release_probe_allows_next_probe():
+    breaker = CircuitBreaker("GET", PATH, failure_threshold=1, open_seconds=30.0)
+    breaker.record_failure()
+    breaker.opened_at -= 31.0
+    assert breaker.allow()
+    breaker.release_probe()
+    assert breaker.state == HALF_OPEN and breaker.allow()
+
+
+@pytest.mark.asyncio
+async def test_send_fails_fast_when_circuit_open():
+    guard = _resilience()
+    calls = 0
+
+    async def failing(request):
+        nonlocal calls
+        calls += 1
+        raise httpx.ConnectError("connection refused", request=request)
+
+    for _ in range(3):
+        with pytest.raises(httpx.ConnectError):
+            await guard.send(_request(), PATH, failing)
+
+    with pytest.raises(CircuitOpenError):
+        await guard.send(_request(), PATH, failing)
+    assert calls == 3
+
+
+@pytest.mark.asyncio
+async def test_send_counts_5xx_as_failure():
+    guard = _resilience()
+
+    async def server_error(request):
+        return httpx.Response(503, request=request)
+
+    for _ in range(3):
+        response = await guard.send(_request(), PATH, server_error)
+        assert response.status_code == 503
+    assert guard.breaker("GET", PATH).state == OPEN
+
+
+@pytest.mark.asyncio
+async def test_cancelled_call_releases_probe():
+    guard = _resilience()
+    breaker = guard.breaker("GET", PATH)
+    for _ in range(guard.failure_threshold):
+        breaker.record_failure()
+    breaker.opened_at -= 31.0
+
+    async def hanging(request):
+        await asyncio.sleep(10)
+
+    task = asyncio.create_task(guard.send(_request(), PATH, hanging))
+    await asyncio.sleep(0.01)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    assert breaker.state == HALF_OPEN
+    assert breaker.allow(), "취소된 시험 호출은 서킷 상태에 반영하지 않고 예약만 해제"
+
+
+def test_hedge_delay_requires_samples_and_get():
+    guard = _resilience(hedging=True)
+    assert guard.hedge_delay("GET", PATH) is None
+
+    tracker = guard._latencies.setdefault(("GET", PATH), resilience.LatencyTracker())
+    for _ in range(4):
+        tracker.add(0.2)
+    assert guard.hedge_delay("GET", PATH) is None
+
+    tracker.add(0.2)
+    assert guard.hedge_delay("GET", PATH) == pytest.approx(0.2)
+    assert guard.hedge_delay("POST", PATH) is None
+
+    guard.hedging_enabled = False
+    assert guard.hedge_delay("GET", PATH) is None
+
+
+def test_hedge_delay_has_minimum():
+    guard = _resilience(hedging=True)
+    guard.hedge_min_delay = 0.05
+    tracker = guard._latencies.setdefault(("GET", PATH), resilience.LatencyTracker())
+    for _ in range(5):
+        tracker.add(0.001)
+    assert guard.hedge_delay("GET", PATH) == pytest.approx(0.05)
+
+
+class _TrackedSend:
+    """요청 순서별 지연/결과를 지정하고 닫힌 응답을 기록하는 전송 함수"""
+
+    def __init__(self, *plans):
+        self.plans = list(plans)
+        self.calls = 0
+        self.cancelled = 0
+        self.responses = []
+
+    async def __call__(self, request):
+        delay, status = self.plans[self.calls]
+        self.calls += 1
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        if status is None:
+            raise httpx.ReadTimeout("timeout", request=request)
+        response = httpx.Response(status, request=request, content=str(self.calls).encode())
+        self.responses.append(response)
+        return response
+
+
+@pytest.mark.asyncio
+async def test_hedged_returns_fast_primary_without_hedge():
+    guard = _resilience(hedging=True)
+    send = _TrackedSend((0.0, 200))
+    response = await guard._hedged(_request(), PATH, send, delay=0.5)
+    assert response.status_code == 200
+    assert send.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_hedged_uses_faster_hedge_and_cancels_primary():
+    guard = _resilience(hedging=True)
+    send = _TrackedSend((1.0, 200), (0.0, 200))
+    response = await guard._hedged(_request(), PATH, send, delay=0.02)
+    assert response.status_code == 200
+    assert send.calls == 2
+    assert send.cancelled == 1
+
+
+@pytest.mark.asyncio
+async def test_hedged_falls_back_to_hedge_when_primary_fails():
+    guard = _resilience(hedging=True)
+    send = _TrackedSend((0.05, None), (0.1, 200))
+    response = await guard._hedged(_request(), PATH, send, delay=0.02)
+    assert response.status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_hedged_raises_primary_error_when_both_fail():
+    guard = _resilience(hedging=True)
+    send = _TrackedSend((0.05, None), (0.06, None))
+    with pytest.raises(httpx.ReadTimeout):
+        await guard._hedged(_request(), PATH, send, delay=0.02)
+
+
+@pytest.mark.asyncio
+async def test_discard_closes_losing_response():
+    closed = []
+
+    class _Response:
+        async def aclose(self):
+            closed.append(True)
+
+    async def finished():
+        return _Response()
+
+    task = asyncio.create_task(finished())
+    await asyncio.sleep(0)
+    await resilience._discard(task)
+    assert closed == [True]
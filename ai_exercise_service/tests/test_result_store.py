@@ -0,0 +1,64 @@
+import pytest
+
+from ai_exercise_service.src.util.cache.result_store import ResultStore, etag_for, etag_matches, fingerprint
+from ai_exercise_service.src.util.cache.shared_cache import SharedCache
+
+
+@pytest.fixture
+def store(tmp_path):
+    return ResultStore("test", ttl_seconds=60.0, cache=SharedCache(str(tmp_path / "cache.sqlite")))
+
+
+def test_etag_is_stable_for_same_body():
+    assert etag_for({"a": 1, "b": [1, 2]}) == etag_for({"a": 1, "b": [1, 2]})
+    assert etag_for({"a": 1}) != etag_for({"a": 2})
+    assert etag_for({"a": 1}).startswith('"') and etag_for({"a": 1}).endswith('"')
+
+
+ETAG = '"0123456789abcdef"'
+
+
+@pytest.mark.parametrize("if_none_match, expected", [
+    (None, False),
+    ("", False),
+    ('"0123456789abcdef"', True),
+    ('W/"0123456789abcdef"', True),
+    ('"other", "0123456789abcdef"', True),
+    ('"other",W/"0123456789abcdef"', True),
+    ("*", True),
+    ('"other"', False),
+    ("0123456789abcdef", False),
+])
+def test_etag_matches(if_none_match, expected):
+    assert etag_matches(if_none_match, ETAG) is expected
+
+
+def test_fingerprint_ignores_key_order():
+    assert fingerprint({"a": 1, "b": 2}, "x") == fingerprint({"b": 2, "a": 1}, "x")
+    assert fingerprint({"a": 1}) != fingerprint({"a": 2})
+
+
+@pytest.mark.asyncio
+async def test_get_requires_matching_fingerprint(store):
+    await store.put("key", "fp-1", {"value": 1})
+    assert await store.get("key", "fp-1") == {"value": 1}
+    assert await store.get("key", "fp-2") is None
+    # 다른 입력으로 조회해도 저장된 결과는 남음
+    assert await store.get("key", "fp-1") == {"value": 1}
+
+    await store.invalidate("key")
+    assert await store.get("key", "fp-1") is None
+
+
+@pytest.mark.asyncio
+async def test_update_reads_and_writes_same_fingerprint(store):
+    def append(current):
+        return (current or []) + ["item"]
+
+    assert await store.update("key", "fp-1", append) == ["item"]
+    assert await store.update("key", "fp-1", append) == ["item", "item"]
+
+    # 지문이 바뀌면 새 결과로 시작하고, None을 반환하면 저장하지 않음
+    assert await store.update("key", "fp-2", append) == ["item"]
+    assert await store.update("key", "fp-1", lambda current: None) is None
+    assert await store.get("key", "fp-2") == ["item"]
@@ -0,0 +1,113 @@
+import pytest
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration, LLMResult
+from langchain_core.prompts import ChatPromptTemplate
+from prometheus_client import REGISTRY
+
+from ai_exercise_service.config.settings import settings
+from ai_exercise_service.src.util.llm.callbacks import LLMMetricsCallbackHandler
+from ai_exercise_service.src.util.llm.token_budget import TokenBudget, TokenCounter, _shrink
+from ai_exercise_service.src.util.monitoring.metrics import (
+    current_request_usage,
+    reset_request_usage,
+    start_request_usage,
+)
+
+PROMPT = ChatPromptTemplate.from_messages([("system", "급식 분석"), ("human", "{analysis}\n{context}")])
+
+
+def _sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+@pytest.fixture
+def budget(monkeypatch):
+    monkeypatch.setattr(settings, "llm_prompt_token_budget", {"trim_node": 120})
+    budget = TokenBudget()
+    # 인코딩 파일 유무와 관계없이 같은 결과가 나오도록 근사 계산 사용
+    budget.counter = TokenCounter("no-such-encoding")
+    return budget
+
+
+def test_approximate_counter_counts_hangul_per_character():
+    counter = TokenCounter("no-such-encoding")
+    assert not counter.load()
+    assert counter.count("김치찌개") == 4
+    assert counter.count("kcal") == 1
+    assert counter.count("밥 200g") == 1 + 2
+
+
+def test_context_within_budget_is_unchanged(budget):
+    sections = {"meals": ["밥", "국"], "statistics": {"days": 2}}
+    before = _sample("llm_context_trims_total", node="trim_node", section="meals", action="truncated")
+
+    assert budget.fit_context("trim_node", PROMPT, {"analysis": "요약"}, "context", sections, ["meals"]) == sections
+    assert _sample("llm_context_trims_total", node="trim_node", section="meals", action="truncated") == before
+
+
+def test_lowest_priority_sections_are_trimmed_first(budget):
+    sections = {
+        "raw_meals": [f"메뉴{i}" for i in range(40)],
+        "daily": [f"{i}일" for i in range(20)],
+        "statistics": {"average_calories": 650},
+    }
+    labels = {"node": "trim_node", "section": "raw_meals"}
+    truncated = _sample("llm_context_trims_total", action="truncated", **labels)
+
+    context = budget.fit_context(
+        "trim_node", PROMPT, {"analysis": "요약"}, "context", sections, ["raw_meals", "daily"]
+    )
+
+    assert budget.estimate_prompt_tokens(PROMPT, {"analysis": "요약", "context": str(context)}) <= 120
+    # 우선순위가 더 높은 섹션과 우선순위 목록에 없는 섹션은 그대로
+    assert context["daily"] == sections["daily"]
+    assert context["statistics"] == sections["statistics"]
+    assert len(context.get("raw_meals", [])) < 40
+    assert _sample("llm_context_trims_total", action="truncated", **labels) > truncated
+    # 원본은 바꾸지 않음
+    assert len(sections["raw_meals"]) == 40
+
+
+def test_sections_outside_priority_are_never_trimmed(budget):
+    sections = {"statistics": {"menus": [f"메뉴{i}" for i in range(80)]}}
+
+    context = budget.fit_context("trim_node", PROMPT, {"analysis": "요약"}, "context", sections, [])
+
+    assert context == sections
+
+
+def test_shrink_halves_lists_and_largest_dict_entry():
+    assert _shrink([1, 2, 3, 4]) == [1, 2]
+    assert _shrink([1]) is None
+    assert _shrink({"data": list(range(10)), "statistics": {"days": 3}}) == {
+        "data": list(range(5)), "statistics": {"days": 3}
+    }
+    assert _shrink({"name": "급식"}) is None
+
+
+def test_prompt_estimate_is_recorded_per_node(budget):
+    before = _sample("llm_prompt_tokens_estimated_count", node="trim_node")
+
+    tokens = budget.record_estimate("trim_node", PROMPT, {"analysis": "요약", "context": "밥"})
+
+    assert tokens == budget.estimate_prompt_tokens(PROMPT, {"analysis": "요약", "context": "밥"})
+    assert _sample("llm_prompt_tokens_estimated_count", node="trim_node") == before + 1
+
+
+def test_actual_usage_is_added_to_request_and_node_totals():
+    handler = LLMMetricsCallbackHandler("test-model")
+    labels = {"node": "usage_node", "model": "test-model"}
+    before = _sample("llm_tokens_total", kind="prompt", **labels)
+    token = start_request_usage()
+    try:
+        for run_id, node in ((1, "usage_node"), (2, "usage_node"), (3, "other_node")):
+            handler.on_chat_model_start({}, [], run_id=run_id, metadata={"langgraph_node": node})
+            message = AIMessage(content="", usage_metadata={"input_tokens": 100, "output_tokens": 10, "total_tokens": 110})
+            handler.on_llm_end(LLMResult(generations=[[ChatGeneration(message=message)]]), run_id=run_id)
+        usage = current_request_usage()
+    finally:
+        reset_request_usage(token)
+
+    assert usage.by_node["usage_node"] == {"input_tokens": 200, "output_tokens": 20, "cached_tokens": 0}
+    assert usage.totals() == {"input_tokens": 300, "output_tokens": 30, "cached_tokens": 0}
+    assert _sample("llm_tokens_total", kind="prompt", **labels) == before + 200
@@ -0,0 +1,140 @@
+import asyncio
+
+import httpx
+import pytest
+
+from ai_exercise_service.src.util.monitoring.tracing import (
+    SpanExporter,
+    get_request_id,
+    inject_headers,
+    span,
+    to_otlp_payload,
+    traced,
+    tracer,
+)
+
+
+class _MemoryExporter(SpanExporter):
+    """내보낸 trace를 메모리에 모으는 테스트용 exporter (스레드 없이 바로 기록)"""
+
+    def __init__(self):
+        super().__init__()
+        self.traces = []
+
+    def submit(self, spans):
+        self.traces.append(spans)
+
+    def export(self, spans):
+        self.traces.append(spans)
+
+
+@pytest.fixture
+def exporter(monkeypatch):
+    exporter = _MemoryExporter()
+    monkeypatch.setattr(tracer, "enabled", True)
+    monkeypatch.setattr(tracer, "sample_rate", 1.0)
+    monkeypatch.setattr(tracer, "_exporter", exporter)
+    return exporter
+
+
+def test_child_spans_link_to_their_parent(exporter):
+    root, tokens = tracer.start_trace("req-1", name="request")
+    with span("node graph.a") as node_span:
+        with span("llm gpt", model="fake") as llm_span:
+            headers = {}
+            inject_headers(headers)
+    tracer.end_trace(root, tokens)
+
+    spans = {item["name"]: item for item in exporter.traces[0]}
+    assert spans["request"]["parent_span_id"] is None
+    assert spans["node graph.a"]["parent_span_id"] == root.span_id
+    assert spans["llm gpt"]["parent_span_id"] == node_span.span_id
+    assert spans["llm gpt"]["attributes"] == {"model": "fake"}
+    assert {item["request_id"] for item in exporter.traces[0]} == {"req-1"}
+    # 다운스트림 호출 헤더에 요청 ID와 현재 span 기준 traceparent 전파
+    assert headers["X-Request-ID"] == "req-1"
+    assert headers["traceparent"] == f"00-{root.trace.trace_id}-{llm_span.span_id}-01"
+    assert get_request_id() is None
+
+
+def test_exception_marks_span_as_error(exporter):
+    root, tokens = tracer.start_trace("req-2")
+    with pytest.raises(ValueError):
+        with span("node graph.failing"):
+            raise ValueError("boom")
+    tracer.end_trace(root, tokens)
+
+    failing = next(item for item in exporter.traces[0] if item["name"] == "node graph.failing")
+    assert failing["status"] == "error"
+
+
+def test_spans_outside_a_request_are_noops():
+    with span("orphan") as orphan:
+        assert orphan is None
+    headers = {}
+    inject_headers(headers)
+    assert headers == {}
+
+
+@pytest.mark.asyncio
+async def test_spans_follow_concurrent_tasks(exporter):
+    @traced("service.call")
+    async def call(delay):
+        await asyncio.sleep(delay)
+        with span("spring GET"):
+            pass
+
+    root, tokens = tracer.start_trace("req-3")
+    await asyncio.gather(call(0.01), call(0))
+    tracer.end_trace(root, tokens)
+
+    spans = exporter.traces[0]
+    service_ids = {item["span_id"] for item in spans if item["name"] == "service.call"}
+    spring_parents = {item["parent_span_id"] for item in spans if item["name"] == "spring GET"}
+    assert len(service_ids) == 2
+    assert spring_parents == service_ids
+
+
+def test_unsampled_traces_are_exported_only_when_slow(exporter, monkeypatch):
+    monkeypatch.setattr(tracer, "sample_rate", 0.0)
+    monkeypatch.setattr(tracer, "slow_threshold_ns", 10 ** 12)
+    root, tokens = tracer.start_trace("fast")
+    tracer.end_trace(root, tokens)
+    assert exporter.traces == []
+
+    monkeypatch.setattr(tracer, "slow_threshold_ns", 0)
+    root, tokens = tracer.start_trace("slow")
+    tracer.end_trace(root, tokens)
+    assert [item["request_id"] for item in exporter.traces[0]] == ["slow"]
+
+
+def test_otlp_payload_shape():
+    spans = [{
+        "trace_id": "a" * 32, "request_id": "req", "span_id": "b" * 16, "parent_span_id": None,
+        "name": "request", "start_ns": 1, "end_ns": 2, "duration_ms": 0.0, "status": "error",
+        "attributes": {"status_code": 500, "cached": True, "ratio": 0.5, "path": "/x"}
+    }]
+    payload = to_otlp_payload(spans)
+
+    otlp_span = payload["resourceSpans"][0]["scopeSpans"][0]["spans"][0]
+    assert otlp_span["traceId"] == "a" * 32
+    assert "parentSpanId" not in otlp_span
+    assert otlp_span["status"] == {"code": 2}
+    assert {"key": "status_code", "value": {"intValue": "500"}} in otlp_span["attributes"]
+    assert {"key": "cached", "value": {"boolValue": True}} in otlp_span["attributes"]
+    assert {"key": "ratio", "value": {"doubleValue": 0.5}} in otlp_span["attributes"]
+
+
+@pytest.mark.asyncio
+async def test_middleware_propagates_request_id(exporter):
+    from main import app
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        response = await client.get("/health", headers={"X-Request-ID": "client-req-7"})
+        generated = await client.get("/health")
+
+    assert response.headers["x-request-id"] == "client-req-7"
+    assert generated.headers["x-request-id"]
+    root = next(item for item in exporter.traces[0] if item["parent_span_id"] is None)
+    assert root["name"] == "GET /health"
+    assert root["attributes"]["status_code"] == 200
@@ -0,0 +1,176 @@
+import asyncio
+import logging
+import threading
+
+import httpx
+import pytest
+
+from ai_exercise_service.config.settings import settings
+from ai_exercise_service.src.util.cache.shared_cache import shared_cache
+from ai_exercise_service.src.util.services import spring_client
+from ai_exercise_service.src.util.services.warmup import WarmupService, warmup_service
+
+
+def _ok(detail=None):
+    async def step():
+        return detail
+    return step
+
+
+def _fail(message):
+    async def step():
+        raise RuntimeError(message)
+    return step
+
+
+def _service(monkeypatch, steps):
+    """단계 함수(인자 없는 코루틴 함수)를 지정한 워밍업 서비스"""
+    service = WarmupService()
+    monkeypatch.setattr(service, "_steps", lambda: dict(steps))
+    return service
+
+
+def _steps(**overrides):
+    steps = {name: _ok() for name in ("graphs", "llm_clients", "tokenizer", "prompts", "persistent_store", "spring")}
+    steps.update(overrides)
+    return steps
+
+
+@pytest.fixture(autouse=True)
+def fast_retry(monkeypatch):
+    monkeypatch.setattr(settings, "warmup_retry_seconds", 0.01)
+    monkeypatch.setattr(settings, "warmup_timeout_seconds", 5.0)
+
+
+@pytest.mark.asyncio
+async def test_ready_when_all_required_steps_succeed(monkeypatch):
+    service = _service(monkeypatch, _steps())
+    await service.run()
+
+    status = service.status()
+    assert status["ready"] is True
+    assert status["failed"] == {}
+    assert all(detail.startswith("ok") for detail in status["steps"].values())
+
+
+@pytest.mark.asyncio
+async def test_optional_step_failure_does_not_block_ready(monkeypatch):
+    service = _service(monkeypatch, _steps(tokenizer=_fail("offline")))
+    await service.run()
+
+    assert service.ready
+    assert service.steps["tokenizer"] == "failed: offline"
+    assert service.failed == {}
+
+
+@pytest.mark.asyncio
+async def test_required_step_failure_keeps_not_ready_and_retries(monkeypatch):
+    outcomes = iter(["Missing credentials", "Missing credentials", None])
+    calls = {"llm_clients": 0, "graphs": 0}
+
+    async def llm_clients():
+        calls["llm_clients"] += 1
+        message = next(outcomes)
+        if message:
+            raise RuntimeError(message)
+
+    async def graphs():
+        calls["graphs"] += 1
+
+    service = _service(monkeypatch, _steps(llm_clients=llm_clients, graphs=graphs))
+    monkeypatch.setattr(settings, "warmup_retry_seconds", 0.05)
+    task = asyncio.create_task(service.run())
+    await asyncio.sleep(0.02)
+
+    status = service.status()
+    assert status["ready"] is False
+    assert status["failed"] == {"llm_clients": "failed: Missing credentials"}
+
+    await asyncio.wait_for(task, timeout=2.0)
+    assert service.ready
+    assert service.attempts == 3
+    # 성공한 단계는 다시 실행하지 않음
+    assert calls == {"llm_clients": 3, "graphs": 1}
+
+
+@pytest.mark.asyncio
+async def test_timeout_marks_unfinished_steps_failed(monkeypatch):
+    async def hang():
+        await asyncio.sleep(10)
+
+    monkeypatch.setattr(settings, "warmup_timeout_seconds", 0.05)
+    monkeypatch.setattr(settings, "warmup_retry_seconds", 10.0)
+    service = _service(monkeypatch, _steps(spring=hang))
+    task = asyncio.create_task(service.run())
+    await asyncio.sleep(0.2)
+
+    try:
+        assert not service.ready
+        assert service.failed == {"spring": "failed: timeout (0.05s)"}
+        assert service.steps["graphs"].startswith("ok")
+    finally:
+        service._task = task
+        await service.stop()
+
+
+@pytest.mark.asyncio
+async def test_ready_endpoint_reports_failures_with_503(monkeypatch):
+    from main import app
+
+    monkeypatch.setattr(warmup_service, "ready", False)
+    monkeypatch.setattr(warmup_service, "steps", {"spring": "failed: Spring 연결 실패", "graphs": "ok (0.10s)"})
+    monkeypatch.setattr(warmup_service, "failed", {"spring": "failed: Spring 연결 실패"})
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        response = await client.get("/ready")
+        assert response.status_code == 503
+        assert response.json()["failed"] == {"spring": "failed: Spring 연결 실패"}
+
+        monkeypatch.setattr(warmup_service, "ready", True)
+        monkeypatch.setattr(warmup_service, "failed", {})
+        response = await client.get("/ready")
+        assert response.status_code == 200
+
+
+def _fake_spring(monkeypatch, handler):
+    monkeypatch.setattr(
+        spring_client, "create_spring_client",
+        lambda service, timeout: httpx.AsyncClient(transport=httpx.MockTransport(handler), timeout=timeout)
+    )
+
+
+@pytest.mark.asyncio
+async def test_spring_step_fails_when_no_connection_opens(monkeypatch):
+    def refuse(request):
+        raise httpx.ConnectError("connection refused", request=request)
+
+    _fake_spring(monkeypatch, refuse)
+    with pytest.raises(ConnectionError, match=f"connections=0/{settings.warmup_spring_connections}"):
+        await WarmupService()._warm_spring()
+
+
+@pytest.mark.asyncio
+async def test_catalog_preload_without_service_token_is_logged(monkeypatch, caplog):
+    _fake_spring(monkeypatch, lambda request: httpx.Response(401))
+    monkeypatch.setattr(settings, "internal_service_token", "")
+
+    with caplog.at_level(logging.WARNING, logger="ai_exercise_service.src.util.services.warmup"):
+        detail = await WarmupService()._warm_spring()
+
+    assert "catalog=skipped (no service token)" in detail
+    assert any("운동 목록 사전 적재 생략" in record.getMessage() for record in caplog.records)
+
+
+@pytest.mark.asyncio
+async def test_namespace_counts_runs_off_the_event_loop(monkeypatch):
+    loop_thread = threading.get_ident()
+    threads = []
+
+    def namespace_counts():
+        threads.append(threading.get_ident())
+        return {}
+
+    monkeypatch.setattr(shared_cache, "namespace_counts", namespace_counts)
+    await WarmupService()._open_persistent_store()
+
+    assert threads and threads[0] != loop_thread